@@ -1,40 +1,18 @@
 -- =================================================================
 -- UNIVERSITY CDC PIPELINE - FLINK SQL JOB
--- This script sets up complete CDC pipeline for University data
 -- PostgreSQL → Debezium → Kafka → Flink → Iceberg
+-- Generated by generate-data/run_flink_job_generation.py from
+-- generate-data/pipeline_tables.py - edit the definition, not this file
 -- =================================================================
 
--- =================================================================
--- 1. SETUP ICEBERG CATALOG
--- =================================================================
-
--- Create Iceberg catalog in Flink
-CREATE CATALOG iceberg_catalog WITH (
-  'type' = 'iceberg',
-  'catalog-type' = 'rest',
-  'uri' = 'http://polaris:8181/api/catalog/',
-  'warehouse' = 'polariscatalog',
-  'credential' = 'root:secret',
-  'scope' = 'PRINCIPAL_ROLE:ALL',
-  's3.endpoint' = 'http://minio:9000',
-  's3.region' = 'dummy-region',
-  's3.access-key-id' = 'admin',
-  's3.secret-access-key' = 'password'
-);
-
--- Use the Iceberg catalog
-USE CATALOG iceberg_catalog;
+-- 1. JOB SETTINGS
+SET 'pipeline.name' = 'university-cdc-pipeline';
+SET 'parallelism.default' = '1';
+SET 'execution.checkpointing.interval' = '60s';
 
--- Create namespace/database
-CREATE DATABASE IF NOT EXISTS university;
-USE university;
+-- 2. KAFKA SOURCE TABLES
 
--- =================================================================
--- 2. KAFKA SOURCE TABLES (for each university table)
--- =================================================================
-
--- Faculty Kafka Source
-CREATE TABLE kafka_faculty (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_faculty (
   id INT,
   faculty_code STRING,
   faculty_name STRING,
@@ -46,13 +24,12 @@ CREATE TABLE kafka_faculty (
   'connector' = 'kafka',
   'topic' = 'university-server.public.faculty',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-faculty-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- Program Kafka Source
-CREATE TABLE kafka_program (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_program (
   id INT,
   program_code STRING,
   program_name STRING,
@@ -66,13 +43,12 @@ CREATE TABLE kafka_program (
   'connector' = 'kafka',
   'topic' = 'university-server.public.program',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-program-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- Students Kafka Source
-CREATE TABLE kafka_students (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_students (
   student_id STRING,
   full_name STRING,
   entry_year INT,
@@ -88,13 +64,12 @@ CREATE TABLE kafka_students (
   'connector' = 'kafka',
   'topic' = 'university-server.public.students',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-students-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- Student Detail Kafka Source
-CREATE TABLE kafka_student_detail (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_student_detail (
   id INT,
   student_id STRING,
   gender STRING,
@@ -124,13 +99,12 @@ CREATE TABLE kafka_student_detail (
   'connector' = 'kafka',
   'topic' = 'university-server.public.student_detail',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-student-detail-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- Student Fee Kafka Source
-CREATE TABLE kafka_student_fee (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_student_fee (
   fee_id STRING,
   student_id STRING,
   ukt_fee DECIMAL(12,2),
@@ -143,13 +117,12 @@ CREATE TABLE kafka_student_fee (
   'connector' = 'kafka',
   'topic' = 'university-server.public.student_fee',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-student-fee-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- Lecturer Kafka Source
-CREATE TABLE kafka_lecturer (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_lecturer (
   id INT,
   lecturer_id STRING,
   name STRING,
@@ -163,13 +136,12 @@ CREATE TABLE kafka_lecturer (
   'connector' = 'kafka',
   'topic' = 'university-server.public.lecturer',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-lecturer-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- Room Kafka Source
-CREATE TABLE kafka_room (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_room (
   id INT,
   room_code STRING,
   building STRING,
@@ -182,13 +154,12 @@ CREATE TABLE kafka_room (
   'connector' = 'kafka',
   'topic' = 'university-server.public.room',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-room-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- Course Kafka Source
-CREATE TABLE kafka_course (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_course (
   id INT,
   course_code STRING,
   course_name STRING,
@@ -202,13 +173,12 @@ CREATE TABLE kafka_course (
   'connector' = 'kafka',
   'topic' = 'university-server.public.course',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-course-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- Registration Kafka Source
-CREATE TABLE kafka_registration (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_registration (
   registration_id STRING,
   student_id STRING,
   academic_year STRING,
@@ -227,13 +197,12 @@ CREATE TABLE kafka_registration (
   'connector' = 'kafka',
   'topic' = 'university-server.public.registration',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-registration-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- Class Kafka Source
-CREATE TABLE kafka_class (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_class (
   class_id STRING,
   course_id INT,
   lecturer_id INT,
@@ -254,13 +223,12 @@ CREATE TABLE kafka_class (
   'connector' = 'kafka',
   'topic' = 'university-server.public.class',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-class-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- Student Enrollment Kafka Source
-CREATE TABLE kafka_student_enrollment (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_student_enrollment (
   enrollment_id INT,
   student_id STRING,
   registration_id STRING,
@@ -272,6 +240,7 @@ CREATE TABLE kafka_student_enrollment (
   attendance_percentage DECIMAL(5,2),
   created_at TIMESTAMP(3),
   updated_at TIMESTAMP(3),
+  academic_year STRING,
   op STRING,
   ts_ms BIGINT,
   PRIMARY KEY (enrollment_id) NOT ENFORCED
@@ -279,13 +248,12 @@ CREATE TABLE kafka_student_enrollment (
   'connector' = 'kafka',
   'topic' = 'university-server.public.student_enrollment',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-enrollment-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- Payment Kafka Source
-CREATE TABLE kafka_payment (
+CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_payment (
   payment_id STRING,
   student_id STRING,
   registration_id STRING,
@@ -303,6 +271,7 @@ CREATE TABLE kafka_payment (
   due_date DATE,
   created_at TIMESTAMP(3),
   updated_at TIMESTAMP(3),
+  academic_year STRING,
   op STRING,
   ts_ms BIGINT,
   PRIMARY KEY (payment_id) NOT ENFORCED
@@ -310,31 +279,46 @@ CREATE TABLE kafka_payment (
   'connector' = 'kafka',
   'topic' = 'university-server.public.payment',
   'properties.bootstrap.servers' = 'kafka-broker:29092',
-  'properties.group.id' = 'flink-payment-consumer',
+  'properties.group.id' = 'flink-university-cdc',
   'scan.startup.mode' = 'earliest-offset',
   'format' = 'debezium-json'
 );
 
--- =================================================================
--- 3. ICEBERG SINK TABLES (for each university table)
--- =================================================================
+-- 3. ICEBERG CATALOG AND SINK TABLES
 
--- Faculty Iceberg Sink
-CREATE TABLE faculty_iceberg (
+CREATE CATALOG iceberg_catalog WITH (
+  'type' = 'iceberg',
+  'catalog-type' = 'rest',
+  'uri' = 'http://polaris:8181/api/catalog/',
+  'warehouse' = 'polariscatalog',
+  'credential' = 'root:secret',
+  'scope' = 'PRINCIPAL_ROLE:ALL',
+  's3.endpoint' = 'http://minio:9000',
+  's3.region' = 'dummy-region',
+  's3.access-key-id' = 'admin',
+  's3.secret-access-key' = 'password'
+);
+
+CREATE DATABASE IF NOT EXISTS iceberg_catalog.university;
+
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.faculty_iceberg (
   id INT,
   faculty_code STRING,
   faculty_name STRING,
   created_at TIMESTAMP(3),
   PRIMARY KEY (id) NOT ENFORCED
 ) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'faculty_iceberg'
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'none',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10'
 );
 
--- Program Iceberg Sink
-CREATE TABLE program_iceberg (
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.program_iceberg (
   id INT,
   program_code STRING,
   program_name STRING,
@@ -343,14 +327,17 @@ CREATE TABLE program_iceberg (
   created_at TIMESTAMP(3),
   PRIMARY KEY (id) NOT ENFORCED
 ) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'program_iceberg'
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'none',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10'
 );
 
--- Students Iceberg Sink
-CREATE TABLE students_iceberg (
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.students_iceberg (
   student_id STRING,
   full_name STRING,
   entry_year INT,
@@ -361,14 +348,18 @@ CREATE TABLE students_iceberg (
   created_at TIMESTAMP(3),
   PRIMARY KEY (student_id) NOT ENFORCED
 ) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'students_iceberg'
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'none',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10',
+  'write.upsert.enabled' = 'true'
 );
 
--- Student Detail Iceberg Sink
-CREATE TABLE student_detail_iceberg (
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.student_detail_iceberg (
   id INT,
   student_id STRING,
   gender STRING,
@@ -393,14 +384,17 @@ CREATE TABLE student_detail_iceberg (
   created_at TIMESTAMP(3),
   PRIMARY KEY (id) NOT ENFORCED
 ) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'student_detail_iceberg'
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'none',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10'
 );
 
--- Student Fee Iceberg Sink
-CREATE TABLE student_fee_iceberg (
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.student_fee_iceberg (
   fee_id STRING,
   student_id STRING,
   ukt_fee DECIMAL(12,2),
@@ -408,14 +402,18 @@ CREATE TABLE student_fee_iceberg (
   updated_at TIMESTAMP(3),
   PRIMARY KEY (fee_id) NOT ENFORCED
 ) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'student_fee_iceberg'
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'none',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10',
+  'write.upsert.enabled' = 'true'
 );
 
--- Lecturer Iceberg Sink
-CREATE TABLE lecturer_iceberg (
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.lecturer_iceberg (
   id INT,
   lecturer_id STRING,
   name STRING,
@@ -424,14 +422,17 @@ CREATE TABLE lecturer_iceberg (
   created_at TIMESTAMP(3),
   PRIMARY KEY (id) NOT ENFORCED
 ) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'lecturer_iceberg'
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'none',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10'
 );
 
--- Room Iceberg Sink
-CREATE TABLE room_iceberg (
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.room_iceberg (
   id INT,
   room_code STRING,
   building STRING,
@@ -439,14 +440,17 @@ CREATE TABLE room_iceberg (
   created_at TIMESTAMP(3),
   PRIMARY KEY (id) NOT ENFORCED
 ) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'room_iceberg'
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'none',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10'
 );
 
--- Course Iceberg Sink
-CREATE TABLE course_iceberg (
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.course_iceberg (
   id INT,
   course_code STRING,
   course_name STRING,
@@ -455,14 +459,17 @@ CREATE TABLE course_iceberg (
   created_at TIMESTAMP(3),
   PRIMARY KEY (id) NOT ENFORCED
 ) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'course_iceberg'
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'none',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10'
 );
 
--- Registration Iceberg Sink
-CREATE TABLE registration_iceberg (
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.registration_iceberg (
   registration_id STRING,
   student_id STRING,
   academic_year STRING,
@@ -474,16 +481,21 @@ CREATE TABLE registration_iceberg (
   late_registration BOOLEAN,
   created_at TIMESTAMP(3),
   updated_at TIMESTAMP(3),
-  PRIMARY KEY (registration_id) NOT ENFORCED
-) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'registration_iceberg'
+  PRIMARY KEY (registration_id, academic_year, semester) NOT ENFORCED
+)
+PARTITIONED BY (academic_year, semester) WITH (
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'hash',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10',
+  'write.upsert.enabled' = 'true'
 );
 
--- Class Iceberg Sink
-CREATE TABLE class_iceberg (
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.class_iceberg (
   class_id STRING,
   course_id INT,
   lecturer_id INT,
@@ -497,16 +509,22 @@ CREATE TABLE class_iceberg (
   enrolled_count INT,
   class_status STRING,
   created_at TIMESTAMP(3),
-  PRIMARY KEY (class_id) NOT ENFORCED
-) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'class_iceberg'
+  PRIMARY KEY (class_id, academic_year, semester) NOT ENFORCED
+)
+PARTITIONED BY (academic_year, semester) WITH (
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'hash',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10',
+  'write.upsert.enabled' = 'true'
 );
 
--- Student Enrollment Iceberg Sink
-CREATE TABLE student_enrollment_iceberg (
+-- Full layout adds bucket(8, student_id): pre-create with generate-data/run_iceberg_layout.py --create
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.student_enrollment_iceberg (
   enrollment_id INT,
   student_id STRING,
   registration_id STRING,
@@ -518,16 +536,22 @@ CREATE TABLE student_enrollment_iceberg (
   attendance_percentage DECIMAL(5,2),
   created_at TIMESTAMP(3),
   updated_at TIMESTAMP(3),
+  academic_year STRING,
   PRIMARY KEY (enrollment_id) NOT ENFORCED
-) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'student_enrollment_iceberg'
+)
+PARTITIONED BY (academic_year) WITH (
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'hash',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10'
 );
 
--- Payment Iceberg Sink
-CREATE TABLE payment_iceberg (
+-- Full layout adds month(payment_time): pre-create with generate-data/run_iceberg_layout.py --create
+CREATE TABLE IF NOT EXISTS iceberg_catalog.university.payment_iceberg (
   payment_id STRING,
   student_id STRING,
   registration_id STRING,
@@ -545,119 +569,81 @@ CREATE TABLE payment_iceberg (
   due_date DATE,
   created_at TIMESTAMP(3),
   updated_at TIMESTAMP(3),
+  academic_year STRING,
   PRIMARY KEY (payment_id) NOT ENFORCED
-) WITH (
-  'connector' = 'iceberg',
-  'catalog-name' = 'iceberg_catalog',
-  'database-name' = 'university',
-  'table-name' = 'payment_iceberg'
+)
+PARTITIONED BY (academic_year) WITH (
+  'format-version' = '2',
+  'write.target-file-size-bytes' = '134217728',
+  'write.distribution-mode' = 'hash',
+  'write.parquet.compression-codec' = 'zstd',
+  'write.metadata.delete-after-commit.enabled' = 'true',
+  'write.metadata.previous-versions-max' = '50',
+  'history.expire.max-snapshot-age-ms' = '259200000',
+  'history.expire.min-snapshots-to-keep' = '10'
 );
 
--- =================================================================
--- 4. INSERT JOBS (Stream data from Kafka to Iceberg)
--- =================================================================
-
--- Note: These INSERT statements should be executed one by one in Flink SQL Client
--- Each INSERT creates a continuous streaming job
-
--- INSERT Faculty Data
-INSERT INTO faculty_iceberg
-SELECT id, faculty_code, faculty_name, created_at
-FROM kafka_faculty
-WHERE op != 'd';  -- Exclude deletes
-
--- INSERT Program Data
-INSERT INTO program_iceberg
-SELECT id, program_code, program_name, faculty_id, degree, created_at
-FROM kafka_program
-WHERE op != 'd';
-
--- INSERT Students Data
-INSERT INTO students_iceberg
-SELECT student_id, full_name, entry_year, program_id, degree, faculty_id, status, created_at
-FROM kafka_students
-WHERE op != 'd';
-
--- INSERT Student Detail Data
-INSERT INTO student_detail_iceberg
-SELECT id, student_id, gender, birth_date, birth_place, religion, nationality, 
-       registration_date, address, city, province, postal_code, phone_number,
-       high_school, high_school_year, parent_name, parent_income, parent_occupation,
-       blood_type, health_insurance, accommodation, created_at
-FROM kafka_student_detail
-WHERE op != 'd';
-
--- INSERT Student Fee Data
-INSERT INTO student_fee_iceberg
-SELECT fee_id, student_id, ukt_fee, bop_fee, updated_at
-FROM kafka_student_fee
-WHERE op != 'd';
-
--- INSERT Lecturer Data
-INSERT INTO lecturer_iceberg
-SELECT id, lecturer_id, name, email, faculty_id, created_at
-FROM kafka_lecturer
-WHERE op != 'd';
-
--- INSERT Room Data
-INSERT INTO room_iceberg
-SELECT id, room_code, building, capacity, created_at
-FROM kafka_room
-WHERE op != 'd';
-
--- INSERT Course Data
-INSERT INTO course_iceberg
-SELECT id, course_code, course_name, credits, program_id, created_at
-FROM kafka_course
-WHERE op != 'd';
-
--- INSERT Registration Data
-INSERT INTO registration_iceberg
-SELECT registration_id, student_id, academic_year, semester, semester_code,
-       registration_date, registration_status, total_sks, late_registration,
-       created_at, updated_at
-FROM kafka_registration
-WHERE op != 'd';
-
--- INSERT Class Data
-INSERT INTO class_iceberg
-SELECT class_id, course_id, lecturer_id, academic_year, semester, class_code,
-       room_code, schedule_day, schedule_time, capacity, enrolled_count, 
-       class_status, created_at
-FROM kafka_class
-WHERE op != 'd';
-
--- INSERT Student Enrollment Data
-INSERT INTO student_enrollment_iceberg
-SELECT enrollment_id, student_id, registration_id, class_id, enrollment_date,
-       enrollment_status, final_grade, grade_point, attendance_percentage,
-       created_at, updated_at
-FROM kafka_student_enrollment
-WHERE op != 'd';
-
--- INSERT Payment Data
-INSERT INTO payment_iceberg
-SELECT payment_id, student_id, registration_id, payment_type, payment_amount,
-       bank_name, virtual_account_number, payment_channel, payment_time,
-       payment_status, installment_number, late_fee_charged, total_paid_amount,
-       payment_proof_url, due_date, created_at, updated_at
-FROM kafka_payment
-WHERE op != 'd';
-
--- =================================================================
--- 5. UTILITY QUERIES (For monitoring and verification)
--- =================================================================
-
--- Check table counts
--- SELECT 'faculty' as table_name, COUNT(*) as count FROM faculty_iceberg
--- UNION ALL
--- SELECT 'program' as table_name, COUNT(*) as count FROM program_iceberg
--- UNION ALL
--- SELECT 'students' as table_name, COUNT(*) as count FROM students_iceberg;
-
--- Monitor streaming jobs
--- SHOW JOBS;
-
--- =================================================================
--- END OF UNIVERSITY CDC PIPELINE
--- ================================================================= 
\ No newline at end of file
+-- 4. ONE STREAMING JOB FOR ALL 12 TABLES
+
+EXECUTE STATEMENT SET
+BEGIN
+  INSERT INTO iceberg_catalog.university.faculty_iceberg /*+ OPTIONS('write-parallelism'='1') */
+  SELECT id, faculty_code, faculty_name, created_at
+  FROM default_catalog.default_database.kafka_faculty
+  WHERE op <> 'd';
+
+  INSERT INTO iceberg_catalog.university.program_iceberg /*+ OPTIONS('write-parallelism'='1') */
+  SELECT id, program_code, program_name, faculty_id, degree, created_at
+  FROM default_catalog.default_database.kafka_program
+  WHERE op <> 'd';
+
+  INSERT INTO iceberg_catalog.university.students_iceberg /*+ OPTIONS('write-parallelism'='1', 'upsert-enabled'='true') */
+  SELECT student_id, full_name, entry_year, program_id, degree, faculty_id, status, created_at
+  FROM default_catalog.default_database.kafka_students
+  WHERE op <> 'd';
+
+  INSERT INTO iceberg_catalog.university.student_detail_iceberg /*+ OPTIONS('write-parallelism'='1') */
+  SELECT id, student_id, gender, birth_date, birth_place, religion, nationality, registration_date, address, city, province, postal_code, phone_number, high_school, high_school_year, parent_name, parent_income, parent_occupation, blood_type, health_insurance, accommodation, created_at
+  FROM default_catalog.default_database.kafka_student_detail
+  WHERE op <> 'd';
+
+  INSERT INTO iceberg_catalog.university.student_fee_iceberg /*+ OPTIONS('write-parallelism'='1', 'upsert-enabled'='true') */
+  SELECT fee_id, student_id, ukt_fee, bop_fee, updated_at
+  FROM default_catalog.default_database.kafka_student_fee
+  WHERE op <> 'd';
+
+  INSERT INTO iceberg_catalog.university.lecturer_iceberg /*+ OPTIONS('write-parallelism'='1') */
+  SELECT id, lecturer_id, name, email, faculty_id, created_at
+  FROM default_catalog.default_database.kafka_lecturer
+  WHERE op <> 'd';
+
+  INSERT INTO iceberg_catalog.university.room_iceberg /*+ OPTIONS('write-parallelism'='1') */
+  SELECT id, room_code, building, capacity, created_at
+  FROM default_catalog.default_database.kafka_room
+  WHERE op <> 'd';
+
+  INSERT INTO iceberg_catalog.university.course_iceberg /*+ OPTIONS('write-parallelism'='1') */
+  SELECT id, course_code, course_name, credits, program_id, created_at
+  FROM default_catalog.default_database.kafka_course
+  WHERE op <> 'd';
+
+  INSERT INTO iceberg_catalog.university.registration_iceberg /*+ OPTIONS('write-parallelism'='2', 'upsert-enabled'='true') */
+  SELECT registration_id, student_id, academic_year, semester, semester_code, registration_date, registration_status, total_sks, late_registration, created_at, updated_at
+  FROM default_catalog.default_database.kafka_registration
+  WHERE op <> 'd';
+
+  INSERT INTO iceberg_catalog.university.class_iceberg /*+ OPTIONS('write-parallelism'='1', 'upsert-enabled'='true') */
+  SELECT class_id, course_id, lecturer_id, academic_year, semester, class_code, room_code, schedule_day, schedule_time, capacity, enrolled_count, class_status, created_at
+  FROM default_catalog.default_database.kafka_class
+  WHERE op <> 'd';
+
+  INSERT INTO iceberg_catalog.university.student_enrollment_iceberg /*+ OPTIONS('write-parallelism'='4') */
+  SELECT enrollment_id, student_id, registration_id, class_id, enrollment_date, enrollment_status, final_grade, grade_point, attendance_percentage, created_at, updated_at, academic_year
+  FROM default_catalog.default_database.kafka_student_enrollment
+  WHERE op <> 'd';
+
+  INSERT INTO iceberg_catalog.university.payment_iceberg /*+ OPTIONS('write-parallelism'='2') */
+  SELECT payment_id, student_id, registration_id, payment_type, payment_amount, bank_name, virtual_account_number, payment_channel, payment_time, payment_status, installment_number, late_fee_charged, total_paid_amount, payment_proof_url, due_date, created_at, updated_at, academic_year
+  FROM default_catalog.default_database.kafka_payment
+  WHERE op <> 'd';
+END;
@@ -1,68 +1,80 @@
 """Academic generator for registrations and classes"""
 
+import calendar
 import logging
 import random
 from datetime import datetime, date, timedelta
-from faker import Faker
 import static_data
 import db_utils
+import locale_providers
+import reference_cache
+import timetable_scheduler
+import columnar_batch
+import registration_engine
 
-fake = Faker('id_ID')
+fake = locale_providers.fake  # shared Faker('id_ID'), built on first use
 
 class AcademicGenerator:
-    def __init__(self):
-        self.db = db_utils.get_db_manager()
+    def __init__(self, db=None, cache=None):
+        self.db = db or db_utils.get_db_manager()
+        self.cache = cache or reference_cache.get_reference_cache(self.db)
         
-    def generate_registration_for_semester(self, academic_year, semester):
-        """Generate registrations for a specific semester"""
+    def generate_registration_for_semester(self, academic_year, semester, engine='python', seed=None):
+        """Generate registrations for a specific semester
+        
+        engine='vectorized' builds the whole roster at once with registration_engine.
+        """
         try:
             logging.info(f"📝 Generating registrations for {academic_year} semester {semester}")
             
-            # Get students from all years (students can register each semester)
-            student_results = self.db.execute_query(
-                "SELECT student_id, entry_year, program_id FROM students WHERE status = 'active' ORDER BY student_id"
-            )
+            # Active students from all years (graduates, dropouts and students on leave don't register)
+            students = self.cache.active_students()
             
-            if not student_results:
+            if engine == 'vectorized':
+                year_start = int(academic_year.split('/')[0])
+                engine = registration_engine.get_registration_engine(seed, stream=(year_start, semester))
+                return engine.generate(academic_year, semester, students)
+            
+            if not len(students):
                 logging.warning("⚠️ No active students found")
                 return []
             
-            registrations = []
+            registrations = columnar_batch.get_batch('registration')
             year_start = int(academic_year.split('/')[0])
             
-            for student_id, entry_year, program_id in student_results:
+            for index in range(len(students)):
+                student_id = students.student_ids[index]
+                entry_year = students.entry_years[index]
+                
                 # Calculate which year this student is in
                 student_year = year_start - entry_year + 1
                 
                 # Only allow registrations for students who should be active in this year
                 # (max 6 years for undergraduate)
-                if student_year <= 0 or student_year > 6:
+                if student_year <= 0 or student_year > static_data.MAX_STUDY_YEARS:
                     continue
                     
                 # Some students might skip semesters (dropout probability)
-                if random.random() < 0.05:  # 5% chance to skip
+                if random.random() < static_data.REGISTRATION_SKIP_PROBABILITY:
                     continue
                 
                 # Generate registration
                 registration_id = f"REG-{student_id}-{academic_year.replace('/', '')}-{semester}"
                 semester_code = f"{academic_year.replace('/', '')}-{semester}"
                 
-                # Registration date (usually in July for semester 1, December for semester 2)
-                if semester == 1:
-                    reg_date = date(year_start, random.randint(7, 8), random.randint(1, 31))
-                else:
-                    reg_date = date(year_start, random.randint(12, 12), random.randint(1, 31))
+                # Registration date (July-August for semester 1, December for semester 2)
+                reg_month = random.randint(*static_data.REGISTRATION_MONTHS[semester])
+                reg_day = random.randint(1, calendar.monthrange(year_start, reg_month)[1])
+                reg_date = date(year_start, reg_month, reg_day)
                 
                 # Calculate expected SKS based on student year
-                if student_year <= 2:
-                    target_sks = random.randint(18, 24)  # Fresh students take more
-                elif student_year <= 4:
-                    target_sks = random.randint(15, 21)  # Mid-level students
-                else:
-                    target_sks = random.randint(6, 15)   # Senior students (thesis)
+                for last_year, sks_range in static_data.REGISTRATION_SKS_BANDS:
+                    if student_year <= last_year:
+                        break
+                target_sks = random.randint(*sks_range)
                 
                 # Late registration probability
-                late_registration = random.random() < 0.1  # 10% chance
+                late_registration = random.random() < static_data.LATE_REGISTRATION_PROBABILITY
                 
                 registrations.append((
                     registration_id,
@@ -91,59 +103,63 @@ class AcademicGenerator:
             logging.info(f"🏫 Generating classes for {academic_year} semester {semester}")
             
             # Get courses and lecturers
-            course_results = self.db.execute_query(
-                "SELECT id, course_code, course_name, credits, program_id FROM course ORDER BY id"
-            )
-            
-            lecturer_results = self.db.execute_query(
-                "SELECT id, lecturer_id, name FROM lecturer ORDER BY id"
-            )
-            
-            room_results = self.db.execute_query(
-                "SELECT room_code FROM room ORDER BY id"
-            )
+            course_results = self.cache.courses()
+            lecturer_results = self.cache.lecturers()
+            room_results = self.cache.rooms()
             
             if not course_results or not lecturer_results or not room_results:
                 logging.warning("⚠️ Missing required data for class generation")
                 return []
             
-            classes = []
-            room_codes = [room[0] for room in room_results]
+            classes = columnar_batch.get_batch('class')
+            scheduler = timetable_scheduler.get_timetable_scheduler(
+                [(room.room_code, room.capacity) for room in room_results],
+                [lecturer.id for lecturer in lecturer_results]
+            )
+            
+            # Generate 1-3 classes per course (different lecturers/schedules)
+            sections = [(course, random.randint(1, 3)) for course in course_results]
+            max_sections = max(num_classes for course, num_classes in sections)
             
-            # Generate multiple classes per course (different lecturers/schedules)
-            for course_id, course_code, course_name, credits, program_id in course_results:
-                # Generate 1-3 classes per course
-                num_classes = random.randint(1, 3)
-                
-                for class_num in range(1, num_classes + 1):
-                    # Select random lecturer
-                    lecturer_id, lecturer_code, lecturer_name = random.choice(lecturer_results)
+            # Schedule section by section so every course gets its first class
+            # before any course gets a second one when the timetable is tight
+            for class_num in range(1, max_sections + 1):
+                for course, num_classes in sections:
+                    if class_num > num_classes:
+                        continue
+                    course_id, course_code = course.id, course.course_code
+                    
+                    capacity = random.randint(30, 60)
+                    slot = scheduler.assign(capacity)
+                    if slot is None:
+                        continue
                     
                     # Generate class details
                     class_id = f"CLASS-{course_code}-{academic_year.replace('/', '')}-{semester}-{class_num}"
                     class_code = f"{course_code}-{class_num}"
-                    room_code = random.choice(room_codes)
-                    schedule_day = random.choice(static_data.DAYS_OF_WEEK)
-                    schedule_time = random.choice(static_data.TIME_SLOTS)
-                    capacity = random.randint(30, 60)
-                    enrolled_count = random.randint(15, capacity - 5)  # Some empty spots
+                    capacity = min(capacity, slot.room_capacity)
+                    max_enrolled = max(capacity - 5, 1)
+                    enrolled_count = random.randint(min(15, max_enrolled), max_enrolled)  # Some empty spots
                     
                     classes.append((
                         class_id,
                         course_id,
-                        lecturer_id,
+                        slot.lecturer_id,
                         academic_year,
                         semester,
                         class_code,
-                        room_code,
-                        schedule_day,
-                        schedule_time,
+                        slot.room_code,
+                        slot.schedule_day,
+                        slot.schedule_time,
                         capacity,
                         enrolled_count,
                         'active',
                         datetime.now()
                     ))
             
+            if scheduler.unscheduled_count:
+                logging.warning(f"⚠️ Timetable full: {scheduler.unscheduled_count} classes could not be scheduled without conflicts")
+            
             logging.info(f"✅ Generated {len(classes)} classes")
             return classes
             
@@ -151,6 +167,6 @@ class AcademicGenerator:
             logging.error(f"❌ Error generating classes: {e}")
             raise
 
-def get_academic_generator():
+def get_academic_generator(db=None, cache=None):
     """Factory function to get academic generator instance"""
-    return AcademicGenerator() 
\ No newline at end of file
+    return AcademicGenerator(db, cache) 
\ No newline at end of file
@@ -2,21 +2,27 @@
 
 import logging
 import random
-import csv
 import io
 from datetime import datetime, date, timedelta
-from faker import Faker
+import static_data
 import db_utils
+import locale_providers
+import columnar_batch
+import sql_generation_engine
 
-fake = Faker('id_ID')
+fake = locale_providers.fake  # shared Faker('id_ID'), built on first use
 
 class AttendanceGenerator:
-    def __init__(self, context=None):
-        self.db = db_utils.get_db_manager()
+    def __init__(self, context=None, db=None, sink=None):
+        self.db = db or db_utils.get_db_manager()
         self.context = context
+        self.sink = sink  # fanout_sink.FanOutSink also receiving the attendance rows
         
-    def generate_attendance_for_academic_year(self, academic_year):
+    def generate_attendance_for_academic_year(self, academic_year, engine='python', seed=None):
         """Generate attendance data and save to MinIO"""
+        if engine == 'sql':
+            return self.generate_attendance_in_database(academic_year, seed)
+        
         try:
             logging.info(f"📋 Generating attendance data for {academic_year}")
             
@@ -35,27 +41,20 @@ class AttendanceGenerator:
                 logging.warning(f"⚠️ No enrollments found for {academic_year}")
                 return False
             
-            attendance_records = []
+            attendance_records = columnar_batch.get_batch('attendance')
             
             # Generate attendance for each enrollment
             for student_id, class_id, enrollment_date, schedule_day, schedule_time, acad_year, semester in enrollment_results:
                 # Calculate semester dates
                 year_start = int(academic_year.split('/')[0])
                 
-                if semester == 1:
-                    # Semester 1: August - December
-                    semester_start = date(year_start, 8, 15)
-                    semester_end = date(year_start, 12, 15)
-                else:
-                    # Semester 2: February - June
-                    semester_start = date(year_start + 1, 2, 15)  
-                    semester_end = date(year_start + 1, 6, 15)
+                semester_start, semester_end = static_data.get_semester_period(year_start, semester)
                 
                 # Generate attendance for each week (approximately 16 weeks per semester)
                 current_date = semester_start
                 week_count = 0
                 
-                while current_date <= semester_end and week_count < 16:
+                while current_date <= semester_end and week_count < static_data.WEEKS_PER_SEMESTER:
                     # Find the correct day of week for this class
                     days_ahead = self._get_days_until_weekday(current_date, schedule_day)
                     class_date = current_date + timedelta(days=days_ahead)
@@ -63,8 +62,8 @@ class AttendanceGenerator:
                     if class_date <= semester_end:
                         # Generate attendance record
                         attendance_status = random.choices(
-                            ['hadir', 'tidak_hadir', 'izin', 'sakit'],
-                            weights=[80, 15, 3, 2]  # 80% present, 15% absent, 3% permission, 2% sick
+                            list(static_data.ATTENDANCE_STATUS_WEIGHTS.keys()),
+                            weights=list(static_data.ATTENDANCE_STATUS_WEIGHTS.values())  # 80% present, 15% absent, 3% permission, 2% sick
                         )[0]
                         
                         attendance_time = None
@@ -72,26 +71,29 @@ class AttendanceGenerator:
                             # Generate check-in time (usually close to class time)
                             base_time = datetime.strptime(schedule_time.split('-')[0], '%H:%M').time()
                             # Add some variation (-10 to +30 minutes)
-                            minutes_variation = random.randint(-10, 30)
+                            minutes_variation = random.randint(*static_data.ATTENDANCE_CHECKIN_VARIATION_MINUTES)
                             attendance_datetime = datetime.combine(class_date, base_time) + timedelta(minutes=minutes_variation)
                             attendance_time = attendance_datetime.strftime('%H:%M:%S')
                         
-                        attendance_records.append({
-                            'student_id': student_id,
-                            'class_id': class_id,
-                            'attendance_date': class_date.strftime('%Y-%m-%d'),
-                            'attendance_time': attendance_time,
-                            'attendance_status': attendance_status,
-                            'week_number': week_count + 1,
-                            'semester': semester,
-                            'academic_year': academic_year,
-                            'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                        })
+                        attendance_records.append((
+                            student_id,
+                            class_id,
+                            class_date,
+                            attendance_time,
+                            attendance_status,
+                            week_count + 1,
+                            semester,
+                            academic_year,
+                            datetime.now()
+                        ))
                     
                     # Move to next week
                     current_date += timedelta(days=7)
                     week_count += 1
             
+            if self.sink is not None:
+                self.sink.write('attendance', attendance_records.column_names, attendance_records)
+            
             # Save to MinIO as CSV
             success = self._save_attendance_to_minio(attendance_records, academic_year)
             
@@ -106,6 +108,31 @@ class AttendanceGenerator:
             logging.error(f"❌ Error generating attendance: {e}")
             raise
     
+    def generate_attendance_in_database(self, academic_year, seed=None):
+        """Generate attendance server-side (generate_series over weeks) and save to MinIO"""
+        try:
+            output = io.StringIO()
+            engine = sql_generation_engine.get_sql_generation_engine(self.db, seed)
+            record_count = engine.generate_attendance(academic_year, output)
+            
+            if not record_count:
+                logging.warning(f"⚠️ No enrollments found for {academic_year}")
+                return False
+            
+            csv_content = output.getvalue()
+            output.close()
+            
+            success = self._upload_attendance_csv(csv_content, record_count, academic_year)
+            if success:
+                logging.info(f"✅ Generated and saved {record_count} attendance records")
+            else:
+                logging.error("❌ Failed to save attendance data to MinIO")
+            return success
+            
+        except Exception as e:
+            logging.error(f"❌ Error generating attendance in database: {e}")
+            raise
+    
     def _get_days_until_weekday(self, start_date, target_weekday):
         """Calculate days until target weekday"""
         weekday_map = {
@@ -125,24 +152,31 @@ class AttendanceGenerator:
     def _save_attendance_to_minio(self, attendance_records, academic_year):
         """Save attendance records to MinIO as CSV"""
         try:
-            # For now, just log that we would save to MinIO
-            # In a real implementation, you'd use the minio client
-            logging.info(f"📁 Would save {len(attendance_records)} attendance records to MinIO")
             logging.info(f"📋 Sample attendance record: {attendance_records[0] if attendance_records else 'No records'}")
             
             # Create CSV content
+            csv_content = ''
             if attendance_records:
                 output = io.StringIO()
-                fieldnames = attendance_records[0].keys()
-                writer = csv.DictWriter(output, fieldnames=fieldnames)
-                
-                writer.writeheader()
-                for record in attendance_records:
-                    writer.writerow(record)
+                attendance_records.write_csv(output)
                 
                 csv_content = output.getvalue()
                 output.close()
-                
+            
+            return self._upload_attendance_csv(csv_content, len(attendance_records), academic_year)
+            
+        except Exception as e:
+            logging.error(f"❌ Error saving attendance to MinIO: {e}")
+            return False
+    
+    def _upload_attendance_csv(self, csv_content, record_count, academic_year):
+        """Upload attendance CSV content to MinIO"""
+        try:
+            # For now, just log that we would save to MinIO
+            # In a real implementation, you'd use the minio client
+            logging.info(f"📁 Would save {record_count} attendance records to MinIO")
+            
+            if csv_content:
                 # Log CSV sample (first few lines)
                 csv_lines = csv_content.split('\n')[:5]
                 logging.info(f"📄 CSV Sample:\n" + '\n'.join(csv_lines))
@@ -155,6 +189,6 @@ class AttendanceGenerator:
             logging.error(f"❌ Error saving attendance to MinIO: {e}")
             return False
 
-def get_attendance_generator(context=None):
+def get_attendance_generator(context=None, db=None, sink=None):
     """Factory function to get attendance generator instance"""
-    return AttendanceGenerator(context) 
\ No newline at end of file
+    return AttendanceGenerator(context, db, sink) 
\ No newline at end of file
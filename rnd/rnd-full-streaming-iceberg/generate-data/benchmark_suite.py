@@ -0,0 +1,146 @@
+"""Generator benchmark suite: per-generator rows/sec and peak memory at several scales, end-to-end runs, JSON baselines"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+import generation_benchmark
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_PATH = os.getenv('BENCHMARK_BASELINE', os.path.join(MODULE_DIR, 'benchmark_baseline.json'))
+
+# Generator class -> generation_benchmark step it is measured by
+GENERATOR_STEPS = {
+    'MasterDataGenerator': 'master_data',
+    'StudentGenerator': 'students',
+    'AcademicGenerator': 'academic',
+    'EnrollmentGenerator': 'enrollments',
+    'PaymentGenerator': 'payments',
+    'AttendanceGenerator': 'attendance',
+}
+
+DEFAULT_SCALES = (100, 1000)
+
+# Relative change of a metric that counts as a regression
+REGRESSION_THRESHOLD = 0.2
+
+# Peak memory growth below this is noise, whatever its relative size
+MEMORY_NOISE_MB = 5.0
+
+# Throughput of steps faster than this (baseline CPU seconds) is noise, so it is not gated
+TIMING_NOISE_SECONDS = 0.1
+
+def micro_benchmarks(scales=DEFAULT_SCALES, engines=('python',), academic_year='2024/2025', seed=42, repeats=3,
+                     trace_memory=True):
+    """
+    {'micro/<engine>/<scale>/<Generator>': metrics} of every generator at every scale.
+
+    Each scale runs `repeats` timed passes on the in-memory database.
+    rows_per_second is rows over CPU seconds of the fastest pass (like
+    timeit: slower passes measure warm-up and other load, not the
+    generator). peak_memory_mb comes from one extra pass under tracemalloc,
+    which would distort the timings.
+    """
+    results = {}
+    for engine in engines:
+        for scale in scales:
+            passes = [generation_benchmark.run_generation_benchmark(scale, academic_year, engine, seed)['steps']
+                      for _ in range(repeats)]
+            memory = (generation_benchmark.run_generation_benchmark(scale, academic_year, engine, seed,
+                                                                    trace_memory=True)['steps']
+                      if trace_memory else None)
+            for generator, step in GENERATOR_STEPS.items():
+                rows = passes[0][step]['rows']
+                fastest = min((timing[step] for timing in passes), key=lambda timing: timing['cpu_seconds'])
+                metrics = {
+                    'rows': rows,
+                    'wall_seconds': fastest['wall_seconds'],
+                    'cpu_seconds': fastest['cpu_seconds'],
+                    'rows_per_second': round(rows / fastest['cpu_seconds'], 1) if fastest['cpu_seconds'] else None,
+                }
+                if memory:
+                    metrics['peak_memory_mb'] = memory[step]['peak_memory_mb']
+                results[f"micro/{engine}/{scale}/{generator}"] = metrics
+    return results
+
+def macro_benchmark(student_count=1000, academic_year='2024/2025', engine='python', seed=42, in_memory=False):
+    """
+    {'macro/<target>/<engine>/<count>': metrics} of one run_complete_generation in a fresh interpreter.
+
+    Against PostgreSQL (the DB_* settings) the run uses --force, so every
+    step generates; point it at a disposable database. peak_memory_mb is the
+    child's maximum resident set size.
+    """
+    command = [sys.executable, 'run_complete_generation.py', '--year', academic_year, '--count', str(student_count),
+               '--seed', str(seed), '--engine', engine, '--force']
+    if in_memory:
+        command.append('--in-memory')
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=MODULE_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    _, status, usage = os.wait4(process.pid, 0)
+    wall = time.perf_counter() - started
+    returncode = os.waitstatus_to_exitcode(status)
+    process.returncode = returncode  # reaped by wait4 (for its rusage), so Popen must not wait again
+    if returncode != 0:
+        raise Exception(f"❌ run_complete_generation exited with {returncode}: {' '.join(command)}")
+
+    target = 'memory' if in_memory else 'postgres'
+    return {f"macro/{target}/{engine}/{student_count}": {
+        'students': student_count,
+        'wall_seconds': round(wall, 3),
+        'rows_per_second': round(student_count / wall, 1),  # students per second
+        'peak_memory_mb': round(usage.ru_maxrss / 1024, 2),  # ru_maxrss is in KiB on Linux
+    }}
+
+def compare(results, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Regressions of results against the baseline's results.
+
+    A benchmark regresses when rows_per_second drops, or peak_memory_mb
+    grows, by more than threshold (relative to the baseline). Benchmarks
+    missing from either side are not compared, nor is the throughput of
+    steps under TIMING_NOISE_SECONDS. Returns [{'benchmark',
+    'metric', 'baseline', 'current', 'change'}].
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get('results', {}).get(name)
+        if not reference:
+            continue
+        before, after = reference.get('rows_per_second'), current.get('rows_per_second')
+        measurable = reference.get('cpu_seconds', reference.get('wall_seconds', 0)) >= TIMING_NOISE_SECONDS
+        if before and after is not None and measurable and after < before * (1 - threshold):
+            regressions.append({'benchmark': name, 'metric': 'rows_per_second', 'baseline': before,
+                                'current': after, 'change': round(after / before - 1, 3)})
+        before, after = reference.get('peak_memory_mb'), current.get('peak_memory_mb')
+        if before and after is not None and after > before * (1 + threshold) and after - before > MEMORY_NOISE_MB:
+            regressions.append({'benchmark': name, 'metric': 'peak_memory_mb', 'baseline': before,
+                                'current': after, 'change': round(after / before - 1, 3)})
+    return regressions
+
+def load_baseline(path=BASELINE_PATH):
+    """The baseline document at path, or None when there is none yet"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+def save_baseline(results, path=BASELINE_PATH):
+    """Merge results into the baseline at path (other benchmarks keep their entries) and return it"""
+    baseline = load_baseline(path) or {'results': {}}
+    baseline['results'].update(results)
+    baseline.update({
+        'updated': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'processor_count': os.cpu_count(),
+    })
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+    return baseline
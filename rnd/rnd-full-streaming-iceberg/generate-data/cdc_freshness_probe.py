@@ -0,0 +1,190 @@
+"""Freshness probe: when tracer marker rows reach the change stream and the *_iceberg tables"""
+
+import logging
+import math
+import time
+import cdc_latency_tracer
+import file_event_log
+import hadoop_catalog
+
+# Try to import pyiceberg and pyarrow for reading Iceberg snapshots
+try:
+    import pyarrow.parquet as pq
+    from pyiceberg.io import load_file_io
+    from pyiceberg.manifest import DataFileContent, ManifestEntryStatus
+    from pyiceberg.table import StaticTable
+    ICEBERG_AVAILABLE = True
+except ImportError:
+    ICEBERG_AVAILABLE = False
+    logging.warning("⚠️ pyiceberg/pyarrow not available - Iceberg visibility will not be measured")
+
+# Hadoop catalog used by test-end-to-end.sql
+ICEBERG_WAREHOUSE = hadoop_catalog.ICEBERG_WAREHOUSE
+ICEBERG_NAMESPACE = hadoop_catalog.ICEBERG_NAMESPACE
+
+PERCENTILES = (50, 95, 99)
+
+# Stages of a marker, measured from its generation time
+STAGES = ('commit', 'kafka', 'iceberg')
+
+def percentile(values, p):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+def iceberg_table_name(table_name):
+    """Sink table of a source table, e.g. students -> students_iceberg"""
+    return f"{table_name}_iceberg"
+
+class IcebergVisibilityReader:
+    """
+    Finds the first snapshot of a hadoop-catalog table that contains given keys.
+
+    Each snapshot is read once: only the data files it added, and only their
+    key columns, so equality deletes written by upserts are never needed. A
+    key's visibility time is the timestamp of the first snapshot adding it.
+    """
+
+    def __init__(self, warehouse=ICEBERG_WAREHOUSE, namespace=ICEBERG_NAMESPACE):
+        if not ICEBERG_AVAILABLE:
+            raise Exception("❌ pyiceberg not available - please install pyiceberg and pyarrow")
+        self.warehouse = warehouse.rstrip('/')
+        self.namespace = namespace
+        self.io = load_file_io({}, self.warehouse)
+        self._scanned = {}  # table -> snapshot ids already read
+
+    def metadata_location(self, table_name):
+        """Current metadata file of a table in the hadoop layout"""
+        return hadoop_catalog.metadata_location(self.io, self.warehouse, self.namespace, table_name)
+
+    def first_visible(self, table_name, key_columns, pending_keys):
+        """{key: snapshot timestamp_ms} for the pending keys added by snapshots not read before"""
+        location = self.metadata_location(table_name)
+        if location is None or not pending_keys:
+            return {}
+
+        table = StaticTable.from_metadata(location)
+        scanned = self._scanned.setdefault(table_name, set())
+        found = {}
+        for snapshot in sorted(table.metadata.snapshots, key=lambda s: s.timestamp_ms):
+            if snapshot.snapshot_id in scanned:
+                continue
+            scanned.add(snapshot.snapshot_id)
+            for manifest in snapshot.manifests(table.io):
+                if manifest.added_snapshot_id != snapshot.snapshot_id:
+                    continue
+                for entry in manifest.fetch_manifest_entry(table.io, discard_deleted=True):
+                    if entry.status != ManifestEntryStatus.ADDED or entry.data_file.content != DataFileContent.DATA:
+                        continue
+                    with table.io.new_input(entry.data_file.file_path).open() as f:
+                        data = pq.read_table(f, columns=list(key_columns))
+                    columns = [data.column(name).to_pylist() for name in key_columns]
+                    for values in zip(*columns):
+                        key = cdc_latency_tracer.marker_key(values)
+                        if key in pending_keys and key not in found:
+                            found[key] = snapshot.timestamp_ms
+        return found
+
+class CdcFreshnessProbe:
+    """
+    Polls the change stream and the Iceberg snapshots for tracer markers.
+
+    The change stream is a FileEventLog stand-in or the real topics
+    (file_event_log.KafkaEventLog); either way the record timestamp is when
+    the change reached the log. report() gives p50/p95/p99 lag per table and
+    stage (Postgres commit, change stream, Iceberg snapshot), measured in
+    milliseconds from the marker's generation time.
+    """
+
+    def __init__(self, event_log=None, iceberg_reader=None, manifest_path=cdc_latency_tracer.CDC_TRACE_MANIFEST, run_id=None):
+        self.event_log = event_log
+        self.iceberg_reader = iceberg_reader
+        self.manifest_path = manifest_path
+        self.run_id = run_id
+        self.markers = {}  # (table, key) -> marker with the stage times found so far
+
+    def _load_markers(self):
+        for marker in cdc_latency_tracer.read_manifest(self.manifest_path, self.run_id):
+            key_columns = cdc_latency_tracer.MARKER_KEYS.get(marker['table'])
+            if not key_columns:
+                continue
+            key = cdc_latency_tracer.marker_key(marker['key'].get(name) for name in key_columns)
+            self.markers.setdefault((marker['table'], key), marker)
+
+    def _pending(self, stage):
+        """{table: {key: marker}} of markers without a time for a stage"""
+        pending = {}
+        for (table_name, key), marker in self.markers.items():
+            if f'{stage}_ms' not in marker:
+                pending.setdefault(table_name, {})[key] = marker
+        return pending
+
+    def poll(self):
+        """Read new change records and snapshots, returns the number of markers still unresolved"""
+        self._load_markers()
+
+        for marker in self.markers.values():
+            if 'commit_ms' not in marker and marker.get('committed_ns'):
+                marker['commit_ms'] = (marker['committed_ns'] - marker['generated_ns']) / 1e6
+
+        if self.event_log is not None:
+            pending = self._pending('kafka')
+            for table_name in cdc_latency_tracer.MARKER_KEYS:
+                key_columns = cdc_latency_tracer.MARKER_KEYS[table_name]
+                for record in self.event_log.poll(file_event_log.debezium_topic(table_name)):
+                    if not record.value:
+                        continue
+                    key = cdc_latency_tracer.marker_key(record.value.get(name) for name in key_columns)
+                    marker = pending.get(table_name, {}).get(key)
+                    if marker is not None and 'kafka_ms' not in marker:
+                        marker['kafka_ms'] = record.timestamp_ms - marker['generated_ns'] / 1e6
+
+        if self.iceberg_reader is not None:
+            for table_name, markers in self._pending('iceberg').items():
+                found = self.iceberg_reader.first_visible(
+                    iceberg_table_name(table_name), cdc_latency_tracer.MARKER_KEYS[table_name], markers
+                )
+                for key, timestamp_ms in found.items():
+                    markers[key]['iceberg_ms'] = timestamp_ms - markers[key]['generated_ns'] / 1e6
+
+        final_stage = 'iceberg' if self.iceberg_reader is not None else 'kafka' if self.event_log is not None else 'commit'
+        return sum(1 for marker in self.markers.values() if f'{final_stage}_ms' not in marker)
+
+    def run(self, timeout_seconds=300, poll_interval=2.0):
+        """Poll until every marker is visible or the timeout passes, returns report()"""
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            unresolved = self.poll()
+            logging.info(f"🛰️ {len(self.markers)} markers, {unresolved} not visible yet")
+            if unresolved == 0 or time.monotonic() >= deadline:
+                break
+            time.sleep(poll_interval)
+        return self.report()
+
+    def report(self):
+        """{table: {'markers': n, stage: {'count', 'p50', 'p95', 'p99', 'max'}}} with lags in ms"""
+        report = {}
+        for (table_name, _), marker in sorted(self.markers.items()):
+            table_report = report.setdefault(table_name, {'markers': 0, **{stage: [] for stage in STAGES}})
+            table_report['markers'] += 1
+            for stage in STAGES:
+                if f'{stage}_ms' in marker:
+                    table_report[stage].append(marker[f'{stage}_ms'])
+
+        for table_report in report.values():
+            for stage in STAGES:
+                lags = table_report[stage]
+                summary = {'count': len(lags)}
+                for p in PERCENTILES:
+                    summary[f'p{p}'] = round(percentile(lags, p), 1) if lags else None
+                summary['max'] = round(max(lags), 1) if lags else None
+                table_report[stage] = summary
+        return report
+
+def get_cdc_freshness_probe(event_log_kind='file', warehouse=ICEBERG_WAREHOUSE, manifest_path=cdc_latency_tracer.CDC_TRACE_MANIFEST, run_id=None):
+    """Factory function to get a probe over the file or Kafka change stream and the hadoop warehouse"""
+    event_log = file_event_log.get_event_log(event_log_kind) if event_log_kind else None
+    iceberg_reader = IcebergVisibilityReader(warehouse) if ICEBERG_AVAILABLE and warehouse else None
+    return CdcFreshnessProbe(event_log, iceberg_reader, manifest_path, run_id)
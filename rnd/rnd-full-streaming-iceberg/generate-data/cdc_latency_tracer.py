@@ -0,0 +1,132 @@
+"""Tracer mode: marker rows with generation timestamps for end-to-end CDC latency"""
+
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+import load_conflicts
+
+CDC_TRACE_MANIFEST = os.getenv("CDC_TRACE_MANIFEST", "/tmp/university-cdc-trace.jsonl")
+
+# One marker per this many loaded rows (the first row of every load is always a marker)
+TRACE_SAMPLE_EVERY = int(os.getenv("CDC_TRACE_SAMPLE_EVERY", "1000"))
+
+# Columns identifying a marker row in the change stream and in the *_iceberg table
+# (student_detail and student_enrollment have serial ids the generators don't know)
+MARKER_KEYS = {
+    'students': ('student_id',),
+    'student_detail': ('student_id',),
+    'student_fee': ('fee_id',),
+    'registration': ('registration_id',),
+    'class': ('class_id',),
+    'student_enrollment': ('student_id', 'class_id'),
+    'payment': ('payment_id',),
+}
+
+# Column stamped with the generation timestamp, first one present wins
+STAMP_COLUMNS = ('created_at', 'updated_at')
+
+def marker_key(values):
+    """Comparable key of a marker from its key column values"""
+    return tuple('' if value is None else str(value) for value in values)
+
+class CdcLatencyTracer:
+    """
+    Picks marker rows out of every bulk load and records when they were generated.
+
+    Installed as a DatabaseManager load hook: just before a load it takes every
+    sample_every-th row as a marker, stamps its created_at (or updated_at) with
+    the generation time and remembers time.time_ns(). After the load commits
+    the markers are appended to the manifest with their commit time, where the
+    probe (cdc_freshness_probe) picks them up. With an event_log set, every
+    committed load is also published to it as Debezium change events, standing
+    in for Debezium when Kafka is not running: only the rows the database
+    kept, since a consumer keeps the last event of a key.
+    """
+
+    def __init__(self, db, manifest_path=CDC_TRACE_MANIFEST, sample_every=TRACE_SAMPLE_EVERY, event_log=None):
+        self.db = db
+        self.manifest_path = manifest_path
+        self.sample_every = max(1, sample_every)
+        self.event_log = event_log
+        self.run_id = uuid.uuid4().hex[:12]
+        self.marker_count = 0
+        self.conflicts = load_conflicts.get_conflict_filter(db) if event_log is not None else None
+        self._pending = {}  # table -> [(columns, data_list, markers)]
+
+    def install(self):
+        """Hook the tracer into the database manager's bulk loads"""
+        self.db.add_load_hook(self.before_load)
+        self.db.add_write_listener(self.after_commit)
+        logging.info(f"🛰️ CDC tracer {self.run_id}: one marker per {self.sample_every} rows -> {self.manifest_path}")
+        return self
+
+    def before_load(self, table_name, columns, data_list):
+        key_columns = MARKER_KEYS.get(table_name)
+        if not key_columns or not set(key_columns) <= set(columns):
+            return
+
+        if self.conflicts:
+            self.conflicts.prepare(table_name, columns)
+        key_positions = [columns.index(name) for name in key_columns]
+        stamp_column = next((name for name in STAMP_COLUMNS if name in columns), None)
+        markers = []
+        for index in range(0, len(data_list), self.sample_every):
+            generated_ns = time.time_ns()
+            row = data_list[index]
+            if stamp_column:
+                self._stamp(data_list, index, columns, stamp_column, datetime.fromtimestamp(generated_ns / 1e9))
+            markers.append({
+                'key': dict(zip(key_columns, marker_key(row[p] for p in key_positions))),
+                'generated_ns': generated_ns,
+            })
+        # Loads commit one at a time; markers of a load that rolled back are dropped here
+        self._pending[table_name] = [(columns, data_list, markers)]
+
+    def _stamp(self, data_list, index, columns, stamp_column, generated_at):
+        if hasattr(data_list, 'set_value'):
+            data_list.set_value(index, stamp_column, generated_at)
+        else:
+            row = list(data_list[index])
+            row[columns.index(stamp_column)] = generated_at
+            data_list[index] = tuple(row)
+
+    def after_commit(self, table_name):
+        loads = self._pending.pop(table_name, None)
+        if not loads:
+            return
+
+        committed_ns = time.time_ns()
+        with open(self.manifest_path, 'a', encoding='utf-8') as f:
+            for _, _, markers in loads:
+                for marker in markers:
+                    marker.update({'run_id': self.run_id, 'table': table_name, 'committed_ns': committed_ns})
+                    f.write(json.dumps(marker) + '\n')
+                self.marker_count += len(markers)
+
+        # Markers are on record before their change events can be seen
+        if self.event_log is not None:
+            for columns, data_list, _ in loads:
+                rows = self.conflicts.first_rows(table_name, columns, data_list)
+                if rows:
+                    self.event_log.append_rows(table_name, columns, rows, MARKER_KEYS[table_name])
+
+def read_manifest(manifest_path=CDC_TRACE_MANIFEST, run_id=None):
+    """Markers recorded by tracers, optionally of one run only"""
+    markers = []
+    if not os.path.exists(manifest_path):
+        return markers
+    with open(manifest_path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            marker = json.loads(line)
+            if run_id is None or marker.get('run_id') == run_id:
+                markers.append(marker)
+    return markers
+
+def get_cdc_latency_tracer(db, manifest_path=CDC_TRACE_MANIFEST, sample_every=TRACE_SAMPLE_EVERY, event_log=None):
+    """Factory function to get a CDC latency tracer installed on a database manager"""
+    return CdcLatencyTracer(db, manifest_path, sample_every, event_log).install()
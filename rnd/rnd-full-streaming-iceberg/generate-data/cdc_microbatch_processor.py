@@ -0,0 +1,294 @@
+"""Standalone change-stream processor: Debezium topics to the *_iceberg tables in micro-batches, without Flink"""
+
+import base64
+import logging
+import time
+from decimal import Decimal
+import cdc_freshness_probe
+import file_event_log
+import hadoop_catalog
+import iceberg_backfill
+import iceberg_layout
+import pipeline_tables
+
+# Try to import pyarrow and pyiceberg for building batches and committing files
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyiceberg.expressions import AlwaysTrue, And, GreaterThanOrEqual, In, LessThanOrEqual
+    from pyiceberg.io.pyarrow import ArrowScan, _dataframe_to_data_files
+    ICEBERG_AVAILABLE = True
+except ImportError:
+    ICEBERG_AVAILABLE = False
+    logging.warning("⚠️ pyarrow/pyiceberg not available - micro-batch processor disabled")
+
+# A table commits once it has buffered this many change records...
+BATCH_RECORDS = 50000
+# ...or once its oldest buffered record waited this long (the Flink job's checkpoint interval)
+MAX_LATENCY_SECONDS = 60
+
+# Records fetched per topic and poll
+POLL_RECORDS = 10000
+IDLE_SLEEP_SECONDS = 1.0
+
+# Snapshot summary properties carrying the offset checkpoint, committed atomically with the data
+CHECKPOINT_TOPIC_PROPERTY = 'cdc.topic'
+CHECKPOINT_OFFSET_PROPERTY = 'cdc.next-offset'
+
+# Fields ExtractNewRecordState adds (add.fields=op,ts_ms, delete.handling.mode=rewrite)
+OP_FIELD = '__op'
+DELETED_FIELD = '__deleted'
+
+KEY_SEPARATOR = '\x1f'
+
+def is_delete(value):
+    return value.get(OP_FIELD) == 'd' or value.get(DELETED_FIELD) == 'true'
+
+def decode_decimal(value, scale):
+    """Number of a Debezium decimal: a plain number, or base64 unscaled bytes (decimal.handling.mode=precise)"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    unscaled = int.from_bytes(base64.b64decode(value), 'big', signed=True)
+    return float(Decimal(unscaled).scaleb(-scale))
+
+def arrow_column(values, arrow_type):
+    """Arrow array of Debezium-encoded values (dates as epoch days, timestamps as epoch micros)"""
+    if pa.types.is_timestamp(arrow_type):
+        return pa.array(values, pa.int64()).cast(arrow_type)
+    if pa.types.is_date(arrow_type):
+        return pa.array(values, pa.int32()).cast(arrow_type)
+    if pa.types.is_decimal(arrow_type):
+        floats = pa.array([decode_decimal(v, arrow_type.scale) for v in values], pa.float64())
+        return pc.round(floats, arrow_type.scale).cast(arrow_type, safe=False)
+    return pa.array(values, arrow_type)
+
+def key_strings(data, key_columns):
+    """One string per row identifying its primary key, comparable across batches and files"""
+    columns = [pc.cast(data.column(name), pa.string()) for name in key_columns]
+    if len(columns) == 1:
+        return columns[0]
+    return pc.binary_join_element_wise(*columns, KEY_SEPARATOR)
+
+def checkpoint_properties(table_name, next_offset):
+    """Snapshot summary properties recording the next offset of a table's topic"""
+    return {
+        CHECKPOINT_TOPIC_PROPERTY: file_event_log.debezium_topic(table_name),
+        CHECKPOINT_OFFSET_PROPERTY: str(next_offset),
+    }
+
+def read_checkpoint(catalog, table_name):
+    """Next offset recorded by the newest checkpointed snapshot of a table's topic (0 without one)"""
+    table = catalog.load_table(f"{table_name}_iceberg")
+    if table is None:
+        return 0
+    topic = file_event_log.debezium_topic(table_name)
+    for snapshot in sorted(table.metadata.snapshots, key=lambda s: s.timestamp_ms, reverse=True):
+        properties = snapshot.summary.additional_properties if snapshot.summary else {}
+        if properties.get(CHECKPOINT_TOPIC_PROPERTY) == topic and CHECKPOINT_OFFSET_PROPERTY in properties:
+            return int(properties[CHECKPOINT_OFFSET_PROPERTY])
+    return 0
+
+class CdcMicroBatchProcessor:
+    """
+    Applies the Debezium change stream to the *_iceberg tables, one commit per table and batch.
+
+    Records of each table's topic are buffered until the batch size or the
+    latency target is reached, reduced to the last change per primary key,
+    and converted to Arrow in the sink schema of pipeline_tables. Data files
+    holding keys of the batch are rewritten without them (copy-on-write), and
+    the upserted rows are appended, in one snapshot whose summary carries the
+    topic's next offset. On start, each topic resumes from the newest such
+    checkpoint; without one it replays from the beginning, which applying by
+    key makes idempotent. The event log is pluggable: a FileEventLog stand-in
+    or the real topics (file_event_log.KafkaEventLog). Flink's upsert sinks
+    write equality deletes pyiceberg cannot apply, so a table is either
+    written by this processor or by the Flink job.
+    """
+
+    def __init__(self, event_log, catalog, tables=None, batch_records=BATCH_RECORDS,
+                 max_latency_seconds=MAX_LATENCY_SECONDS, poll_records=POLL_RECORDS, sink_schemas=None):
+        if not ICEBERG_AVAILABLE:
+            raise Exception("❌ pyarrow/pyiceberg not available - please install pyarrow and pyiceberg")
+        self.event_log = event_log
+        self.catalog = catalog
+        self.sink_schemas = sink_schemas or pipeline_tables.PIPELINE_TABLES
+        self.tables = list(tables or self.sink_schemas)
+        self.batch_records = batch_records
+        self.max_latency_seconds = max_latency_seconds
+        self.poll_records = poll_records
+        self.writer = iceberg_backfill.IcebergBackfillWriter(catalog, self.sink_schemas)
+        self.offsets = {}  # table -> next offset of its topic
+        self._buffers = {}  # table -> (monotonic time of the first record, records)
+        self.stats = {table_name: {'records': 0, 'upserted': 0, 'deleted': 0, 'skipped': 0,
+                                   'commits': 0, 'files_rewritten': 0, 'rows_rewritten': 0} for table_name in self.tables}
+        self.lags_ms = []
+
+    def restore(self):
+        """Seek every topic to its checkpoint"""
+        for table_name in self.tables:
+            self.offsets[table_name] = read_checkpoint(self.catalog, table_name)
+            self.event_log.seek(file_event_log.debezium_topic(table_name), self.offsets[table_name])
+            logging.info(f"⏮️ {table_name}: resuming at offset {self.offsets[table_name]}")
+        return self.offsets
+
+    def poll(self):
+        """Buffer new records of every topic, returns the number received"""
+        received = 0
+        for table_name in self.tables:
+            started, records = self._buffers.get(table_name, (None, []))
+            room = self.batch_records - len(records)
+            if room <= 0:
+                continue
+            polled = self.event_log.poll(file_event_log.debezium_topic(table_name), min(room, self.poll_records))
+            if polled:
+                self._buffers[table_name] = (started or time.monotonic(), records + polled)
+                received += len(polled)
+        return received
+
+    def due(self, table_name):
+        """Whether a table's buffer reached the batch size or the latency target"""
+        started, records = self._buffers.get(table_name, (None, []))
+        if not records:
+            return False
+        return len(records) >= self.batch_records or time.monotonic() - started >= self.max_latency_seconds
+
+    def to_arrow(self, table_name, values):
+        """Arrow table of change event values in the sink schema"""
+        schema = iceberg_backfill.arrow_schema(self.sink_schemas[table_name])
+        arrays = [arrow_column([value.get(field.name) for value in values], field.type) for field in schema]
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+    def _candidate_tasks(self, table, key_columns, batch):
+        """Scan tasks of files that may hold keys of the batch"""
+        first_key = batch.column(key_columns[0])
+        bounds = pc.min_max(first_key)
+        row_filter = And(
+            GreaterThanOrEqual(key_columns[0], bounds['min'].as_py()),
+            LessThanOrEqual(key_columns[0], bounds['max'].as_py())
+        )
+        for name in key_columns:
+            # pyiceberg only prunes by large IN lists in partition and dictionary filters
+            row_filter = And(row_filter, In(name, set(batch.column(name).to_pylist())))
+        return list(table.scan(row_filter=row_filter).plan_files())
+
+    def _rewrite(self, table, key_columns, batch):
+        """(files to delete, rows they keep) for the data files holding keys of the batch"""
+        batch_keys = key_strings(batch, key_columns)
+        key_schema = table.schema().select(*key_columns)
+        removed = []
+        kept = []
+        for task in self._candidate_tasks(table, key_columns, batch):
+            if task.delete_files:
+                raise Exception(f"❌ {task.file.file_path} has delete files - the table is written by Flink's upsert sink")
+            keys = ArrowScan(table.metadata, table.io, key_schema, AlwaysTrue()).to_table([task])
+            if not pc.any(pc.is_in(key_strings(keys, key_columns), value_set=batch_keys)).as_py():
+                continue
+            data = ArrowScan(table.metadata, table.io, table.schema(), AlwaysTrue()).to_table([task])
+            mask = pc.invert(pc.is_in(key_strings(data, key_columns), value_set=batch_keys))
+            removed.append(task.file)
+            kept.append(data.filter(mask))
+        return removed, kept
+
+    def flush(self, table_name):
+        """Apply a table's buffered records in one snapshot, returns the number of records applied"""
+        started, records = self._buffers.pop(table_name, (None, []))
+        if not records:
+            return 0
+        commit_started = time.monotonic()
+        spec = self.sink_schemas[table_name]
+        key_columns = spec['primary_key']
+        next_offset = records[-1].offset + 1
+
+        latest = {}
+        skipped = 0
+        for record in records:
+            if record.value is None:
+                continue  # tombstone following a delete
+            key = tuple(record.value.get(name) for name in key_columns)
+            if None in key:
+                # Generator rows on the file stand-in lack serial keys Postgres would assign
+                skipped += 1
+                continue
+            latest.pop(key, None)
+            latest[key] = record.value
+        upserts = [value for value in latest.values() if not is_delete(value)]
+        deletes = len(latest) - len(upserts)
+
+        self.writer.table(table_name)  # created with its layout when missing
+        version = self.catalog.hadoop_version(f"{table_name}_iceberg")
+        table = self.catalog.load_table(f"{table_name}_iceberg")
+        schema = iceberg_backfill.arrow_schema(spec)
+        removed, kept = [], []
+        if latest and table.current_snapshot() is not None:
+            removed, kept = self._rewrite(table, key_columns, self.to_arrow(table_name, list(latest.values())))
+
+        data = pa.concat_tables([part.cast(schema) for part in kept] + [self.to_arrow(table_name, upserts)])
+        if removed or len(data):
+            added = list(_dataframe_to_data_files(table.metadata, iceberg_layout.sort_table(data, spec), table.io)) if len(data) else []
+            with table.transaction() as transaction:
+                update = transaction.update_snapshot(snapshot_properties=checkpoint_properties(table_name, next_offset))
+                with (update.overwrite() if removed else update.fast_append()) as commit:
+                    for data_file in removed:
+                        commit.delete_data_file(data_file)
+                    for data_file in added:
+                        commit.append_data_file(data_file)
+            self.catalog.publish(table, expected_version=version)
+            self.stats[table_name]['commits'] += 1
+        # Without a commit (only tombstones or unknown deletes) the offset advances in memory; a replay is harmless
+
+        self.offsets[table_name] = next_offset
+        lag_ms = time.time() * 1000 - min(record.timestamp_ms for record in records)
+        self.lags_ms.append(lag_ms)
+        stats = self.stats[table_name]
+        stats['records'] += len(records)
+        stats['upserted'] += len(upserts)
+        stats['deleted'] += deletes
+        stats['skipped'] += skipped
+        stats['files_rewritten'] += len(removed)
+        stats['rows_rewritten'] += sum(len(part) for part in kept)
+        logging.info(f"🧊 {table_name}: {len(records)} records ({len(upserts)} upserts, {deletes} deletes, "
+                     f"{skipped} without key, {len(removed)} files rewritten) to offset {next_offset} in {time.monotonic() - commit_started:.2f}s, "
+                     f"lag {lag_ms / 1000:.1f}s")
+        return len(records)
+
+    def flush_all(self):
+        return sum(self.flush(table_name) for table_name in list(self._buffers))
+
+    def run(self, duration_seconds=None, stop_when_idle=False):
+        """Poll and commit until the duration passes (or the topics are drained with stop_when_idle), returns report()"""
+        self.restore()
+        started = time.monotonic()
+        while True:
+            received = self.poll()
+            for table_name in self.tables:
+                if self.due(table_name):
+                    self.flush(table_name)
+            if (stop_when_idle and received == 0) or (duration_seconds is not None and time.monotonic() - started >= duration_seconds):
+                self.flush_all()
+                break
+            if received == 0:
+                time.sleep(IDLE_SLEEP_SECONDS)
+        return self.report(time.monotonic() - started)
+
+    def report(self, elapsed_seconds=None):
+        """{'tables': {table: stats and offset}, 'lag_ms': {'p50', 'p95', 'max'}, 'records_per_second'}"""
+        records = sum(stats['records'] for stats in self.stats.values())
+        return {
+            'tables': {table_name: {**stats, 'offset': self.offsets.get(table_name, 0)} for table_name, stats in self.stats.items()},
+            'lag_ms': {
+                'p50': cdc_freshness_probe.percentile(self.lags_ms, 50),
+                'p95': cdc_freshness_probe.percentile(self.lags_ms, 95),
+                'max': max(self.lags_ms) if self.lags_ms else None,
+            },
+            'records_per_second': round(records / elapsed_seconds, 1) if elapsed_seconds else None,
+        }
+
+def get_cdc_microbatch_processor(event_log_kind='file', warehouse=hadoop_catalog.ICEBERG_WAREHOUSE,
+                                 catalog_uri=hadoop_catalog.ICEBERG_CATALOG_URI, event_log_dir=file_event_log.EVENT_LOG_DIR, **kwargs):
+    """Factory function to get a processor from the file or Kafka change stream into the local warehouse"""
+    if event_log_kind == 'kafka':
+        event_log = file_event_log.get_event_log('kafka')
+    else:
+        event_log = file_event_log.get_event_log('file', event_log_dir)
+    catalog = hadoop_catalog.get_local_catalog(warehouse, catalog_uri=catalog_uri)
+    return CdcMicroBatchProcessor(event_log, catalog, **kwargs)
@@ -0,0 +1,285 @@
+"""Compact columnar in-memory representation for generated rows"""
+
+import csv
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+import table_schemas
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+
+# Storage typecode per column kind ('str' columns are plain lists)
+TYPECODES = {
+    'int': 'q',
+    'float': 'd',
+    'bool': 'b',
+    'date': 'i',
+    'datetime': 'q',
+    'dict': 'I',
+}
+
+# Rows decoded at a time when iterating or writing a batch
+DECODE_CHUNK_SIZE = 4096
+
+def datetime_to_micros(value):
+    """Naive datetime -> microseconds since epoch"""
+    days = value.toordinal() - EPOCH_ORDINAL
+    seconds = days * 86400 + value.hour * 3600 + value.minute * 60 + value.second
+    return seconds * 1000000 + value.microsecond
+
+def micros_to_datetime(value):
+    """Microseconds since epoch -> naive datetime"""
+    return EPOCH + timedelta(microseconds=value)
+
+def encode_dictionary(values):
+    """(codes, dictionary) for a 'dict' column, dictionary in first-seen order"""
+    lookup = {}
+    codes = array(TYPECODES['dict'], [lookup.setdefault(value, len(lookup)) for value in values])
+    return codes, list(lookup)
+
+class Column:
+    """A single typed column with an optional null mask"""
+    __slots__ = ('name', 'kind', 'data', 'nulls', 'values', 'lookup')
+
+    def __init__(self, name, kind):
+        if kind != 'str' and kind not in TYPECODES:
+            raise ValueError(f"Unknown column kind '{kind}' for column {name}")
+        self.name = name
+        self.kind = kind
+        self.data = [] if kind == 'str' else array(TYPECODES[kind])
+        self.nulls = None  # bytearray, created on the first NULL
+        self.values = [] if kind == 'dict' else None
+        self.lookup = {} if kind == 'dict' else None
+
+    def __len__(self):
+        return len(self.data)
+
+    def append(self, value):
+        if value is None:
+            if self.nulls is None:
+                self.nulls = bytearray(len(self.data))
+            self.nulls.append(1)
+            self.data.append('' if self.kind == 'str' else 0)
+            return
+
+        if self.nulls is not None:
+            self.nulls.append(0)
+
+        kind = self.kind
+        if kind == 'dict':
+            code = self.lookup.get(value)
+            if code is None:
+                code = len(self.values)
+                self.lookup[value] = code
+                self.values.append(value)
+            self.data.append(code)
+        elif kind == 'datetime':
+            self.data.append(datetime_to_micros(value))
+        elif kind == 'date':
+            self.data.append(value.toordinal())
+        else:
+            self.data.append(value)
+
+    def load(self, values, nulls=None, dictionary=None):
+        """
+        Replace the column with already-encoded storage values.
+
+        values: date ordinals, datetime microseconds, dictionary codes or plain
+        values (a numpy array is copied buffer to buffer)
+        nulls: optional per-row null flags
+        dictionary: decoded values of the codes for 'dict' columns
+        """
+        if self.kind == 'str':
+            self.data = list(values)
+        else:
+            self.data = array(TYPECODES[self.kind])
+            if hasattr(values, 'astype'):
+                self.data.frombytes(values.astype(self.data.typecode).tobytes())
+            else:
+                self.data.extend(values)
+
+        if self.kind == 'dict':
+            self.values = list(dictionary or [])
+            self.lookup = {value: code for code, value in enumerate(self.values)}
+
+        self.nulls = None
+        if nulls is not None:
+            self.nulls = bytearray(nulls.astype('b').tobytes()) if hasattr(nulls, 'astype') else bytearray(nulls)
+            if len(self.nulls) != len(self.data):
+                raise ValueError(f"Null mask of {self.name} has {len(self.nulls)} entries, column has {len(self.data)}")
+
+    def set(self, index, value):
+        """Overwrite one value in place"""
+        if value is None:
+            if self.nulls is None:
+                self.nulls = bytearray(len(self.data))
+            self.nulls[index] = 1
+            return
+        if self.nulls is not None:
+            self.nulls[index] = 0
+        kind = self.kind
+        if kind == 'dict':
+            code = self.lookup.get(value)
+            if code is None:
+                code = len(self.values)
+                self.lookup[value] = code
+                self.values.append(value)
+            self.data[index] = code
+        elif kind == 'datetime':
+            self.data[index] = datetime_to_micros(value)
+        elif kind == 'date':
+            self.data[index] = value.toordinal()
+        else:
+            self.data[index] = value
+
+    def get(self, index):
+        if self.nulls is not None and self.nulls[index]:
+            return None
+        raw = self.data[index]
+        kind = self.kind
+        if kind == 'dict':
+            return self.values[raw]
+        if kind == 'datetime':
+            return micros_to_datetime(raw)
+        if kind == 'date':
+            return date.fromordinal(raw)
+        if kind == 'bool':
+            return bool(raw)
+        return raw
+
+    def decode(self, start=0, stop=None):
+        """Decode a range of the column into Python values"""
+        return [self.get(i) for i in range(start, len(self.data) if stop is None else stop)]
+
+    def nbytes(self):
+        """Approximate memory used by the column"""
+        if self.kind == 'str':
+            size = sys.getsizeof(self.data) + sum(sys.getsizeof(value) for value in self.data)
+        else:
+            size = self.data.itemsize * len(self.data)
+        if self.kind == 'dict':
+            size += sum(sys.getsizeof(value) for value in self.values)
+        if self.nulls is not None:
+            size += len(self.nulls)
+        return size
+
+class ColumnarBatch:
+    """
+    Column-oriented row container.
+
+    Behaves like a read-only list of row tuples (len, iteration, indexing and
+    slicing), so it can be passed anywhere a list of tuples is accepted, e.g.
+    DatabaseManager.bulk_insert_data.
+    """
+
+    def __init__(self, columns):
+        """columns: (column_name, kind) pairs, see table_schemas"""
+        self.columns = [Column(name, kind) for name, kind in columns]
+        self._size = 0
+
+    @classmethod
+    def for_table(cls, table_name):
+        """Empty batch with the insert columns of a table"""
+        return cls(table_schemas.get_table_columns(table_name))
+
+    @classmethod
+    def from_columns(cls, table_name, data, nulls=None, dictionaries=None):
+        """
+        Batch of a table built directly from encoded column data, see Column.load.
+
+        data: column name -> storage values (every insert column is required)
+        nulls: column name -> null flags
+        dictionaries: column name -> decoded values for 'dict' columns
+        """
+        nulls = nulls or {}
+        dictionaries = dictionaries or {}
+        batch = cls.for_table(table_name)
+        for column in batch.columns:
+            column.load(data[column.name], nulls.get(column.name), dictionaries.get(column.name))
+
+        sizes = {len(column) for column in batch.columns}
+        if len(sizes) > 1:
+            raise ValueError(f"Columns of {table_name} have different lengths: {sorted(sizes)}")
+        batch._size = sizes.pop() if sizes else 0
+        return batch
+
+    @property
+    def column_names(self):
+        return [column.name for column in self.columns]
+
+    def __len__(self):
+        return self._size
+
+    def __bool__(self):
+        return self._size > 0
+
+    def append(self, row):
+        if len(row) != len(self.columns):
+            raise ValueError(f"Row has {len(row)} values, batch has {len(self.columns)} columns")
+        for column, value in zip(self.columns, row):
+            column.append(value)
+        self._size += 1
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def row(self, index):
+        return tuple(column.get(index) for column in self.columns)
+
+    def set_value(self, index, name, value):
+        """Overwrite one cell of a row in place"""
+        self.columns[self.column_names.index(name)].set(index, value)
+
+    def rows(self, start=0, stop=None):
+        """Decode a range of rows into tuples (column at a time)"""
+        stop = self._size if stop is None else min(stop, self._size)
+        if start >= stop:
+            return []
+        return list(zip(*[column.decode(start, stop) for column in self.columns]))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._size)
+            if step != 1:
+                return [self.row(i) for i in range(start, stop, step)]
+            return self.rows(start, stop)
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError("batch index out of range")
+        return self.row(key)
+
+    def __iter__(self):
+        for start in range(0, self._size, DECODE_CHUNK_SIZE):
+            yield from self.rows(start, start + DECODE_CHUNK_SIZE)
+
+    def column(self, name):
+        """Decoded values of one column"""
+        return self.columns[self.column_names.index(name)].decode()
+
+    def select(self, names):
+        """New batch sharing the selected columns (no copy)"""
+        batch = ColumnarBatch([])
+        by_name = {column.name: column for column in self.columns}
+        batch.columns = [by_name[name] for name in names]
+        batch._size = self._size
+        return batch
+
+    def nbytes(self):
+        """Approximate memory used by the batch"""
+        return sum(column.nbytes() for column in self.columns)
+
+    def write_csv(self, fileobj, header=True):
+        """Write the batch as CSV (NULL as empty field)"""
+        writer = csv.writer(fileobj)
+        if header:
+            writer.writerow(self.column_names)
+        for start in range(0, self._size, DECODE_CHUNK_SIZE):
+            writer.writerows(self.rows(start, start + DECODE_CHUNK_SIZE))
+        return self._size
+
+def get_batch(table_name):
+    """Factory function to get an empty columnar batch for a table"""
+    return ColumnarBatch.for_table(table_name)
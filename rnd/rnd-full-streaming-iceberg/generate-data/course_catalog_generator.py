@@ -0,0 +1,116 @@
+"""Procedural course catalog generator for university master data"""
+
+import logging
+import random
+from datetime import datetime
+import static_data
+
+ROMAN_NUMERALS = ['', ' I', ' II', ' III', ' IV', ' V', ' VI', ' VII', ' VIII', ' IX', ' X']
+
+class CourseCatalogGenerator:
+    def __init__(self, courses_per_program=None, seed=None):
+        """
+        courses_per_program: int (same size for every program) or dict of
+        degree -> size. Defaults to static_data.COURSE_CATALOG_SIZES.
+        """
+        if courses_per_program is None:
+            courses_per_program = static_data.COURSE_CATALOG_SIZES
+        elif isinstance(courses_per_program, int):
+            courses_per_program = {degree: courses_per_program for degree in static_data.COURSE_LEVELS}
+        self.courses_per_program = courses_per_program
+        # Without a seed, draw one from the module-level random, so a run seeded with random.seed() stays reproducible
+        self.rng = random.Random(random.getrandbits(64) if seed is None else seed)
+
+    def generate_catalog(self, program_results):
+        """
+        Generate courses and prerequisite chains for every program.
+
+        program_results: rows of (program_id, program_code, program_name, degree)
+        Returns (courses, prerequisites) where courses are rows of
+        (course_code, course_name, credits, program_id, created_at) and
+        prerequisites are rows of (course_code, prerequisite_code, created_at).
+        """
+        try:
+            logging.info(f"📚 Generating course catalog for {len(program_results)} programs")
+
+            courses = []
+            prerequisites = []
+            used_prefixes = set()
+            credit_values = list(static_data.COURSE_CREDIT_WEIGHTS.keys())
+            credit_weights = list(static_data.COURSE_CREDIT_WEIGHTS.values())
+
+            for program_id, program_code, program_name, degree in program_results:
+                levels = static_data.COURSE_LEVELS.get(degree, static_data.COURSE_LEVELS['S1'])
+                size = self.courses_per_program.get(degree, 0)
+                if size <= 0:
+                    continue
+
+                prefix = self._course_prefix(program_code, program_id, levels, used_prefixes)
+                stem = self._program_stem(program_name)
+
+                # Spread courses evenly across levels, earlier levels get the remainder
+                per_level = [size // len(levels)] * len(levels)
+                for i in range(size % len(levels)):
+                    per_level[i] += 1
+
+                now = datetime.now()
+                codes_by_level = {}
+                name_counts = {}
+                for level, level_size in zip(levels, per_level):
+                    credits_list = self.rng.choices(credit_values, weights=credit_weights, k=level_size)
+                    topics = static_data.COURSE_TOPICS.get(level, static_data.COURSE_TOPICS[1])
+                    level_codes = []
+
+                    for seq in range(1, level_size + 1):
+                        course_code = f"{prefix}{level}{seq:02d}"
+                        base_name = f"{topics[(seq - 1) % len(topics)]} {stem}"
+                        name_counts[base_name] = name_counts.get(base_name, 0) + 1
+                        suffix_index = name_counts[base_name]
+                        suffix = ROMAN_NUMERALS[suffix_index] if suffix_index < len(ROMAN_NUMERALS) else f" {suffix_index}"
+                        course_name = f"{base_name}{suffix if suffix_index > 1 else ''}"[:100]
+
+                        courses.append((course_code, course_name, credits_list[seq - 1], program_id, now))
+                        level_codes.append(course_code)
+
+                        # Prerequisite chain: link to courses from the previous level
+                        previous_codes = codes_by_level.get(level - 1)
+                        if previous_codes and self.rng.random() < static_data.COURSE_PREREQUISITE_PROBABILITY:
+                            count = self.rng.randint(1, min(static_data.COURSE_MAX_PREREQUISITES, len(previous_codes)))
+                            for prerequisite_code in self.rng.sample(previous_codes, count):
+                                prerequisites.append((course_code, prerequisite_code, now))
+
+                    codes_by_level[level] = level_codes
+
+                # General courses for undergraduate programs
+                if degree == 'S1':
+                    for course_code, course_name, credits in static_data.GENERAL_COURSES:
+                        courses.append((f"{course_code}{prefix}", course_name, credits, program_id, now))
+
+            logging.info(f"✅ Generated {len(courses)} courses with {len(prerequisites)} prerequisite links")
+            return courses, prerequisites
+
+        except Exception as e:
+            logging.error(f"❌ Error generating course catalog: {e}")
+            raise
+
+    def _course_prefix(self, program_code, program_id, levels, used_prefixes):
+        """Derive a unique course code prefix (max 4 chars) for a program"""
+        prefix = program_code.split('-')[0].upper()[:4]
+        key = (prefix, tuple(levels))
+        if key in used_prefixes:
+            # Another program with the same prefix and levels, disambiguate with the id
+            prefix = f"{prefix[:2]}{program_id % 100:02d}"
+            key = (prefix, tuple(levels))
+        used_prefixes.add(key)
+        return prefix
+
+    def _program_stem(self, program_name):
+        """Program name without the degree suffix (e.g. 'Ilmu Komputer S1' -> 'Ilmu Komputer')"""
+        parts = program_name.rsplit(' ', 1)
+        if len(parts) == 2 and parts[1] in static_data.COURSE_LEVELS:
+            return parts[0]
+        return program_name
+
+def get_course_catalog_generator(courses_per_program=None, seed=None):
+    """Factory function to get course catalog generator instance"""
+    return CourseCatalogGenerator(courses_per_program, seed)
@@ -0,0 +1,302 @@
+"""Dataset artifacts: the final state of a generation run as Arrow IPC files plus a manifest, loaded back with COPY"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+import flink_job_builder
+import iceberg_backfill
+
+# Try to import pyarrow for the artifact files
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pcsv
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+    logging.warning("⚠️ pyarrow not available - dataset artifacts disabled")
+
+DATASET_DIR = os.getenv("DATASET_DIR", "/tmp/university-dataset")
+MANIFEST_FILE = 'manifest.json'
+FORMAT_VERSION = 1
+
+# Uncompressed files are memory-mapped without copying; 'zstd' or 'lz4' trade load time for size
+COMPRESSION = None
+
+# Rows encoded per pyarrow.csv call when handing a table to COPY
+CSV_CHUNK_ROWS = 65536
+
+SERIAL_TYPES = ('SERIAL', 'BIGSERIAL')
+
+def serial_columns(sql_path=flink_job_builder.POSTGRES_SCHEMA_SQL):
+    """{table: [columns]} of the SERIAL columns of a Postgres schema file"""
+    with open(sql_path, encoding='utf-8') as f:
+        sql = f.read()
+
+    serials = {}
+    for table_name, body in flink_job_builder.POSTGRES_TABLE_PATTERN.findall(sql):
+        for line in body.splitlines():
+            parts = line.strip().split()
+            if len(parts) > 1 and parts[1].rstrip(',').upper() in SERIAL_TYPES:
+                serials.setdefault(table_name, []).append(parts[0])
+    return serials
+
+def arrow_schema(columns):
+    """Arrow schema of [(name, flink_type)] (flink_job_builder.load_postgres_schemas)"""
+    return pa.schema([(name, iceberg_backfill.arrow_type(flink_type)) for name, flink_type in columns])
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class ArrowRows:
+    """
+    An Arrow table in the row interface of columnar_batch.ColumnarBatch.
+
+    DatabaseManager.copy_insert_data writes it with write_csv in one pass,
+    and the load hooks (Iceberg backfill, event recording) read it through
+    column() or slices of row tuples, so artifact loads look like any other
+    generator load.
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    @property
+    def column_names(self):
+        return self.data.column_names
+
+    def __len__(self):
+        return self.data.num_rows
+
+    def __bool__(self):
+        return self.data.num_rows > 0
+
+    def rows(self, start=0, stop=None):
+        """Row tuples of [start, stop)"""
+        stop = self.data.num_rows if stop is None else min(stop, self.data.num_rows)
+        if start >= stop:
+            return []
+        window = self.data.slice(start, stop - start)
+        return list(zip(*[column.to_pylist() for column in window.columns]))
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self.data.num_rows)
+            rows = self.rows(start, stop)
+            return rows[::step] if step != 1 else rows
+        if key < 0:
+            key += self.data.num_rows
+        return self.rows(key, key + 1)[0]
+
+    def __iter__(self):
+        for start in range(0, self.data.num_rows, CSV_CHUNK_ROWS):
+            yield from self.rows(start, start + CSV_CHUNK_ROWS)
+
+    def column(self, name):
+        return self.data.column(name).to_pylist()
+
+    def write_csv(self, fileobj, header=True):
+        """Write the rows as CSV (NULL as empty field, empty strings quoted)"""
+        for start in range(0, self.data.num_rows, CSV_CHUNK_ROWS):
+            buffer = io.BytesIO()
+            options = pcsv.WriteOptions(include_header=header and start == 0)
+            pcsv.write_csv(self.data.slice(start, CSV_CHUNK_ROWS), buffer, options)
+            fileobj.write(buffer.getvalue().decode('utf-8'))
+        return self.data.num_rows
+
+class DatasetArtifactWriter:
+    """
+    Writes the tables of a generated database as one Arrow IPC file each.
+
+    Every table is exported with COPY TO STDOUT in schema order, so the
+    artifact holds the committed state (serial ids, lifecycle updates and
+    server-side --engine sql rows included) rather than what the generators
+    handed to the loads. The CSV is spooled to a temporary file and
+    converted batch by batch with the column types of university_tables.sql.
+    The manifest is written last, so an interrupted export never looks like
+    a complete artifact.
+    """
+
+    def __init__(self, directory=DATASET_DIR, compression=COMPRESSION, sql_path=flink_job_builder.POSTGRES_SCHEMA_SQL):
+        if not ARROW_AVAILABLE:
+            raise Exception("❌ pyarrow not available - please install pyarrow")
+        self.directory = directory
+        self.compression = compression
+        self.schemas = flink_job_builder.load_postgres_schemas(sql_path)
+        self.serials = serial_columns(sql_path)
+        os.makedirs(directory, exist_ok=True)
+
+    def write_table(self, table_name, columns, csv_file):
+        """Convert a Postgres CSV export (with header) into <table>.arrow, returns its manifest entry"""
+        schema = arrow_schema(columns)
+        convert_options = pcsv.ConvertOptions(
+            column_types=schema, true_values=['t'], false_values=['f'],
+            strings_can_be_null=True, quoted_strings_can_be_null=False,
+        )
+        file_name = f"{table_name}.arrow"
+        path = os.path.join(self.directory, file_name)
+        rows = 0
+        reader = pcsv.open_csv(csv_file, convert_options=convert_options)
+        with pa.OSFile(path, 'wb') as sink:
+            with pa.ipc.new_file(sink, schema, options=pa.ipc.IpcWriteOptions(compression=self.compression)) as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+        return {
+            'name': table_name,
+            'file': file_name,
+            'rows': rows,
+            'bytes': os.path.getsize(path),
+            'sha256': file_sha256(path),
+            'columns': [list(column) for column in columns],
+            'serial_columns': self.serials.get(table_name, []),
+        }
+
+    def export(self, db, tables=None, **metadata):
+        """Export the tables of db (default every table of the schema that exists), returns the manifest"""
+        started = time.monotonic()
+        entries = []
+        for table_name, columns in self.schemas.items():
+            if tables and table_name not in tables:
+                continue
+            if not db.table_exists(table_name):
+                logging.warning(f"⚠️ {table_name} does not exist - not exported")
+                continue
+            existing = {row[0] for row in db.get_table_schema(table_name)}
+            columns = [(name, flink_type) for name, flink_type in columns if name in existing]
+            column_list = ', '.join(name for name, _ in columns)
+
+            with tempfile.TemporaryFile() as spool:
+                db.copy_query_to_file(f"SELECT {column_list} FROM {table_name}", None, spool)
+                spool.seek(0)
+                entry = self.write_table(table_name, columns, spool)
+            entries.append(entry)
+            logging.info(f"💾 {table_name}: {entry['rows']} rows, {entry['bytes'] / 1e6:.2f} MB")
+
+        manifest = {
+            'version': FORMAT_VERSION,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'compression': self.compression,
+            **metadata,
+            'tables': entries,  # in load (foreign key) order
+        }
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        with open(f"{path}.tmp", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, default=str)
+        os.replace(f"{path}.tmp", path)
+        logging.info(f"✅ Dataset artifact with {len(entries)} tables written to {self.directory} "
+                     f"in {time.monotonic() - started:.1f}s")
+        return manifest
+
+class DatasetArtifact:
+    """
+    A dataset artifact opened for loading.
+
+    The files are memory-mapped read-only, so any number of loads (several
+    databases in parallel, or repeated rebuilds of one) share the same
+    pages instead of regenerating or re-reading the data.
+    """
+
+    def __init__(self, directory=DATASET_DIR):
+        if not ARROW_AVAILABLE:
+            raise Exception("❌ pyarrow not available - please install pyarrow")
+        self.directory = directory
+        path = os.path.join(directory, MANIFEST_FILE)
+        if not os.path.exists(path):
+            raise Exception(f"❌ No dataset manifest in {directory}")
+        with open(path, encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != FORMAT_VERSION:
+            raise Exception(f"❌ Unsupported dataset version {self.manifest.get('version')} in {directory}")
+        self.entries = {entry['name']: entry for entry in self.manifest['tables']}
+
+    def tables(self):
+        """Table names in load order"""
+        return [entry['name'] for entry in self.manifest['tables']]
+
+    def read_table(self, table_name):
+        """Arrow table of one artifact file (memory-mapped)"""
+        source = pa.memory_map(os.path.join(self.directory, self.entries[table_name]['file']), 'r')
+        return pa.ipc.open_file(source).read_all()
+
+    def academic_years(self):
+        """Academic years of the registrations, the partitions a partitioned schema needs"""
+        if 'registration' not in self.entries:
+            return []
+        return sorted(set(self.read_table('registration').column('academic_year').to_pylist()) - {None})
+
+    def verify(self):
+        """{table: problem} for files that are missing or do not match the manifest checksum"""
+        problems = {}
+        for table_name, entry in self.entries.items():
+            path = os.path.join(self.directory, entry['file'])
+            if not os.path.exists(path):
+                problems[table_name] = 'missing'
+            elif file_sha256(path) != entry['sha256']:
+                problems[table_name] = 'checksum mismatch'
+        return problems
+
+    def info(self):
+        """Manifest metadata with per-table rows and sizes"""
+        summary = {key: value for key, value in self.manifest.items() if key != 'tables'}
+        summary['tables'] = {entry['name']: {'rows': entry['rows'], 'bytes': entry['bytes']} for entry in self.manifest['tables']}
+        summary['rows'] = sum(entry['rows'] for entry in self.manifest['tables'])
+        summary['bytes'] = sum(entry['bytes'] for entry in self.manifest['tables'])
+        return summary
+
+    def reset_sequences(self, db, table_name):
+        """Move the SERIAL sequences of a table past its loaded ids"""
+        for column in self.entries[table_name]['serial_columns']:
+            db.execute_query(
+                f"SELECT setval(pg_get_serial_sequence(%s, %s), COALESCE(MAX({column}), 1), MAX({column}) IS NOT NULL) "
+                f"FROM {table_name}",
+                (table_name, column)
+            )
+
+    def load(self, db, tables=None, skip_conflicts=False):
+        """COPY the tables into db in load order, returns {table: {'rows', 'seconds'}}"""
+        stats = {}
+        for table_name in self.tables():
+            if tables and table_name not in tables:
+                continue
+            started = time.monotonic()
+            data = self.read_table(table_name)
+            columns = [name for name, _ in self.entries[table_name]['columns']]
+            loaded = db.copy_insert_data(table_name, columns, ArrowRows(data), skip_conflicts) if data.num_rows else 0
+            self.reset_sequences(db, table_name)
+            stats[table_name] = {'rows': loaded, 'seconds': round(time.monotonic() - started, 2)}
+            logging.info(f"📥 {table_name}: {loaded} of {data.num_rows} rows loaded in {stats[table_name]['seconds']}s")
+        return stats
+
+    def partition_loaders(self, db, academic_year, tables=None):
+        """{table: callable(staging_table)} copying one academic year of each table, for partition_manager.backfill_academic_year"""
+        def loader(table_name):
+            def load(staging_table):
+                data = self.read_table(table_name)
+                data = data.filter(pc.equal(data.column('academic_year'), academic_year))
+                columns = [name for name, _ in self.entries[table_name]['columns']]
+                loaded = db.copy_insert_data(staging_table, columns, ArrowRows(data)) if data.num_rows else 0
+                logging.info(f"📥 {staging_table}: {loaded} rows of {table_name} {academic_year}")
+                return loaded
+            return load
+
+        return {table_name: loader(table_name) for table_name in self.tables()
+                if (not tables or table_name in tables)
+                and 'academic_year' in [name for name, _ in self.entries[table_name]['columns']]}
+
+def get_dataset_writer(directory=DATASET_DIR, compression=COMPRESSION):
+    """Factory function to get a writer for a dataset artifact directory"""
+    return DatasetArtifactWriter(directory, compression)
+
+def get_dataset_artifact(directory=DATASET_DIR):
+    """Factory function to open a dataset artifact for loading"""
+    return DatasetArtifact(directory)
@@ -1,18 +1,22 @@
 # include/utils/db_utils.py
+import csv
+import io
 import logging
 import os
+import re
 from typing import List, Tuple, Any
+import load_verification
 
 # Try to import psycopg2, with fallback options
 try:
     import psycopg2
-    from psycopg2.extras import execute_batch
+    from psycopg2.extras import execute_values
     PSYCOPG2_AVAILABLE = True
     logging.info("✅ psycopg2 imported successfully")
 except ImportError:
     try:
         import psycopg2cffi as psycopg2
-        from psycopg2cffi.extras import execute_batch
+        from psycopg2cffi.extras import execute_values
         PSYCOPG2_AVAILABLE = True
         logging.info("✅ psycopg2cffi imported as fallback")
     except ImportError:
@@ -29,6 +33,12 @@ DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")  # postgres password as per d
 # Alternative container connection settings
 CONTAINER_HOST = os.getenv("CONTAINER_HOST", "rnd-full-streaming-iceberg-postgres-1")
 
+# Target table of a write statement (INSERT/UPDATE/DELETE/TRUNCATE)
+WRITE_TARGET_PATTERN = re.compile(
+    r'^\s*(?:INSERT\s+INTO|UPDATE|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?)\s+(?:ONLY\s+)?([\w.]+)',
+    re.IGNORECASE
+)
+
 class DatabaseManager:
     def __init__(self):
         self.connection_params = {
@@ -39,13 +49,50 @@ class DatabaseManager:
             'password': DB_PASSWORD
         }
         self.use_airflow_hook = False
+        self._write_listeners = []
+        self._load_hooks = []
+        self._change_hooks = []
+        self.load_throttle = None  # replication_throttle.LoadThrottle pacing bulk loads
+        self.load_verify_sample = load_verification.LOAD_VERIFY_SAMPLE
+        self.last_load_report = None  # load_verification.LoadReport of the latest bulk load
+        self._use_container_host = False  # set once localhost failed and the container name answered
         logging.info(f"🔧 Database config: {DB_HOST}:{DB_PORT}/{DB_NAME} as {DB_USER}")
         
+    def add_write_listener(self, listener):
+        """Register a callback(table_name) invoked after a committed write (None = schema change)"""
+        self._write_listeners.append(listener)
+    
+    def _notify_write(self, table_name):
+        """Notify write listeners that a table changed"""
+        for listener in self._write_listeners:
+            listener(table_name)
+    
+    def add_load_hook(self, hook):
+        """Register a callback(table_name, columns, data_list) invoked before a bulk load (may edit rows in place)"""
+        self._load_hooks.append(hook)
+    
+    def _before_load(self, table_name, columns, data_list):
+        """Run load hooks on rows about to be loaded"""
+        for hook in self._load_hooks:
+            hook(table_name, list(columns), data_list)
+    
+    def add_change_hook(self, hook):
+        """Register a callback(table_name, op, key_column, keys) invoked after committed row changes that are not bulk loads"""
+        self._change_hooks.append(hook)
+    
+    def notify_changes(self, table_name, op, key_column, keys):
+        """Tell change hooks that the rows with these keys were updated ('u') or deleted ('d') and committed"""
+        for hook in self._change_hooks:
+            hook(table_name, op, key_column, list(keys))
 
 
     def get_connection(self):
         """Get PostgreSQL connection with fallback to container name"""
         if PSYCOPG2_AVAILABLE:
+            # Skip the localhost attempt (and its timeout) once the container name is known to work
+            if self._use_container_host:
+                return psycopg2.connect(**{**self.connection_params, 'host': CONTAINER_HOST}, connect_timeout=5)
+            
             # Try localhost connection first
             try:
                 logging.info(f"🔄 Attempting to connect to PostgreSQL at {self.connection_params['host']}:{self.connection_params['port']}")
@@ -70,6 +117,7 @@ class DatabaseManager:
                         connect_timeout=5
                     )
                     logging.info("✅ Successfully connected to PostgreSQL via container name")
+                    self._use_container_host = True
                     return conn
                 except Exception as container_error:
                     logging.error(f"❌ Container connection also failed: {container_error}")
@@ -92,15 +140,45 @@ class DatabaseManager:
             logging.error(f"❌ Database connection test failed: {e}")
             return False
     
+    def set_load_throttle(self, throttle):
+        """Pace bulk loads with a replication_throttle.LoadThrottle (None = unthrottled)"""
+        self.load_throttle = throttle
+    
+    def set_load_verification(self, sample_size):
+        """Read back and checksum sample_size rows after each bulk load (0 = row counts only)"""
+        self.load_verify_sample = sample_size or 0
+    
+    def _verify_load(self, cursor, table_name, columns, data_list, report):
+        """Check a committed load against a sample of its rows and keep the report"""
+        if self.load_verify_sample:
+            rows = load_verification.sample_rows(data_list, self.load_verify_sample)
+            load_verification.verify_sample(cursor, table_name, list(columns), rows, report)
+        report.log()
+        self.last_load_report = report
+        return report
+    
     def bulk_insert_data(self, table_name: str, columns: List[str], data_list: List[Tuple]):
-        """Bulk insert data with error handling"""
+        """Bulk insert data with error handling
+        
+        data_list can be a list of tuples or a columnar_batch.ColumnarBatch
+        (rows are decoded one chunk at a time).
+        
+        With a load throttle set, every chunk is committed on its own and the
+        chunk size follows the CDC replication lag.
+        
+        Returns the number of rows the database reported inserted (rows
+        skipped by ON CONFLICT DO NOTHING are not counted); the full
+        load_verification.LoadReport is kept in last_load_report.
+        """
         if not data_list:
             logging.warning(f"No data to insert into {table_name}")
             return 0
+        self._before_load(table_name, columns, data_list)
         
         placeholders = ','.join(['%s'] * len(columns))
         columns_str = ','.join(columns)
-        sql = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders}) ON CONFLICT DO NOTHING"
+        sql = f"INSERT INTO {table_name} ({columns_str}) VALUES %s ON CONFLICT DO NOTHING"
+        row_sql = f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders}) ON CONFLICT DO NOTHING"
         
         conn = None
         cursor = None
@@ -120,43 +198,49 @@ class DatabaseManager:
             logging.info(f"🔍 Transaction status before insert: {conn.get_transaction_status()}")
             
             # Split data into chunks for better memory management
-            chunk_size = 1000
-            total_inserted = 0
+            throttle = self.load_throttle
+            chunk_size = throttle.next_chunk_size() if throttle else 1000
+            report = load_verification.LoadReport(table_name, 'insert', len(data_list))
+            i = 0
             
-            for i in range(0, len(data_list), chunk_size):
+            while i < len(data_list):
                 chunk = data_list[i:i + chunk_size]
-                logging.info(f"📦 Processing chunk {i//chunk_size + 1} of {(len(data_list) + chunk_size - 1)//chunk_size}")
+                logging.info(f"📦 Processing chunk of {len(chunk)} records at offset {i} of {len(data_list)}")
                 
                 if PSYCOPG2_AVAILABLE:
-                    # Use psycopg2's execute_batch for better performance
-                    execute_batch(cursor, sql, chunk, page_size=chunk_size)
+                    # One multi-row INSERT per chunk, so rowcount covers the whole chunk
+                    execute_values(cursor, sql, chunk, page_size=len(chunk))
+                    chunk_inserted = cursor.rowcount
                 else:
                     # Fallback to individual inserts
+                    chunk_inserted = 0
                     for row in chunk:
-                        cursor.execute(sql, row)
+                        cursor.execute(row_sql, row)
+                        chunk_inserted += cursor.rowcount
+                
+                report.add_chunk(chunk_inserted)
+                i += len(chunk)
+                logging.info(f"✅ Inserted {chunk_inserted} of {len(chunk)} records in current chunk")
                 
-                total_inserted += len(chunk)
-                logging.info(f"✅ Executed insert for {len(chunk)} records in current chunk")
+                if throttle:
+                    # Commit so the CDC consumer can see and confirm the chunk
+                    conn.commit()
+                    chunk_size = throttle.after_chunk(len(chunk))
                 
                 # Check transaction status after each chunk
                 logging.info(f"🔍 Transaction status after chunk: {conn.get_transaction_status()}")
             
-            # EXPLICIT COMMIT with verification
             logging.info("🔄 Committing transaction...")
             conn.commit()
             logging.info("✅ Transaction committed successfully")
+            self._notify_write(table_name)
             
-            # Verify the data was actually inserted
-            verify_sql = f"SELECT COUNT(*) FROM {table_name} WHERE {columns[2]} = %s"  # Assuming entry_year is 3rd column
-            if len(data_list) > 0 and len(data_list[0]) > 2:
-                entry_year = data_list[0][2]  # Get entry_year from first record
-                cursor.execute(verify_sql, (entry_year,))
-                count_result = cursor.fetchone()
-                actual_count = count_result[0] if count_result else 0
-                logging.info(f"🔍 Verification: Found {actual_count} records with entry_year {entry_year} in database")
+            # Verify from the reported row counts (and an optional sampled checksum)
+            self._verify_load(cursor, table_name, columns, data_list, report)
+            conn.commit()
             
-            logging.info(f"✅ Successfully inserted {total_inserted} records into {table_name}")
-            return total_inserted
+            logging.info(f"✅ Successfully inserted {report.rows_inserted} records into {table_name}")
+            return report.rows_inserted
             
         except Exception as e:
             logging.error(f"❌ Error inserting into {table_name}: {e}")
@@ -173,6 +257,94 @@ class DatabaseManager:
                 conn.close()
                 logging.info("🔍 Connection closed")
     
+    def copy_insert_data(self, table_name: str, columns: List[str], data_list: List[Tuple], skip_conflicts: bool = False):
+        """Load rows with COPY FROM STDIN (CSV) in a single transaction
+        
+        Much faster than bulk_insert_data for large fact tables, but COPY has no
+        ON CONFLICT clause: the rows must not already exist unless skip_conflicts
+        is set, in which case they are copied into a temporary staging table and
+        moved with INSERT ... SELECT ... ON CONFLICT DO NOTHING. NULL and empty
+        strings are both written as empty fields and load as NULL.
+        
+        With a load throttle set, rows are copied and committed in chunks sized
+        by the CDC replication lag.
+        """
+        if not data_list:
+            logging.warning(f"No data to copy into {table_name}")
+            return 0
+        self._before_load(table_name, columns, data_list)
+        
+        conn = None
+        cursor = None
+        try:
+            logging.info(f"🔄 Starting COPY into {table_name} with {len(data_list)} records")
+            
+            columns_str = ','.join(columns)
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            copy_target = table_name
+            if skip_conflicts:
+                copy_target = f"{table_name}_copy_staging"
+                cursor.execute(
+                    f"CREATE TEMP TABLE {copy_target} ON COMMIT DELETE ROWS AS "
+                    f"SELECT {columns_str} FROM {table_name} WITH NO DATA"
+                )
+            
+            throttle = self.load_throttle
+            chunk_size = throttle.next_chunk_size() if throttle else len(data_list)
+            report = load_verification.LoadReport(table_name, 'copy', len(data_list))
+            i = 0
+            
+            while i < len(data_list):
+                buffer = io.StringIO()
+                if i == 0 and chunk_size >= len(data_list) and hasattr(data_list, 'write_csv'):
+                    # Whole batch at once, encoded chunk by chunk by the batch itself
+                    data_list.write_csv(buffer, header=False)
+                    chunk_length = len(data_list)
+                else:
+                    chunk = data_list[i:i + chunk_size]
+                    csv.writer(buffer).writerows(chunk)
+                    chunk_length = len(chunk)
+                buffer.seek(0)
+                
+                cursor.copy_expert(f"COPY {copy_target} ({columns_str}) FROM STDIN WITH CSV", buffer)
+                copied = cursor.rowcount if cursor.rowcount >= 0 else chunk_length
+                if skip_conflicts:
+                    cursor.execute(
+                        f"INSERT INTO {table_name} ({columns_str}) "
+                        f"SELECT {columns_str} FROM {copy_target} ON CONFLICT DO NOTHING"
+                    )
+                    report.add_chunk(cursor.rowcount)
+                    cursor.execute(f"TRUNCATE {copy_target}")
+                else:
+                    report.add_chunk(copied)
+                i += chunk_length
+                
+                if throttle:
+                    conn.commit()
+                    chunk_size = throttle.after_chunk(chunk_length)
+            
+            conn.commit()
+            self._notify_write(table_name)
+            
+            self._verify_load(cursor, table_name, columns, data_list, report)
+            conn.commit()
+            
+            logging.info(f"✅ Successfully copied {report.rows_inserted} of {len(data_list)} records into {table_name}")
+            return report.rows_inserted
+            
+        except Exception as e:
+            logging.error(f"❌ Error copying into {table_name}: {e}")
+            if conn:
+                conn.rollback()
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+    
     def execute_query(self, query: str, params: tuple = None) -> List[Tuple]:
         """Execute SELECT query and return results"""
         conn = None
@@ -220,6 +392,10 @@ class DatabaseManager:
             conn.commit()
             rowcount = cursor.rowcount
             logging.info(f"✅ Query executed successfully - {rowcount} rows affected")
+            
+            write_target = WRITE_TARGET_PATTERN.match(query)
+            if write_target:
+                self._notify_write(write_target.group(1).split('.')[-1])
             return rowcount
         except Exception as e:
             if conn:
@@ -234,6 +410,69 @@ class DatabaseManager:
             if conn:
                 conn.close()
     
+    def execute_transaction(self, statements: List[Tuple[str, Any]]) -> List[int]:
+        """Execute several statements (query, params) in one transaction and return their rowcounts"""
+        conn = None
+        cursor = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            rowcounts = []
+            for query, params in statements:
+                logging.info(f"🔍 Executing statement: {query.strip().splitlines()[0]}")
+                cursor.execute(query, params)
+                rowcounts.append(cursor.rowcount)
+            
+            conn.commit()
+            logging.info(f"✅ Transaction executed successfully - rowcounts {rowcounts}")
+            
+            for query, params in statements:
+                write_target = WRITE_TARGET_PATTERN.match(query)
+                if write_target:
+                    self._notify_write(write_target.group(1).split('.')[-1])
+            return rowcounts
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logging.error(f"❌ Error executing transaction: {e}")
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+    
+    def copy_query_to_file(self, query: str, params: Any, fileobj, setup_statements: List[Tuple[str, Any]] = None) -> int:
+        """Stream the result of a SELECT to a file object as CSV (with header) using COPY TO STDOUT"""
+        conn = None
+        cursor = None
+        try:
+            conn = self.get_connection()
+            cursor = conn.cursor()
+            
+            # Session setup (e.g. setseed) must run on the same connection as the COPY
+            for setup_query, setup_params in setup_statements or []:
+                cursor.execute(setup_query, setup_params)
+            
+            select_sql = cursor.mogrify(query, params).decode() if params else query
+            cursor.copy_expert(f"COPY ({select_sql}) TO STDOUT WITH CSV HEADER", fileobj)
+            rowcount = cursor.rowcount
+            conn.commit()
+            logging.info(f"✅ Copied {rowcount} rows to file")
+            return rowcount
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            logging.error(f"❌ Error copying query to file: {e}")
+            logging.error(f"Query: {query}")
+            raise
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                conn.close()
+    
     def table_exists(self, table_name: str) -> bool:
         """Check if table exists"""
         query = """
@@ -263,8 +502,13 @@ class DatabaseManager:
             logging.error(f"❌ Error getting schema for table {table_name}: {e}")
             return []
     
-    def create_tables_from_sql_file(self, sql_file_path: str):
-        """Create tables from SQL file"""
+    def create_tables_from_sql_file(self, sql_file_path: str, academic_years: List[str] = None):
+        """Create tables from SQL file
+        
+        For a partitioned schema (see university_tables_partitioned.sql) the
+        partitions of academic_years are created as well, and the Debezium
+        publication is set to publish partition changes via the parent table.
+        """
         try:
             # Read and execute SQL file
             with open(sql_file_path, 'r') as f:
@@ -277,6 +521,7 @@ class DatabaseManager:
             try:
                 cursor.execute(sql_commands)
                 logging.info(f"✅ Successfully executed SQL file: {sql_file_path}")
+                self._notify_write(None)
             except Exception as e:
                 logging.error(f"❌ Error executing SQL file {sql_file_path}: {e}")
                 logging.error(f"Query: {sql_commands}")
@@ -285,18 +530,27 @@ class DatabaseManager:
             cursor.close()
             conn.close()
             
+            import partition_manager
+            if partition_manager.partitioned_tables(self):
+                for academic_year in academic_years or []:
+                    partition_manager.ensure_partitions(self, academic_year)
+                partition_manager.ensure_publication(self)
+            
         except Exception as e:
             logging.error(f"❌ Error creating tables from SQL file: {e}")
             raise
 
 # Factory function with error handling
-def get_db_manager():
-    """Get database manager instance with error handling"""
+def get_db_manager(check_connection=False):
+    """Get database manager instance with error handling
+    
+    No connection is opened until the first query, so importing and
+    constructing generators stays cheap; check_connection tests it now.
+    """
     try:
         manager = DatabaseManager()
         
-        # Test the connection immediately
-        if not manager.test_connection():
+        if check_connection and not manager.test_connection():
             logging.error("❌ Database manager created but connection test failed")
         
         return manager
@@ -304,6 +558,18 @@ def get_db_manager():
         logging.error(f"❌ Failed to create database manager: {e}")
         raise
 
+def get_target_db_manager(target):
+    """Database manager for HOST:PORT/DBNAME (missing parts and the credentials from the DB_* settings)"""
+    manager = DatabaseManager()
+    address, _, database = target.partition('/')
+    host, _, port = address.partition(':')
+    manager.connection_params.update({'host': host or DB_HOST, 'port': port or DB_PORT})
+    if database:
+        manager.connection_params['database'] = database
+    logging.info(f"🔧 Target database: {manager.connection_params['host']}:{manager.connection_params['port']}/"
+                 f"{manager.connection_params['database']}")
+    return manager
+
 # Simple test function
 def test_database_setup():
     """Test database setup and connection"""
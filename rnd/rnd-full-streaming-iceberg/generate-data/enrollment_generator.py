@@ -3,17 +3,32 @@
 import logging
 import random
 from datetime import datetime, date, timedelta
-from faker import Faker
+import static_data
 import db_utils
+import locale_providers
+import reference_cache
+import columnar_batch
+import sql_generation_engine
+import grade_engine
 
-fake = Faker('id_ID')
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+fake = locale_providers.fake  # shared Faker('id_ID'), built on first use
 
 class EnrollmentGenerator:
-    def __init__(self):
-        self.db = db_utils.get_db_manager()
+    def __init__(self, db=None, cache=None):
+        self.db = db or db_utils.get_db_manager()
+        self.cache = cache or reference_cache.get_reference_cache(self.db)
+        
+    def generate_enrollments_for_academic_year(self, academic_year, engine='python', seed=None, ability_spread=0.0):
+        """Generate student enrollments for an academic year
         
-    def generate_enrollments_for_academic_year(self, academic_year):
-        """Generate student enrollments for an academic year"""
+        engine='vectorized' grades all selected enrollments at once with
+        grade_engine (ability_spread > 0 adds a per-student ability factor).
+        """
         try:
             logging.info(f"📚 Generating enrollments for academic year {academic_year}")
             
@@ -45,8 +60,7 @@ class EnrollmentGenerator:
                 logging.warning(f"⚠️ No classes found for {academic_year}")
                 return []
             
-            enrollments = []
-            enrollment_counter = 1
+            enrollments = columnar_batch.get_batch('student_enrollment')
             
             # Create a mapping of classes by semester and program
             classes_by_semester_program = {}
@@ -62,18 +76,17 @@ class EnrollmentGenerator:
                     'enrolled_count': enrolled_count
                 })
             
+            students = self.cache.students()
+            vectorized = engine == 'vectorized'
+            selected = []
+            
             # Generate enrollments for each registration
             for registration_id, student_id, semester, total_sks, reg_date in registration_results:
                 # Get student's program
-                student_program = self.db.execute_query(
-                    "SELECT program_id FROM students WHERE student_id = %s",
-                    (student_id,)
-                )
+                program_id = students.program_id_of(student_id)
                 
-                if not student_program:
+                if program_id is None:
                     continue
-                    
-                program_id = student_program[0][0]
                 
                 # Get available classes for this semester and program
                 key = f"{semester}_{program_id}"
@@ -115,39 +128,25 @@ class EnrollmentGenerator:
                 
                 # Generate enrollment records
                 for class_info in enrolled_classes:
-                    enrollment_date = reg_date + timedelta(days=random.randint(0, 7))  # Within a week of registration
+                    enrollment_date = reg_date + timedelta(days=random.randint(0, static_data.ENROLLMENT_DATE_MAX_OFFSET))  # Within a week of registration
+                    
+                    if vectorized:
+                        # Graded in bulk below
+                        selected.append((student_id, registration_id, class_info['class_id'], enrollment_date))
+                        continue
                     
                     # Generate grades (some might not have grades yet)
-                    has_grade = random.random() < 0.8  # 80% have grades
+                    has_grade = random.random() < static_data.GRADED_PROBABILITY
                     final_grade = None
                     grade_point = None
                     
                     if has_grade:
                         # Generate realistic grade distribution
-                        grade_rand = random.random()
-                        if grade_rand < 0.05:      # 5% A
-                            final_grade = random.uniform(85, 100)
-                            grade_point = 4.0
-                        elif grade_rand < 0.20:    # 15% B+
-                            final_grade = random.uniform(80, 84)
-                            grade_point = 3.5
-                        elif grade_rand < 0.45:    # 25% B
-                            final_grade = random.uniform(75, 79)
-                            grade_point = 3.0
-                        elif grade_rand < 0.70:    # 25% C+
-                            final_grade = random.uniform(70, 74)
-                            grade_point = 2.5
-                        elif grade_rand < 0.90:    # 20% C
-                            final_grade = random.uniform(65, 69)
-                            grade_point = 2.0
-                        else:                      # 10% D or E
-                            final_grade = random.uniform(40, 64)
-                            grade_point = random.choice([1.0, 0.0])
+                        final_grade, grade_point = self._draw_grade()
                     
-                    attendance_percentage = random.uniform(70, 100) if has_grade else None
+                    attendance_percentage = random.uniform(*static_data.ATTENDANCE_PERCENTAGE_RANGE) if has_grade else None
                     
                     enrollments.append((
-                        enrollment_counter,  # enrollment_id (will be removed during insertion)
                         student_id,
                         registration_id,
                         class_info['class_id'],
@@ -157,10 +156,12 @@ class EnrollmentGenerator:
                         grade_point,
                         attendance_percentage,
                         datetime.now(),
-                        datetime.now()
+                        datetime.now(),
+                        academic_year
                     ))
-                    
-                    enrollment_counter += 1
+            
+            if vectorized:
+                enrollments = self._grade_enrollments_vectorized(academic_year, selected, seed, ability_spread)
             
             logging.info(f"✅ Generated {len(enrollments)} enrollments")
             return enrollments
@@ -169,6 +170,62 @@ class EnrollmentGenerator:
             logging.error(f"❌ Error generating enrollments: {e}")
             raise
 
-def get_enrollment_generator():
+    def _grade_enrollments_vectorized(self, academic_year, selected, seed=None, ability_spread=0.0):
+        """Grade (student_id, registration_id, class_id, enrollment_date) selections in one pass"""
+        student_codes, student_ids = columnar_batch.encode_dictionary([row[0] for row in selected])
+        registration_codes, registration_ids = columnar_batch.encode_dictionary([row[1] for row in selected])
+        class_codes, class_ids = columnar_batch.encode_dictionary([row[2] for row in selected])
+        enrollment_dates = np.fromiter((row[3].toordinal() for row in selected), dtype=np.int64, count=len(selected))
+        
+        engine = grade_engine.get_grade_engine(seed, ability_spread, stream=(int(academic_year.split('/')[0]),))
+        final_grade, grade_point, attendance = engine.grade(np.frombuffer(student_codes, dtype=np.uint32))
+        ungraded = np.isnan(final_grade)
+        
+        now = columnar_batch.datetime_to_micros(datetime.now())
+        return columnar_batch.ColumnarBatch.from_columns(
+            'student_enrollment',
+            {
+                'student_id': student_codes,
+                'registration_id': registration_codes,
+                'class_id': class_codes,
+                'enrollment_date': enrollment_dates,
+                'enrollment_status': np.zeros(len(selected), dtype=np.int64),
+                'final_grade': np.nan_to_num(final_grade),
+                'grade_point': np.nan_to_num(grade_point),
+                'attendance_percentage': np.nan_to_num(attendance),
+                'created_at': np.full(len(selected), now),
+                'updated_at': np.full(len(selected), now),
+                'academic_year': np.zeros(len(selected), dtype=np.int64),
+            },
+            nulls={
+                'final_grade': ungraded,
+                'grade_point': ungraded,
+                'attendance_percentage': ungraded,
+            },
+            dictionaries={
+                'student_id': student_ids,
+                'registration_id': registration_ids,
+                'class_id': class_ids,
+                'enrollment_status': ['enrolled'],
+                'academic_year': [academic_year],
+            }
+        )
+    
+    def generate_enrollments_in_database(self, academic_year, seed=None):
+        """Generate and insert enrollments server-side with one INSERT ... SELECT, returns row count"""
+        engine = sql_generation_engine.get_sql_generation_engine(self.db, seed)
+        return engine.generate_enrollments(academic_year)
+
+    def _draw_grade(self):
+        """Draw (final_grade, grade_point) from static_data.GRADE_BANDS"""
+        grade_rand = random.random()
+        cumulative = 0.0
+        for probability, min_grade, max_grade, grade_points in static_data.GRADE_BANDS:
+            cumulative += probability
+            if grade_rand < cumulative:
+                break
+        return random.uniform(min_grade, max_grade), random.choice(grade_points)
+
+def get_enrollment_generator(db=None, cache=None):
     """Factory function to get enrollment generator instance"""
-    return EnrollmentGenerator() 
\ No newline at end of file
+    return EnrollmentGenerator(db, cache) 
\ No newline at end of file
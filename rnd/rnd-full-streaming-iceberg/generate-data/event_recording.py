@@ -0,0 +1,414 @@
+"""Record-and-replay of generated change streams: a compressed, indexed event log and a paced replayer"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import namedtuple
+from datetime import date, datetime, timedelta
+import cdc_latency_tracer
+import columnar_batch
+import file_event_log
+import load_conflicts
+import pipeline_tables
+import table_schemas
+
+# Try to import kafka-python for the Kafka sink
+try:
+    from kafka import KafkaProducer
+    KAFKA_AVAILABLE = True
+except ImportError:
+    KAFKA_AVAILABLE = False
+
+RECORDING_DIR = os.getenv("EVENT_RECORDING_DIR", "/tmp/university-recording")
+
+# Compressed blocks of a recording and their index (one JSON line per block)
+LOG_FILE = 'events.log'
+INDEX_FILE = 'events.index'
+
+# Events per compressed block: the seek granularity
+BLOCK_EVENTS = 1000
+COMPRESSION_LEVEL = 6
+
+# Longest sleep between checks for pause and seek while pacing
+PACING_STEP_SECONDS = 0.2
+
+RecordedEvent = namedtuple('RecordedEvent', ['offset', 'table', 'op', 'key', 'payload', 'logical_ms'])
+
+def record_key_columns(table_name, columns):
+    """Key of a table's events: its primary key, else its natural key (serial ids are not generated)"""
+    spec = pipeline_tables.PIPELINE_TABLES.get(table_name)
+    if spec and set(spec['primary_key']) <= set(columns):
+        return list(spec['primary_key'])
+    marker_key = cdc_latency_tracer.MARKER_KEYS.get(table_name)
+    if marker_key and set(marker_key) <= set(columns):
+        return list(marker_key)
+    return [columns[0]]
+
+def column_types(columns, rows):
+    """{column: 'timestamp' | 'date'} of the columns whose values are encoded as epoch numbers"""
+    types = {}
+    for position, name in enumerate(columns):
+        value = next((row[position] for row in rows if row[position] is not None), None)
+        if isinstance(value, datetime):
+            types[name] = 'timestamp'
+        elif isinstance(value, date):
+            types[name] = 'date'
+    return types
+
+def decode_value(value, kind):
+    """Python value of an encoded column value"""
+    if value is None or kind is None:
+        return value
+    if kind == 'timestamp':
+        return columnar_batch.micros_to_datetime(value)
+    return file_event_log.EPOCH_DATE + timedelta(days=value)
+
+class EventRecording:
+    """
+    An append-only recording of change events in compressed blocks.
+
+    Each block holds up to BLOCK_EVENTS events of one table, operation and
+    logical time: the columns, key columns and value types once, then the
+    rows in Debezium encoding (dates as epoch days, timestamps as epoch
+    micros), compressed with zlib. The index has one JSON line per block
+    with its first offset, event count, table, operation, logical time and
+    byte range, so seeking to an offset decompresses a single block. The
+    logical time is milliseconds since recording started, continued across
+    appends. Installed on a DatabaseManager, the rows of every committed bulk
+    load that the database kept (load_conflicts) are recorded as insert
+    events, and every committed UPDATE it is told about
+    (notify_changes, e.g. the lifecycle status changes) as update events
+    carrying the whole updated row.
+    """
+
+    def __init__(self, directory=RECORDING_DIR):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.log_path = os.path.join(directory, LOG_FILE)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.index = self._load_index()
+        self._offsets = [entry['offset'] for entry in self.index]
+        self._logical_base = self.index[-1]['logical_ms'] if self.index else 0
+        self._started = time.monotonic()
+        self._pending = {}  # table -> (columns, data_list) of the load being committed
+        self.db = None
+        self.conflicts = None
+
+    def _load_index(self):
+        index = []
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding='utf-8') as f:
+                for line in f:
+                    if line.endswith('\n'):
+                        index.append(json.loads(line))
+        return index
+
+    @property
+    def end_offset(self):
+        """Offset the next recorded event will get"""
+        return self.index[-1]['offset'] + self.index[-1]['count'] if self.index else 0
+
+    def install(self, db):
+        """Record every committed bulk load and notified update of db"""
+        self.db = db
+        self.conflicts = load_conflicts.get_conflict_filter(db)
+        db.add_load_hook(self._before_load)
+        db.add_write_listener(self._after_commit)
+        db.add_change_hook(self._after_change)
+        return self
+
+    def _before_load(self, table_name, columns, data_list):
+        self.conflicts.prepare(table_name, columns)
+        self._pending[table_name] = (columns, data_list)
+
+    def _after_commit(self, table_name):
+        pending = self._pending.pop(table_name, None)
+        if pending:
+            columns, data_list = pending
+            rows = self.conflicts.first_rows(table_name, columns, data_list)
+            if rows:
+                self.record(table_name, columns, rows)
+
+    def _after_change(self, table_name, op, key_column, keys):
+        if op != 'u' or not keys:
+            return
+        # Read the rows back, so the events carry the whole row like Debezium's after image
+        columns = table_schemas.get_column_names(table_name)
+        for start in range(0, len(keys), BLOCK_EVENTS):
+            rows = self.db.execute_query(
+                f"SELECT {', '.join(columns)} FROM {table_name} WHERE {key_column} = ANY(%s) ORDER BY {key_column}",
+                (keys[start:start + BLOCK_EVENTS],)
+            )
+            if rows:
+                self.record(table_name, columns, [tuple(row) for row in rows], op='u')
+
+    def record(self, table_name, columns, rows, op='c', logical_ms=None):
+        """Append rows (tuples or a ColumnarBatch) as change events, returns the offset of the first one"""
+        columns = list(columns)
+        if logical_ms is None:
+            logical_ms = self._logical_base + int((time.monotonic() - self._started) * 1000)
+        key_columns = record_key_columns(table_name, columns)
+        first_offset = self.end_offset
+
+        with open(self.log_path, 'ab') as log, open(self.index_path, 'a', encoding='utf-8') as index:
+            for start in range(0, len(rows), BLOCK_EVENTS):
+                block_rows = rows[start:start + BLOCK_EVENTS]
+                block = {
+                    'table': table_name, 'op': op, 'columns': columns, 'key_columns': key_columns,
+                    'types': column_types(columns, block_rows),
+                    'rows': [[file_event_log.encode_value(value) for value in row] for row in block_rows],
+                }
+                raw = json.dumps(block, separators=(',', ':'), default=str).encode('utf-8')
+                payload = zlib.compress(raw, COMPRESSION_LEVEL)
+                position = log.tell()
+                log.write(payload)
+                log.flush()
+                entry = {
+                    'offset': self.end_offset, 'count': len(block_rows), 'table': table_name, 'op': op,
+                    'logical_ms': logical_ms, 'position': position, 'length': len(payload), 'raw_bytes': len(raw),
+                }
+                # The index line is written after its block, so a crash never indexes a partial block
+                index.write(json.dumps(entry) + '\n')
+                self.index.append(entry)
+                self._offsets.append(entry['offset'])
+        return first_offset
+
+    def block_at(self, offset):
+        """Index entry of the block holding an offset, None past the end"""
+        position = bisect.bisect_right(self._offsets, offset) - 1
+        if position < 0 or offset >= self.end_offset:
+            return None
+        return self.index[position]
+
+    def read_block(self, entry):
+        """Decompressed block of an index entry, rows decoded to Python values"""
+        with open(self.log_path, 'rb') as f:
+            f.seek(entry['position'])
+            block = json.loads(zlib.decompress(f.read(entry['length'])))
+        kinds = [block['types'].get(name) for name in block['columns']]
+        block['rows'] = [tuple(decode_value(value, kind) for value, kind in zip(row, kinds)) for row in block['rows']]
+        return block
+
+    def events(self, start_offset=0, end_offset=None):
+        """RecordedEvents from start_offset up to end_offset"""
+        offset = start_offset
+        while True:
+            entry = self.block_at(offset)
+            if entry is None or (end_offset is not None and offset >= end_offset):
+                return
+            block = self.read_block(entry)
+            key_positions = [block['columns'].index(name) for name in block['key_columns']]
+            for index in range(offset - entry['offset'], entry['count']):
+                if end_offset is not None and entry['offset'] + index >= end_offset:
+                    return
+                row = block['rows'][index]
+                yield RecordedEvent(
+                    entry['offset'] + index, entry['table'], entry['op'],
+                    {name: row[p] for name, p in zip(block['key_columns'], key_positions)},
+                    dict(zip(block['columns'], row)), entry['logical_ms']
+                )
+            offset = entry['offset'] + entry['count']
+
+    def info(self):
+        """Events, blocks, per-table counts, sizes and recorded duration"""
+        tables = {}
+        for entry in self.index:
+            tables[entry['table']] = tables.get(entry['table'], 0) + entry['count']
+        compressed = sum(entry['length'] for entry in self.index)
+        raw = sum(entry['raw_bytes'] for entry in self.index)
+        return {
+            'events': self.end_offset,
+            'blocks': len(self.index),
+            'tables': tables,
+            'compressed_bytes': compressed,
+            'raw_bytes': raw,
+            'compression_ratio': round(raw / compressed, 1) if compressed else None,
+            'duration_ms': self.index[-1]['logical_ms'] - self.index[0]['logical_ms'] if self.index else 0,
+        }
+
+class FileEventSink:
+    """Replays into the file stand-in for the Debezium topics"""
+
+    def __init__(self, event_log):
+        self.event_log = event_log
+
+    def write(self, table_name, columns, key_columns, op, rows):
+        self.event_log.append_rows(table_name, columns, rows, key_columns, op)
+
+    def close(self):
+        pass
+
+class KafkaEventSink:
+    """Replays into the Debezium topics as unwrapped change events (what ExtractNewRecordState emits)"""
+
+    def __init__(self, bootstrap_servers=file_event_log.KAFKA_BOOTSTRAP_SERVERS):
+        if not KAFKA_AVAILABLE:
+            raise Exception("❌ kafka-python not available - please install kafka-python")
+        self.producer = KafkaProducer(
+            bootstrap_servers=bootstrap_servers,
+            key_serializer=lambda key: json.dumps(key, default=str).encode('utf-8'),
+            value_serializer=lambda value: json.dumps(value, default=str).encode('utf-8')
+        )
+
+    def write(self, table_name, columns, key_columns, op, rows):
+        topic = file_event_log.debezium_topic(table_name)
+        ts_ms = int(time.time() * 1000)
+        key_positions = [columns.index(name) for name in key_columns]
+        for row in rows:
+            key = {name: file_event_log.encode_value(row[p]) for name, p in zip(key_columns, key_positions)}
+            self.producer.send(topic, key=key, value=file_event_log.change_event(columns, row, op, ts_ms))
+        # Block until the batch is acknowledged, so a slow broker slows the replay down
+        self.producer.flush()
+
+    def close(self):
+        self.producer.close()
+
+class PostgresEventSink:
+    """Replays into PostgreSQL: inserts as bulk loads, updates and deletes by key in one transaction"""
+
+    def __init__(self, db):
+        self.db = db
+
+    def write(self, table_name, columns, key_columns, op, rows):
+        if op in ('c', 'r'):
+            self.db.bulk_insert_data(table_name, columns, rows)
+            return
+        key_positions = [columns.index(name) for name in key_columns]
+        where = ' AND '.join(f"{name} = %s" for name in key_columns)
+        if op == 'd':
+            statements = [(f"DELETE FROM {table_name} WHERE {where}", tuple(row[p] for p in key_positions)) for row in rows]
+        else:
+            assignments = ', '.join(f"{name} = %s" for name in columns if name not in key_columns)
+            statements = [
+                (f"UPDATE {table_name} SET {assignments} WHERE {where}",
+                 tuple(value for name, value in zip(columns, row) if name not in key_columns) + tuple(row[p] for p in key_positions))
+                for row in rows
+            ]
+        self.db.execute_transaction(statements)
+
+    def close(self):
+        pass
+
+class EventReplayer:
+    """
+    Pushes a recording into a sink, paced by its logical timestamps.
+
+    speed 1 reproduces the recorded pacing, N compresses every gap N times,
+    and None writes as fast as the sink accepts. Each block is one sink
+    write, so a synchronous sink throttles the replay. pause(), resume()
+    and seek() may be called from another thread or a signal handler while
+    run() is going; after a pause or seek the pacing restarts from the next
+    block instead of catching up.
+    """
+
+    def __init__(self, recording, sink, speed=1.0, tables=None):
+        self.recording = recording
+        self.sink = sink
+        self.speed = speed
+        self.tables = set(tables) if tables else None
+        self.position = 0
+        self._running = threading.Event()
+        self._running.set()
+        self._seek_to = None
+        self.stats = {'events': 0, 'blocks': 0, 'skipped_blocks': 0}
+
+    def pause(self):
+        self._running.clear()
+        logging.info(f"⏸️ Replay paused at offset {self.position}")
+
+    def resume(self):
+        self._running.set()
+        logging.info(f"▶️ Replay resumed at offset {self.position}")
+
+    def toggle_pause(self):
+        if self._running.is_set():
+            self.pause()
+        else:
+            self.resume()
+
+    def seek(self, offset):
+        """Continue the replay at an offset"""
+        self._seek_to = offset
+
+    def _interrupted(self):
+        return self._seek_to is not None or not self._running.is_set()
+
+    def _wait_until(self, due):
+        """Sleep until a monotonic time, returns False when a pause or seek came first"""
+        while True:
+            if self._interrupted():
+                return False
+            remaining = due - time.monotonic()
+            if remaining <= 0:
+                return True
+            time.sleep(min(remaining, PACING_STEP_SECONDS))
+
+    def run(self, start_offset=0, end_offset=None):
+        """Replay from start_offset up to end_offset (or the end), returns the replay statistics"""
+        self.position = start_offset
+        anchor = None  # (monotonic time, logical_ms) the pacing is measured from
+        started = time.monotonic()
+        first_logical = last_logical = None
+        while True:
+            if self._seek_to is not None:
+                self.position, self._seek_to = self._seek_to, None
+                anchor = None
+            if not self._running.is_set():
+                self._running.wait(PACING_STEP_SECONDS)
+                anchor = None
+                continue
+
+            entry = self.recording.block_at(self.position)
+            if entry is None or (end_offset is not None and self.position >= end_offset):
+                break
+            block_end = entry['offset'] + entry['count']
+            if self.tables and entry['table'] not in self.tables:
+                self.stats['skipped_blocks'] += 1
+                self.position = block_end
+                continue
+
+            if self.speed:
+                if anchor is None:
+                    anchor = (time.monotonic(), entry['logical_ms'])
+                if not self._wait_until(anchor[0] + (entry['logical_ms'] - anchor[1]) / 1000 / self.speed):
+                    continue
+
+            block = self.recording.read_block(entry)
+            stop = min(block_end, end_offset) if end_offset is not None else block_end
+            rows = block['rows'][self.position - entry['offset']:stop - entry['offset']]
+            self.sink.write(block['table'], block['columns'], block['key_columns'], block['op'], rows)
+
+            self.stats['events'] += len(rows)
+            self.stats['blocks'] += 1
+            first_logical = entry['logical_ms'] if first_logical is None else first_logical
+            last_logical = entry['logical_ms']
+            self.position = stop
+
+        elapsed = time.monotonic() - started
+        recorded_ms = (last_logical - first_logical) if first_logical is not None else 0
+        return {
+            **self.stats,
+            'position': self.position,
+            'elapsed_seconds': round(elapsed, 2),
+            'events_per_second': round(self.stats['events'] / elapsed, 1) if elapsed else None,
+            'recorded_seconds': round(recorded_ms / 1000, 2),
+            'effective_speed': round(recorded_ms / 1000 / elapsed, 1) if elapsed and recorded_ms else None,
+        }
+
+def get_event_recording(directory=RECORDING_DIR):
+    """Factory function to get a recording (created when missing)"""
+    return EventRecording(directory)
+
+def get_event_sink(kind='file', db=None, event_log_dir=file_event_log.EVENT_LOG_DIR,
+                   bootstrap_servers=file_event_log.KAFKA_BOOTSTRAP_SERVERS):
+    """Factory function to get a replay sink: 'postgres', 'kafka' or 'file'"""
+    if kind == 'postgres':
+        import db_utils
+        return PostgresEventSink(db or db_utils.get_db_manager())
+    if kind == 'kafka':
+        return KafkaEventSink(bootstrap_servers)
+    return FileEventSink(file_event_log.get_event_log('file', event_log_dir))
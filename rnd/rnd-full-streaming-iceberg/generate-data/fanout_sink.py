@@ -0,0 +1,258 @@
+"""Fan-out of generated rows to several sinks (Postgres COPY, Parquet, CSV, event log) with bounded queues"""
+
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+import event_recording
+import file_event_log
+import table_schemas
+
+# Try to import pyarrow for the Parquet sink
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+    logging.warning("⚠️ pyarrow not available - Parquet sink disabled")
+
+FANOUT_DIR = os.getenv("FANOUT_DIR", "/tmp/university-fanout")
+
+# Batches a sink may have queued before write() blocks on it
+MAX_PENDING_BATCHES = 4
+
+# Arrow type per table_schemas column kind
+ARROW_KINDS = {
+    'str': 'string', 'dict': 'string', 'int': 'int64', 'float': 'float64',
+    'bool': 'bool', 'date': 'date32', 'datetime': 'timestamp[us]',
+}
+
+# Generated but not stored in PostgreSQL (see table_schemas)
+SKIP_POSTGRES_TABLES = {'attendance'}
+
+_CLOSE = object()
+
+def column_values(rows, columns, name):
+    """Python values of one column of tuples or a ColumnarBatch"""
+    if hasattr(rows, 'column'):
+        return rows.column(name)
+    position = columns.index(name)
+    return [row[position] for row in rows]
+
+class PostgresCopySink:
+    """Loads batches with COPY (DatabaseManager.copy_insert_data), e.g. into a second database"""
+
+    name = 'postgres'
+
+    def __init__(self, db, skip_conflicts=True):
+        self.db = db
+        self.skip_conflicts = skip_conflicts
+
+    def write(self, table_name, columns, rows):
+        if table_name in SKIP_POSTGRES_TABLES:
+            return 0
+        return self.db.copy_insert_data(table_name, columns, rows, self.skip_conflicts)
+
+    def close(self):
+        pass
+
+class ParquetSink:
+    """
+    One Parquet file per table, every batch appended as a row group.
+
+    Types follow the table_schemas column kinds where the table has them and
+    are inferred from the first batch otherwise; later batches are cast to
+    the schema of the first.
+    """
+
+    name = 'parquet'
+
+    def __init__(self, directory, compression='zstd'):
+        if not ARROW_AVAILABLE:
+            raise Exception("❌ pyarrow not available - please install pyarrow")
+        self.directory = directory
+        self.compression = compression
+        self.writers = {}  # table -> pq.ParquetWriter
+        os.makedirs(directory, exist_ok=True)
+
+    def _array(self, table_name, columns, rows, name):
+        kinds = dict(table_schemas.TABLE_COLUMNS.get(table_name, []))
+        values = column_values(rows, columns, name)
+        if name in kinds:
+            return pa.array(values, pa.type_for_alias(ARROW_KINDS[kinds[name]]))
+        array = pa.array(values)
+        return array.cast(pa.string()) if pa.types.is_null(array.type) else array
+
+    def write(self, table_name, columns, rows):
+        data = pa.Table.from_arrays([self._array(table_name, columns, rows, name) for name in columns], names=list(columns))
+        writer = self.writers.get(table_name)
+        if writer is None:
+            path = os.path.join(self.directory, f"{table_name}.parquet")
+            writer = self.writers[table_name] = pq.ParquetWriter(path, data.schema, compression=self.compression)
+        writer.write_table(data.cast(writer.schema))
+        return len(data)
+
+    def close(self):
+        for writer in self.writers.values():
+            writer.close()
+        self.writers = {}
+
+class CsvSink:
+    """One CSV file per table with a header row (NULL as empty field)"""
+
+    name = 'csv'
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.files = {}  # table -> open file
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, table_name, columns, rows):
+        f = self.files.get(table_name)
+        if f is None:
+            f = self.files[table_name] = open(os.path.join(self.directory, f"{table_name}.csv"), 'w', encoding='utf-8', newline='')
+            csv.writer(f).writerow(columns)
+        if hasattr(rows, 'write_csv'):
+            rows.write_csv(f, header=False)
+        else:
+            csv.writer(f).writerows(rows)
+        return len(rows)
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+
+class EventLogSink:
+    """Publishes batches as Debezium change events to the file stand-in or the Kafka topics"""
+
+    name = 'event-log'
+
+    def __init__(self, event_sink):
+        self.event_sink = event_sink  # event_recording.FileEventSink or KafkaEventSink
+
+    def write(self, table_name, columns, rows):
+        columns = list(columns)
+        key_columns = event_recording.record_key_columns(table_name, columns)
+        self.event_sink.write(table_name, columns, key_columns, 'c', rows)
+        return len(rows)
+
+    def close(self):
+        self.event_sink.close()
+
+class FanOutSink:
+    """
+    Writes every batch of a generation pass to several sinks concurrently.
+
+    Each sink has its own worker thread and a queue of at most
+    max_pending_batches batches. write() hands the same batch object to every
+    queue and blocks while the slowest sink's queue is full, so memory stays
+    bounded by that sink's backlog instead of growing with the run, and the
+    time spent waiting is reported as that sink's backpressure. Batches must
+    not be modified after write(). A failed sink stops the pass: the next
+    write() or close() raises its error.
+
+    Installed on a DatabaseManager, every bulk load is fanned out just before
+    it is loaded, so the other sinks write while Postgres loads.
+    """
+
+    def __init__(self, sinks, max_pending_batches=MAX_PENDING_BATCHES):
+        self.sinks = list(sinks)
+        self.queues = [queue.Queue(maxsize=max(1, max_pending_batches)) for _ in self.sinks]
+        self.stats = [{'sink': sink.name, 'batches': 0, 'rows': 0, 'write_seconds': 0.0, 'blocked_seconds': 0.0}
+                      for sink in self.sinks]
+        self.errors = []
+        self.threads = [
+            threading.Thread(target=self._worker, args=(index,), name=f"fanout-{sink.name}", daemon=True)
+            for index, sink in enumerate(self.sinks)
+        ]
+        self._closed = False
+        for thread in self.threads:
+            thread.start()
+
+    def install(self, db):
+        """Fan out every bulk load of db"""
+        db.add_load_hook(self._before_load)
+        return self
+
+    def _before_load(self, table_name, columns, data_list):
+        self.write(table_name, columns, data_list)
+
+    def _worker(self, index):
+        sink, work, stats = self.sinks[index], self.queues[index], self.stats[index]
+        while True:
+            item = work.get()
+            if item is _CLOSE:
+                return
+            if self.errors:
+                continue  # drain without writing after a failure
+            table_name, columns, rows = item
+            started = time.monotonic()
+            try:
+                sink.write(table_name, columns, rows)
+            except Exception as e:
+                logging.error(f"❌ {sink.name} sink failed on {table_name}: {e}")
+                self.errors.append((sink.name, e))
+                continue
+            stats['batches'] += 1
+            stats['rows'] += len(rows)
+            stats['write_seconds'] = round(stats['write_seconds'] + time.monotonic() - started, 3)
+
+    def _raise_error(self):
+        if self.errors:
+            name, error = self.errors[0]
+            raise Exception(f"❌ {name} sink failed: {error}") from error
+
+    def write(self, table_name, columns, rows):
+        """Queue a batch for every sink, blocking while a sink's queue is full"""
+        self._raise_error()
+        if not rows:
+            return 0
+        columns = list(columns)
+        for work, stats in zip(self.queues, self.stats):
+            started = time.monotonic()
+            work.put((table_name, columns, rows))
+            stats['blocked_seconds'] = round(stats['blocked_seconds'] + time.monotonic() - started, 3)
+        return len(rows)
+
+    def close(self):
+        """Wait for every sink to finish its queue, close them, returns the report"""
+        if not self._closed:
+            self._closed = True
+            for work in self.queues:
+                work.put(_CLOSE)
+            for thread in self.threads:
+                thread.join()
+            for sink in self.sinks:
+                sink.close()
+        self._raise_error()
+        return self.report()
+
+    def report(self):
+        return {stats['sink']: {key: value for key, value in stats.items() if key != 'sink'} for stats in self.stats}
+
+def get_sink(spec, db=None):
+    """
+    Factory function to get a sink from a spec:
+    'postgres[:HOST:PORT/DB]', 'parquet[:DIR]', 'csv[:DIR]', 'event-log[:DIR]' or 'kafka[:BOOTSTRAP]'
+    """
+    kind, _, argument = spec.partition(':')
+    if kind == 'postgres':
+        import db_utils
+        return PostgresCopySink(db_utils.get_target_db_manager(argument) if argument else db or db_utils.get_db_manager())
+    if kind == 'parquet':
+        return ParquetSink(argument or os.path.join(FANOUT_DIR, 'parquet'))
+    if kind == 'csv':
+        return CsvSink(argument or os.path.join(FANOUT_DIR, 'csv'))
+    if kind == 'event-log':
+        return EventLogSink(event_recording.get_event_sink('file', event_log_dir=argument or file_event_log.EVENT_LOG_DIR))
+    if kind == 'kafka':
+        return EventLogSink(event_recording.get_event_sink('kafka', bootstrap_servers=argument or file_event_log.KAFKA_BOOTSTRAP_SERVERS))
+    raise ValueError(f"Unknown sink '{spec}' (postgres, parquet, csv, event-log or kafka)")
+
+def get_fanout_sink(specs, db=None, max_pending_batches=MAX_PENDING_BATCHES):
+    """Factory function to get a fan-out sink over sink specs (see get_sink)"""
+    return FanOutSink([get_sink(spec, db) for spec in specs], max_pending_batches)
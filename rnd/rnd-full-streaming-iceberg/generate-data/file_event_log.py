@@ -0,0 +1,216 @@
+"""File-based stand-in for the Debezium Kafka topics (one JSON-lines file per topic)"""
+
+import json
+import os
+import time
+from collections import namedtuple
+from datetime import date, datetime
+from decimal import Decimal
+
+# Try to import kafka-python for reading the real topics
+try:
+    from kafka import KafkaConsumer, TopicPartition
+    KAFKA_AVAILABLE = True
+except ImportError:
+    KAFKA_AVAILABLE = False
+
+EVENT_LOG_DIR = os.getenv("EVENT_LOG_DIR", "/tmp/university-event-log")
+KAFKA_BOOTSTRAP_SERVERS = os.getenv("KAFKA_BOOTSTRAP_SERVERS", "localhost:9092")
+
+# Debezium topic naming from debezium/university-connector.json
+TOPIC_PREFIX = "university-server"
+TOPIC_SCHEMA = "public"
+
+EPOCH_DATE = date(1970, 1, 1)
+
+EventRecord = namedtuple('EventRecord', ['topic', 'offset', 'timestamp_ms', 'key', 'value'])
+
+def debezium_topic(table_name):
+    """Kafka topic Debezium writes a table's changes to, e.g. university-server.public.students"""
+    return f"{TOPIC_PREFIX}.{TOPIC_SCHEMA}.{table_name}"
+
+def encode_value(value):
+    """JSON value of a column as Debezium emits it (dates as epoch days, timestamps as epoch micros)"""
+    if isinstance(value, datetime):
+        delta = value - datetime(1970, 1, 1, tzinfo=value.tzinfo)
+        return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+    if isinstance(value, date):
+        return (value - EPOCH_DATE).days
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+def change_event(columns, row, op='c', ts_ms=None):
+    """Unwrapped Debezium change event value (ExtractNewRecordState with op and ts_ms added)"""
+    value = {column: encode_value(v) for column, v in zip(columns, row)}
+    value['__op'] = op
+    value['__ts_ms'] = ts_ms if ts_ms is not None else int(time.time() * 1000)
+    value['__deleted'] = 'true' if op == 'd' else 'false'
+    return value
+
+class FileEventLog:
+    """
+    Append-only topics stored as <directory>/<topic>.jsonl.
+
+    Each line is {"offset", "timestamp", "key", "value"}, where the offset is
+    the line number and the timestamp the append time in milliseconds, like a
+    single-partition Kafka topic with LogAppendTime. One writer per topic.
+    poll() keeps a read position per topic so repeated polls return only new
+    records.
+    """
+
+    def __init__(self, directory=EVENT_LOG_DIR):
+        self.directory = directory
+        self._end_offsets = {}
+        self._positions = {}  # topic -> (next offset, byte position)
+        os.makedirs(directory, exist_ok=True)
+
+    def topic_path(self, topic):
+        return os.path.join(self.directory, f"{topic}.jsonl")
+
+    def topics(self):
+        return sorted(name[:-len('.jsonl')] for name in os.listdir(self.directory) if name.endswith('.jsonl'))
+
+    def end_offset(self, topic):
+        """Offset the next appended record will get"""
+        if topic not in self._end_offsets:
+            path = self.topic_path(topic)
+            count = 0
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    count = sum(1 for _ in f)
+            self._end_offsets[topic] = count
+        return self._end_offsets[topic]
+
+    def append(self, topic, records):
+        """Append (key, value) records, returns the offset of the first one"""
+        first_offset = offset = self.end_offset(topic)
+        timestamp_ms = int(time.time() * 1000)
+        with open(self.topic_path(topic), 'a', encoding='utf-8') as f:
+            for key, value in records:
+                f.write(json.dumps({'offset': offset, 'timestamp': timestamp_ms, 'key': key, 'value': value}, default=str))
+                f.write('\n')
+                offset += 1
+        self._end_offsets[topic] = offset
+        return first_offset
+
+    def append_rows(self, table_name, columns, rows, key_columns, op='c'):
+        """Publish rows as Debezium change events on the table's topic, returns the record count"""
+        ts_ms = int(time.time() * 1000)
+        key_positions = [columns.index(name) for name in key_columns]
+        records = [
+            ({name: encode_value(row[p]) for name, p in zip(key_columns, key_positions)},
+             change_event(columns, row, op, ts_ms))
+            for row in rows
+        ]
+        self.append(debezium_topic(table_name), records)
+        return len(records)
+
+    def read(self, topic, offset=0, max_records=None):
+        """Records of a topic from an offset"""
+        records = []
+        path = self.topic_path(topic)
+        if not os.path.exists(path):
+            return records
+
+        next_offset, position = self._positions.get(topic, (0, 0))
+        if offset < next_offset:
+            next_offset, position = 0, 0
+
+        with open(path, 'rb') as f:
+            f.seek(position)
+            while max_records is None or len(records) < max_records:
+                line = f.readline()
+                if not line.endswith(b'\n'):
+                    break  # end of file or a record still being written
+                position += len(line)
+                if next_offset >= offset:
+                    entry = json.loads(line)
+                    records.append(EventRecord(topic, entry['offset'], entry['timestamp'], entry['key'], entry['value']))
+                next_offset += 1
+
+        self._positions[topic] = (next_offset, position)
+        return records
+
+    def poll(self, topic, max_records=None):
+        """Records appended since the previous poll of the topic"""
+        next_offset, _ = self._positions.get(topic, (0, 0))
+        return self.read(topic, next_offset, max_records)
+
+    def seek(self, topic, offset):
+        """Make the next poll of a topic start at an offset"""
+        next_offset, position = self._positions.get(topic, (0, 0))
+        if offset < next_offset:
+            next_offset, position = 0, 0
+        path = self.topic_path(topic)
+        if os.path.exists(path):
+            with open(path, 'rb') as f:
+                f.seek(position)
+                while next_offset < offset:
+                    line = f.readline()
+                    if not line.endswith(b'\n'):
+                        break
+                    position += len(line)
+                    next_offset += 1
+        self._positions[topic] = (next_offset, position)
+
+class KafkaEventLog:
+    """Reads the Debezium topics from Kafka with the same poll() interface as FileEventLog"""
+
+    def __init__(self, bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS, poll_timeout_ms=1000):
+        if not KAFKA_AVAILABLE:
+            raise Exception("❌ kafka-python not available - please install kafka-python")
+        self.consumer = KafkaConsumer(
+            bootstrap_servers=bootstrap_servers,
+            enable_auto_commit=False,
+            auto_offset_reset='earliest'
+        )
+        self.poll_timeout_ms = poll_timeout_ms
+        self._assigned = set()
+        self._buffered = {}  # topic -> records fetched while polling another topic
+
+    def end_offsets(self, topic):
+        """{partition: end offset} of a topic"""
+        partitions = [TopicPartition(topic, p) for p in self.consumer.partitions_for_topic(topic) or []]
+        return {tp.partition: offset for tp, offset in self.consumer.end_offsets(partitions).items()}
+
+    def _assign(self, topic):
+        """Partitions of a topic, assigned from the beginning on first use"""
+        partitions = [TopicPartition(topic, p) for p in self.consumer.partitions_for_topic(topic) or []]
+        if partitions and topic not in self._assigned:
+            self._assigned.add(topic)
+            self.consumer.assign(list(set(self.consumer.assignment()) | set(partitions)))
+            self.consumer.seek_to_beginning(*partitions)
+        return partitions
+
+    def seek(self, topic, offset):
+        """Make the next poll of a topic start at an offset (the topics have one partition, KAFKA_NUM_PARTITIONS=1)"""
+        for partition in self._assign(topic):
+            self.consumer.seek(partition, offset)
+        self._buffered[topic] = [record for record in self._buffered.get(topic, []) if record.offset >= offset]
+
+    def poll(self, topic, max_records=None):
+        """Records of the topic not returned by an earlier poll"""
+        if not self._assign(topic):
+            return []
+
+        # The consumer fetches every assigned topic; keep the other topics' records for their next poll
+        batches = self.consumer.poll(timeout_ms=self.poll_timeout_ms, max_records=max_records)
+        for tp, messages in batches.items():
+            self._buffered.setdefault(tp.topic, []).extend(
+                EventRecord(
+                    tp.topic,
+                    message.offset,
+                    message.timestamp,
+                    json.loads(message.key) if message.key else None,
+                    json.loads(message.value) if message.value else None
+                )
+                for message in messages
+            )
+        return self._buffered.pop(topic, [])
+
+def get_event_log(kind='file', directory=EVENT_LOG_DIR, bootstrap_servers=KAFKA_BOOTSTRAP_SERVERS):
+    """Factory function to get the file stand-in ('file') or the real topics ('kafka')"""
+    if kind == 'kafka':
+        return KafkaEventLog(bootstrap_servers)
+    return FileEventLog(directory)
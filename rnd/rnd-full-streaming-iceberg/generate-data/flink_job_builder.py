@@ -0,0 +1,381 @@
+"""Flink SQL job of the CDC pipeline, generated from pipeline_tables, plus a column drift check"""
+
+import json
+import logging
+import os
+import re
+import pipeline_tables
+import table_schemas
+
+BASE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# Checked-in job, Postgres schema and Debezium connector the drift check compares
+FLINK_PIPELINE_SQL = os.path.join(BASE_DIR, 'flink-sql', 'university-cdc-pipeline.sql')
+POSTGRES_SCHEMA_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'university_tables.sql')
+DEBEZIUM_CONNECTOR_JSON = os.path.join(BASE_DIR, 'debezium', 'university-connector.json')
+
+TOPIC_PREFIX = 'university-server.public'
+KAFKA_BOOTSTRAP_SERVERS = 'kafka-broker:29092'
+
+# One consumer group for the whole statement set (it is a single job)
+CONSUMER_GROUP = 'flink-university-cdc'
+
+ICEBERG_DATABASE = 'university'
+
+CATALOGS = {
+    'rest': {
+        'type': 'iceberg',
+        'catalog-type': 'rest',
+        'uri': 'http://polaris:8181/api/catalog/',
+        'warehouse': 'polariscatalog',
+        'credential': 'root:secret',
+        'scope': 'PRINCIPAL_ROLE:ALL',
+        's3.endpoint': 'http://minio:9000',
+        's3.region': 'dummy-region',
+        's3.access-key-id': 'admin',
+        's3.secret-access-key': 'password',
+    },
+    # Local warehouse of test-end-to-end.sql, readable by hadoop_catalog
+    'hadoop': {
+        'type': 'iceberg',
+        'catalog-type': 'hadoop',
+        'warehouse': 'file:///tmp/warehouse',
+    },
+}
+
+# Iceberg commits on checkpoints: without an interval the sinks never publish a snapshot
+JOB_SETTINGS = {
+    'pipeline.name': 'university-cdc-pipeline',
+    'parallelism.default': '1',
+    'execution.checkpointing.interval': '60s',
+}
+
+# Debezium change metadata carried by every Kafka source
+CHANGE_COLUMNS = [('op', 'STRING'), ('ts_ms', 'BIGINT')]
+
+# Postgres type -> Flink SQL type
+POSTGRES_TYPES = {
+    'VARCHAR': 'STRING', 'TEXT': 'STRING', 'CHAR': 'STRING',
+    'SERIAL': 'INT', 'INTEGER': 'INT', 'INT': 'INT', 'SMALLINT': 'INT',
+    'BIGSERIAL': 'BIGINT', 'BIGINT': 'BIGINT',
+    'BOOLEAN': 'BOOLEAN', 'DATE': 'DATE', 'TIMESTAMP': 'TIMESTAMP(3)',
+    'DOUBLE': 'DOUBLE', 'REAL': 'DOUBLE',
+}
+
+SINK_TABLE_PATTERN = re.compile(r'CREATE TABLE (?:IF NOT EXISTS )?(?:[\w.]+\.)?(\w+)_iceberg \((.*?)\)\s*(?:PARTITIONED BY \(([^)]*)\)\s*)?WITH', re.DOTALL)
+SOURCE_TABLE_PATTERN = re.compile(r'CREATE TABLE (?:IF NOT EXISTS )?(?:[\w.]+\.)?kafka_(\w+) \((.*?)\)\s*WITH', re.DOTALL)
+POSTGRES_TABLE_PATTERN = re.compile(r'CREATE TABLE (?:IF NOT EXISTS )?(\w+) \((.*?)\n\);', re.DOTALL)
+POSTGRES_ADD_COLUMN_PATTERN = re.compile(r'ALTER TABLE (\w+) ADD COLUMN (?:IF NOT EXISTS )?(\w+) ([^;]+);')
+PRIMARY_KEY_PATTERN = re.compile(r'PRIMARY KEY \(([^)]*)\)')
+DECIMAL_PATTERN = re.compile(r'(?:DECIMAL|NUMERIC)\((\d+),\s*(\d+)\)', re.IGNORECASE)
+TABLE_CONSTRAINTS = ('PRIMARY KEY', 'FOREIGN KEY', 'UNIQUE', 'CONSTRAINT', 'CHECK')
+
+def kafka_topic(table_name):
+    return f"{TOPIC_PREFIX}.{table_name}"
+
+def _with_clause(options):
+    lines = [f"  '{key}' = '{value}'" for key, value in options.items()]
+    return "WITH (\n" + ",\n".join(lines) + "\n)"
+
+def _column_block(columns, primary_key):
+    lines = [f"  {name} {flink_type}" for name, flink_type in columns]
+    lines.append(f"  PRIMARY KEY ({', '.join(primary_key)}) NOT ENFORCED")
+    return "(\n" + ",\n".join(lines) + "\n)"
+
+def catalog_ddl(catalog='rest'):
+    return f"CREATE CATALOG iceberg_catalog {_with_clause(CATALOGS[catalog])};"
+
+def kafka_source_ddl(table_name, spec):
+    """Kafka source of a table in the default catalog"""
+    options = {
+        'connector': 'kafka',
+        'topic': kafka_topic(table_name),
+        'properties.bootstrap.servers': KAFKA_BOOTSTRAP_SERVERS,
+        'properties.group.id': CONSUMER_GROUP,
+        'scan.startup.mode': 'earliest-offset',
+        'format': 'debezium-json',
+    }
+    columns = _column_block(spec['columns'] + CHANGE_COLUMNS, spec['primary_key'])
+    return f"CREATE TABLE IF NOT EXISTS default_catalog.default_database.kafka_{table_name} {columns} {_with_clause(options)};"
+
+def iceberg_sink_ddl(table_name, spec):
+    """Iceberg sink of a table, created in the Iceberg catalog with its layout"""
+    import iceberg_layout  # pulls in pyiceberg: only the job and drift builders need it
+
+    columns = _column_block(spec['columns'], iceberg_layout.identifier_columns(spec))
+    ddl = f"CREATE TABLE IF NOT EXISTS iceberg_catalog.{ICEBERG_DATABASE}.{table_name}_iceberg {columns}"
+    identity = iceberg_layout.identity_partition_columns(spec)
+    if identity:
+        ddl += f"\nPARTITIONED BY ({', '.join(identity)})"
+    ddl += f" {_with_clause(iceberg_layout.table_properties(spec))};"
+
+    hidden = [field for field in spec.get('partition_by', []) if field not in identity]
+    if hidden:
+        # Flink DDL has no partition transforms: the full spec comes from pre-creating the table
+        ddl = (f"-- Full layout adds {', '.join(hidden)}: pre-create with "
+               f"generate-data/run_iceberg_layout.py --create\n{ddl}")
+    return ddl
+
+def insert_statement(table_name, spec):
+    """INSERT of one table, with its sink parallelism as a hint"""
+    hints = {'write-parallelism': str(spec['parallelism'])}
+    if spec['upsert']:
+        hints['upsert-enabled'] = 'true'
+    options = ", ".join(f"'{key}'='{value}'" for key, value in hints.items())
+    columns = ", ".join(name for name, _ in spec['columns'])
+    return (f"  INSERT INTO iceberg_catalog.{ICEBERG_DATABASE}.{table_name}_iceberg /*+ OPTIONS({options}) */\n"
+            f"  SELECT {columns}\n"
+            f"  FROM default_catalog.default_database.kafka_{table_name}\n"
+            f"  WHERE op <> 'd';")
+
+def build_job_sql(catalog='rest', tables=None):
+    """Complete job script: settings, sources, catalog, sinks and one statement set"""
+    tables = tables or pipeline_tables.PIPELINE_TABLES
+    sections = [
+        "-- =================================================================\n"
+        "-- UNIVERSITY CDC PIPELINE - FLINK SQL JOB\n"
+        "-- PostgreSQL → Debezium → Kafka → Flink → Iceberg\n"
+        "-- Generated by generate-data/run_flink_job_generation.py from\n"
+        "-- generate-data/pipeline_tables.py - edit the definition, not this file\n"
+        "-- ================================================================="
+    ]
+
+    sections.append("-- 1. JOB SETTINGS\n" + "\n".join(f"SET '{key}' = '{value}';" for key, value in JOB_SETTINGS.items()))
+
+    sections.append("-- 2. KAFKA SOURCE TABLES")
+    sections.extend(kafka_source_ddl(name, spec) for name, spec in tables.items())
+
+    sections.append("-- 3. ICEBERG CATALOG AND SINK TABLES")
+    sections.append(catalog_ddl(catalog))
+    sections.append(f"CREATE DATABASE IF NOT EXISTS iceberg_catalog.{ICEBERG_DATABASE};")
+    sections.extend(iceberg_sink_ddl(name, spec) for name, spec in tables.items())
+
+    sections.append(f"-- 4. ONE STREAMING JOB FOR ALL {len(tables)} TABLES")
+    inserts = "\n\n".join(insert_statement(name, spec) for name, spec in tables.items())
+    sections.append(f"EXECUTE STATEMENT SET\nBEGIN\n{inserts}\nEND;")
+
+    return "\n\n".join(sections) + "\n"
+
+def write_job_sql(path=FLINK_PIPELINE_SQL, catalog='rest'):
+    """Write the generated job, returns its path"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(build_job_sql(catalog))
+    logging.info(f"📝 Wrote Flink job for {len(pipeline_tables.PIPELINE_TABLES)} tables to {path}")
+    return path
+
+def _parse_flink_tables(pattern, sql):
+    tables = {}
+    for match in pattern.finditer(sql):
+        table_name, body = match.group(1), match.group(2)
+        partitioned_by = match.group(3) if pattern.groups > 2 else None
+        columns = []
+        primary_key = []
+        for line in body.splitlines():
+            line = line.strip().rstrip(',')
+            if not line or line.startswith('--'):
+                continue
+            match = PRIMARY_KEY_PATTERN.search(line)
+            if match:
+                primary_key = [name.strip() for name in match.group(1).split(',')]
+                continue
+            name, flink_type = line.split(None, 1)
+            columns.append((name, flink_type.strip()))
+        tables[table_name] = {
+            'columns': columns,
+            'primary_key': primary_key,
+            'partitioned_by': [name.strip() for name in partitioned_by.split(',')] if partitioned_by else [],
+        }
+    return tables
+
+def load_sink_schemas(sql_path=FLINK_PIPELINE_SQL):
+    """{table: {'columns': [(name, flink_type)], 'primary_key': [names], 'partitioned_by': [names]}} of the *_iceberg sinks in a job"""
+    with open(sql_path, encoding='utf-8') as f:
+        return _parse_flink_tables(SINK_TABLE_PATTERN, f.read())
+
+def load_source_schemas(sql_path=FLINK_PIPELINE_SQL):
+    """Same for the kafka_* sources, change columns included"""
+    with open(sql_path, encoding='utf-8') as f:
+        return _parse_flink_tables(SOURCE_TABLE_PATTERN, f.read())
+
+def flink_type_of(postgres_type):
+    """Flink SQL type of a Postgres column type"""
+    decimal = DECIMAL_PATTERN.match(postgres_type)
+    if decimal:
+        return f"DECIMAL({decimal.group(1)},{decimal.group(2)})"
+    base = re.split(r'[\s(]', postgres_type.strip(), 1)[0].upper()
+    return POSTGRES_TYPES.get(base, base)
+
+def load_postgres_schemas(sql_path=POSTGRES_SCHEMA_SQL):
+    """{table: [(name, flink_type)]} of a Postgres schema file, ADD COLUMN upgrades included"""
+    with open(sql_path, encoding='utf-8') as f:
+        sql = f.read()
+
+    tables = {}
+    for table_name, body in POSTGRES_TABLE_PATTERN.findall(sql):
+        columns = []
+        for line in body.splitlines():
+            line = line.strip().rstrip(',')
+            if not line or line.startswith('--') or line.upper().startswith(TABLE_CONSTRAINTS):
+                continue
+            name, postgres_type = line.split(None, 1)
+            columns.append((name, flink_type_of(postgres_type)))
+        tables[table_name] = columns
+
+    for table_name, name, postgres_type in POSTGRES_ADD_COLUMN_PATTERN.findall(sql):
+        columns = tables.setdefault(table_name, [])
+        if name not in [column for column, _ in columns]:
+            columns.append((name, flink_type_of(postgres_type)))
+    return tables
+
+def load_postgres_not_null(sql_path=POSTGRES_SCHEMA_SQL):
+    """{table: {columns}} of the NOT NULL (or primary key) columns of a Postgres schema file"""
+    with open(sql_path, encoding='utf-8') as f:
+        sql = f.read()
+
+    not_null = {}
+    for table_name, body in POSTGRES_TABLE_PATTERN.findall(sql):
+        columns = not_null.setdefault(table_name, set())
+        for line in body.splitlines():
+            line = line.strip().rstrip(',')
+            upper = line.upper()
+            if not line or line.startswith('--'):
+                continue
+            if upper.startswith('PRIMARY KEY'):
+                columns.update(name.strip() for name in PRIMARY_KEY_PATTERN.search(line).group(1).split(','))
+            elif not upper.startswith(TABLE_CONSTRAINTS) and ('NOT NULL' in upper or 'PRIMARY KEY' in upper):
+                columns.add(line.split(None, 1)[0])
+    return not_null
+
+def load_postgres_primary_keys(sql_path=POSTGRES_SCHEMA_SQL):
+    """{table: [columns]} of the primary keys (column or table level) of a Postgres schema file"""
+    with open(sql_path, encoding='utf-8') as f:
+        sql = f.read()
+
+    primary_keys = {}
+    for table_name, body in POSTGRES_TABLE_PATTERN.findall(sql):
+        for line in body.splitlines():
+            line = line.strip().rstrip(',')
+            upper = line.upper()
+            if not line or line.startswith('--'):
+                continue
+            if upper.startswith('PRIMARY KEY'):
+                primary_keys[table_name] = [name.strip() for name in PRIMARY_KEY_PATTERN.search(line).group(1).split(',')]
+            elif not upper.startswith(TABLE_CONSTRAINTS) and 'PRIMARY KEY' in upper:
+                primary_keys[table_name] = [line.split(None, 1)[0]]
+    return primary_keys
+
+def load_postgres_unique_keys(sql_path=POSTGRES_SCHEMA_SQL):
+    """{table: [[columns], ...]} of the UNIQUE constraints (column or table level) of a Postgres schema file"""
+    with open(sql_path, encoding='utf-8') as f:
+        sql = f.read()
+
+    unique_keys = {}
+    for table_name, body in POSTGRES_TABLE_PATTERN.findall(sql):
+        keys = unique_keys.setdefault(table_name, [])
+        for line in body.splitlines():
+            line = line.strip().rstrip(',')
+            upper = line.upper()
+            if not line or line.startswith('--'):
+                continue
+            if upper.startswith('UNIQUE'):
+                keys.append([name.strip() for name in line[line.index('(') + 1:line.index(')')].split(',')])
+            elif not upper.startswith(TABLE_CONSTRAINTS) and re.search(r'\bUNIQUE\b', upper):
+                keys.append([line.split(None, 1)[0]])
+    return unique_keys
+
+def load_connector_tables(path=DEBEZIUM_CONNECTOR_JSON):
+    """Tables captured by the Debezium connector"""
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)['config']
+    return [name.split('.', 1)[-1] for name in config.get('table.include.list', '').split(',') if name]
+
+def _compare_columns(issues, source, table_name, expected, actual, level='error'):
+    expected = dict(expected)
+    actual = dict(actual)
+    for name in expected:
+        if name not in actual:
+            issues.append((level, source, table_name, f"column {name} missing"))
+        elif actual[name].replace(' ', '') != expected[name].replace(' ', ''):
+            issues.append((level, source, table_name, f"column {name} is {actual[name]}, expected {expected[name]}"))
+    for name in actual:
+        if name not in expected:
+            issues.append((level, source, table_name, f"unexpected column {name}"))
+
+def check_drift(flink_sql_path=FLINK_PIPELINE_SQL, postgres_sql_path=POSTGRES_SCHEMA_SQL, connector_path=DEBEZIUM_CONNECTOR_JSON):
+    """
+    Column drift between Postgres, the generators, the pipeline definition and the Flink job.
+
+    Returns [(level, source, table, message)], level 'error' for drift that
+    drops or nulls data in the pipeline and 'warning' for columns that are
+    not replicated on purpose or not emitted by a generator.
+    """
+    import iceberg_layout
+
+    issues = []
+    postgres = load_postgres_schemas(postgres_sql_path)
+
+    for table_name, spec in pipeline_tables.PIPELINE_TABLES.items():
+        if table_name not in postgres:
+            issues.append(('error', 'postgres', table_name, "table missing from the Postgres schema"))
+            continue
+        pg_columns = dict(postgres[table_name])
+        for name, flink_type in spec['columns']:
+            if name not in pg_columns:
+                issues.append(('error', 'postgres', table_name, f"pipeline column {name} missing"))
+            elif pg_columns[name].replace(' ', '') != flink_type.replace(' ', ''):
+                issues.append(('error', 'postgres', table_name, f"column {name} is {pg_columns[name]}, pipeline has {flink_type}"))
+        pipeline_columns = pipeline_tables.get_column_names(table_name)
+        for name in pg_columns:
+            if name not in pipeline_columns:
+                issues.append(('warning', 'postgres', table_name, f"column {name} is not replicated"))
+
+    for table_name in table_schemas.TABLE_COLUMNS:
+        if table_name not in postgres:
+            continue  # written to file sinks only (attendance)
+        for name in table_schemas.get_column_names(table_name):
+            if name not in dict(postgres[table_name]):
+                issues.append(('error', 'generator', table_name, f"generated column {name} missing from Postgres"))
+
+    if os.path.exists(flink_sql_path):
+        sinks = load_sink_schemas(flink_sql_path)
+        sources = load_source_schemas(flink_sql_path)
+        for table_name, spec in pipeline_tables.PIPELINE_TABLES.items():
+            for source, tables, expected in (
+                ('flink sink', sinks, spec['columns']),
+                ('flink source', sources, spec['columns'] + CHANGE_COLUMNS),
+            ):
+                if table_name not in tables:
+                    issues.append(('error', source, table_name, "table missing"))
+                    continue
+                _compare_columns(issues, source, table_name, expected, tables[table_name]['columns'])
+                primary_key = iceberg_layout.identifier_columns(spec) if source == 'flink sink' else spec['primary_key']
+                if tables[table_name]['primary_key'] != primary_key:
+                    issues.append(('error', source, table_name, f"primary key {tables[table_name]['primary_key']}, expected {primary_key}"))
+            if table_name in sinks and sinks[table_name]['partitioned_by'] != iceberg_layout.identity_partition_columns(spec):
+                issues.append(('error', 'flink sink', table_name, f"partitioned by {sinks[table_name]['partitioned_by']}, "
+                               f"expected {iceberg_layout.identity_partition_columns(spec)}"))
+    else:
+        issues.append(('error', 'flink', '-', f"{flink_sql_path} not found"))
+
+    issues.extend(iceberg_layout.check_layout(pipeline_tables.PIPELINE_TABLES, load_postgres_not_null(postgres_sql_path)))
+
+    if os.path.exists(connector_path):
+        captured = load_connector_tables(connector_path)
+        for table_name in pipeline_tables.PIPELINE_TABLES:
+            if table_name not in captured:
+                issues.append(('error', 'debezium', table_name, "table not in table.include.list, no change events"))
+
+    return issues
+
+def log_drift(issues):
+    """Log drift issues, returns the number of errors"""
+    errors = 0
+    for level, source, table_name, message in issues:
+        if level == 'error':
+            errors += 1
+            logging.error(f"❌ [{source}] {table_name}: {message}")
+        else:
+            logging.warning(f"⚠️ [{source}] {table_name}: {message}")
+    if not issues:
+        logging.info("✅ No column drift between Postgres, generators and the Flink job")
+    return errors
@@ -0,0 +1,155 @@
+"""Database-free generation benchmark: CPU time of each generation step against the in-memory database"""
+
+import random
+import time
+import tracemalloc
+import academic_generator
+import attendance_generator
+import enrollment_generator
+import in_memory_db
+import locale_providers
+import master_data_generator
+import payment_generator
+import reference_cache
+import student_generator
+import student_lifecycle
+import table_schemas
+
+STEPS = ('master_data', 'students', 'academic', 'enrollments', 'payments', 'attendance')
+
+class RowCounter:
+    """Sink for the attendance generator that only counts rows (attendance has no table)"""
+
+    def __init__(self):
+        self.rows = 0
+
+    def write(self, table_name, columns, rows):
+        self.rows += len(rows)
+        return len(rows)
+
+def _steps(db, cache, academic_year, student_count, engine, seed, attendance_rows):
+    """step name -> callable running it like run_complete_generation does"""
+    entry_year = int(academic_year.split('/')[0])
+
+    def master_data():
+        master_data_generator.get_master_data_generator(db=db, cache=cache).setup_master_data()
+
+    def students():
+        generator = student_generator.get_student_generator(db, cache)
+        student_rows, details, fees = generator.generate_students_for_year(entry_year, student_count)
+        db.bulk_insert_data('students', table_schemas.get_column_names('students'), student_rows)
+        db.bulk_insert_data('student_detail', table_schemas.get_column_names('student_detail'), details)
+        db.bulk_insert_data('student_fee', table_schemas.get_column_names('student_fee'), fees)
+
+    def academic():
+        generator = academic_generator.get_academic_generator(db, cache)
+        student_lifecycle.get_student_lifecycle(db, cache, seed).advance(academic_year)
+        for semester in (1, 2):
+            if engine == 'vectorized':
+                registrations = generator.generate_registration_for_semester(academic_year, semester, engine, seed)
+                if registrations:
+                    db.copy_insert_data('registration', table_schemas.get_column_names('registration'), registrations,
+                                        skip_conflicts=True)
+            else:
+                registrations = generator.generate_registration_for_semester(academic_year, semester)
+                if registrations:
+                    db.bulk_insert_data('registration', table_schemas.get_column_names('registration'), registrations)
+            classes = generator.generate_classes_for_semester(academic_year, semester)
+            if classes:
+                db.bulk_insert_data('class', table_schemas.get_column_names('class'), classes)
+
+    def enrollments():
+        generator = enrollment_generator.get_enrollment_generator(db, cache)
+        if engine == 'vectorized':
+            rows = generator.generate_enrollments_for_academic_year(academic_year, engine, seed)
+            if rows:
+                db.copy_insert_data('student_enrollment', table_schemas.get_column_names('student_enrollment'), rows)
+        else:
+            rows = generator.generate_enrollments_for_academic_year(academic_year)
+            if rows:
+                db.bulk_insert_data('student_enrollment', table_schemas.get_column_names('student_enrollment'), rows)
+
+    def payments():
+        generator = payment_generator.get_payment_generator(db, cache)
+        registrations = db.execute_query(
+            """SELECT registration_id, student_id, academic_year, semester,
+                      semester_code, registration_date
+               FROM registration
+               WHERE academic_year = %s
+               ORDER BY student_id, semester""",
+            (academic_year,)
+        )
+        if engine == 'vectorized':
+            rows = generator.generate_payments_vectorized(academic_year, registrations, seed)
+            if rows:
+                db.copy_insert_data('payment', table_schemas.get_column_names('payment'), rows, skip_conflicts=True)
+        else:
+            rows = generator.generate_payments_for_registrations(academic_year, registrations)
+            if rows:
+                db.bulk_insert_data('payment', table_schemas.get_column_names('payment'), rows)
+
+    def attendance():
+        attendance_generator.get_attendance_generator(db=db, sink=attendance_rows).generate_attendance_for_academic_year(
+            academic_year, engine, seed
+        )
+
+    return {
+        'master_data': master_data, 'students': students, 'academic': academic,
+        'enrollments': enrollments, 'payments': payments, 'attendance': attendance,
+    }
+
+def run_generation_benchmark(student_count=1000, academic_year='2024/2025', engine='python', seed=42, steps=None,
+                             trace_memory=False):
+    """
+    Run the generation steps of one academic year against a fresh in-memory database.
+
+    Returns {'engine', 'students', 'academic_year', 'steps': {step:
+    {'wall_seconds', 'cpu_seconds', 'db_seconds', 'generate_seconds',
+    'rows'}}, 'total': {...}}. db_seconds is the time spent inside the
+    in-memory database and generate_seconds the rest of the step: the
+    generators' own cost. Steps are cumulative, so a later step runs on the
+    rows of the earlier ones; steps only chooses which are reported.
+    With trace_memory each step also reports peak_memory_mb, its peak of
+    Python and numpy allocations (tracemalloc slows the run down, so the
+    timings of a traced run are not comparable).
+    """
+    if engine == 'sql':
+        raise ValueError("--engine sql generates inside PostgreSQL and cannot be benchmarked in memory")
+    random.seed(seed)
+    locale_providers.seed(seed)
+    db = in_memory_db.get_in_memory_db_manager()
+    cache = reference_cache.get_reference_cache(db)
+    attendance_rows = RowCounter()
+
+    results = {}
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        for name, step in _steps(db, cache, academic_year, student_count, engine, seed, attendance_rows).items():
+            if trace_memory:
+                tracemalloc.reset_peak()
+                memory_before = tracemalloc.get_traced_memory()[0]
+            rows_before = sum(db.table_counts().values()) + attendance_rows.rows
+            db_before = db.db_seconds
+            wall_started = time.perf_counter()
+            cpu_started = time.process_time()
+            step()
+            wall = time.perf_counter() - wall_started
+            db_seconds = db.db_seconds - db_before
+            results[name] = {
+                'wall_seconds': round(wall, 3),
+                'cpu_seconds': round(time.process_time() - cpu_started, 3),
+                'db_seconds': round(db_seconds, 3),
+                'generate_seconds': round(wall - db_seconds, 3),
+                'rows': sum(db.table_counts().values()) + attendance_rows.rows - rows_before,
+            }
+            if trace_memory:
+                results[name]['peak_memory_mb'] = round((tracemalloc.get_traced_memory()[1] - memory_before) / 1024 ** 2, 2)
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+
+    reported = {name: results[name] for name in (steps or STEPS)}
+    total = {key: round(sum(step[key] for step in reported.values()), 3)
+             for key in ('wall_seconds', 'cpu_seconds', 'db_seconds', 'generate_seconds', 'rows')}
+    return {'engine': engine, 'students': student_count, 'academic_year': academic_year, 'steps': reported, 'total': total}
@@ -0,0 +1,207 @@
+"""Iceberg catalogs for the Python writers: the local hadoop warehouse of test-end-to-end.sql, or Polaris"""
+
+import glob
+import logging
+import os
+
+# Try to import pyiceberg for local catalog access
+try:
+    from pyiceberg.catalog import load_catalog
+    from pyiceberg.catalog.sql import SqlCatalog
+    from pyiceberg.exceptions import NamespaceAlreadyExistsError, NoSuchTableError
+    from pyiceberg.io import load_file_io
+    from pyiceberg.table import StaticTable
+    ICEBERG_AVAILABLE = True
+except ImportError:
+    ICEBERG_AVAILABLE = False
+    logging.warning("⚠️ pyiceberg not available - local Iceberg catalog disabled")
+
+# Hadoop catalog of test-end-to-end.sql and the namespace of the *_iceberg tables
+ICEBERG_WAREHOUSE = os.getenv("ICEBERG_WAREHOUSE", "file:///tmp/warehouse")
+ICEBERG_NAMESPACE = os.getenv("ICEBERG_NAMESPACE", "university")
+
+# SQL catalog to use instead of the hadoop layout, e.g. sqlite:////tmp/warehouse/catalog.db
+ICEBERG_CATALOG_URI = os.getenv("ICEBERG_CATALOG_URI")
+
+# pyiceberg has no hadoop catalog: commits go through a sqlite catalog next to the tables
+SIDECAR_CATALOG_FILE = ".pyiceberg-catalog.db"
+
+def local_path(location):
+    """Filesystem path of a file:// location"""
+    return location[len('file://'):] if location.startswith('file://') else location
+
+def table_location(warehouse, namespace, table_name):
+    """Table directory in the hadoop layout: <warehouse>/<namespace>/<table>"""
+    return f"{warehouse.rstrip('/')}/{namespace}/{table_name}"
+
+def metadata_location(io, warehouse, namespace, table_name):
+    """Current metadata file of a hadoop table (version-hint.text, else the highest vN.metadata.json)"""
+    metadata_dir = f"{table_location(warehouse, namespace, table_name)}/metadata"
+    hint = io.new_input(f"{metadata_dir}/version-hint.text")
+    if hint.exists():
+        with hint.open() as f:
+            version = int(f.read().decode('utf-8').strip())
+        return f"{metadata_dir}/v{version}.metadata.json"
+
+    paths = glob.glob(os.path.join(local_path(metadata_dir), 'v*.metadata.json'))
+    if paths:
+        latest = max(paths, key=lambda path: int(os.path.basename(path)[1:].split('.')[0]))
+        return f"{metadata_dir}/{os.path.basename(latest)}"
+    return None
+
+def current_version(io, warehouse, namespace, table_name):
+    """N of the current vN.metadata.json (0 for a table without hadoop metadata)"""
+    location = metadata_location(io, warehouse, namespace, table_name)
+    if location is None:
+        return 0
+    return int(location.rsplit('/v', 1)[1].split('.')[0])
+
+class LocalIcebergCatalog:
+    """
+    pyiceberg catalog for the local warehouse.
+
+    Without a catalog URI, tables live in the hadoop layout and every commit
+    is published as the next vN.metadata.json plus version-hint.text, so
+    Flink's hadoop catalog (and other hadoop readers) see it. Tables created
+    or advanced by Flink are re-registered from their hadoop metadata before
+    use. With a catalog URI this is a plain SQL catalog.
+    """
+
+    def __init__(self, warehouse=ICEBERG_WAREHOUSE, namespace=ICEBERG_NAMESPACE, catalog_uri=ICEBERG_CATALOG_URI):
+        if not ICEBERG_AVAILABLE:
+            raise Exception("❌ pyiceberg not available - please install pyiceberg and pyarrow")
+        self.warehouse = warehouse.rstrip('/')
+        self.namespace = namespace
+        self.hadoop_layout = not catalog_uri
+        if self.hadoop_layout:
+            if not self.warehouse.startswith('file://'):
+                raise ValueError(f"Hadoop layout needs a file:// warehouse, got {warehouse}; set ICEBERG_CATALOG_URI instead")
+            os.makedirs(local_path(self.warehouse), exist_ok=True)
+            catalog_uri = f"sqlite:///{local_path(self.warehouse)}/{SIDECAR_CATALOG_FILE}"
+        self.catalog = SqlCatalog('university', uri=catalog_uri, warehouse=self.warehouse)
+        self.io = load_file_io({}, self.warehouse)
+        try:
+            self.catalog.create_namespace(namespace)
+        except NamespaceAlreadyExistsError:
+            pass
+
+    def identifier(self, table_name):
+        return (self.namespace, table_name)
+
+    def load_table(self, table_name):
+        """Current version of a table, or None when it does not exist"""
+        if self.hadoop_layout:
+            location = metadata_location(self.io, self.warehouse, self.namespace, table_name)
+            if location is None:
+                return None
+            try:
+                table = self.catalog.load_table(self.identifier(table_name))
+                hadoop_metadata = StaticTable.from_metadata(location).metadata
+                if table.metadata.last_updated_ms == hadoop_metadata.last_updated_ms:
+                    return table
+            except NoSuchTableError:
+                pass
+            # Created or advanced outside this catalog (e.g. by Flink)
+            return self.catalog.register_table(self.identifier(table_name), location, overwrite=True)
+
+        try:
+            return self.catalog.load_table(self.identifier(table_name))
+        except NoSuchTableError:
+            return None
+
+    def create_table(self, table_name, schema, partition_spec=None, sort_order=None, properties=None):
+        """Create a table (in the hadoop layout when enabled) and publish its first version"""
+        kwargs = {'properties': properties or {}}
+        if partition_spec is not None:
+            kwargs['partition_spec'] = partition_spec
+        if sort_order is not None:
+            kwargs['sort_order'] = sort_order
+        if self.hadoop_layout:
+            kwargs['location'] = table_location(self.warehouse, self.namespace, table_name)
+        table = self.catalog.create_table(self.identifier(table_name), schema, **kwargs)
+        self.publish(table)
+        logging.info(f"🧊 Created Iceberg table {self.namespace}.{table_name}")
+        return table
+
+    def hadoop_version(self, table_name):
+        """Current hadoop version of a table (None for a SQL catalog)"""
+        if not self.hadoop_layout:
+            return None
+        return current_version(self.io, self.warehouse, self.namespace, table_name)
+
+    def publish(self, table, expected_version=None):
+        """Expose a table's latest commit as the next hadoop version (no-op for a SQL catalog)"""
+        if not self.hadoop_layout:
+            return None
+        table_name = table.name()[-1]
+        version = current_version(self.io, self.warehouse, self.namespace, table_name) + 1
+        if expected_version is not None and version != expected_version + 1:
+            # Another writer (e.g. Flink) committed since the table was loaded
+            raise Exception(f"❌ {self.namespace}.{table_name} moved to v{version - 1} during the commit, expected v{expected_version}")
+        metadata_dir = f"{table_location(self.warehouse, self.namespace, table_name)}/metadata"
+        with self.io.new_input(table.metadata_location).open() as source:
+            content = source.read()
+        with self.io.new_output(f"{metadata_dir}/v{version}.metadata.json").create(overwrite=True) as target:
+            target.write(content)
+        with self.io.new_output(f"{metadata_dir}/version-hint.text").create(overwrite=True) as hint:
+            hint.write(str(version).encode('utf-8'))
+        return version
+
+    def table_names(self):
+        """Tables of the namespace"""
+        if self.hadoop_layout:
+            namespace_dir = os.path.join(local_path(self.warehouse), self.namespace)
+            if not os.path.isdir(namespace_dir):
+                return []
+            return sorted(name for name in os.listdir(namespace_dir)
+                          if os.path.isdir(os.path.join(namespace_dir, name, 'metadata')))
+        return sorted(identifier[-1] for identifier in self.catalog.list_tables(self.namespace))
+
+class RestIcebergCatalog:
+    """The same interface over a REST catalog (Polaris of docker-compose), commits are visible as-is"""
+
+    def __init__(self, options, namespace=ICEBERG_NAMESPACE):
+        if not ICEBERG_AVAILABLE:
+            raise Exception("❌ pyiceberg not available - please install pyiceberg and pyarrow")
+        self.namespace = namespace
+        self.catalog = load_catalog('rest', **{'type': 'rest', **options})
+        try:
+            self.catalog.create_namespace(namespace)
+        except NamespaceAlreadyExistsError:
+            pass
+
+    def identifier(self, table_name):
+        return (self.namespace, table_name)
+
+    def load_table(self, table_name):
+        try:
+            return self.catalog.load_table(self.identifier(table_name))
+        except NoSuchTableError:
+            return None
+
+    def create_table(self, table_name, schema, partition_spec=None, sort_order=None, properties=None):
+        kwargs = {'properties': properties or {}}
+        if partition_spec is not None:
+            kwargs['partition_spec'] = partition_spec
+        if sort_order is not None:
+            kwargs['sort_order'] = sort_order
+        table = self.catalog.create_table(self.identifier(table_name), schema, **kwargs)
+        logging.info(f"🧊 Created Iceberg table {self.namespace}.{table_name}")
+        return table
+
+    def hadoop_version(self, table_name):
+        return None
+
+    def publish(self, table, expected_version=None):
+        return None
+
+    def table_names(self):
+        return sorted(identifier[-1] for identifier in self.catalog.list_tables(self.namespace))
+
+def get_local_catalog(warehouse=ICEBERG_WAREHOUSE, namespace=ICEBERG_NAMESPACE, catalog_uri=ICEBERG_CATALOG_URI):
+    """Factory function to get the local Iceberg catalog"""
+    return LocalIcebergCatalog(warehouse, namespace, catalog_uri)
+
+def get_rest_catalog(options, namespace=ICEBERG_NAMESPACE):
+    """Factory function to get a REST catalog, options as in pyiceberg (uri, warehouse, credential, s3.*)"""
+    return RestIcebergCatalog(options, namespace)
@@ -0,0 +1,137 @@
+"""Iceberg layout of the *_iceberg sinks: partition spec, sort order and table properties"""
+
+import re
+
+# Try to import pyarrow and pyiceberg for building specs and sorting data
+try:
+    import pyarrow as pa
+    from pyiceberg.partitioning import PartitionField, PartitionSpec
+    from pyiceberg.table.sorting import SortField, SortOrder
+    from pyiceberg.transforms import (
+        BucketTransform, DayTransform, HourTransform, IdentityTransform,
+        MonthTransform, TruncateTransform, YearTransform
+    )
+    ICEBERG_AVAILABLE = True
+except ImportError:
+    ICEBERG_AVAILABLE = False
+
+# Streaming commits write one file per writer and partition; compaction grows them to this size
+TARGET_FILE_SIZE_BYTES = 128 * 1024 * 1024
+
+# Metadata kept per table: a commit per checkpoint adds a metadata file every minute
+METADATA_VERSIONS_KEPT = 50
+SNAPSHOT_MAX_AGE_MS = 3 * 24 * 60 * 60 * 1000
+SNAPSHOTS_KEPT = 10
+
+# First field id of partition fields (Iceberg convention)
+PARTITION_FIELD_ID_START = 1000
+
+TRANSFORM_PATTERN = re.compile(r'(\w+)\((?:(\d+),\s*)?(\w+)\)')
+
+# Partition field name suffix per transform
+TRANSFORM_SUFFIXES = {
+    'year': 'year', 'month': 'month', 'day': 'day', 'hour': 'hour',
+    'bucket': 'bucket', 'truncate': 'trunc',
+}
+
+def partition_fields(spec):
+    """[(transform, width, column)] of a table spec, width None unless bucket/truncate"""
+    fields = []
+    for field in spec.get('partition_by', []):
+        match = TRANSFORM_PATTERN.fullmatch(field.replace(' ', ''))
+        if match:
+            transform, width, column = match.groups()
+            if transform not in TRANSFORM_SUFFIXES:
+                raise ValueError(f"Unsupported partition transform {field}")
+            fields.append((transform, int(width) if width else None, column))
+        else:
+            fields.append(('identity', None, field))
+    return fields
+
+def partition_columns(spec):
+    """Source columns of the partition fields"""
+    return [column for _, _, column in partition_fields(spec)]
+
+def identity_partition_columns(spec):
+    """Partition columns Flink DDL can express (PARTITIONED BY only takes identity fields)"""
+    return [column for transform, _, column in partition_fields(spec) if transform == 'identity']
+
+def identifier_columns(spec):
+    """Iceberg identifier fields: the primary key, plus the partition columns of upsert sinks"""
+    columns = list(spec['primary_key'])
+    if spec.get('upsert'):
+        # Flink's upsert writer deletes by key within a partition, so the key must fix the partition
+        columns += [column for column in partition_columns(spec) if column not in columns]
+    return columns
+
+def table_properties(spec):
+    """Iceberg table properties of a sink"""
+    properties = {
+        'format-version': '2',
+        'write.target-file-size-bytes': str(TARGET_FILE_SIZE_BYTES),
+        'write.distribution-mode': 'hash' if spec.get('partition_by') else 'none',
+        'write.parquet.compression-codec': 'zstd',
+        'write.metadata.delete-after-commit.enabled': 'true',
+        'write.metadata.previous-versions-max': str(METADATA_VERSIONS_KEPT),
+        'history.expire.max-snapshot-age-ms': str(SNAPSHOT_MAX_AGE_MS),
+        'history.expire.min-snapshots-to-keep': str(SNAPSHOTS_KEPT),
+    }
+    if spec.get('upsert'):
+        properties['write.upsert.enabled'] = 'true'
+    return properties
+
+def _transform(transform, width):
+    if transform == 'bucket':
+        return BucketTransform(width)
+    if transform == 'truncate':
+        return TruncateTransform(width)
+    return {
+        'identity': IdentityTransform, 'year': YearTransform, 'month': MonthTransform,
+        'day': DayTransform, 'hour': HourTransform,
+    }[transform]()
+
+def partition_spec(spec, schema):
+    """pyiceberg PartitionSpec of a table spec over its Iceberg schema"""
+    fields = []
+    for field_id, (transform, width, column) in enumerate(partition_fields(spec), start=PARTITION_FIELD_ID_START):
+        name = column if transform == 'identity' else f"{column}_{TRANSFORM_SUFFIXES[transform]}"
+        fields.append(PartitionField(schema.find_field(column).field_id, field_id, _transform(transform, width), name))
+    return PartitionSpec(*fields)
+
+def sort_order(spec, schema):
+    """pyiceberg SortOrder of a table spec (unsorted when it has no sort_by)"""
+    if not spec.get('sort_by'):
+        return SortOrder()
+    return SortOrder(*[SortField(schema.find_field(column).field_id, IdentityTransform()) for column in spec['sort_by']])
+
+def sort_table(data, spec):
+    """Arrow table ordered by the partition and sort columns, so files cluster and min/max stats prune"""
+    keys = [column for column in partition_columns(spec) + spec.get('sort_by', []) if column in data.column_names]
+    if not keys:
+        return data
+    return data.sort_by([(column, 'ascending') for column in dict.fromkeys(keys)])
+
+def check_layout(tables, not_null):
+    """
+    Layout problems of the table specs as [(level, 'layout', table, message)].
+
+    not_null maps tables to their NOT NULL Postgres columns: the partition
+    columns an upsert sink adds to its key must never be null.
+    """
+    issues = []
+    for table_name, spec in tables.items():
+        columns = [name for name, _ in spec['columns']]
+        try:
+            fields = partition_fields(spec)
+        except ValueError as e:
+            issues.append(('error', 'layout', table_name, str(e)))
+            continue
+        for _, _, column in fields:
+            if column not in columns:
+                issues.append(('error', 'layout', table_name, f"partition column {column} is not a sink column"))
+            elif spec.get('upsert') and column not in not_null.get(table_name, ()):
+                issues.append(('error', 'layout', table_name, f"upsert key column {column} is nullable in Postgres"))
+        for column in spec.get('sort_by', []):
+            if column not in columns:
+                issues.append(('error', 'layout', table_name, f"sort column {column} is not a sink column"))
+    return issues
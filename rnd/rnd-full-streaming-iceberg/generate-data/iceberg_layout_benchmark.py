@@ -0,0 +1,152 @@
+"""Scan-planning benchmark: data files read by typical queries with and without the sink layout"""
+
+import logging
+import random
+import time
+from datetime import date, datetime, timedelta
+import hadoop_catalog
+import iceberg_backfill
+import iceberg_layout
+import pipeline_tables
+import table_schemas
+
+BENCHMARK_WAREHOUSE = 'file:///tmp/iceberg-layout-benchmark'
+BENCHMARK_TABLES = ('student_enrollment', 'payment')
+
+# Namespaces of the two variants in the benchmark warehouse
+VARIANTS = {
+    'flat': 'layout_bench_flat',  # no partitioning or sort order, as the sinks were created before
+    'layout': 'layout_bench_layout',
+}
+
+CLASSES_PER_SEMESTER = 6
+
+def flat_spec(spec):
+    """A table spec without partitioning or sort order"""
+    return {key: value for key, value in spec.items() if key not in ('partition_by', 'sort_by')}
+
+def _semester_start(year, semester):
+    return date(year, 8, 20) if semester == 1 else date(year + 1, 2, 1)
+
+def synthetic_batches(years, students, seed=42, first_year=2020):
+    """
+    {table: [(academic_year, columns, rows)]} per semester in generator column order.
+
+    Rows mimic the generators (enrollments per class, one payment per student
+    and semester, 10% unpaid without payment_time) and arrive in time order,
+    like the change stream does.
+    """
+    rng = random.Random(seed)
+    student_ids = [f"{first_year}{index:06d}" for index in range(students)]
+    batches = {table_name: [] for table_name in BENCHMARK_TABLES}
+    for year in range(first_year, first_year + years):
+        academic_year = f"{year}/{year + 1}"
+        for semester in (1, 2):
+            start = _semester_start(year, semester)
+            created = datetime.combine(start, datetime.min.time())
+            enrollments = []
+            payments = []
+            for student_id in rng.sample(student_ids, len(student_ids)):
+                registration_id = f"REG-{student_id}-{year}{semester}"
+                for class_index in rng.sample(range(200), CLASSES_PER_SEMESTER):
+                    grade = round(rng.uniform(40, 100), 2)
+                    enrollments.append([
+                        student_id, registration_id, f"CLS-{year}{semester}-{class_index:03d}",
+                        start, 'completed', grade, round(min(4.0, grade / 25), 2), round(rng.uniform(60, 100), 2),
+                        created, created, academic_year,
+                    ])
+                paid = rng.random() >= 0.1
+                payment_time = created + timedelta(days=rng.randint(0, 29), seconds=rng.randint(0, 86399)) if paid else None
+                amount = rng.choice((2400000, 4000000, 6500000))
+                payments.append([
+                    f"PAY-{student_id}-{year}{semester}", student_id, registration_id, 'UKT', amount,
+                    rng.choice(('BNI', 'BRI', 'Mandiri')), f"8{rng.randint(10 ** 14, 10 ** 15 - 1)}",
+                    'virtual_account', payment_time, 'paid' if paid else 'pending', 1, 0,
+                    amount if paid else 0, None, start + timedelta(days=30), created, created, academic_year,
+                ])
+            payments.sort(key=lambda row: row[8] or datetime.max)
+            batches['student_enrollment'].append((academic_year, table_schemas.get_column_names('student_enrollment'), enrollments))
+            batches['payment'].append((academic_year, table_schemas.get_column_names('payment'), payments))
+    return batches
+
+def benchmark_queries(table_name, batches):
+    """[(label, row filter)] of typical single-semester, single-day and single-student queries"""
+    academic_year, columns, rows = batches[-1]
+    student_id = rows[0][columns.index('student_id')]
+    queries = [
+        ('one academic year', f"academic_year == '{academic_year}'"),
+        ('one student', f"student_id == '{student_id}'"),
+    ]
+    if table_name == 'payment':
+        day = next(row[columns.index('payment_time')] for row in rows if row[columns.index('payment_time')]).date()
+        queries.append(('one payment day', f"payment_time >= '{day.isoformat()}T00:00:00' and "
+                                           f"payment_time < '{(day + timedelta(days=1)).isoformat()}T00:00:00'"))
+    else:
+        class_id = rows[0][columns.index('class_id')]
+        queries.append(('one class', f"class_id == '{class_id}'"))
+    return queries
+
+def plan(table, row_filter):
+    """Files and bytes a scan with a row filter would read, and the planning time"""
+    started = time.monotonic()
+    tasks = list(table.scan(row_filter=row_filter).plan_files())
+    return {
+        'files': len(tasks),
+        'bytes': sum(task.file.file_size_in_bytes for task in tasks),
+        'plan_ms': round((time.monotonic() - started) * 1000, 1),
+    }
+
+def compact(catalog, table, spec):
+    """Rewrite a table as one sorted file per partition (what the maintenance job converges to)"""
+    data = iceberg_layout.sort_table(table.scan().to_arrow(), spec)
+    table.overwrite(data, snapshot_properties={'benchmark.operation': 'compact'})
+    catalog.publish(table)
+    return table
+
+def measure(table, queries):
+    return {
+        'data_files': len(list(table.scan().plan_files())),
+        'queries': {label: plan(table, row_filter) for label, row_filter in queries},
+    }
+
+def run_benchmark(warehouse=BENCHMARK_WAREHOUSE, years=3, students=2000, commits_per_semester=12, seed=42):
+    """
+    Write the same change stream into a flat and a laid-out copy of each table, then plan queries.
+
+    Each semester arrives as commits_per_semester appends, like checkpoint
+    commits of the streaming job, and is measured again after compaction.
+    Returns {table: {'rows', 'commits', variant: {'write_seconds',
+    'partition_spec', stage: {'data_files', 'queries': {label: {'files',
+    'bytes', 'plan_ms'}}}}}} with stages 'streaming' and 'compacted'.
+    """
+    batches = synthetic_batches(years, students, seed)
+    results = {}
+    for table_name in BENCHMARK_TABLES:
+        spec = pipeline_tables.PIPELINE_TABLES[table_name]
+        table_batches = batches[table_name]
+        result = {'rows': sum(len(rows) for _, _, rows in table_batches), 'commits': len(table_batches) * commits_per_semester}
+
+        for variant, namespace in VARIANTS.items():
+            catalog = hadoop_catalog.get_local_catalog(warehouse, namespace, catalog_uri=None)
+            if f"{table_name}_iceberg" in catalog.table_names():
+                raise Exception(f"❌ {warehouse}/{namespace}/{table_name}_iceberg exists - use an empty warehouse")
+            variant_spec = spec if variant == 'layout' else flat_spec(spec)
+            writer = iceberg_backfill.IcebergBackfillWriter(catalog, {table_name: variant_spec})
+            started = time.monotonic()
+            for _, columns, rows in table_batches:
+                chunk_size = max(1, -(-len(rows) // commits_per_semester))
+                for offset in range(0, len(rows), chunk_size):
+                    writer.write(table_name, columns, rows[offset:offset + chunk_size])
+            table = writer.table(table_name)
+            queries = benchmark_queries(table_name, table_batches)
+
+            result[variant] = {
+                'write_seconds': round(time.monotonic() - started, 2),
+                'partition_spec': iceberg_layout.partition_fields(variant_spec),
+                'streaming': measure(table, queries),
+            }
+            result[variant]['compacted'] = measure(compact(catalog, table, variant_spec), queries)
+            logging.info(f"📊 {table_name} ({variant}): {result[variant]['streaming']['data_files']} data files, "
+                         f"{result[variant]['compacted']['data_files']} after compaction")
+        results[table_name] = result
+    return results
@@ -0,0 +1,281 @@
+"""Iceberg table maintenance: bin-pack small files, rewrite manifests, expire snapshots, remove orphan files"""
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+import hadoop_catalog
+import iceberg_layout
+import pipeline_tables
+
+# Try to import pyiceberg for reading and rewriting table files
+try:
+    from pyiceberg.expressions import AlwaysTrue
+    from pyiceberg.io.pyarrow import ArrowScan, _dataframe_to_data_files
+    from pyiceberg.manifest import ManifestContent
+    ICEBERG_AVAILABLE = True
+except ImportError:
+    ICEBERG_AVAILABLE = False
+    logging.warning("⚠️ pyiceberg not available - Iceberg maintenance disabled")
+
+MAINTENANCE_STEPS = ('compact', 'manifests', 'expire', 'orphans')
+
+# Files under this share of the table's target file size are compaction candidates
+SMALL_FILE_RATIO = 0.75
+
+# A partition is compacted once it has this many small files
+MIN_INPUT_FILES = 5
+
+# Manifests are rewritten once the current snapshot has this many data manifests
+MIN_MANIFESTS = 10
+
+# Unreferenced files younger than this may belong to a commit in flight (Flink writes files before committing)
+ORPHAN_MIN_AGE_SECONDS = 24 * 60 * 60
+
+MAINTENANCE_INTERVAL_SECONDS = 60 * 60
+
+# Table properties enabling pyiceberg's manifest merge for one commit
+MANIFEST_MERGE_PROPERTIES = {
+    'commit.manifest-merge.enabled': 'true',
+    'commit.manifest.min-count-to-merge': '2',
+}
+
+def _pipeline_spec(table_name):
+    """pipeline_tables spec of a *_iceberg table, None for other tables"""
+    if table_name.endswith('_iceberg'):
+        return pipeline_tables.PIPELINE_TABLES.get(table_name[:-len('_iceberg')])
+    return None
+
+def bin_pack(files, target_bytes):
+    """Greedy bins of (file, size) pairs up to target_bytes, smallest first"""
+    bins = []
+    current = []
+    current_bytes = 0
+    for item in sorted(files, key=lambda item: item[1]):
+        if current and current_bytes + item[1] > target_bytes:
+            bins.append(current)
+            current, current_bytes = [], 0
+        current.append(item)
+        current_bytes += item[1]
+    if current:
+        bins.append(current)
+    return bins
+
+class IcebergMaintenance:
+    """
+    Maintenance of the tables of a local catalog (hadoop layout or SQL).
+
+    compact() bin-packs small data files per partition into target-sized,
+    sorted files. Files with delete files (Flink upserts) are left alone,
+    since pyiceberg cannot apply equality deletes. rewrite_manifests() merges
+    the manifests that every streaming commit adds. expire_snapshots()
+    follows the history.expire.* table properties. remove_orphans() deletes
+    files no live snapshot references, once they are older than the orphan
+    age. Every commit in the hadoop layout is published as the next version,
+    and is abandoned if another writer committed meanwhile.
+    """
+
+    def __init__(self, catalog, min_input_files=MIN_INPUT_FILES, min_manifests=MIN_MANIFESTS,
+                 orphan_min_age_seconds=ORPHAN_MIN_AGE_SECONDS, dry_run=False):
+        if not ICEBERG_AVAILABLE:
+            raise Exception("❌ pyiceberg not available - please install pyiceberg and pyarrow")
+        self.catalog = catalog
+        self.min_input_files = min_input_files
+        self.min_manifests = min_manifests
+        self.orphan_min_age_seconds = orphan_min_age_seconds
+        self.dry_run = dry_run
+
+    def compact(self, table_name):
+        """Rewrite small files of each partition in target-sized bins, returns a step report"""
+        report = {'files_removed': 0, 'files_added': 0, 'bytes_rewritten': 0, 'skipped_with_deletes': 0}
+        version = self.catalog.hadoop_version(table_name)
+        table = self.catalog.load_table(table_name)
+        if table is None or table.current_snapshot() is None:
+            return report
+
+        target_bytes = int(table.properties.get('write.target-file-size-bytes', iceberg_layout.TARGET_FILE_SIZE_BYTES))
+        small_bytes = int(target_bytes * SMALL_FILE_RATIO)
+        partitions = {}
+        for task in table.scan().plan_files():
+            if task.file.file_size_in_bytes >= small_bytes:
+                continue
+            if task.delete_files:
+                report['skipped_with_deletes'] += 1
+                continue
+            key = (task.file.spec_id, repr(task.file.partition))
+            partitions.setdefault(key, []).append((task, task.file.file_size_in_bytes))
+
+        bins = [
+            [task for task, _ in packed]
+            for small_files in partitions.values() if len(small_files) >= self.min_input_files
+            for packed in bin_pack(small_files, target_bytes) if len(packed) > 1
+        ]
+        if not bins:
+            return report
+
+        removed = [task.file for packed in bins for task in packed]
+        report['files_removed'] = len(removed)
+        report['bytes_rewritten'] = sum(data_file.file_size_in_bytes for data_file in removed)
+        if self.dry_run:
+            return report
+
+        spec = _pipeline_spec(table_name)
+        added = []
+        for packed in bins:
+            data = ArrowScan(table.metadata, table.io, table.schema(), AlwaysTrue()).to_table(packed)
+            if spec is not None:
+                data = iceberg_layout.sort_table(data, spec)
+            added.extend(_dataframe_to_data_files(table.metadata, data, table.io))
+        report['files_added'] = len(added)
+
+        with table.transaction() as transaction:
+            with transaction.update_snapshot(snapshot_properties={'maintenance.operation': 'compact'}).overwrite() as rewrite:
+                for data_file in removed:
+                    rewrite.delete_data_file(data_file)
+                for data_file in added:
+                    rewrite.append_data_file(data_file)
+        self.catalog.publish(table, expected_version=version)
+        return report
+
+    def rewrite_manifests(self, table_name):
+        """Merge the data manifests of the current snapshot, returns a step report"""
+        version = self.catalog.hadoop_version(table_name)
+        table = self.catalog.load_table(table_name)
+        if table is None or table.current_snapshot() is None:
+            return {'manifests_before': 0, 'manifests_after': 0}
+
+        def data_manifests():
+            return [m for m in table.current_snapshot().manifests(table.io) if m.content == ManifestContent.DATA]
+
+        before = len(data_manifests())
+        if before < self.min_manifests or self.dry_run:
+            return {'manifests_before': before, 'manifests_after': before}
+
+        previous = {key: table.properties[key] for key in MANIFEST_MERGE_PROPERTIES if key in table.properties}
+        with table.transaction() as transaction:
+            transaction.set_properties(MANIFEST_MERGE_PROPERTIES)
+            with transaction.update_snapshot(snapshot_properties={'maintenance.operation': 'rewrite-manifests'}).merge_append():
+                pass
+            transaction.remove_properties(*[key for key in MANIFEST_MERGE_PROPERTIES if key not in previous])
+            if previous:
+                transaction.set_properties(previous)
+        self.catalog.publish(table, expected_version=version)
+        return {'manifests_before': before, 'manifests_after': len(data_manifests())}
+
+    def expire_snapshots(self, table_name, max_age_ms=None, min_to_keep=None):
+        """Expire snapshots older than max_age_ms beyond the newest min_to_keep, returns a step report"""
+        version = self.catalog.hadoop_version(table_name)
+        table = self.catalog.load_table(table_name)
+        if table is None:
+            return {'expired': 0, 'kept': 0}
+
+        if max_age_ms is None:
+            max_age_ms = int(table.properties.get('history.expire.max-snapshot-age-ms', iceberg_layout.SNAPSHOT_MAX_AGE_MS))
+        if min_to_keep is None:
+            min_to_keep = int(table.properties.get('history.expire.min-snapshots-to-keep', iceberg_layout.SNAPSHOTS_KEPT))
+
+        protected = {ref.snapshot_id for ref in table.metadata.refs.values()}
+        cutoff_ms = int(time.time() * 1000) - max_age_ms
+        snapshots = sorted(table.snapshots(), key=lambda snapshot: snapshot.timestamp_ms, reverse=True)
+        expired = [
+            snapshot.snapshot_id for snapshot in snapshots[min_to_keep:]
+            if snapshot.timestamp_ms < cutoff_ms and snapshot.snapshot_id not in protected
+        ]
+        if expired and not self.dry_run:
+            table.maintenance.expire_snapshots().by_ids(expired).commit()
+            self.catalog.publish(table, expected_version=version)
+        return {'expired': len(expired), 'kept': len(snapshots) - len(expired)}
+
+    def referenced_files(self, table):
+        """Paths every live snapshot and the metadata log still need"""
+        referenced = {table.metadata_location}
+        referenced.update(entry.metadata_file for entry in table.metadata.metadata_log)
+        referenced.update(statistics.statistics_path for statistics in table.metadata.statistics)
+        for snapshot in table.snapshots():
+            referenced.add(snapshot.manifest_list)
+            for manifest in snapshot.manifests(table.io):
+                referenced.add(manifest.manifest_path)
+                for entry in manifest.fetch_manifest_entry(table.io, discard_deleted=True):
+                    referenced.add(entry.data_file.file_path)
+        return {hadoop_catalog.local_path(path) for path in referenced}
+
+    def remove_orphans(self, table_name):
+        """Delete unreferenced files under the table location older than the orphan age, returns a step report"""
+        report = {'orphans': 0, 'bytes': 0}
+        table = self.catalog.load_table(table_name)
+        if table is None:
+            return report
+        if not table.location().startswith('file://') and '://' in table.location():
+            logging.warning(f"⚠️ {table_name}: orphan removal only lists local warehouses, skipped {table.location()}")
+            return report
+
+        referenced = self.referenced_files(table)
+        location = hadoop_catalog.local_path(table.location())
+        metadata_dir = os.path.join(location, 'metadata')
+        if getattr(self.catalog, 'hadoop_layout', False):
+            # Hadoop versions Flink reads: the hint and the newest versions the table keeps
+            versions_kept = int(table.properties.get('write.metadata.previous-versions-max', iceberg_layout.METADATA_VERSIONS_KEPT))
+            current = self.catalog.hadoop_version(table_name)
+            referenced.add(os.path.join(metadata_dir, 'version-hint.text'))
+            referenced.update(os.path.join(metadata_dir, f"v{v}.metadata.json") for v in range(max(1, current - versions_kept), current + 1))
+
+        cutoff = time.time() - self.orphan_min_age_seconds
+        for directory, _, file_names in os.walk(location):
+            for file_name in file_names:
+                path = os.path.join(directory, file_name)
+                if path in referenced or os.path.getmtime(path) > cutoff:
+                    continue
+                report['orphans'] += 1
+                report['bytes'] += os.path.getsize(path)
+                if not self.dry_run:
+                    os.remove(path)
+        return report
+
+    def maintain(self, table_name, steps=MAINTENANCE_STEPS):
+        """Run maintenance steps on one table, returns {step: report}"""
+        report = {}
+        for step in steps:
+            started = time.monotonic()
+            if step == 'compact':
+                report[step] = self.compact(table_name)
+            elif step == 'manifests':
+                report[step] = self.rewrite_manifests(table_name)
+            elif step == 'expire':
+                report[step] = self.expire_snapshots(table_name)
+            elif step == 'orphans':
+                report[step] = self.remove_orphans(table_name)
+            else:
+                raise ValueError(f"Unknown maintenance step {step}")
+            report[step]['seconds'] = round(time.monotonic() - started, 2)
+        return report
+
+    def run(self, table_names=None, steps=MAINTENANCE_STEPS):
+        """Maintain every table (or the given ones), returns {table: {step: report}}; a failing table is logged and skipped"""
+        results = {}
+        for table_name in table_names or self.catalog.table_names():
+            try:
+                results[table_name] = self.maintain(table_name, steps)
+                logging.info(f"🧹 {table_name}: {results[table_name]}")
+            except Exception as e:
+                logging.error(f"❌ Maintenance of {table_name} failed: {e}")
+                results[table_name] = {'error': str(e)}
+        return results
+
+    def run_forever(self, interval_seconds=MAINTENANCE_INTERVAL_SECONDS, table_names=None, steps=MAINTENANCE_STEPS, iterations=None):
+        """Run on a schedule until interrupted (or for a number of iterations), returns the last results"""
+        results = {}
+        iteration = 0
+        while iterations is None or iteration < iterations:
+            started = datetime.now()
+            results = self.run(table_names, steps)
+            iteration += 1
+            next_run = started + timedelta(seconds=interval_seconds)
+            logging.info(f"⏰ Maintenance pass {iteration} done, next at {next_run:%H:%M:%S}")
+            if iterations is not None and iteration >= iterations:
+                break
+            time.sleep(max(0, (next_run - datetime.now()).total_seconds()))
+        return results
+
+def get_iceberg_maintenance(warehouse=hadoop_catalog.ICEBERG_WAREHOUSE, catalog_uri=hadoop_catalog.ICEBERG_CATALOG_URI, **kwargs):
+    """Factory function to get maintenance over the local hadoop warehouse (or a SQL catalog)"""
+    return IcebergMaintenance(hadoop_catalog.get_local_catalog(warehouse, catalog_uri=catalog_uri), **kwargs)
@@ -0,0 +1,266 @@
+"""In-memory stand-in for DatabaseManager: the university schema in an in-process SQLite database"""
+
+import csv
+import io
+import logging
+import re
+import sqlite3
+import threading
+import time
+from datetime import date, datetime
+from decimal import ROUND_HALF_UP, Decimal
+import db_utils
+import flink_job_builder
+import load_verification
+
+# Try to import numpy so vectorized engines can hand over numpy scalars
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# CREATE TABLE of the plain and the partitioned schema files
+CREATE_TABLE_PATTERN = re.compile(r'CREATE TABLE (?:IF NOT EXISTS )?(\w+) \((.*?)\n\)(?: PARTITION BY [^;]*)?;', re.DOTALL)
+CREATE_INDEX_PATTERN = re.compile(r'CREATE (?:UNIQUE )?INDEX [^;]+;', re.IGNORECASE)
+SERIAL_PATTERN = re.compile(r'\b(?:BIG)?SERIAL PRIMARY KEY\b', re.IGNORECASE)
+# psycopg2 passes a list for "= ANY(%s)"; SQLite needs "IN (?, ...)"
+ANY_PREFIX_PATTERN = re.compile(r'=\s*ANY\(\s*$', re.IGNORECASE)
+# PostgreSQL catalogs (partitions, replication slots): empty in memory
+CATALOG_PATTERN = re.compile(r'\bpg_\w+', re.IGNORECASE)
+
+# Rows per executemany call of a load
+INSERT_CHUNK_SIZE = 10000
+
+# Values come back with the Python types psycopg2 returns
+sqlite3.register_adapter(Decimal, float)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('DATE', lambda value: date.fromisoformat(value.decode()))
+sqlite3.register_converter('TIMESTAMP', lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter('DECIMAL', lambda value: Decimal(value.decode()))
+sqlite3.register_converter('BOOLEAN', lambda value: value not in (b'0', b'false', b'f'))
+if NUMPY_AVAILABLE:
+    for numpy_type in (np.int8, np.int16, np.int32, np.int64, np.uint8, np.uint16, np.uint32, np.uint64):
+        sqlite3.register_adapter(numpy_type, int)
+    for numpy_type in (np.float32, np.float64):
+        sqlite3.register_adapter(numpy_type, float)
+    sqlite3.register_adapter(np.bool_, bool)
+
+def round_decimal(value, scale):
+    """A numeric value rounded to a DECIMAL column's scale, as PostgreSQL stores it"""
+    if value is None:
+        return None
+    return Decimal(str(value)).quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP)
+
+def copy_text(value):
+    """A value as COPY ... CSV writes it (booleans as t / f)"""
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return value
+
+def sqlite_statement(query, params=None):
+    """(query, params) of a psycopg2 statement for SQLite: %s as ?, lists of = ANY(%s) expanded to IN (?, ...)"""
+    if isinstance(params, dict):
+        raise Exception("❌ Named parameters (server-side --engine sql) need PostgreSQL")
+    params = list(params or [])
+    parts = query.replace('%%', '\0').split('%s')
+    if len(parts) - 1 != len(params):
+        raise Exception(f"❌ {len(parts) - 1} placeholders but {len(params)} parameters")
+
+    pieces = [parts[0]]
+    values = []
+    for part, value in zip(parts[1:], params):
+        if isinstance(value, (list, tuple)) and ANY_PREFIX_PATTERN.search(pieces[-1]):
+            pieces[-1] = ANY_PREFIX_PATTERN.sub('IN (', pieces[-1])
+            pieces.append(', '.join('?' * len(value)) + part)
+            values.extend(value)
+        else:
+            pieces.append('?' + part)
+            values.append(value)
+    return ''.join(pieces).replace('\0', '%'), values
+
+class InMemoryDatabaseManager(db_utils.DatabaseManager):
+    """
+    DatabaseManager backed by an in-process SQLite database instead of PostgreSQL.
+
+    The tables and indexes of university_tables.sql (SERIAL keys as SQLite
+    rowids, UNIQUE constraints kept, so ON CONFLICT DO NOTHING skips the same
+    rows) answer the queries the generators issue, and dates, timestamps,
+    decimals and booleans come back with the types psycopg2 returns. SQLite
+    ignores DECIMAL scales, so loads round those columns like PostgreSQL. Loads
+    run the load hooks and write listeners like the PostgreSQL manager, so
+    the reference cache, the backfill writer and the fan-out keep working.
+    Catalog queries (partitions, replication slots) return no rows, and
+    server-side generation (--engine sql) is not available.
+
+    Time spent inside the database is summed in db_seconds, so the
+    generators' own CPU cost is the rest of a step's time.
+    """
+
+    def __init__(self, sql_path=flink_job_builder.POSTGRES_SCHEMA_SQL, create_schema=True):
+        super().__init__()
+        self.connection_params = {'host': 'memory', 'port': None, 'database': ':memory:', 'user': None, 'password': None}
+        self.conn = sqlite3.connect(':memory:', detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        self._lock = threading.RLock()
+        self.db_seconds = 0.0
+        self.statements = 0
+        self.decimal_scales = {}  # table -> {column: scale} of the DECIMAL columns
+        if create_schema:
+            self.create_tables_from_sql_file(sql_path)
+
+    def get_connection(self):
+        raise Exception("❌ The in-memory database has no PostgreSQL connection")
+
+    def test_connection(self):
+        return True
+
+    def _run(self, work):
+        """Run work(cursor) in one transaction under the lock, adding its time to db_seconds"""
+        with self._lock:
+            started = time.perf_counter()
+            cursor = self.conn.cursor()
+            try:
+                result = work(cursor)
+                self.conn.commit()
+                return result
+            except Exception:
+                self.conn.rollback()
+                raise
+            finally:
+                cursor.close()
+                self.db_seconds += time.perf_counter() - started
+
+    def _execute(self, cursor, query, params):
+        self.statements += 1
+        if CATALOG_PATTERN.search(query):
+            return False
+        cursor.execute(*sqlite_statement(query, params))
+        return True
+
+    def execute_query(self, query: str, params: tuple = None):
+        """Execute SELECT query and return results"""
+        return self._run(lambda cursor: cursor.fetchall() if self._execute(cursor, query, params) else [])
+
+    def execute_single_query(self, query: str, params: tuple = None):
+        """Execute single query (INSERT/UPDATE/DELETE)"""
+        rowcount = self._run(lambda cursor: cursor.rowcount if self._execute(cursor, query, params) else 0)
+        write_target = db_utils.WRITE_TARGET_PATTERN.match(query)
+        if write_target:
+            self._notify_write(write_target.group(1).split('.')[-1])
+        return rowcount
+
+    def execute_transaction(self, statements):
+        """Execute several statements (query, params) in one transaction and return their rowcounts"""
+        def work(cursor):
+            return [cursor.rowcount if self._execute(cursor, query, params) else 0 for query, params in statements]
+
+        rowcounts = self._run(work)
+        for query, params in statements:
+            write_target = db_utils.WRITE_TARGET_PATTERN.match(query)
+            if write_target:
+                self._notify_write(write_target.group(1).split('.')[-1])
+        return rowcounts
+
+    def _load(self, table_name, columns, data_list, method, on_conflict):
+        if not data_list:
+            logging.warning(f"No data to insert into {table_name}")
+            return 0
+        self._before_load(table_name, columns, data_list)
+        report = load_verification.LoadReport(table_name, method, len(data_list))
+        scales = self.decimal_scales.get(table_name, {})
+        decimals = [(index, scales[name]) for index, name in enumerate(columns) if name in scales]
+        sql = (f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+               f"{' ON CONFLICT DO NOTHING' if on_conflict else ''}")
+
+        def work(cursor):
+            for start in range(0, len(data_list), INSERT_CHUNK_SIZE):
+                chunk = data_list[start:start + INSERT_CHUNK_SIZE]
+                if decimals:
+                    chunk = [list(row) for row in chunk]
+                    for row in chunk:
+                        for index, scale in decimals:
+                            row[index] = round_decimal(row[index], scale)
+                cursor.executemany(sql, chunk)
+                self.statements += 1
+                report.add_chunk(cursor.rowcount)
+
+        try:
+            self._run(work)
+        except Exception as e:
+            logging.error(f"❌ Error inserting into {table_name}: {e}")
+            raise
+        self._notify_write(table_name)
+        report.log()
+        self.last_load_report = report
+        return report.rows_inserted
+
+    def bulk_insert_data(self, table_name: str, columns, data_list):
+        """Insert rows (tuples or a ColumnarBatch), skipping existing keys like ON CONFLICT DO NOTHING"""
+        return self._load(table_name, list(columns), data_list, 'insert', on_conflict=True)
+
+    def copy_insert_data(self, table_name: str, columns, data_list, skip_conflicts: bool = False):
+        """Insert rows like COPY: an existing key fails the load unless skip_conflicts is set"""
+        return self._load(table_name, list(columns), data_list, 'copy', on_conflict=skip_conflicts)
+
+    def copy_query_to_file(self, query: str, params, fileobj, setup_statements=None) -> int:
+        """Write the result of a SELECT to a file object as COPY ... CSV HEADER would; setup statements are skipped"""
+        def work(cursor):
+            self._execute(cursor, query, params)
+            return [column[0] for column in cursor.description], cursor.fetchall()
+
+        header, rows = self._run(work)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(header)
+        writer.writerows([copy_text(value) for value in row] for row in rows)
+        fileobj.write(buffer.getvalue() if isinstance(fileobj, io.TextIOBase) else buffer.getvalue().encode('utf-8'))
+        return len(rows)
+
+    def table_exists(self, table_name: str) -> bool:
+        return bool(self._run(lambda cursor: cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)
+        ).fetchall()))
+
+    def get_table_schema(self, table_name: str):
+        """(column_name, data_type, is_nullable) like information_schema.columns"""
+        columns = self._run(lambda cursor: cursor.execute(f"PRAGMA table_info({table_name})").fetchall())
+        return [(name, data_type.lower(), 'NO' if not_null or primary_key else 'YES')
+                for _, name, data_type, not_null, _, primary_key in columns]
+
+    def create_tables_from_sql_file(self, sql_file_path: str, academic_years=None):
+        """Create the tables and indexes of a Postgres schema file (partitions are not needed in memory)"""
+        with open(sql_file_path, encoding='utf-8') as f:
+            sql = f.read()
+
+        for table_name, columns in flink_job_builder.load_postgres_schemas(sql_file_path).items():
+            scales = {name: int(decimal.group(2)) for name, flink_type in columns
+                      for decimal in [flink_job_builder.DECIMAL_PATTERN.match(flink_type)] if decimal}
+            if scales:
+                self.decimal_scales[table_name] = scales
+
+        def work(cursor):
+            for match in CREATE_TABLE_PATTERN.finditer(sql):
+                cursor.execute(SERIAL_PATTERN.sub('INTEGER PRIMARY KEY', match.group(0)))
+            for statement in CREATE_INDEX_PATTERN.findall(sql):
+                cursor.execute(statement)
+            for table_name, name, postgres_type in flink_job_builder.POSTGRES_ADD_COLUMN_PATTERN.findall(sql):
+                existing = [row[1] for row in cursor.execute(f"PRAGMA table_info({table_name})").fetchall()]
+                if name not in existing:
+                    cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {name} {postgres_type}")
+
+        self._run(work)
+        logging.info(f"✅ Created in-memory schema from {sql_file_path}")
+        self._notify_write(None)
+
+    def table_counts(self):
+        """{table: rows} of every table"""
+        def work(cursor):
+            names = [row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")]
+            return {name: cursor.execute(f"SELECT COUNT(*) FROM {name}").fetchone()[0] for name in names}
+
+        return self._run(work)
+
+def get_in_memory_db_manager(sql_path=flink_job_builder.POSTGRES_SCHEMA_SQL, create_schema=True):
+    """Factory function to get an in-memory database manager with the university schema"""
+    return InMemoryDatabaseManager(sql_path, create_schema)
@@ -0,0 +1,91 @@
+"""Rows a bulk load keeps under ON CONFLICT DO NOTHING: the first row of every primary and UNIQUE key"""
+
+import flink_job_builder
+
+def conflict_keys(sql_path=flink_job_builder.POSTGRES_SCHEMA_SQL):
+    """{table: [key columns tuple]} of the primary key and UNIQUE constraints of a Postgres schema file"""
+    primary_keys = flink_job_builder.load_postgres_primary_keys(sql_path)
+    unique_keys = flink_job_builder.load_postgres_unique_keys(sql_path)
+    return {
+        table_name: [tuple(key) for key in ([primary_keys[table_name]] if table_name in primary_keys else [])
+                     + unique_keys.get(table_name, [])]
+        for table_name in set(primary_keys) | set(unique_keys)
+    }
+
+def database_key_loader(db):
+    """key_loader reading the values of a key already stored in a table of db"""
+    def load(table_name, key):
+        return db.execute_query(f"SELECT {', '.join(key)} FROM {table_name}")
+    return load
+
+class ConflictFilter:
+    """
+    Drops the rows of a load that ON CONFLICT DO NOTHING skips.
+
+    A row is skipped when one of its keys (primary key or UNIQUE constraint,
+    as far as the load carries its columns) is already stored or on an
+    earlier row of the load. The stored values of a key are read once with
+    key_loader(table_name, key) and then kept up to date by first_rows, so
+    consumers mirroring the database (event logs, recordings, Iceberg
+    backfill) see only the rows it kept.
+    """
+
+    def __init__(self, key_loader, keys=None):
+        self.key_loader = key_loader
+        self.keys = conflict_keys() if keys is None else keys
+        self.rows_skipped = {}
+        self._known = {}  # (table, key columns) -> stored key values
+
+    def conflict_keys(self, table_name, columns):
+        """Keys of a table the database skips rows on, as far as the columns carry them"""
+        return [key for key in self.keys.get(table_name, []) if set(key) <= set(columns)]
+
+    def known_keys(self, table_name, key):
+        """Values of a key already stored (read once, then kept up to date by first_rows)"""
+        known = self._known.get((table_name, key))
+        if known is None:
+            known = set(tuple(row) for row in self.key_loader(table_name, key))
+            self._known[(table_name, key)] = known
+        return known
+
+    def prepare(self, table_name, columns):
+        """Read the stored keys a load will be checked against; call before the load commits"""
+        for key in self.conflict_keys(table_name, columns):
+            self.known_keys(table_name, key)
+
+    def first_rows(self, table_name, columns, data_list, keys=None):
+        """
+        data_list without the rows ON CONFLICT DO NOTHING skips. keys
+        overrides the keys checked (default conflict_keys). Returns data_list
+        itself when every row is kept, else a list of its kept rows.
+        """
+        columns = list(columns)
+        keys = self.conflict_keys(table_name, columns) if keys is None else keys
+        if not keys or not data_list:
+            return data_list
+        if hasattr(data_list, 'column'):
+            values = {name: data_list.column(name) for key in keys for name in key}
+            key_rows = [list(zip(*(values[name] for name in key))) for key in keys]
+        else:
+            positions = {name: columns.index(name) for key in keys for name in key}
+            key_rows = [[tuple(row[positions[name]] for name in key) for row in data_list] for key in keys]
+        known = [self.known_keys(table_name, key) for key in keys]
+
+        kept = []
+        for index in range(len(data_list)):
+            row_keys = [rows[index] for rows in key_rows]
+            if any(row_key in seen for row_key, seen in zip(row_keys, known)):
+                continue
+            for row_key, seen in zip(row_keys, known):
+                seen.add(row_key)
+            kept.append(index)
+        if len(kept) == len(data_list):
+            return data_list
+        self.rows_skipped[table_name] = self.rows_skipped.get(table_name, 0) + len(data_list) - len(kept)
+        if hasattr(data_list, 'row'):
+            return [data_list.row(index) for index in kept]
+        return [data_list[index] for index in kept]
+
+def get_conflict_filter(db=None, key_loader=None):
+    """Factory function to get a conflict filter reading stored keys from db (or with key_loader)"""
+    return ConflictFilter(key_loader or database_key_loader(db))
@@ -0,0 +1,161 @@
+"""Load verification from statement row counts and sampled row checksums"""
+
+import hashlib
+import logging
+import os
+import random
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP
+
+# Rows per load read back and compared by checksum (0 = row counts only)
+LOAD_VERIFY_SAMPLE = int(os.getenv("LOAD_VERIFY_SAMPLE", "0"))
+
+class LoadReport:
+    """Outcome of one bulk load: rows sent, rows the database reported inserted, sample check"""
+
+    def __init__(self, table_name, method, rows_sent=0):
+        self.table_name = table_name
+        self.method = method
+        self.rows_sent = rows_sent
+        self.rows_inserted = 0
+        self.chunks = 0
+        self.sample_size = 0
+        self.sample_missing = 0
+        self.sample_mismatched = 0
+        self.sample_checksum = None
+
+    @property
+    def rows_skipped(self):
+        """Rows not inserted, i.e. skipped by ON CONFLICT DO NOTHING"""
+        return self.rows_sent - self.rows_inserted
+
+    @property
+    def sample_ok(self):
+        return self.sample_missing == 0 and self.sample_mismatched == 0
+
+    def add_chunk(self, rows_inserted):
+        self.rows_inserted += rows_inserted
+        self.chunks += 1
+
+    def as_dict(self):
+        return {
+            'table': self.table_name,
+            'method': self.method,
+            'rows_sent': self.rows_sent,
+            'rows_inserted': self.rows_inserted,
+            'rows_skipped': self.rows_skipped,
+            'chunks': self.chunks,
+            'sample_size': self.sample_size,
+            'sample_missing': self.sample_missing,
+            'sample_mismatched': self.sample_mismatched,
+            'sample_checksum': self.sample_checksum,
+        }
+
+    def log(self):
+        message = (f"🔍 Load report {self.table_name} ({self.method}): {self.rows_inserted} of {self.rows_sent} "
+                   f"rows inserted, {self.rows_skipped} skipped, {self.chunks} chunks")
+        if self.sample_size:
+            message += (f", sample of {self.sample_size}: {self.sample_missing} missing, "
+                        f"{self.sample_mismatched} mismatched")
+        if self.sample_size and not self.sample_ok:
+            logging.warning(f"⚠️ {message}")
+        else:
+            logging.info(message)
+
+def canonical_value(value, scale=None):
+    """
+    Text form of a value that compares equal before and after a database
+    round trip. scale is the DECIMAL scale of the value's column: numbers
+    are rounded to it (half up, as PostgreSQL stores them) first.
+    """
+    if value is None or value == '':
+        return ''  # COPY loads empty fields as NULL
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (int, float, Decimal)):
+        if scale is not None:
+            return str(Decimal(str(value)).quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP))
+        number = float(value)
+        return str(int(number)) if number.is_integer() else f"{number:.6f}"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+def row_checksum(row, scales=None):
+    """md5 of the canonical text of a row, scales the DECIMAL scale (or None) of each column"""
+    scales = scales or [None] * len(row)
+    return hashlib.md5('\x1f'.join(canonical_value(value, scale) for value, scale in zip(row, scales))
+                       .encode('utf-8')).hexdigest()
+
+def sample_rows(data_list, sample_size, seed=None):
+    """Up to sample_size rows drawn without replacement (works on lists and ColumnarBatch)"""
+    if sample_size <= 0 or not data_list:
+        return []
+    indices = random.Random(seed).sample(range(len(data_list)), min(sample_size, len(data_list)))
+    return [data_list[index] for index in sorted(indices)]
+
+def unique_keys(cursor, table_name):
+    """Columns of a table's primary key, then of its UNIQUE constraints, each in key order (catalog lookup)"""
+    cursor.execute(
+        """SELECT i.indexrelid, a.attname
+           FROM pg_index i
+           JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+           WHERE i.indrelid = %s::regclass AND i.indisunique AND i.indpred IS NULL
+           ORDER BY i.indisprimary DESC, i.indexrelid, array_position(i.indkey, a.attnum)""",
+        (table_name,)
+    )
+    keys = {}
+    for index_id, name in cursor.fetchall():
+        keys.setdefault(index_id, []).append(name)
+    return list(keys.values())
+
+def decimal_scales(cursor, table_name):
+    """{column: scale} of a table's DECIMAL / NUMERIC columns with a declared scale (catalog lookup)"""
+    cursor.execute(
+        """SELECT column_name, numeric_scale
+           FROM information_schema.columns
+           WHERE table_schema = current_schema() AND table_name = %s
+             AND data_type = 'numeric' AND numeric_scale IS NOT NULL""",
+        (table_name,)
+    )
+    return {name: int(scale) for name, scale in cursor.fetchall()}
+
+def verify_sample(cursor, table_name, columns, rows, report):
+    """
+    Read sampled rows back by primary key and compare row checksums.
+
+    When the load does not carry the primary key (a SERIAL id such as
+    student_enrollment.enrollment_id), the first UNIQUE key it carries is
+    used instead. Lookups go through the key's index, so the cost is
+    proportional to the sample, not the table. DECIMAL values are compared
+    at their column's scale. Rows skipped as conflicts may legitimately
+    differ from the stored row; the counts are reported, not raised.
+    """
+    if not rows:
+        return report
+    key_columns = next((key for key in unique_keys(cursor, table_name) if set(key) <= set(columns)), None)
+    if not key_columns:
+        return report
+    column_scales = decimal_scales(cursor, table_name)
+    scales = [column_scales.get(name) for name in columns]
+
+    key_positions = [columns.index(name) for name in key_columns]
+    def key_of(row):
+        return tuple(canonical_value(row[p]) for p in key_positions)
+
+    expected = {key_of(row): row_checksum(row, scales) for row in rows}
+    key_values = [[row[p] for row in rows] for p in key_positions]
+
+    keys_str = ','.join(key_columns)
+    cursor.execute(
+        f"SELECT {','.join(columns)} FROM {table_name} "
+        f"WHERE ({keys_str}) IN (SELECT * FROM unnest({','.join(['%s'] * len(key_columns))}))",
+        tuple(key_values)
+    )
+    actual = {key_of(row): row_checksum(row, scales) for row in cursor.fetchall()}
+
+    report.sample_size = len(expected)
+    report.sample_missing = sum(1 for key in expected if key not in actual)
+    report.sample_mismatched = sum(1 for key, checksum in expected.items() if key in actual and actual[key] != checksum)
+    report.sample_checksum = hashlib.md5(''.join(expected[key] for key in sorted(expected)).encode('utf-8')).hexdigest()
+    return report
@@ -0,0 +1,35 @@
+"""Shared Faker instances for the generators, imported and created on first use"""
+
+import threading
+
+FAKER_LOCALE = 'id_ID'  # Indonesian locale
+
+_fakers = {}  # locale -> Faker
+_lock = threading.Lock()
+
+def get_faker(locale=FAKER_LOCALE):
+    """The shared Faker of a locale (faker is imported and the instance built on the first call)"""
+    faker = _fakers.get(locale)
+    if faker is None:
+        with _lock:
+            faker = _fakers.get(locale)
+            if faker is None:
+                from faker import Faker
+                faker = _fakers[locale] = Faker(locale)
+    return faker
+
+class LazyFaker:
+    """Module-level stand-in for a Faker: attribute access goes to the shared instance of its locale"""
+
+    def __init__(self, locale=FAKER_LOCALE):
+        self._locale = locale
+
+    def __getattr__(self, name):
+        return getattr(get_faker(self._locale), name)
+
+def seed(value):
+    """Seed the random generator shared by every Faker instance"""
+    from faker import Faker
+    Faker.seed(value)
+
+fake = LazyFaker()
@@ -3,15 +3,19 @@
 import logging
 import random
 from datetime import datetime
-from faker import Faker
 import static_data
 import db_utils
+import locale_providers
+import reference_cache
+import course_catalog_generator
 
-fake = Faker('id_ID')  # Indonesian locale
+fake = locale_providers.fake  # shared Faker('id_ID'), built on first use
 
 class MasterDataGenerator:
-    def __init__(self):
-        self.db = db_utils.get_db_manager()
+    def __init__(self, courses_per_program=None, db=None, cache=None):
+        self.db = db or db_utils.get_db_manager()
+        self.cache = cache or reference_cache.get_reference_cache(self.db)
+        self.courses_per_program = courses_per_program
         
     def setup_master_data(self):
         """Setup all master data in correct order"""
@@ -172,7 +176,7 @@ class MasterDataGenerator:
             raise
     
     def _setup_courses(self):
-        """Setup course master data"""
+        """Setup course master data from the procedural course catalog"""
         try:
             logging.info("📚 Setting up courses...")
             
@@ -182,67 +186,14 @@ class MasterDataGenerator:
                     logging.info(f"✅ Courses already exist ({existing_count} records), skipping...")
                     return
             
-            # Get program IDs
-            program_results = self.db.execute_query("SELECT id, program_code FROM program ORDER BY id")
-            
-            courses_data = []
-            course_templates = {
-                'ILK-S1': [
-                    ('ILK101', 'Dasar Pemrograman', 3),
-                    ('ILK102', 'Struktur Data', 3),
-                    ('ILK201', 'Algoritma', 4),
-                    ('ILK202', 'Basis Data', 3),
-                ],
-                'SI-S1': [
-                    ('SI101', 'SIM', 3),
-                    ('SI102', 'Analisis Sistem', 3),
-                    ('SI201', 'ERP', 4),
-                    ('SI202', 'E-Business', 3),
-                ],
-                'TEK-S1': [
-                    ('TEK101', 'Rangkaian', 3),
-                    ('TEK102', 'Elektronika', 3),
-                    ('TEK201', 'Sistem Digital', 4),
-                ],
-                'MAT-S1': [
-                    ('MAT101', 'Kalkulus I', 4),
-                    ('MAT102', 'Aljabar', 3),
-                    ('MAT201', 'Kalkulus II', 4),
-                ]
-            }
-            
-            # Add courses for matching programs
-            for program_id, program_code in program_results:
-                if program_code in course_templates:
-                    for course_code, course_name, credits in course_templates[program_code]:
-                        courses_data.append((
-                            course_code,
-                            course_name,
-                            credits,
-                            program_id,
-                            datetime.now()
-                        ))
-            
-            # Add general courses
-            general_courses = [
-                ('UNI101', 'Bahasa Indonesia', 2),
-                ('UNI102', 'Pancasila', 2),
-                ('UNI103', 'Bahasa Inggris', 2),
-                ('UNI104', 'Agama', 2),
+            # Get programs
+            program_results = [
+                (program.id, program.program_code, program.program_name, program.degree)
+                for program in self.cache.programs()
             ]
             
-            # Add general courses to first 4 programs
-            for program_id, program_code in program_results[:4]:
-                for course_code, course_name, credits in general_courses:
-                    short_program = program_code[:3]  # First 3 chars
-                    full_course_code = f"{course_code[:6]}{short_program}"  # No dash to save space
-                    courses_data.append((
-                        full_course_code,
-                        course_name,
-                        credits,
-                        program_id,
-                        datetime.now()
-                    ))
+            catalog = course_catalog_generator.get_course_catalog_generator(self.courses_per_program)
+            courses_data, prerequisites_data = catalog.generate_catalog(program_results)
             
             if courses_data:
                 columns = ['course_code', 'course_name', 'credits', 'program_id', 'created_at']
@@ -250,11 +201,17 @@ class MasterDataGenerator:
                 logging.info(f"✅ Inserted {inserted_count} courses")
             else:
                 logging.warning("⚠️ No course data to insert")
+                return
+            
+            if prerequisites_data:
+                columns = ['course_code', 'prerequisite_code', 'created_at']
+                inserted_count = self.db.bulk_insert_data('course_prerequisite', columns, prerequisites_data)
+                logging.info(f"✅ Inserted {inserted_count} course prerequisites")
             
         except Exception as e:
             logging.error(f"❌ Error setting up courses: {e}")
             raise
 
-def get_master_data_generator():
+def get_master_data_generator(courses_per_program=None, db=None, cache=None):
     """Factory function to get master data generator instance"""
-    return MasterDataGenerator() 
\ No newline at end of file
+    return MasterDataGenerator(courses_per_program, db, cache) 
\ No newline at end of file
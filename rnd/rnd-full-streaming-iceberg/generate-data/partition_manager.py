@@ -0,0 +1,170 @@
+"""Academic-year partition management for the partitioned source schema"""
+
+import json
+import logging
+import flink_job_builder
+
+# Tables partitioned by RANGE (academic_year), referenced tables first
+PARTITIONED_TABLES = ['registration', 'class', 'student_enrollment', 'payment']
+
+PARTITIONED_SCHEMA_FILE = 'university_tables_partitioned.sql'
+
+def partition_bounds(academic_year):
+    """(from, to) range bounds of an academic year, e.g. ('2024/2025', '2025/2026')"""
+    year_start = int(academic_year.split('/')[0])
+    return f"{year_start}/{year_start + 1}", f"{year_start + 1}/{year_start + 2}"
+
+def partition_name(table_name, academic_year):
+    """Partition of a table for an academic year, e.g. registration_y2024_2025"""
+    year_start = int(academic_year.split('/')[0])
+    return f"{table_name}_y{year_start}_{year_start + 1}"
+
+def is_partitioned(db, table_name):
+    """Whether a table is a partitioned parent"""
+    result = db.execute_query(
+        """SELECT 1 FROM pg_partitioned_table pt
+           JOIN pg_class c ON c.oid = pt.partrelid
+           WHERE c.relname = %s AND pg_table_is_visible(c.oid)""",
+        (table_name,)
+    )
+    return bool(result)
+
+def partitioned_tables(db):
+    """Partitioned tables of the schema in dependency order (empty for the heap schema)"""
+    return [table_name for table_name in PARTITIONED_TABLES if is_partitioned(db, table_name)]
+
+def list_partitions(db, table_name):
+    """Attached partitions of a table with their bounds: [(partition_name, bound_expression)]"""
+    return db.execute_query(
+        """SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+           FROM pg_inherits i
+           JOIN pg_class c ON c.oid = i.inhrelid
+           JOIN pg_class p ON p.oid = i.inhparent
+           WHERE p.relname = %s
+           ORDER BY c.relname""",
+        (table_name,)
+    )
+
+def connector_publication(path=flink_job_builder.DEBEZIUM_CONNECTOR_JSON):
+    """(publication name, captured tables) of the Debezium connector"""
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)['config']
+    return config.get('publication.name', 'dbz_publication'), flink_job_builder.load_connector_tables(path)
+
+def ensure_publication(db, path=flink_job_builder.DEBEZIUM_CONNECTOR_JSON):
+    """
+    Publish the partitioned tables' changes under their parent name.
+
+    Without publish_via_partition_root, pgoutput reports a change to
+    registration_y2024_2025 under the partition's name, which the connector's
+    table.include.list does not match, so the partitioned tables would stop
+    streaming silently. The connector's publication is created with the
+    option (for the captured tables that exist), or the option is switched on
+    for an existing one; Debezium's filtered mode keeps it when it updates
+    the table list. Returns the publication name.
+    """
+    name, tables = connector_publication(path)
+    existing = db.execute_query("SELECT pubviaroot FROM pg_publication WHERE pubname = %s", (name,))
+    if existing:
+        if not existing[0][0]:
+            db.execute_transaction([(f"ALTER PUBLICATION {name} SET (publish_via_partition_root = true)", None)])
+    else:
+        tables = [table_name for table_name in tables if db.table_exists(table_name)]
+        db.execute_transaction([(
+            f"CREATE PUBLICATION {name} FOR TABLE {', '.join(tables)} WITH (publish_via_partition_root = true)", None
+        )])
+    logging.info(f"📣 Publication {name} publishes partition changes via the partitioned table")
+    return name
+
+def ensure_partitions(db, academic_year, tables=None):
+    """Create the academic year's partition of every partitioned table, returns created partition names"""
+    tables = tables or partitioned_tables(db)
+    if not tables:
+        return []
+
+    lower, upper = partition_bounds(academic_year)
+    statements = []
+    names = []
+    for table_name in tables:
+        name = partition_name(table_name, academic_year)
+        names.append(name)
+        statements.append((
+            f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table_name} FOR VALUES FROM (%s) TO (%s)",
+            (lower, upper)
+        ))
+
+    db.execute_transaction(statements)
+    logging.info(f"🧱 Ensured partitions for {academic_year}: {', '.join(names)}")
+    return names
+
+def create_staging_table(db, table_name, academic_year):
+    """
+    Standalone table shaped like a partition, for loading a year off-line.
+
+    It carries a CHECK constraint matching the partition bounds, so
+    attach_partition can skip the validation scan.
+    """
+    name = partition_name(table_name, academic_year)
+    lower, upper = partition_bounds(academic_year)
+    db.execute_transaction([
+        (f"CREATE TABLE {name} (LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)", None),
+        (
+            f"ALTER TABLE {name} ADD CONSTRAINT {name}_bounds "
+            f"CHECK (academic_year IS NOT NULL AND academic_year >= %s AND academic_year < %s)",
+            (lower, upper)
+        ),
+    ])
+    logging.info(f"🧱 Created staging table {name} for {table_name} {academic_year}")
+    return name
+
+def attach_partition(db, table_name, academic_year, source_table=None):
+    """Attach a loaded table as the academic year's partition (metadata-only when it has the bounds CHECK)"""
+    name = source_table or partition_name(table_name, academic_year)
+    lower, upper = partition_bounds(academic_year)
+    db.execute_transaction([
+        (f"ALTER TABLE {table_name} ATTACH PARTITION {name} FOR VALUES FROM (%s) TO (%s)", (lower, upper)),
+        (f"ALTER TABLE {name} DROP CONSTRAINT IF EXISTS {name}_bounds", None),
+    ])
+    logging.info(f"📎 Attached {name} to {table_name}")
+    return name
+
+def detach_partition(db, table_name, academic_year):
+    """Detach the academic year's partition, keeping it as a standalone table"""
+    name = partition_name(table_name, academic_year)
+    db.execute_transaction([(f"ALTER TABLE {table_name} DETACH PARTITION {name}", None)])
+    logging.info(f"✂️ Detached {name} from {table_name}")
+    return name
+
+def backfill_academic_year(db, academic_year, loaders, tables=None):
+    """
+    Load an academic year into staging tables and attach them as partitions.
+
+    loaders: {table_name: callable(staging_table_name)} filling each staging
+    table (e.g. with DatabaseManager.copy_insert_data). Tables are attached in
+    dependency order so foreign keys of later tables can be validated.
+    """
+    tables = tables or partitioned_tables(db)
+    attached = []
+    for table_name in tables:
+        if table_name not in loaders:
+            continue
+        staging_table = create_staging_table(db, table_name, academic_year)
+        loaders[table_name](staging_table)
+        attached.append(attach_partition(db, table_name, academic_year, staging_table))
+    return attached
+
+def purge_academic_year(db, academic_year, tables=None):
+    """
+    Detach and drop an academic year's partitions, referencing tables first.
+
+    Detached partitions keep their foreign keys, so a referenced partition can
+    only be detached once the partitions referencing it are gone.
+    """
+    tables = tables or partitioned_tables(db)
+    purged = []
+    for table_name in reversed(tables):
+        name = detach_partition(db, table_name, academic_year)
+        db.execute_transaction([(f"DROP TABLE {name}", None)])
+        logging.info(f"🗑️ Dropped {name}")
+        purged.append(name)
+    return purged
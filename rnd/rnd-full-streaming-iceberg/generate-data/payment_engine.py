@@ -0,0 +1,192 @@
+"""Vectorized payment synthesis over a whole registration set"""
+
+import logging
+from datetime import datetime
+import static_data
+import columnar_batch
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logging.warning("⚠️ numpy is not available, vectorized payment engine disabled")
+
+# Payment kinds in the order they are emitted for a registration
+PAYMENT_TYPES = ['UKT', 'BOP', 'Late Fee']
+UKT, BOP, LATE_FEE = range(len(PAYMENT_TYPES))
+
+MICROS_PER_DAY = 86400 * 1000000
+
+def _randint(rng, bounds, size):
+    """Integers in [low, high] (inclusive, like random.randint)"""
+    low, high = bounds
+    return rng.integers(low, high + 1, size)
+
+def _weighted_codes(rng, weights, size):
+    """Codes into list(weights) drawn with the given weights"""
+    cumulative = np.cumsum(list(weights.values()), dtype=float)
+    return np.searchsorted(cumulative / cumulative[-1], rng.random(size), side='right')
+
+class PaymentEngine:
+    """
+    Draws every payment of a registration set in array form.
+
+    Mirrors PaymentGenerator._generate_payment: one UKT payment per
+    registration, a BOP payment on the first registration of new students,
+    and an occasional late fee, with status, bank, channel, timing, admin
+    fee, overdue fee and installments drawn for all payments at once.
+    """
+
+    def __init__(self, seed=None, stream=()):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for the vectorized payment engine")
+        self.rng = np.random.default_rng(None if seed is None else [seed, *stream])
+
+    def generate(self, academic_year, registrations, students, student_fees):
+        """
+        registrations: rows of (registration_id, student_id, academic_year, semester, semester_code, registration_date)
+        students / student_fees: reference_cache StudentTable / StudentFeeTable
+        Returns a columnar batch for the payment table.
+        """
+        rng = self.rng
+        year_start = int(academic_year.split('/')[0])
+
+        registration_ids = [row[0] for row in registrations]
+        student_ids = [row[1] for row in registrations]
+        semesters = np.fromiter((row[3] for row in registrations), dtype=np.int64, count=len(registrations))
+        registration_dates = np.fromiter((row[5].toordinal() for row in registrations), dtype=np.int64, count=len(registrations))
+        registration_count = len(registrations)
+
+        # Fees and entry years from the reference cache (-1 = unknown)
+        fees = [student_fees.get(student_id) for student_id in student_ids]
+        has_fee = np.fromiter((fee is not None for fee in fees), dtype=bool, count=registration_count)
+        ukt_fees = np.fromiter((fee[0] if fee else 0 for fee in fees), dtype=np.int64, count=registration_count)
+        bop_fees = np.fromiter((fee[1] if fee else 0 for fee in fees), dtype=np.int64, count=registration_count)
+        ukt_fees = np.where(has_fee, ukt_fees, _randint(rng, static_data.DEFAULT_UKT_FEE_RANGE, registration_count))
+        entry_years = np.fromiter(
+            (students.entry_year_of(student_id) or -1 for student_id in student_ids),
+            dtype=np.int64, count=registration_count
+        )
+
+        # Which payments exist for each registration
+        has_bop = (semesters == 1) & (entry_years == year_start) & (bop_fees > 0)
+        has_late_fee = rng.random(registration_count) < static_data.LATE_FEE_PROBABILITY
+
+        bop_source = np.flatnonzero(has_bop)
+        late_source = np.flatnonzero(has_late_fee)
+        source = np.concatenate([np.arange(registration_count), bop_source, late_source])
+        kinds = np.concatenate([
+            np.full(registration_count, UKT),
+            np.full(len(bop_source), BOP),
+            np.full(len(late_source), LATE_FEE),
+        ])
+        amounts = np.concatenate([
+            ukt_fees,
+            bop_fees[bop_source],
+            _randint(rng, static_data.LATE_FEE_RANGE, len(late_source)),
+        ])
+        base_dates = np.concatenate([
+            registration_dates,
+            registration_dates[bop_source],
+            registration_dates[late_source] + _randint(rng, static_data.LATE_FEE_PAYMENT_DELAY_DAYS, len(late_source)),
+        ])
+
+        # Registration order, then UKT / BOP / late fee within a registration
+        order = np.lexsort((kinds, source))
+        source, kinds, amounts, base_dates = source[order], kinds[order], amounts[order], base_dates[order]
+        count = len(source)
+
+        # Categorical draws
+        bank_codes = rng.integers(0, len(static_data.PAYMENT_BANKS), count)
+        channel_codes = rng.integers(0, len(static_data.PAYMENT_CHANNELS), count)
+        status_codes = _weighted_codes(rng, static_data.PAYMENT_STATUS_WEIGHTS, count)
+        statuses = list(static_data.PAYMENT_STATUS_WEIGHTS)
+        paid = status_codes == statuses.index('paid')
+        overdue = status_codes == statuses.index('overdue')
+
+        # Timing
+        payment_dates = base_dates + _randint(rng, static_data.PAYMENT_DELAY_DAYS, count)
+        seconds_of_day = rng.integers(0, 86400, count)
+        payment_times = (payment_dates - columnar_batch.EPOCH_ORDINAL) * MICROS_PER_DAY + seconds_of_day * 1000000
+        due_dates = base_dates + static_data.PAYMENT_DUE_DAYS
+
+        # Fees and totals
+        admin_fees = np.where(
+            rng.random(count) < static_data.ADMIN_FEE_PROBABILITY,
+            _randint(rng, static_data.ADMIN_FEE_RANGE, count), 0
+        )
+        charged = overdue | (paid & (payment_dates > due_dates))
+        late_fees_charged = np.where(charged, _randint(rng, static_data.OVERDUE_FEE_RANGE, count), 0)
+        total_paid = np.where(paid, amounts + admin_fees, 0) + late_fees_charged
+
+        installments = np.where(
+            (kinds == BOP) & (amounts > static_data.BOP_INSTALLMENT_THRESHOLD),
+            rng.choice(static_data.BOP_INSTALLMENT_CHOICES, count), 1
+        )
+
+        # String columns (the only per-row Python work left)
+        banks = static_data.PAYMENT_BANKS
+        payment_student_ids = [student_ids[i] for i in source.tolist()]
+        year_code = academic_year.replace('/', '')
+        payment_ids = [
+            f"PAY-{student_id}-{year_code}-{counter:06d}"
+            for counter, student_id in enumerate(payment_student_ids, start=1)
+        ]
+        account_numbers = rng.integers(1000000000, 10000000000, count).tolist()
+        virtual_accounts = [f"{banks[code]}{number}" for code, number in zip(bank_codes.tolist(), account_numbers)]
+        proof_urls = [
+            f"https://payment-proof.ui.ac.id/{payment_id}.pdf" if is_paid else ''
+            for payment_id, is_paid in zip(payment_ids, paid.tolist())
+        ]
+
+        # Dictionary-encoded id columns
+        student_codes, student_dictionary = columnar_batch.encode_dictionary(student_ids)
+        registration_codes, registration_dictionary = columnar_batch.encode_dictionary(registration_ids)
+        student_codes = np.frombuffer(student_codes, dtype=np.uint32)
+        registration_codes = np.frombuffer(registration_codes, dtype=np.uint32)
+
+        now = columnar_batch.datetime_to_micros(datetime.now())
+        not_paid = ~paid
+        batch = columnar_batch.ColumnarBatch.from_columns(
+            'payment',
+            {
+                'payment_id': payment_ids,
+                'student_id': student_codes[source],
+                'registration_id': registration_codes[source],
+                'payment_type': kinds,
+                'payment_amount': amounts,
+                'bank_name': bank_codes,
+                'virtual_account_number': virtual_accounts,
+                'payment_channel': channel_codes,
+                'payment_time': np.where(paid, payment_times, 0),
+                'payment_status': status_codes,
+                'installment_number': installments,
+                'late_fee_charged': late_fees_charged,
+                'total_paid_amount': total_paid,
+                'payment_proof_url': proof_urls,
+                'due_date': due_dates,
+                'created_at': np.full(count, now),
+                'updated_at': np.full(count, now),
+                'academic_year': np.zeros(count, dtype=np.int64),
+            },
+            nulls={
+                'payment_time': not_paid,
+                'payment_proof_url': not_paid,
+            },
+            dictionaries={
+                'student_id': student_dictionary,
+                'registration_id': registration_dictionary,
+                'payment_type': PAYMENT_TYPES,
+                'bank_name': banks,
+                'payment_channel': static_data.PAYMENT_CHANNELS,
+                'payment_status': statuses,
+                'academic_year': [academic_year],
+            }
+        )
+        logging.info(f"✅ Synthesized {count} payments for {registration_count} registrations")
+        return batch
+
+def get_payment_engine(seed=None, stream=()):
+    """Factory function to get vectorized payment engine instance"""
+    return PaymentEngine(seed, stream)
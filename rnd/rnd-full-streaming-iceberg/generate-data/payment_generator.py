@@ -3,75 +3,75 @@
 import logging
 import random
 from datetime import datetime, date, timedelta
-from faker import Faker
+import static_data
 import db_utils
+import locale_providers
+import reference_cache
+import columnar_batch
+import sql_generation_engine
+import payment_engine
 
-fake = Faker('id_ID')
+fake = locale_providers.fake  # shared Faker('id_ID'), built on first use
 
 class PaymentGenerator:
-    def __init__(self):
-        self.db = db_utils.get_db_manager()
+    def __init__(self, db=None, cache=None):
+        self.db = db or db_utils.get_db_manager()
+        self.cache = cache or reference_cache.get_reference_cache(self.db)
         
     def generate_payments_for_registrations(self, academic_year, registrations):
         """Generate payments for student registrations"""
         try:
             logging.info(f"💰 Generating payments for {len(registrations)} registrations")
             
-            payments = []
+            payments = columnar_batch.get_batch('payment')
             payment_counter = 1
             
             # Bank options
-            banks = ['BNI', 'BCA', 'Mandiri', 'BRI', 'BSI', 'CIMB']
-            payment_channels = ['Virtual Account', 'Transfer Bank', 'Mobile Banking', 'ATM']
-            payment_types = ['UKT', 'BOP', 'Late Fee', 'Reregistration']
+            banks = static_data.PAYMENT_BANKS
+            payment_channels = static_data.PAYMENT_CHANNELS
+            
+            students = self.cache.students()
+            student_fees = self.cache.student_fees()
+            year_start = int(academic_year.split('/')[0])
             
             for registration_id, student_id, academic_year_reg, semester, semester_code, reg_date in registrations:
                 # Get student's fee information
-                fee_result = self.db.execute_query(
-                    "SELECT ukt_fee, bop_fee FROM student_fee WHERE student_id = %s",
-                    (student_id,)
-                )
+                fee_result = student_fees.get(student_id)
                 
                 if not fee_result:
                     # Generate default fees if not found
-                    ukt_fee = random.randint(5000000, 12500000)
+                    ukt_fee = random.randint(*static_data.DEFAULT_UKT_FEE_RANGE)
                     bop_fee = 0  # BOP usually only for new students
                 else:
-                    ukt_fee, bop_fee = fee_result[0]
+                    ukt_fee, bop_fee = fee_result
                 
                 # Generate UKT payment (every semester)
                 self._generate_payment(
                     payments, payment_counter, student_id, registration_id,
-                    'UKT', ukt_fee, reg_date, banks, payment_channels
+                    'UKT', ukt_fee, reg_date, banks, payment_channels, academic_year
                 )
                 payment_counter += 1
                 
                 # BOP payment (only for first year students, semester 1)
                 if semester == 1:
-                    # Check if this is the student's first registration
-                    first_reg = self.db.execute_query(
-                        """SELECT COUNT(*) FROM registration 
-                           WHERE student_id = %s AND registration_date < %s""",
-                        (student_id, reg_date)
-                    )
-                    
-                    is_first_registration = first_reg[0][0] == 0 if first_reg else True
+                    # First registration happens in the student's entry year
+                    is_first_registration = students.entry_year_of(student_id) == year_start
                     
                     if is_first_registration and bop_fee > 0:
                         self._generate_payment(
                             payments, payment_counter, student_id, registration_id,
-                            'BOP', bop_fee, reg_date, banks, payment_channels
+                            'BOP', bop_fee, reg_date, banks, payment_channels, academic_year
                         )
                         payment_counter += 1
                 
                 # Late fee (10% chance)
-                if random.random() < 0.1:
-                    late_fee = random.randint(100000, 500000)  # 100k - 500k IDR
-                    late_payment_date = reg_date + timedelta(days=random.randint(30, 60))
+                if random.random() < static_data.LATE_FEE_PROBABILITY:
+                    late_fee = random.randint(*static_data.LATE_FEE_RANGE)  # 100k - 500k IDR
+                    late_payment_date = reg_date + timedelta(days=random.randint(*static_data.LATE_FEE_PAYMENT_DELAY_DAYS))
                     
                     self._generate_payment(
                         payments, payment_counter, student_id, registration_id,
-                        'Late Fee', late_fee, late_payment_date, banks, payment_channels
+                        'Late Fee', late_fee, late_payment_date, banks, payment_channels, academic_year
                     )
                     payment_counter += 1
             
@@ -82,19 +82,34 @@ class PaymentGenerator:
             logging.error(f"❌ Error generating payments: {e}")
             raise
     
+    def generate_payments_vectorized(self, academic_year, registrations, seed=None):
+        """Generate payments for all registrations at once with the numpy payment engine"""
+        try:
+            logging.info(f"💰 Synthesizing payments for {len(registrations)} registrations (vectorized)")
+            engine = payment_engine.get_payment_engine(seed, stream=(int(academic_year.split('/')[0]),))
+            return engine.generate(academic_year, registrations, self.cache.students(), self.cache.student_fees())
+        except Exception as e:
+            logging.error(f"❌ Error synthesizing payments: {e}")
+            raise
+    
+    def generate_payments_in_database(self, academic_year, seed=None):
+        """Generate and insert payments server-side with one INSERT ... SELECT, returns row count"""
+        engine = sql_generation_engine.get_sql_generation_engine(self.db, seed)
+        return engine.generate_payments(academic_year)
+    
     def _generate_payment(self, payments, payment_counter, student_id, registration_id, 
-                         payment_type, amount, base_date, banks, payment_channels):
+                         payment_type, amount, base_date, banks, payment_channels, academic_year):
         """Generate a single payment record"""
         try:
-            payment_id = f"PAY-{student_id}-{payment_counter:06d}"
+            payment_id = f"PAY-{student_id}-{academic_year.replace('/', '')}-{payment_counter:06d}"
             bank_name = random.choice(banks)
             virtual_account = f"{bank_name}{random.randint(1000000000, 9999999999)}"
             payment_channel = random.choice(payment_channels)
             
             # Payment timing
             payment_status = random.choices(
-                ['paid', 'pending', 'overdue'], 
-                weights=[85, 10, 5]  # 85% paid, 10% pending, 5% overdue
+                list(static_data.PAYMENT_STATUS_WEIGHTS.keys()),
+                weights=list(static_data.PAYMENT_STATUS_WEIGHTS.values())  # 85% paid, 10% pending, 5% overdue
             )[0]
             
             payment_time = None
@@ -102,30 +117,30 @@ class PaymentGenerator:
             
             if payment_status == 'paid':
                 # Payment usually happens within 30 days of registration
-                days_after = random.randint(1, 30)
+                days_after = random.randint(*static_data.PAYMENT_DELAY_DAYS)
                 # Ensure base_date is a date object
                 if isinstance(base_date, datetime):
                     payment_date = base_date.date() + timedelta(days=days_after)
                 else:
                     payment_date = base_date + timedelta(days=days_after)
-                payment_time = datetime.combine(payment_date, fake.time())
+                payment_time = datetime.combine(payment_date, fake.time_object())
                 total_paid_amount = amount
                 
                 # Sometimes there's additional admin fee
-                if random.random() < 0.2:  # 20% chance
-                    admin_fee = random.randint(5000, 25000)
+                if random.random() < static_data.ADMIN_FEE_PROBABILITY:  # 20% chance
+                    admin_fee = random.randint(*static_data.ADMIN_FEE_RANGE)
                     total_paid_amount += admin_fee
             
             # Due date (usually 30 days from registration)
             if isinstance(base_date, datetime):
-                due_date = base_date.date() + timedelta(days=30)
+                due_date = base_date.date() + timedelta(days=static_data.PAYMENT_DUE_DAYS)
             else:
-                due_date = base_date + timedelta(days=30)
+                due_date = base_date + timedelta(days=static_data.PAYMENT_DUE_DAYS)
             
             # Late fee
             late_fee_charged = 0
             if payment_status == 'overdue' or (payment_time and payment_time.date() > due_date):
-                late_fee_charged = random.randint(50000, 200000)  # 50k - 200k IDR
+                late_fee_charged = random.randint(*static_data.OVERDUE_FEE_RANGE)  # 50k - 200k IDR
                 total_paid_amount += late_fee_charged
             
             # Payment proof URL (for paid payments)
@@ -135,8 +150,8 @@ class PaymentGenerator:
             
             # Installment number (most payments are single installment)
             installment_number = 1
-            if payment_type == 'BOP' and amount > 50000000:  # Large BOP can be installments
-                installment_number = random.choice([1, 2, 3])
+            if payment_type == 'BOP' and amount > static_data.BOP_INSTALLMENT_THRESHOLD:  # Large BOP can be installments
+                installment_number = random.choice(static_data.BOP_INSTALLMENT_CHOICES)
             
             payments.append((
                 payment_id,
@@ -155,13 +170,14 @@ class PaymentGenerator:
                 payment_proof_url,
                 due_date,
                 datetime.now(),
-                datetime.now()
+                datetime.now(),
+                academic_year
             ))
             
         except Exception as e:
             logging.error(f"❌ Error generating single payment: {e}")
             raise
 
-def get_payment_generator():
+def get_payment_generator(db=None, cache=None):
     """Factory function to get payment generator instance"""
-    return PaymentGenerator() 
\ No newline at end of file
+    return PaymentGenerator(db, cache) 
\ No newline at end of file
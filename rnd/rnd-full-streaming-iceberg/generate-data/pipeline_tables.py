@@ -0,0 +1,231 @@
+"""Tables replicated by the CDC pipeline: the one schema Flink DDL and Iceberg writers derive from"""
+
+# Per source table, in dependency order:
+#   columns      - (name, Flink SQL type) in Postgres column order
+#   primary_key  - key columns (Iceberg identifier fields, upsert key)
+#   parallelism  - write parallelism of the table's Iceberg sink
+#   partition_by - optional Iceberg partition fields: a column (identity) or a
+#                  transform such as 'day(payment_time)' or 'bucket(16, student_id)'
+#   sort_by      - optional sort order of the data files
+#   upsert       - whether the sink upserts by primary key (format v2 with equality deletes);
+#                  the upsert key also takes the partition columns, which must be NOT NULL
+PIPELINE_TABLES = {
+    'faculty': {
+        'columns': [
+            ('id', 'INT'),
+            ('faculty_code', 'STRING'),
+            ('faculty_name', 'STRING'),
+            ('created_at', 'TIMESTAMP(3)'),
+        ],
+        'primary_key': ['id'],
+        'parallelism': 1,
+        'upsert': False,
+    },
+    'program': {
+        'columns': [
+            ('id', 'INT'),
+            ('program_code', 'STRING'),
+            ('program_name', 'STRING'),
+            ('faculty_id', 'INT'),
+            ('degree', 'STRING'),
+            ('created_at', 'TIMESTAMP(3)'),
+        ],
+        'primary_key': ['id'],
+        'parallelism': 1,
+        'upsert': False,
+    },
+    'students': {
+        'columns': [
+            ('student_id', 'STRING'),
+            ('full_name', 'STRING'),
+            ('entry_year', 'INT'),
+            ('program_id', 'INT'),
+            ('degree', 'STRING'),
+            ('faculty_id', 'INT'),
+            ('status', 'STRING'),
+            ('created_at', 'TIMESTAMP(3)'),
+        ],
+        'primary_key': ['student_id'],
+        'parallelism': 1,
+        'upsert': True,  # status changes every academic year
+    },
+    'student_detail': {
+        'columns': [
+            ('id', 'INT'),
+            ('student_id', 'STRING'),
+            ('gender', 'STRING'),
+            ('birth_date', 'DATE'),
+            ('birth_place', 'STRING'),
+            ('religion', 'STRING'),
+            ('nationality', 'STRING'),
+            ('registration_date', 'DATE'),
+            ('address', 'STRING'),
+            ('city', 'STRING'),
+            ('province', 'STRING'),
+            ('postal_code', 'STRING'),
+            ('phone_number', 'STRING'),
+            ('high_school', 'STRING'),
+            ('high_school_year', 'INT'),
+            ('parent_name', 'STRING'),
+            ('parent_income', 'DECIMAL(15,2)'),
+            ('parent_occupation', 'STRING'),
+            ('blood_type', 'STRING'),
+            ('health_insurance', 'STRING'),
+            ('accommodation', 'STRING'),
+            ('created_at', 'TIMESTAMP(3)'),
+        ],
+        'primary_key': ['id'],
+        'parallelism': 1,
+        'upsert': False,
+    },
+    'student_fee': {
+        'columns': [
+            ('fee_id', 'STRING'),
+            ('student_id', 'STRING'),
+            ('ukt_fee', 'DECIMAL(12,2)'),
+            ('bop_fee', 'DECIMAL(12,2)'),
+            ('updated_at', 'TIMESTAMP(3)'),
+        ],
+        'primary_key': ['fee_id'],
+        'parallelism': 1,
+        'upsert': True,
+    },
+    'lecturer': {
+        'columns': [
+            ('id', 'INT'),
+            ('lecturer_id', 'STRING'),
+            ('name', 'STRING'),
+            ('email', 'STRING'),
+            ('faculty_id', 'INT'),
+            ('created_at', 'TIMESTAMP(3)'),
+        ],
+        'primary_key': ['id'],
+        'parallelism': 1,
+        'upsert': False,
+    },
+    'room': {
+        'columns': [
+            ('id', 'INT'),
+            ('room_code', 'STRING'),
+            ('building', 'STRING'),
+            ('capacity', 'INT'),
+            ('created_at', 'TIMESTAMP(3)'),
+        ],
+        'primary_key': ['id'],
+        'parallelism': 1,
+        'upsert': False,
+    },
+    'course': {
+        'columns': [
+            ('id', 'INT'),
+            ('course_code', 'STRING'),
+            ('course_name', 'STRING'),
+            ('credits', 'INT'),
+            ('program_id', 'INT'),
+            ('created_at', 'TIMESTAMP(3)'),
+        ],
+        'primary_key': ['id'],
+        'parallelism': 1,
+        'upsert': False,
+    },
+    'registration': {
+        'columns': [
+            ('registration_id', 'STRING'),
+            ('student_id', 'STRING'),
+            ('academic_year', 'STRING'),
+            ('semester', 'INT'),
+            ('semester_code', 'STRING'),
+            ('registration_date', 'DATE'),
+            ('registration_status', 'STRING'),
+            ('total_sks', 'INT'),
+            ('late_registration', 'BOOLEAN'),
+            ('created_at', 'TIMESTAMP(3)'),
+            ('updated_at', 'TIMESTAMP(3)'),
+        ],
+        'primary_key': ['registration_id'],
+        'parallelism': 2,
+        'partition_by': ['academic_year', 'semester'],
+        'sort_by': ['student_id'],
+        'upsert': True,
+    },
+    'class': {
+        'columns': [
+            ('class_id', 'STRING'),
+            ('course_id', 'INT'),
+            ('lecturer_id', 'INT'),
+            ('academic_year', 'STRING'),
+            ('semester', 'INT'),
+            ('class_code', 'STRING'),
+            ('room_code', 'STRING'),
+            ('schedule_day', 'STRING'),
+            ('schedule_time', 'STRING'),
+            ('capacity', 'INT'),
+            ('enrolled_count', 'INT'),
+            ('class_status', 'STRING'),
+            ('created_at', 'TIMESTAMP(3)'),
+        ],
+        'primary_key': ['class_id'],
+        'parallelism': 1,
+        'partition_by': ['academic_year', 'semester'],
+        'sort_by': ['course_id'],
+        'upsert': True,  # enrolled_count is updated as students enroll
+    },
+    'student_enrollment': {
+        'columns': [
+            ('enrollment_id', 'INT'),
+            ('student_id', 'STRING'),
+            ('registration_id', 'STRING'),
+            ('class_id', 'STRING'),
+            ('enrollment_date', 'DATE'),
+            ('enrollment_status', 'STRING'),
+            ('final_grade', 'DECIMAL(5,2)'),
+            ('grade_point', 'DECIMAL(3,2)'),
+            ('attendance_percentage', 'DECIMAL(5,2)'),
+            ('created_at', 'TIMESTAMP(3)'),
+            ('updated_at', 'TIMESTAMP(3)'),
+            ('academic_year', 'STRING'),
+        ],
+        'primary_key': ['enrollment_id'],
+        'parallelism': 4,
+        'partition_by': ['academic_year', 'bucket(8, student_id)'],
+        'sort_by': ['class_id'],
+        'upsert': False,  # insert-only, and academic_year is nullable so it cannot join the upsert key
+    },
+    'payment': {
+        'columns': [
+            ('payment_id', 'STRING'),
+            ('student_id', 'STRING'),
+            ('registration_id', 'STRING'),
+            ('payment_type', 'STRING'),
+            ('payment_amount', 'DECIMAL(12,2)'),
+            ('bank_name', 'STRING'),
+            ('virtual_account_number', 'STRING'),
+            ('payment_channel', 'STRING'),
+            ('payment_time', 'TIMESTAMP(3)'),
+            ('payment_status', 'STRING'),
+            ('installment_number', 'INT'),
+            ('late_fee_charged', 'DECIMAL(12,2)'),
+            ('total_paid_amount', 'DECIMAL(12,2)'),
+            ('payment_proof_url', 'STRING'),
+            ('due_date', 'DATE'),
+            ('created_at', 'TIMESTAMP(3)'),
+            ('updated_at', 'TIMESTAMP(3)'),
+            ('academic_year', 'STRING'),
+        ],
+        'primary_key': ['payment_id'],
+        'parallelism': 2,
+        'partition_by': ['academic_year', 'month(payment_time)'],
+        'sort_by': ['student_id'],
+        'upsert': False,  # insert-only, and payment_time is null until paid so it cannot join the upsert key
+    },
+}
+
+def get_table_names():
+    """Replicated tables in dependency order"""
+    return list(PIPELINE_TABLES)
+
+def get_column_names(table_name):
+    return [name for name, _ in PIPELINE_TABLES[table_name]['columns']]
+
+def get_primary_key(table_name):
+    return list(PIPELINE_TABLES[table_name]['primary_key'])
@@ -0,0 +1,217 @@
+"""In-process reference data cache shared across generator steps"""
+
+import logging
+from array import array
+
+class ProgramRecord:
+    __slots__ = ('id', 'program_code', 'program_name', 'faculty_id', 'degree')
+
+    def __init__(self, id, program_code, program_name, faculty_id, degree):
+        self.id = id
+        self.program_code = program_code
+        self.program_name = program_name
+        self.faculty_id = faculty_id
+        self.degree = degree
+
+class CourseRecord:
+    __slots__ = ('id', 'course_code', 'course_name', 'credits', 'program_id')
+
+    def __init__(self, id, course_code, course_name, credits, program_id):
+        self.id = id
+        self.course_code = course_code
+        self.course_name = course_name
+        self.credits = credits
+        self.program_id = program_id
+
+class LecturerRecord:
+    __slots__ = ('id', 'lecturer_id', 'name', 'faculty_id')
+
+    def __init__(self, id, lecturer_id, name, faculty_id):
+        self.id = id
+        self.lecturer_id = lecturer_id
+        self.name = name
+        self.faculty_id = faculty_id
+
+class RoomRecord:
+    __slots__ = ('id', 'room_code', 'building', 'capacity')
+
+    def __init__(self, id, room_code, building, capacity):
+        self.id = id
+        self.room_code = room_code
+        self.building = building
+        self.capacity = capacity
+
+class StudentTable:
+    """Array-backed student dimension (one typed array per column)"""
+    __slots__ = ('student_ids', 'entry_years', 'program_ids', 'faculty_ids', 'status_codes', 'status_values', '_index')
+
+    def __init__(self, rows):
+        """rows: (student_id, entry_year, program_id, faculty_id, status)"""
+        self.student_ids = []
+        self.entry_years = array('i')
+        self.program_ids = array('i')
+        self.faculty_ids = array('i')
+        self.status_codes = array('B')
+        self.status_values = []
+        self._index = {}
+        status_lookup = {}
+
+        for student_id, entry_year, program_id, faculty_id, status in rows:
+            if status not in status_lookup:
+                status_lookup[status] = len(self.status_values)
+                self.status_values.append(status)
+            self._index[student_id] = len(self.student_ids)
+            self.student_ids.append(student_id)
+            self.entry_years.append(entry_year)
+            self.program_ids.append(program_id)
+            self.faculty_ids.append(faculty_id)
+            self.status_codes.append(status_lookup[status])
+
+    def __len__(self):
+        return len(self.student_ids)
+
+    def index_of(self, student_id):
+        """Row index of a student, or None if unknown"""
+        return self._index.get(student_id)
+
+    def program_id_of(self, student_id):
+        index = self._index.get(student_id)
+        return self.program_ids[index] if index is not None else None
+
+    def entry_year_of(self, student_id):
+        index = self._index.get(student_id)
+        return self.entry_years[index] if index is not None else None
+
+    def status_of(self, student_id):
+        index = self._index.get(student_id)
+        return self.status_values[self.status_codes[index]] if index is not None else None
+
+    def indices_with_status(self, status):
+        """Row indices of all students with the given status"""
+        if status not in self.status_values:
+            return []
+        code = self.status_values.index(status)
+        return [i for i, value in enumerate(self.status_codes) if value == code]
+
+class StudentFeeTable:
+    """Array-backed student_fee dimension keyed by student_id"""
+    __slots__ = ('ukt_fees', 'bop_fees', '_index')
+
+    def __init__(self, rows):
+        """rows: (student_id, ukt_fee, bop_fee)"""
+        self.ukt_fees = array('q')
+        self.bop_fees = array('q')
+        self._index = {}
+
+        for student_id, ukt_fee, bop_fee in rows:
+            self._index[student_id] = len(self.ukt_fees)
+            self.ukt_fees.append(int(ukt_fee or 0))
+            self.bop_fees.append(int(bop_fee or 0))
+
+    def __len__(self):
+        return len(self.ukt_fees)
+
+    def get(self, student_id):
+        """(ukt_fee, bop_fee) for a student, or None if no fee record exists"""
+        index = self._index.get(student_id)
+        if index is None:
+            return None
+        return self.ukt_fees[index], self.bop_fees[index]
+
+# Dimension name -> (source table, query, loader)
+DIMENSIONS = {
+    'programs': (
+        'program',
+        "SELECT id, program_code, program_name, faculty_id, degree FROM program ORDER BY id",
+        lambda rows: [ProgramRecord(*row) for row in rows]
+    ),
+    'courses': (
+        'course',
+        "SELECT id, course_code, course_name, credits, program_id FROM course ORDER BY id",
+        lambda rows: [CourseRecord(*row) for row in rows]
+    ),
+    'lecturers': (
+        'lecturer',
+        "SELECT id, lecturer_id, name, faculty_id FROM lecturer ORDER BY id",
+        lambda rows: [LecturerRecord(*row) for row in rows]
+    ),
+    'rooms': (
+        'room',
+        "SELECT id, room_code, building, capacity FROM room ORDER BY id",
+        lambda rows: [RoomRecord(*row) for row in rows]
+    ),
+    'students': (
+        'students',
+        "SELECT student_id, entry_year, program_id, faculty_id, status FROM students ORDER BY student_id",
+        StudentTable
+    ),
+    'active_students': (
+        'students',
+        "SELECT student_id, entry_year, program_id, faculty_id, status FROM students WHERE status = 'active' ORDER BY student_id",
+        StudentTable
+    ),
+    'student_fees': (
+        'student_fee',
+        "SELECT student_id, ukt_fee, bop_fee FROM student_fee",
+        StudentFeeTable
+    ),
+}
+
+class ReferenceDataCache:
+    """
+    Loads each reference dimension once per run and keeps it until a write
+    to the underlying table is reported by the DatabaseManager.
+    """
+
+    def __init__(self, db):
+        self.db = db
+        self._data = {}
+        self.loads = 0
+        self.hits = 0
+        db.add_write_listener(self.invalidate)
+
+    def _get(self, dimension):
+        if dimension in self._data:
+            self.hits += 1
+            return self._data[dimension]
+
+        table_name, query, loader = DIMENSIONS[dimension]
+        rows = self.db.execute_query(query) if self.db.table_exists(table_name) else []
+        data = loader(rows)
+        self._data[dimension] = data
+        self.loads += 1
+        logging.info(f"🗃️ Cached {len(data)} {dimension}")
+        return data
+
+    def invalidate(self, table_name=None):
+        """Drop cached dimensions backed by table_name (all dimensions if None)"""
+        for dimension, (source_table, query, loader) in DIMENSIONS.items():
+            if dimension in self._data and (table_name is None or source_table == table_name):
+                del self._data[dimension]
+                logging.info(f"♻️ Invalidated cached {dimension} after write to {table_name or 'schema'}")
+
+    def programs(self):
+        return self._get('programs')
+
+    def courses(self):
+        return self._get('courses')
+
+    def lecturers(self):
+        return self._get('lecturers')
+
+    def rooms(self):
+        return self._get('rooms')
+
+    def students(self):
+        return self._get('students')
+
+    def active_students(self):
+        """Students with status 'active' only (served by the idx_students_active partial index)"""
+        return self._get('active_students')
+
+    def student_fees(self):
+        return self._get('student_fees')
+
+def get_reference_cache(db):
+    """Factory function to get a reference data cache bound to a database manager"""
+    return ReferenceDataCache(db)
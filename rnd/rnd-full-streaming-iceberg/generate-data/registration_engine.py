@@ -0,0 +1,113 @@
+"""Vectorized registration batch builder over the whole student roster"""
+
+import calendar
+import logging
+from datetime import date, datetime
+import static_data
+import columnar_batch
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+    logging.warning("⚠️ numpy is not available, vectorized registration engine disabled")
+
+class RegistrationEngine:
+    """
+    Builds a semester's registrations for every active student in array form.
+
+    Mirrors AcademicGenerator.generate_registration_for_semester: study year
+    window, skip draw, registration date, target SKS band and late flag are
+    drawn for the whole roster at once. Days are sampled within the length
+    of the drawn month, so dates are always valid.
+    """
+
+    def __init__(self, seed=None, stream=()):
+        if not NUMPY_AVAILABLE:
+            raise ImportError("numpy is required for the vectorized registration engine")
+        # stream = (year, semester): each semester draws independently of the others
+        self.rng = np.random.default_rng(None if seed is None else [seed, *stream])
+
+    def draw_dates(self, year, first_month, last_month, size):
+        """Date ordinals uniform over the days of [first_month, last_month] of a year"""
+        months = np.arange(first_month, last_month + 1)
+        first_days = np.array([date(year, month, 1).toordinal() for month in months])
+        month_lengths = np.array([calendar.monthrange(year, month)[1] for month in months])
+
+        # Month first, then a day within that month (same as randint(month) + valid randint(day))
+        month_index = self.rng.integers(0, len(months), size)
+        days = np.floor(self.rng.random(size) * month_lengths[month_index]).astype(np.int64)
+        return first_days[month_index] + days
+
+    def draw_target_sks(self, student_years):
+        """Target SKS per registration from static_data.REGISTRATION_SKS_BANDS"""
+        last_years = np.array([band[0] for band in static_data.REGISTRATION_SKS_BANDS])
+        lows = np.array([band[1][0] for band in static_data.REGISTRATION_SKS_BANDS])
+        highs = np.array([band[1][1] for band in static_data.REGISTRATION_SKS_BANDS])
+        bands = np.minimum(np.searchsorted(last_years, student_years, side='left'), len(last_years) - 1)
+        return lows[bands] + np.floor(self.rng.random(len(student_years)) * (highs[bands] - lows[bands] + 1)).astype(np.int64)
+
+    def generate(self, academic_year, semester, students):
+        """
+        students: reference_cache StudentTable
+        Returns a columnar batch for the registration table.
+        """
+        rng = self.rng
+        year_start = int(academic_year.split('/')[0])
+        year_code = academic_year.replace('/', '')
+        semester_code = f"{year_code}-{semester}"
+
+        # Roster arrays straight from the cache's typed arrays
+        entry_years = np.frombuffer(students.entry_years, dtype=np.int32).astype(np.int64)
+        status_codes = np.frombuffer(students.status_codes, dtype=np.uint8)
+        if 'active' not in students.status_values:
+            logging.warning("⚠️ No active students found")
+            return columnar_batch.get_batch('registration')
+
+        student_years = year_start - entry_years + 1
+        eligible = (
+            (status_codes == students.status_values.index('active'))
+            & (student_years > 0) & (student_years <= static_data.MAX_STUDY_YEARS)
+        )
+        registering = eligible & (rng.random(len(entry_years)) >= static_data.REGISTRATION_SKIP_PROBABILITY)
+        rows = np.flatnonzero(registering)
+        count = len(rows)
+
+        first_month, last_month = static_data.REGISTRATION_MONTHS[semester]
+        registration_dates = self.draw_dates(year_start, first_month, last_month, count)
+        target_sks = self.draw_target_sks(student_years[rows])
+        late_registration = rng.random(count) < static_data.LATE_REGISTRATION_PROBABILITY
+
+        student_ids = [students.student_ids[row] for row in rows.tolist()]
+        registration_ids = [f"REG-{student_id}-{year_code}-{semester}" for student_id in student_ids]
+
+        now = columnar_batch.datetime_to_micros(datetime.now())
+        zeros = np.zeros(count, dtype=np.int64)
+        batch = columnar_batch.ColumnarBatch.from_columns(
+            'registration',
+            {
+                'registration_id': registration_ids,
+                'student_id': student_ids,
+                'academic_year': zeros,
+                'semester': np.full(count, semester),
+                'semester_code': zeros,
+                'registration_date': registration_dates,
+                'registration_status': zeros,
+                'total_sks': target_sks,
+                'late_registration': late_registration,
+                'created_at': np.full(count, now),
+                'updated_at': np.full(count, now),
+            },
+            dictionaries={
+                'academic_year': [academic_year],
+                'semester_code': [semester_code],
+                'registration_status': ['active'],
+            }
+        )
+        logging.info(f"✅ Built {count} registrations from {int(eligible.sum())} eligible students")
+        return batch
+
+def get_registration_engine(seed=None, stream=()):
+    """Factory function to get vectorized registration engine instance"""
+    return RegistrationEngine(seed, stream)
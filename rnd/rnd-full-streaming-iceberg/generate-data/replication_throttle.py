@@ -0,0 +1,154 @@
+"""Replication-lag-aware throttling for CDC-safe bulk loads"""
+
+import logging
+import os
+import time
+
+# Debezium slot from debezium/university-connector.json and default lag budget
+CDC_SLOT_NAME = os.getenv("CDC_SLOT_NAME", "university_slot")
+CDC_MAX_LAG_BYTES = int(os.getenv("CDC_MAX_LAG_BYTES", str(64 * 1024 * 1024)))
+CDC_MAX_LAG_SECONDS = float(os.getenv("CDC_MAX_LAG_SECONDS", "10"))
+
+# Chunk sizing (rows per committed chunk)
+MIN_CHUNK_SIZE = 500
+MAX_CHUNK_SIZE = 50000
+INITIAL_CHUNK_SIZE = 5000
+CHUNK_SIZE_STEP = 1000
+
+# Waiting for the slot to catch up
+POLL_INTERVAL_SECONDS = 0.5
+MAX_WAIT_SECONDS = 300
+
+class ReplicationLagMonitor:
+    """Reads how far a replication slot's consumer is behind the current WAL position"""
+
+    def __init__(self, db, slot_name=CDC_SLOT_NAME):
+        self.db = db
+        self.slot_name = slot_name
+
+    def read_lag(self):
+        """
+        (lag_bytes, lag_seconds) of the slot.
+
+        lag_bytes is the WAL not yet confirmed by the consumer
+        (pg_replication_slots); lag_seconds is the walsender's reported
+        write/flush/replay lag (pg_stat_replication), None when the consumer
+        is not connected. Returns (None, None) when the slot does not exist.
+        """
+        result = self.db.execute_query(
+            """SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), s.confirmed_flush_lsn),
+                      EXTRACT(EPOCH FROM COALESCE(r.replay_lag, r.flush_lag, r.write_lag))
+               FROM pg_replication_slots s
+               LEFT JOIN pg_stat_replication r ON r.pid = s.active_pid
+               WHERE s.slot_name = %s""",
+            (self.slot_name,)
+        )
+        if not result:
+            return None, None
+        lag_bytes, lag_seconds = result[0]
+        return (
+            int(lag_bytes) if lag_bytes is not None else None,
+            float(lag_seconds) if lag_seconds is not None else None
+        )
+
+class LoadThrottle:
+    """
+    Adapts load chunk size and pace so a CDC slot stays within a lag budget.
+
+    Loaders commit one chunk at a time and call after_chunk(), which returns
+    the next chunk size. While the slot lag is within budget the chunk grows
+    additively; when it is exceeded the chunk is halved and the loader waits
+    until the lag has drained to half the budget (AIMD, like TCP congestion
+    control). report() summarises sustained throughput under the constraint.
+    """
+
+    def __init__(self, monitor, max_lag_bytes=CDC_MAX_LAG_BYTES, max_lag_seconds=CDC_MAX_LAG_SECONDS,
+                 initial_chunk_size=INITIAL_CHUNK_SIZE, min_chunk_size=MIN_CHUNK_SIZE, max_chunk_size=MAX_CHUNK_SIZE):
+        self.monitor = monitor
+        self.max_lag_bytes = max_lag_bytes
+        self.max_lag_seconds = max_lag_seconds
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self.chunk_size = initial_chunk_size
+
+        self.rows = 0
+        self.chunks = 0
+        self.throttle_events = 0
+        self.wait_seconds = 0.0
+        self.peak_lag_bytes = 0
+        self.peak_lag_seconds = 0.0
+        self.started_at = None
+        self.slot_missing = False
+
+    def _over_budget(self, lag_bytes, lag_seconds, factor=1.0):
+        if lag_bytes is not None and self.max_lag_bytes and lag_bytes > self.max_lag_bytes * factor:
+            return True
+        if lag_seconds is not None and self.max_lag_seconds and lag_seconds > self.max_lag_seconds * factor:
+            return True
+        return False
+
+    def _read_lag(self):
+        lag_bytes, lag_seconds = self.monitor.read_lag()
+        if lag_bytes is None and lag_seconds is None:
+            if not self.slot_missing:
+                logging.warning(f"⚠️ Replication slot {self.monitor.slot_name} not found, loading unthrottled")
+                self.slot_missing = True
+            return None, None
+        self.peak_lag_bytes = max(self.peak_lag_bytes, lag_bytes or 0)
+        self.peak_lag_seconds = max(self.peak_lag_seconds, lag_seconds or 0.0)
+        return lag_bytes, lag_seconds
+
+    def start(self):
+        """Mark the start of a load (first call of next_chunk_size also does this)"""
+        if self.started_at is None:
+            self.started_at = time.monotonic()
+
+    def next_chunk_size(self):
+        self.start()
+        return self.chunk_size
+
+    def after_chunk(self, row_count):
+        """Record a committed chunk, wait out excess lag and return the next chunk size"""
+        self.rows += row_count
+        self.chunks += 1
+
+        lag_bytes, lag_seconds = self._read_lag()
+        if not self._over_budget(lag_bytes, lag_seconds):
+            self.chunk_size = min(self.max_chunk_size, self.chunk_size + CHUNK_SIZE_STEP)
+            return self.chunk_size
+
+        self.throttle_events += 1
+        self.chunk_size = max(self.min_chunk_size, self.chunk_size // 2)
+        logging.info(f"🐢 CDC lag {lag_bytes} bytes / {lag_seconds}s over budget, chunk size now {self.chunk_size}")
+
+        # Wait for the consumer to drain the backlog to half the budget
+        wait_started = time.monotonic()
+        while self._over_budget(lag_bytes, lag_seconds, factor=0.5):
+            if time.monotonic() - wait_started > MAX_WAIT_SECONDS:
+                logging.warning(f"⚠️ CDC lag did not drain within {MAX_WAIT_SECONDS}s, continuing")
+                break
+            time.sleep(POLL_INTERVAL_SECONDS)
+            lag_bytes, lag_seconds = self._read_lag()
+        self.wait_seconds += time.monotonic() - wait_started
+        return self.chunk_size
+
+    def report(self):
+        """Throughput and lag summary of the loads run through this throttle"""
+        elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+        return {
+            'rows': self.rows,
+            'chunks': self.chunks,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(self.rows / elapsed, 1) if elapsed else 0.0,
+            'throttle_events': self.throttle_events,
+            'wait_seconds': round(self.wait_seconds, 3),
+            'peak_lag_bytes': self.peak_lag_bytes,
+            'peak_lag_seconds': round(self.peak_lag_seconds, 3),
+            'final_chunk_size': self.chunk_size,
+            'max_lag_bytes': self.max_lag_bytes,
+            'max_lag_seconds': self.max_lag_seconds,
+        }
+
+def get_load_throttle(db, slot_name=CDC_SLOT_NAME, max_lag_bytes=CDC_MAX_LAG_BYTES, max_lag_seconds=CDC_MAX_LAG_SECONDS):
+    """Factory function to get a load throttle watching a replication slot"""
+    return LoadThrottle(ReplicationLagMonitor(db, slot_name), max_lag_bytes, max_lag_seconds)
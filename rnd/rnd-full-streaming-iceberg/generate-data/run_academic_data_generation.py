@@ -26,10 +26,11 @@ def main(academic_year=None):
         # Import local modules
         import academic_generator
         import db_utils
+        import table_schemas
         
         # Get generator
-        generator = academic_generator.get_academic_generator()
         db = db_utils.get_db_manager()
+        generator = academic_generator.get_academic_generator(db)
         
         # Check if academic data for this year already exists
         existing_registrations = 0
@@ -63,26 +64,14 @@ def main(academic_year=None):
             # Generate registrations for this semester
             registrations = generator.generate_registration_for_semester(academic_year, semester)
             if registrations:
-                registration_columns = [
-                    'registration_id', 'student_id', 'academic_year', 'semester',
-                    'semester_code', 'registration_date', 'registration_status',
-                    'total_sks', 'late_registration', 'created_at', 'updated_at'
-                ]
-                
-                inserted_reg_count = db.bulk_insert_data('registration', registration_columns, registrations)
+                inserted_reg_count = db.bulk_insert_data('registration', table_schemas.get_column_names('registration'), registrations)
                 total_registrations += inserted_reg_count
                 print(f"✅ Inserted {inserted_reg_count} registrations for semester {semester}")
             
             # Generate classes for this semester
             classes = generator.generate_classes_for_semester(academic_year, semester)
             if classes:
-                class_columns = [
-                    'class_id', 'course_id', 'lecturer_id', 'academic_year', 'semester',
-                    'class_code', 'room_code', 'schedule_day', 'schedule_time',
-                    'capacity', 'enrolled_count', 'class_status', 'created_at'
-                ]
-                
-                inserted_class_count = db.bulk_insert_data('class', class_columns, classes)
+                inserted_class_count = db.bulk_insert_data('class', table_schemas.get_column_names('class'), classes)
                 total_classes += inserted_class_count
                 print(f"✅ Inserted {inserted_class_count} classes for semester {semester}")
         
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Run the generator benchmark suite, compare it with the JSON baseline and fail on regressions"""
+
+import argparse
+import json
+import logging
+import sys
+
+# Setup logging (warnings only by default: per-row INFO logging would dominate the timings)
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def main(scales=None, engines=None, repeats=3, trace_memory=True, macro=None, macro_count=1000, seed=42,
+         baseline_path=None, threshold=None, update_baseline=False, output=None):
+    """Run the micro benchmarks (and the macro ones), print them and gate them against the baseline"""
+    try:
+        import benchmark_suite
+
+        baseline_path = baseline_path or benchmark_suite.BASELINE_PATH
+        threshold = benchmark_suite.REGRESSION_THRESHOLD if threshold is None else threshold
+        scales = scales or list(benchmark_suite.DEFAULT_SCALES)
+        engines = engines or ['python']
+
+        print(f"🧪 Generator benchmarks: scales {scales}, engines {engines}, {repeats} timed passes each")
+        results = benchmark_suite.micro_benchmarks(scales, engines, seed=seed, repeats=repeats, trace_memory=trace_memory)
+        for target in macro or []:
+            for engine in engines:
+                print(f"🧪 End-to-end run_complete_generation ({target}, {engine}, {macro_count} students)")
+                results.update(benchmark_suite.macro_benchmark(macro_count, engine=engine, seed=seed,
+                                                               in_memory=target == 'memory'))
+
+        print(f"\n{'benchmark':<50} {'rows':>9} {'rows/s':>11} {'peak MB':>9}")
+        for name, metrics in results.items():
+            rows = metrics.get('rows', metrics.get('students'))
+            peak = metrics.get('peak_memory_mb')
+            print(f"{name:<50} {rows:>9} {metrics['rows_per_second'] or 0:>11.1f} "
+                  f"{peak if peak is not None else '-':>9}")
+
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"\n📄 Results written to {output}")
+
+        if update_baseline:
+            benchmark_suite.save_baseline(results, baseline_path)
+            print(f"\n💾 Baseline updated: {baseline_path}")
+            return True
+
+        baseline = benchmark_suite.load_baseline(baseline_path)
+        if baseline is None:
+            print(f"\n❌ No baseline at {baseline_path} to gate against; run with --update-baseline to record one")
+            return False
+
+        regressions = benchmark_suite.compare(results, baseline, threshold)
+        if not regressions:
+            print(f"\n✅ No regressions beyond {threshold:.0%} against {baseline_path} (recorded {baseline.get('updated')})")
+            return True
+
+        print(f"\n❌ {len(regressions)} regression(s) beyond {threshold:.0%}:")
+        for regression in regressions:
+            print(f"   {regression['benchmark']} {regression['metric']}: {regression['baseline']} → "
+                  f"{regression['current']} ({regression['change']:+.0%})")
+        return False
+
+    except Exception as e:
+        print(f"❌ Benchmark suite error: {e}")
+        logging.error(f"❌ Benchmark suite error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generator benchmark suite with regression gates')
+    parser.add_argument('--scales', type=int, nargs='+', help='Student counts to benchmark the generators at (default 100 1000)')
+    parser.add_argument('--engines', nargs='+', choices=['python', 'vectorized'], help='Engines to benchmark (default python)')
+    parser.add_argument('--repeats', type=int, default=3, help='Timed passes per scale (the fastest is kept)')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass measuring peak memory')
+    parser.add_argument('--macro', nargs='+', choices=['postgres', 'memory'],
+                        help='Also time run_complete_generation end to end against PostgreSQL and/or the in-memory database')
+    parser.add_argument('--macro-count', type=int, default=1000, help='Students of the end-to-end runs')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--baseline', type=str, help='Baseline JSON (default BENCHMARK_BASELINE or benchmark_baseline.json)')
+    parser.add_argument('--threshold', type=float, help='Relative change that fails the run (default 0.2)')
+    parser.add_argument('--update-baseline', action='store_true', help='Record these results as the baseline instead of gating')
+    parser.add_argument('--output', type=str, help='Write the results as JSON')
+
+    args = parser.parse_args()
+    success = main(args.scales, args.engines, args.repeats, not args.no_memory, args.macro, args.macro_count, args.seed,
+                   args.baseline, args.threshold, args.update_baseline, args.output)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Report end-to-end CDC freshness of tracer marker rows (Postgres -> change stream -> Iceberg)"""
+
+import argparse
+import json
+import logging
+import sys
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def main(source='file', warehouse=None, manifest_path=None, run_id=None, timeout=300, poll_interval=2.0, output=None):
+    """Poll for the tracer markers and print p50/p95/p99 lag per table and stage"""
+    try:
+        import cdc_latency_tracer
+        import cdc_freshness_probe
+
+        probe = cdc_freshness_probe.get_cdc_freshness_probe(
+            event_log_kind=None if source == 'none' else source,
+            warehouse=warehouse or cdc_freshness_probe.ICEBERG_WAREHOUSE,
+            manifest_path=manifest_path or cdc_latency_tracer.CDC_TRACE_MANIFEST,
+            run_id=run_id
+        )
+        print(f"🛰️ Probing CDC freshness (change stream: {source}, warehouse: {warehouse or cdc_freshness_probe.ICEBERG_WAREHOUSE})")
+        report = probe.run(timeout, poll_interval)
+
+        if not report:
+            print("⚠️ No tracer markers found - run the generation with --trace-cdc first")
+            return False
+
+        print(f"\n{'table':<20} {'stage':<8} {'seen':>10} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+        for table_name, table_report in report.items():
+            for stage in cdc_freshness_probe.STAGES:
+                summary = table_report[stage]
+                if not summary['count']:
+                    continue
+                print(f"{table_name:<20} {stage:<8} {summary['count']:>4}/{table_report['markers']:<5} "
+                      f"{summary['p50']:>10} {summary['p95']:>10} {summary['p99']:>10}")
+
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"\n📄 Report written to {output}")
+        return True
+
+    except Exception as e:
+        print(f"❌ CDC latency probe error: {e}")
+        logging.error(f"❌ CDC latency probe error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measure CDC freshness lag of tracer marker rows')
+    parser.add_argument('--source', choices=['file', 'kafka', 'none'], default='file',
+                        help='Change stream to watch: file event log stand-in, Kafka, or none')
+    parser.add_argument('--warehouse', type=str, help='Hadoop catalog warehouse (default file:///tmp/warehouse)')
+    parser.add_argument('--manifest', type=str, help='Tracer manifest written by --trace-cdc')
+    parser.add_argument('--run-id', type=str, help='Only markers of this tracer run')
+    parser.add_argument('--timeout', type=float, default=300, help='Seconds to wait for markers to become visible')
+    parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds between polls')
+    parser.add_argument('--output', type=str, help='Write the report as JSON to this file')
+
+    args = parser.parse_args()
+    success = main(args.source, args.warehouse, args.manifest, args.run_id, args.timeout, args.poll_interval, args.output)
+    sys.exit(0 if success else 1)
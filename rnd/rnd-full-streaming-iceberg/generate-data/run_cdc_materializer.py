@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Keyed CDC materializer: keep the latest row per key, honour deletes, emit compacted *_iceberg snapshots"""
+
+import argparse
+import json
+import logging
+import sys
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def main(source='file', event_log_dir=None, warehouse=None, catalog_uri=None, tables=None, emit_interval=None,
+         emit_changes=None, duration=None, drain=False, output=None):
+    """Run the materializer until interrupted, the duration passes, or (with drain) the topics are empty"""
+    try:
+        import cdc_materializer
+        import file_event_log
+        import hadoop_catalog
+
+        kwargs = {'tables': tables}
+        if emit_interval is not None:
+            kwargs['emit_interval_seconds'] = emit_interval
+        if emit_changes is not None:
+            kwargs['emit_changes'] = emit_changes
+        materializer = cdc_materializer.get_cdc_materializer(
+            source, warehouse or hadoop_catalog.ICEBERG_WAREHOUSE, catalog_uri or hadoop_catalog.ICEBERG_CATALOG_URI,
+            event_log_dir or file_event_log.EVENT_LOG_DIR, **kwargs
+        )
+        print(f"🚀 Materializing {source} change stream into {warehouse or hadoop_catalog.ICEBERG_WAREHOUSE} "
+              f"(emit every {materializer.emit_interval_seconds}s or {materializer.emit_changes} changes)")
+
+        stats = materializer.run(duration, stop_when_idle=drain)
+
+        print(f"\n{'table':<20} {'records':>9} {'upserts':>9} {'deletes':>8} {'emits':>6} {'live rows':>10} {'offset':>9}")
+        for table_name, table_stats in stats.items():
+            print(f"{table_name:<20} {table_stats['records']:>9} {table_stats['upserts']:>9} {table_stats['deletes']:>8} "
+                  f"{table_stats['emits']:>6} {table_stats['live_rows']:>10} {table_stats['offset']:>9}")
+
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(stats, f, indent=2)
+            print(f"📄 Report written to {output}")
+        return True
+
+    except KeyboardInterrupt:
+        # Changes since the last emit are re-read from the checkpoint on the next start
+        print("⏹️ Materializer stopped")
+        return True
+    except Exception as e:
+        print(f"❌ CDC materializer error: {e}")
+        logging.error(f"❌ CDC materializer error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Materialize the CDC topics as compacted Iceberg snapshots')
+    parser.add_argument('--source', choices=['file', 'kafka'], default='file',
+                        help='Change stream: file stand-in (EVENT_LOG_DIR) or the Debezium topics (KAFKA_BOOTSTRAP_SERVERS)')
+    parser.add_argument('--event-log-dir', type=str, help='Directory of the file stand-in (default /tmp/university-event-log)')
+    parser.add_argument('--warehouse', type=str, help='Hadoop-layout warehouse (default file:///tmp/warehouse)')
+    parser.add_argument('--catalog-uri', type=str, help='SQL catalog instead of the hadoop layout')
+    parser.add_argument('--tables', nargs='+', help='Source tables to materialize (default all pipeline tables)')
+    parser.add_argument('--emit-interval', type=float, help='Seconds between snapshots of a changed table (default 300)')
+    parser.add_argument('--emit-changes', type=int, help='Changes that trigger a snapshot early (default 200000)')
+    parser.add_argument('--duration', type=float, help='Stop after this many seconds')
+    parser.add_argument('--drain', action='store_true', help='Stop once the topics have no new records')
+    parser.add_argument('--output', type=str, help='Write the statistics as JSON')
+
+    args = parser.parse_args()
+    success = main(args.source, args.event_log_dir, args.warehouse, args.catalog_uri, args.tables, args.emit_interval,
+                   args.emit_changes, args.duration, args.drain, args.output)
+    sys.exit(0 if success else 1)
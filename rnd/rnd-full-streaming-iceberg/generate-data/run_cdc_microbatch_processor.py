@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Standalone Python pipeline: apply the Debezium topics (or the file stand-in) to the *_iceberg tables without Flink"""
+
+import argparse
+import json
+import logging
+import sys
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def main(source='file', event_log_dir=None, warehouse=None, catalog_uri=None, tables=None, batch_records=None,
+         max_latency=None, poll_records=None, duration=None, drain=False, output=None):
+    """Run the micro-batch processor until interrupted, the duration passes, or (with drain) the topics are empty"""
+    try:
+        import cdc_microbatch_processor
+        import file_event_log
+        import hadoop_catalog
+
+        kwargs = {'tables': tables}
+        if batch_records is not None:
+            kwargs['batch_records'] = batch_records
+        if max_latency is not None:
+            kwargs['max_latency_seconds'] = max_latency
+        if poll_records is not None:
+            kwargs['poll_records'] = poll_records
+        processor = cdc_microbatch_processor.get_cdc_microbatch_processor(
+            source, warehouse or hadoop_catalog.ICEBERG_WAREHOUSE, catalog_uri or hadoop_catalog.ICEBERG_CATALOG_URI,
+            event_log_dir or file_event_log.EVENT_LOG_DIR, **kwargs
+        )
+        print(f"🚀 Processing {source} change stream into {warehouse or hadoop_catalog.ICEBERG_WAREHOUSE} "
+              f"(batches of {processor.batch_records} records or {processor.max_latency_seconds}s)")
+
+        report = processor.run(duration, stop_when_idle=drain)
+
+        print(f"\n{'table':<20} {'records':>9} {'upserted':>9} {'deleted':>8} {'commits':>8} {'rewritten':>10} {'offset':>9}")
+        for table_name, stats in report['tables'].items():
+            print(f"{table_name:<20} {stats['records']:>9} {stats['upserted']:>9} {stats['deleted']:>8} "
+                  f"{stats['commits']:>8} {stats['files_rewritten']:>10} {stats['offset']:>9}")
+        lag = report['lag_ms']
+        if lag['p50'] is not None:
+            print(f"⏱️ Batch lag p50 {lag['p50'] / 1000:.1f}s, p95 {lag['p95'] / 1000:.1f}s, max {lag['max'] / 1000:.1f}s, "
+                  f"{report['records_per_second']} records/s")
+
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"📄 Report written to {output}")
+        return True
+
+    except KeyboardInterrupt:
+        # Buffered records are not committed; the next start resumes from the last checkpoint
+        print("⏹️ Processor stopped")
+        return True
+    except Exception as e:
+        print(f"❌ Micro-batch processor error: {e}")
+        logging.error(f"❌ Micro-batch processor error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Apply the CDC topics to the Iceberg tables in micro-batches, without Flink')
+    parser.add_argument('--source', choices=['file', 'kafka'], default='file',
+                        help='Change stream: file stand-in (EVENT_LOG_DIR) or the Debezium topics (KAFKA_BOOTSTRAP_SERVERS)')
+    parser.add_argument('--event-log-dir', type=str, help='Directory of the file stand-in (default /tmp/university-event-log)')
+    parser.add_argument('--warehouse', type=str, help='Hadoop-layout warehouse (default file:///tmp/warehouse)')
+    parser.add_argument('--catalog-uri', type=str, help='SQL catalog instead of the hadoop layout')
+    parser.add_argument('--tables', nargs='+', help='Source tables to process (default all pipeline tables)')
+    parser.add_argument('--batch-records', type=int, help='Records per table that trigger a commit (default 50000)')
+    parser.add_argument('--max-latency', type=float, help='Seconds a record may wait before its table commits (default 60)')
+    parser.add_argument('--poll-records', type=int, help='Records fetched per topic and poll (default 10000)')
+    parser.add_argument('--duration', type=float, help='Stop after this many seconds')
+    parser.add_argument('--drain', action='store_true', help='Stop once the topics have no new records')
+    parser.add_argument('--output', type=str, help='Write the report as JSON')
+
+    args = parser.parse_args()
+    success = main(args.source, args.event_log_dir, args.warehouse, args.catalog_uri, args.tables, args.batch_records,
+                   args.max_latency, args.poll_records, args.duration, args.drain, args.output)
+    sys.exit(0 if success else 1)
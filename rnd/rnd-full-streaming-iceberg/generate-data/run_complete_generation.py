@@ -25,11 +25,16 @@ def run_step(step_name, func, *args, **kwargs):
         logging.error(f"❌ {step_name} failed: {e}")
         return False
 
-def main(academic_year=None, student_count=1000, skip_existing=True):
+def main(academic_year=None, student_count=1000, skip_existing=True, engine='python', seed=None, max_cdc_lag_mb=None, verify_sample=0,
+         trace_cdc=False, trace_event_log=False, iceberg_warehouse=None, record_events=None,
+         save_dataset=None, fan_out=None, fan_out_pending=None, in_memory=False):
     """Run complete data generation pipeline"""
     try:
-        # Import all modules
+        # Import the generation modules (the optional features import theirs when enabled:
+        # pyiceberg, pyarrow and sqlalchemy cost more than a second of startup)
         import db_utils
+        import reference_cache
+        import table_schemas
         import master_data_generator
         import static_data
         import student_generator
@@ -37,6 +42,10 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
         import enrollment_generator
         import payment_generator
         import attendance_generator
+        import student_lifecycle
+        import partition_manager
+        import locale_providers
+        import random
         
         # Determine academic year
         if academic_year is None:
@@ -47,10 +56,80 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
         print(f"🎓 Running complete data generation for academic year: {academic_year}")
         print(f"👥 New student entry year: {entry_year}")
         print(f"📊 Target student count: {student_count}")
+        print(f"⚙️ Fact table engine: {engine}")
+        
+        # Seed every generator so runs can be reproduced
+        if seed is not None:
+            random.seed(seed)
+            locale_providers.seed(seed)
+            print(f"🎲 Random seed: {seed}")
+        
+        # One database manager and reference data cache shared by every step
+        if in_memory:
+            if engine == 'sql':
+                raise ValueError("--engine sql generates inside PostgreSQL and cannot run --in-memory")
+            import in_memory_db
+            db = in_memory_db.get_in_memory_db_manager()
+            print("🧪 In-memory database: nothing is written to PostgreSQL")
+        else:
+            db = db_utils.get_db_manager()
+        cache = reference_cache.get_reference_cache(db)
+        
+        # Keep the Debezium slot within a lag budget while loading
+        throttle = None
+        if max_cdc_lag_mb:
+            import replication_throttle
+            throttle = replication_throttle.get_load_throttle(db, max_lag_bytes=int(max_cdc_lag_mb * 1024 * 1024))
+            db.set_load_throttle(throttle)
+            print(f"🐢 CDC-safe loading: replication lag budget {max_cdc_lag_mb} MB on slot {replication_throttle.CDC_SLOT_NAME}")
+        
+        # Read back a sample of every load and compare row checksums
+        if verify_sample:
+            db.set_load_verification(verify_sample)
+            print(f"🔍 Load verification: checksum sample of {verify_sample} rows per load")
+        
+        # Stamp marker rows for the CDC freshness probe (run_cdc_latency_probe.py)
+        tracer = None
+        if trace_cdc or trace_event_log:
+            import cdc_latency_tracer
+            import file_event_log
+            event_log = file_event_log.get_event_log() if trace_event_log else None
+            tracer = cdc_latency_tracer.get_cdc_latency_tracer(db, event_log=event_log)
+            print(f"🛰️ CDC tracer run {tracer.run_id}: markers in {tracer.manifest_path}")
+            if event_log is not None:
+                print(f"🛰️ Publishing loads to the file event log in {event_log.directory}")
+        
+        # Also write every committed load straight into the *_iceberg tables
+        backfill_writer = None
+        if iceberg_warehouse:
+            import iceberg_backfill
+            backfill_writer = iceberg_backfill.get_backfill_writer(iceberg_warehouse).install(db)
+            print(f"🧊 Iceberg backfill into {iceberg_warehouse}")
+            if engine == 'sql':
+                print("⚠️ --engine sql inserts server-side: enrollments and payments will not be backfilled")
+        
+        # Record every committed load for replaying the same workload (run_event_replay.py)
+        recording = None
+        if record_events:
+            import event_recording
+            recording = event_recording.get_event_recording(record_events).install(db)
+            print(f"📼 Recording loads to {recording.directory} from offset {recording.end_offset}")
+            if engine == 'sql':
+                print("⚠️ --engine sql inserts server-side: enrollments and payments will not be recorded")
+        
+        # Write every load to further targets in the same pass (Parquet, CSV, event log, another database)
+        fanout = None
+        if fan_out:
+            if 'postgres' in fan_out:
+                raise ValueError("The database being generated is always loaded; use postgres:HOST:PORT/DB for another one")
+            import fanout_sink
+            fanout = fanout_sink.get_fanout_sink(fan_out, db, fan_out_pending or fanout_sink.MAX_PENDING_BATCHES).install(db)
+            print(f"🔀 Fanning out every load to {', '.join(fan_out)} ({fan_out_pending or fanout_sink.MAX_PENDING_BATCHES} batches pending at most)")
+            if engine == 'sql':
+                print("⚠️ --engine sql inserts server-side: enrollments, payments and attendance will not be fanned out")
         
         # Step 1: Test database connection
         def test_connection():
-            db = db_utils.get_db_manager()
             return db.test_connection()
         
         if not run_step("Database Connection Test", test_connection):
@@ -58,7 +137,7 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
         
         # Step 2: Setup master data
         def setup_master_data():
-            generator = master_data_generator.get_master_data_generator()
+            generator = master_data_generator.get_master_data_generator(db=db, cache=cache)
             return generator.setup_master_data()
         
         if not run_step("Master Data Setup", setup_master_data):
@@ -66,8 +145,7 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
         
         # Step 3: Generate students
         def generate_students():
-            db = db_utils.get_db_manager()
-            generator = student_generator.get_student_generator()
+            generator = student_generator.get_student_generator(db, cache)
             
             # Check if students already exist
             if skip_existing and db.table_exists('students'):
@@ -83,23 +161,13 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
             students, student_details, student_fees = generator.generate_students_for_year(entry_year, student_count)
             
             # Insert students
-            student_columns = ['student_id', 'full_name', 'entry_year', 'program_id', 'degree', 'faculty_id', 'status', 'created_at']
-            db.bulk_insert_data('students', student_columns, students)
+            db.bulk_insert_data('students', table_schemas.get_column_names('students'), students)
             
             # Insert student details
-            detail_columns = [
-                'student_id', 'gender', 'birth_date', 'birth_place',
-                'religion', 'nationality', 'registration_date', 'address', 'city',
-                'province', 'postal_code', 'phone_number', 'high_school', 'high_school_year',
-                'parent_name', 'parent_income', 'parent_occupation', 'blood_type',
-                'health_insurance', 'accommodation'
-            ]
-            student_details_for_insert = [detail[1:] for detail in student_details]
-            db.bulk_insert_data('student_detail', detail_columns, student_details_for_insert)
+            db.bulk_insert_data('student_detail', table_schemas.get_column_names('student_detail'), student_details)
             
             # Insert student fees
-            fee_columns = ['fee_id', 'student_id', 'ukt_fee', 'bop_fee', 'updated_at']
-            db.bulk_insert_data('student_fee', fee_columns, student_fees)
+            db.bulk_insert_data('student_fee', table_schemas.get_column_names('student_fee'), student_fees)
             
             return True
         
@@ -108,8 +176,7 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
         
         # Step 4: Generate academic data
         def generate_academic_data():
-            db = db_utils.get_db_manager()
-            generator = academic_generator.get_academic_generator()
+            generator = academic_generator.get_academic_generator(db, cache)
             
             # Check if academic data already exists
             if skip_existing:
@@ -127,29 +194,33 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
                     print(f"✅ Academic data already exists, skipping...")
                     return True
             
+            # Partitions of the year for the partitioned schema (no-op for the heap schema)
+            partition_manager.ensure_partitions(db, academic_year)
+            
+            # Graduate, drop out or suspend students before the new academic year
+            lifecycle = student_lifecycle.get_student_lifecycle(db, cache, seed)
+            lifecycle.advance(academic_year)
+            
             # Generate for both semesters
             for semester in [1, 2]:
                 print(f"📚 Processing semester {semester}")
                 
                 # Generate registrations
-                registrations = generator.generate_registration_for_semester(academic_year, semester)
-                if registrations:
-                    registration_columns = [
-                        'registration_id', 'student_id', 'academic_year', 'semester',
-                        'semester_code', 'registration_date', 'registration_status',
-                        'total_sks', 'late_registration', 'created_at', 'updated_at'
-                    ]
-                    db.bulk_insert_data('registration', registration_columns, registrations)
+                if engine == 'vectorized':
+                    registrations = generator.generate_registration_for_semester(academic_year, semester, engine, seed)
+                    if registrations:
+                        # Registrations may already exist when only the classes are missing
+                        db.copy_insert_data('registration', table_schemas.get_column_names('registration'), registrations,
+                                            skip_conflicts=True)
+                else:
+                    registrations = generator.generate_registration_for_semester(academic_year, semester)
+                    if registrations:
+                        db.bulk_insert_data('registration', table_schemas.get_column_names('registration'), registrations)
                 
                 # Generate classes
                 classes = generator.generate_classes_for_semester(academic_year, semester)
                 if classes:
-                    class_columns = [
-                        'class_id', 'course_id', 'lecturer_id', 'academic_year', 'semester',
-                        'class_code', 'room_code', 'schedule_day', 'schedule_time',
-                        'capacity', 'enrolled_count', 'class_status', 'created_at'
-                    ]
-                    db.bulk_insert_data('class', class_columns, classes)
+                    db.bulk_insert_data('class', table_schemas.get_column_names('class'), classes)
             
             return True
         
@@ -158,15 +229,13 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
         
         # Step 5: Generate enrollments
         def generate_enrollments():
-            db = db_utils.get_db_manager()
-            generator = enrollment_generator.get_enrollment_generator()
+            generator = enrollment_generator.get_enrollment_generator(db, cache)
             
             # Check if enrollments already exist
             if skip_existing and db.table_exists('student_enrollment'):
                 result = db.execute_query(
-                    """SELECT COUNT(*) FROM student_enrollment se
-                       JOIN registration r ON se.registration_id = r.registration_id
-                       WHERE r.academic_year = %s""",
+                    """SELECT COUNT(*) FROM student_enrollment
+                       WHERE academic_year = %s""",
                     (academic_year,)
                 )
                 existing_count = result[0][0] if result else 0
@@ -174,17 +243,21 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
                     print(f"✅ Enrollments already exist ({existing_count} records), skipping...")
                     return True
             
+            if engine == 'sql':
+                generator.generate_enrollments_in_database(academic_year, seed)
+                return True
+            
+            if engine == 'vectorized':
+                enrollments = generator.generate_enrollments_for_academic_year(academic_year, engine, seed)
+                if enrollments:
+                    db.copy_insert_data('student_enrollment', table_schemas.get_column_names('student_enrollment'), enrollments,
+                                        skip_conflicts=not skip_existing)
+                return True
+            
             enrollments = generator.generate_enrollments_for_academic_year(academic_year)
             
             if enrollments:
-                # Remove enrollment_id (first element) for insertion
-                enrollments_for_insert = [enrollment[1:] for enrollment in enrollments]
-                enrollment_columns = [
-                    'student_id', 'registration_id', 'class_id', 'enrollment_date',
-                    'enrollment_status', 'final_grade', 'grade_point', 'attendance_percentage',
-                    'created_at', 'updated_at'
-                ]
-                db.bulk_insert_data('student_enrollment', enrollment_columns, enrollments_for_insert)
+                db.bulk_insert_data('student_enrollment', table_schemas.get_column_names('student_enrollment'), enrollments)
             
             return True
         
@@ -193,15 +266,13 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
         
         # Step 6: Generate payments
         def generate_payments():
-            db = db_utils.get_db_manager()
-            generator = payment_generator.get_payment_generator()
+            generator = payment_generator.get_payment_generator(db, cache)
             
             # Check if payments already exist
             if skip_existing and db.table_exists('payment'):
                 result = db.execute_query(
-                    """SELECT COUNT(*) FROM payment p
-                       JOIN registration r ON p.registration_id = r.registration_id
-                       WHERE r.academic_year = %s""",
+                    """SELECT COUNT(*) FROM payment
+                       WHERE academic_year = %s""",
                     (academic_year,)
                 )
                 existing_count = result[0][0] if result else 0
@@ -209,10 +280,14 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
                     print(f"✅ Payments already exist ({existing_count} records), skipping...")
                     return True
             
+            if engine == 'sql':
+                generator.generate_payments_in_database(academic_year, seed)
+                return True
+            
             # Get registrations for payment generation
             registrations = db.execute_query(
                 """SELECT registration_id, student_id, academic_year, semester, 
-                          registration_date, registration_status
+                          semester_code, registration_date
                    FROM registration 
                    WHERE academic_year = %s
                    ORDER BY student_id, semester""",
@@ -223,16 +298,18 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
                 print(f"⚠️ No registrations found for {academic_year}")
                 return True
             
+            if engine == 'vectorized':
+                payments = generator.generate_payments_vectorized(academic_year, registrations, seed)
+                if payments:
+                    # Payment ids carry the academic year, so a conflict is this year's payment generated again
+                    db.copy_insert_data('payment', table_schemas.get_column_names('payment'), payments,
+                                        skip_conflicts=True)
+                return True
+            
             payments = generator.generate_payments_for_registrations(academic_year, registrations)
             
             if payments:
-                payment_columns = [
-                    'payment_id', 'student_id', 'registration_id', 'payment_type',
-                    'payment_amount', 'bank_name', 'virtual_account_number', 'payment_channel',
-                    'payment_time', 'payment_status', 'installment_number', 'late_fee_charged',
-                    'total_paid_amount', 'payment_proof_url', 'due_date', 'created_at', 'updated_at'
-                ]
-                db.bulk_insert_data('payment', payment_columns, payments)
+                db.bulk_insert_data('payment', table_schemas.get_column_names('payment'), payments)
             
             return True
         
@@ -241,14 +318,57 @@ def main(academic_year=None, student_count=1000, skip_existing=True):
         
         # Step 7: Generate attendance (optional)
         def generate_attendance():
-            generator = attendance_generator.get_attendance_generator()
-            return generator.generate_attendance_for_academic_year(academic_year)
+            generator = attendance_generator.get_attendance_generator(db=db, sink=fanout)
+            return generator.generate_attendance_for_academic_year(academic_year, engine, seed)
         
         run_step("Attendance Generation", generate_attendance)  # Don't fail on attendance
         
+        # Wait for the fan-out sinks to write their queued batches
+        fanout_report = fanout.close() if fanout else None
+        
+        # Step 8: Save the final state as a dataset artifact (run_dataset_load.py)
+        dataset_manifest = None
+        if save_dataset:
+            def save_dataset_artifact():
+                nonlocal dataset_manifest
+                import dataset_artifact
+                writer = dataset_artifact.get_dataset_writer(save_dataset)
+                dataset_manifest = writer.export(db, seed=seed, student_count=student_count,
+                                                 academic_year=academic_year, engine=engine)
+                return True
+            
+            if not run_step("Dataset Artifact Export", save_dataset_artifact):
+                return False
+        
         print(f"\n🎉 Complete data generation pipeline finished successfully!")
         print(f"📊 Academic year: {academic_year}")
         print(f"👥 Entry year: {entry_year}")
+        if throttle:
+            report = throttle.report()
+            print(f"🐢 Throttled load: {report['rows']} rows in {report['elapsed_seconds']}s "
+                  f"({report['rows_per_second']} rows/s), {report['throttle_events']} slowdowns, "
+                  f"peak lag {report['peak_lag_bytes']} bytes")
+        if backfill_writer:
+            print(f"🧊 Backfilled {sum(backfill_writer.rows_written.values())} rows in {backfill_writer.snapshots} Iceberg snapshots")
+            if backfill_writer.rows_skipped:
+                print(f"   Left out rows with an existing key (as the database did): {backfill_writer.rows_skipped}")
+        if recording:
+            info = recording.info()
+            print(f"📼 Recording holds {info['events']} events ({info['compressed_bytes'] / 1e6:.2f} MB), "
+                  f"replay with: python run_event_replay.py --recording {recording.directory}")
+        if fanout_report:
+            for sink_name, sink_stats in fanout_report.items():
+                print(f"🔀 {sink_name}: {sink_stats['rows']} rows in {sink_stats['batches']} batches, "
+                      f"{sink_stats['write_seconds']}s writing, {sink_stats['blocked_seconds']}s of backpressure")
+        if dataset_manifest:
+            print(f"💾 Dataset artifact with {sum(entry['rows'] for entry in dataset_manifest['tables'])} rows saved, "
+                  f"load with: python run_dataset_load.py --dataset {save_dataset}")
+        if in_memory:
+            print(f"🧪 {sum(db.table_counts().values())} rows in memory, {db.statements} statements, "
+                  f"{db.db_seconds:.1f}s inside the database")
+        if tracer:
+            print(f"🛰️ {tracer.marker_count} CDC markers recorded, probe with: "
+                  f"python run_cdc_latency_probe.py --run-id {tracer.run_id}")
         return True
         
     except Exception as e:
@@ -263,9 +383,36 @@ if __name__ == "__main__":
     parser.add_argument('--year', type=str, help='Academic year (e.g., 2024/2025)')
     parser.add_argument('--count', type=int, default=1000, help='Number of students to generate')
     parser.add_argument('--force', action='store_true', help='Force regeneration even if data exists')
+    parser.add_argument('--engine', choices=['python', 'vectorized', 'sql'], default='python',
+                        help='Generate fact tables row by row in Python, as numpy arrays, or in the database')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible generation')
+    parser.add_argument('--max-cdc-lag-mb', type=float,
+                        help='Throttle loads so the Debezium replication slot lag stays under this many MB')
+    parser.add_argument('--verify-sample', type=int, default=0,
+                        help='Read back this many rows of every load and compare checksums')
+    parser.add_argument('--trace-cdc', action='store_true',
+                        help='Stamp marker rows for measuring CDC latency with run_cdc_latency_probe.py')
+    parser.add_argument('--trace-event-log', action='store_true',
+                        help='With --trace-cdc, also publish every load to the file event log (Debezium stand-in)')
+    parser.add_argument('--iceberg-backfill', nargs='?', const='file:///tmp/warehouse',
+                        help='Also write every load straight into the *_iceberg tables of this warehouse')
+    parser.add_argument('--record-events', nargs='?', const='/tmp/university-recording',
+                        help='Record every load as a replayable change stream in this directory')
+    parser.add_argument('--fan-out', nargs='+', metavar='SINK',
+                        help='Also write every load to these sinks in the same pass: parquet[:DIR], csv[:DIR], '
+                             'event-log[:DIR], kafka[:BOOTSTRAP], postgres:HOST:PORT/DB')
+    parser.add_argument('--fan-out-pending', type=int,
+                        help='Batches a fan-out sink may queue before generation waits for it (default 4)')
+    parser.add_argument('--in-memory', action='store_true',
+                        help='Generate into an in-process SQLite stand-in instead of PostgreSQL (no database needed)')
+    parser.add_argument('--save-dataset', nargs='?', const='/tmp/university-dataset',
+                        help='Save the generated tables as a dataset artifact in this directory')
     
     args = parser.parse_args()
     skip_existing = not args.force
     
-    success = main(args.year, args.count, skip_existing)
+    success = main(args.year, args.count, skip_existing, args.engine, args.seed, args.max_cdc_lag_mb, args.verify_sample,
+                   args.trace_cdc, args.trace_event_log, args.iceberg_backfill, args.record_events,
+                   args.save_dataset, args.fan_out, args.fan_out_pending,
+                   args.in_memory)
     sys.exit(0 if success else 1) 
\ No newline at end of file
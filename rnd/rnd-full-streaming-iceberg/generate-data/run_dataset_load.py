@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Load a dataset artifact (run_complete_generation.py --save-dataset) into one or more PostgreSQL databases"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def load_into(artifact, db, tables=None, create_schema=False, partitioned=False, skip_conflicts=False):
+    """Create the schema if asked and load the artifact into one database, returns the load stats"""
+    import partition_manager
+
+    if create_schema:
+        schema_name = partition_manager.PARTITIONED_SCHEMA_FILE if partitioned else 'university_tables.sql'
+        academic_years = artifact.academic_years() if partitioned else None
+        db.create_tables_from_sql_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), schema_name), academic_years)
+    return artifact.load(db, tables, skip_conflicts)
+
+def main(dataset_dir=None, targets=None, tables=None, create_schema=False, partitioned=False, skip_conflicts=False,
+         verify=False, info_only=False, output=None):
+    """Print an artifact's summary, verify it, or load it into every target in parallel"""
+    try:
+        import dataset_artifact
+        import db_utils
+
+        artifact = dataset_artifact.get_dataset_artifact(dataset_dir or dataset_artifact.DATASET_DIR)
+        info = artifact.info()
+        print(f"💾 {artifact.directory}: {info['rows']} rows in {len(info['tables'])} tables, {info['bytes'] / 1e6:.2f} MB "
+              f"(seed {info.get('seed')}, {info.get('student_count')} students, {info.get('academic_year')}, "
+              f"created {info['created_at']})")
+        for table_name, table_info in info['tables'].items():
+            print(f"   {table_name:<20} {table_info['rows']:>9} rows {table_info['bytes'] / 1e6:>9.2f} MB")
+
+        if verify:
+            problems = artifact.verify()
+            for table_name, problem in problems.items():
+                print(f"❌ {table_name}: {problem}")
+            if problems:
+                return False
+            print("✅ Every file matches its manifest checksum")
+        if info_only:
+            return True
+
+        # One database per target, all reading the same memory-mapped files
+        databases = {target: db_utils.get_target_db_manager(target) for target in targets} if targets else {'default': db_utils.get_db_manager()}
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=len(databases)) as pool:
+            futures = {
+                target: pool.submit(load_into, artifact, db, tables, create_schema, partitioned, skip_conflicts)
+                for target, db in databases.items()
+            }
+            results = {}
+            for target, future in futures.items():
+                try:
+                    results[target] = {'tables': future.result()}
+                except Exception as e:
+                    logging.error(f"❌ Load into {target} failed: {e}")
+                    results[target] = {'error': str(e)}
+        elapsed = time.monotonic() - started
+
+        for target, result in results.items():
+            if 'error' in result:
+                print(f"❌ {target}: {result['error']}")
+                continue
+            rows = sum(table_stats['rows'] for table_stats in result['tables'].values())
+            seconds = sum(table_stats['seconds'] for table_stats in result['tables'].values())
+            print(f"✅ {target}: {rows} rows loaded in {seconds:.1f}s")
+        print(f"⏱️ {len(databases)} database(s) populated in {elapsed:.1f}s")
+
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump({'dataset': info, 'elapsed_seconds': round(elapsed, 2), 'targets': results}, f, indent=2)
+            print(f"📄 Report written to {output}")
+        return all('error' not in result for result in results.values())
+
+    except Exception as e:
+        print(f"❌ Dataset load error: {e}")
+        logging.error(f"❌ Dataset load error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Load a generated dataset artifact instead of regenerating the data')
+    parser.add_argument('--dataset', type=str, help='Artifact directory (default /tmp/university-dataset)')
+    parser.add_argument('--targets', nargs='+',
+                        help='Databases as HOST:PORT/DBNAME, loaded in parallel (default DB_HOST/DB_PORT/DB_NAME)')
+    parser.add_argument('--tables', nargs='+', help='Load only these tables')
+    parser.add_argument('--create-schema', action='store_true', help='Create the university schema before loading')
+    parser.add_argument('--partitioned', action='store_true',
+                        help='With --create-schema, use the partitioned schema with partitions for the artifact years')
+    parser.add_argument('--skip-conflicts', action='store_true', help='Skip rows whose key already exists')
+    parser.add_argument('--verify', action='store_true', help='Check the file checksums against the manifest first')
+    parser.add_argument('--info', action='store_true', help='Only print the artifact summary')
+    parser.add_argument('--output', type=str, help='Write the load report as JSON')
+
+    args = parser.parse_args()
+    success = main(args.dataset, args.targets, args.tables, args.create_schema, args.partitioned, args.skip_conflicts,
+                   args.verify, args.info, args.output)
+    sys.exit(0 if success else 1)
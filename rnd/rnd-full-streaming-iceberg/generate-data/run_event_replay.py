@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Replay a recorded change stream (run_complete_generation.py --record-events) into Postgres, Kafka or the file stand-in"""
+
+import argparse
+import json
+import logging
+import signal
+import sys
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def main(recording_dir=None, sink='file', speed=1.0, start_offset=0, end_offset=None, tables=None,
+         event_log_dir=None, info_only=False, output=None):
+    """Print a recording's summary, or replay it"""
+    try:
+        import event_recording
+        import file_event_log
+
+        recording = event_recording.get_event_recording(recording_dir or event_recording.RECORDING_DIR)
+        info = recording.info()
+        print(f"📼 {recording.directory}: {info['events']} events in {info['blocks']} blocks, "
+              f"{info['duration_ms'] / 1000:.1f}s recorded, {info['compressed_bytes'] / 1e6:.2f} MB "
+              f"(compression {info['compression_ratio']}x)")
+        for table_name, count in info['tables'].items():
+            print(f"   {table_name:<20} {count:>9} events")
+        if info_only:
+            return True
+        if not info['events']:
+            print("❌ Recording is empty")
+            return False
+
+        replayer = event_recording.EventReplayer(
+            recording,
+            event_recording.get_event_sink(sink, event_log_dir=event_log_dir or file_event_log.EVENT_LOG_DIR),
+            speed, tables
+        )
+        # kill -USR1 <pid> pauses and resumes the replay
+        signal.signal(signal.SIGUSR1, lambda signum, frame: replayer.toggle_pause())
+        print(f"▶️ Replaying into {sink} at {f'{speed}x' if speed else 'max speed'} from offset {start_offset}")
+
+        try:
+            report = replayer.run(start_offset, end_offset)
+        finally:
+            replayer.sink.close()
+
+        effective = f", effective speed {report['effective_speed']}x" if report['effective_speed'] else ""
+        print(f"✅ Replayed {report['events']} events in {report['elapsed_seconds']}s "
+              f"({report['events_per_second']} events/s{effective}), stopped at offset {report['position']}")
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"📄 Report written to {output}")
+        return True
+
+    except KeyboardInterrupt:
+        print("⏹️ Replay stopped")
+        return True
+    except Exception as e:
+        print(f"❌ Event replay error: {e}")
+        logging.error(f"❌ Event replay error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Replay a recorded change stream at 1x, Nx or max speed')
+    parser.add_argument('--recording', type=str, help='Recording directory (default /tmp/university-recording)')
+    parser.add_argument('--sink', choices=['postgres', 'kafka', 'file'], default='file',
+                        help='Replay target: PostgreSQL tables, the Debezium topics, or the file stand-in')
+    speed_group = parser.add_mutually_exclusive_group()
+    speed_group.add_argument('--speed', type=float, default=1.0, help='Pacing factor (1 = as recorded, 10 = ten times faster)')
+    speed_group.add_argument('--max-speed', action='store_true', help='No pacing, as fast as the sink accepts')
+    parser.add_argument('--from-offset', type=int, default=0, help='First event offset to replay')
+    parser.add_argument('--to-offset', type=int, help='Stop before this event offset')
+    parser.add_argument('--tables', nargs='+', help='Replay only these tables')
+    parser.add_argument('--event-log-dir', type=str, help='Directory of the file sink (default /tmp/university-event-log)')
+    parser.add_argument('--info', action='store_true', help='Only print the recording summary')
+    parser.add_argument('--output', type=str, help='Write the replay report as JSON')
+
+    args = parser.parse_args()
+    success = main(args.recording, args.sink, None if args.max_speed else args.speed, args.from_offset, args.to_offset,
+                   args.tables, args.event_log_dir, args.info, args.output)
+    sys.exit(0 if success else 1)
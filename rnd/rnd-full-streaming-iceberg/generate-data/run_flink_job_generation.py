@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""Generate the Flink CDC job (one statement set) from pipeline_tables and check column drift"""
+
+import argparse
+import logging
+import sys
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def main(output=None, catalog='rest', check_only=False):
+    """Write the job (unless check_only) and report drift, False when drift errors remain"""
+    try:
+        import flink_job_builder
+
+        output = output or flink_job_builder.FLINK_PIPELINE_SQL
+        if not check_only:
+            flink_job_builder.write_job_sql(output, catalog)
+            print(f"📝 Flink job written to {output} ({catalog} catalog)")
+
+        issues = flink_job_builder.check_drift(flink_sql_path=output)
+        errors = flink_job_builder.log_drift(issues)
+        warnings = len(issues) - errors
+        if errors:
+            print(f"❌ {errors} drift errors, {warnings} warnings")
+            return False
+        print(f"✅ No drift errors ({warnings} warnings)")
+        return True
+
+    except Exception as e:
+        print(f"❌ Flink job generation error: {e}")
+        logging.error(f"❌ Flink job generation error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Generate the Flink CDC statement set job and check column drift')
+    parser.add_argument('--output', type=str, help='Job file (default flink-sql/university-cdc-pipeline.sql)')
+    parser.add_argument('--catalog', choices=['rest', 'hadoop'], default='rest',
+                        help='Iceberg catalog: Polaris REST on MinIO, or the local hadoop warehouse')
+    parser.add_argument('--check', action='store_true', help='Only check drift against the existing job file')
+
+    args = parser.parse_args()
+    success = main(args.output, args.catalog, args.check)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Benchmark the generators without PostgreSQL: per-step generation and database time on the in-memory stand-in"""
+
+import argparse
+import json
+import logging
+import sys
+
+# Setup logging (warnings only by default: per-row INFO logging would dominate the timings)
+logging.basicConfig(
+    level=logging.WARNING,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def main(student_count=1000, academic_year='2024/2025', engines=None, seed=42, steps=None, output=None):
+    """Run the generation benchmark for every engine and print the step timings"""
+    try:
+        import generation_benchmark
+
+        reports = []
+        for engine in engines or ['python']:
+            print(f"🧪 Generating {student_count} students for {academic_year} in memory with the {engine} engine")
+            report = generation_benchmark.run_generation_benchmark(student_count, academic_year, engine, seed, steps)
+            reports.append(report)
+
+            print(f"\n{'step':<14} {'rows':>9} {'wall':>8} {'cpu':>8} {'database':>9} {'generate':>9}")
+            for name, timing in list(report['steps'].items()) + [('total', report['total'])]:
+                print(f"{name:<14} {timing['rows']:>9} {timing['wall_seconds']:>7.2f}s {timing['cpu_seconds']:>7.2f}s "
+                      f"{timing['db_seconds']:>8.2f}s {timing['generate_seconds']:>8.2f}s")
+            print()
+
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(reports, f, indent=2)
+            print(f"📄 Report written to {output}")
+        return True
+
+    except Exception as e:
+        print(f"❌ Generation benchmark error: {e}")
+        logging.error(f"❌ Generation benchmark error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark the generators against the in-memory database')
+    parser.add_argument('--count', type=int, default=1000, help='Number of students to generate')
+    parser.add_argument('--year', type=str, default='2024/2025', help='Academic year (e.g., 2024/2025)')
+    parser.add_argument('--engines', nargs='+', choices=['python', 'vectorized'], help='Engines to compare (default python)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--steps', nargs='+',
+                        choices=['master_data', 'students', 'academic', 'enrollments', 'payments', 'attendance'],
+                        help='Steps to report (every step still runs, later ones need the earlier rows)')
+    parser.add_argument('--output', type=str, help='Write the reports as JSON')
+
+    args = parser.parse_args()
+    success = main(args.count, args.year, args.engines, args.seed, args.steps, args.output)
+    sys.exit(0 if success else 1)
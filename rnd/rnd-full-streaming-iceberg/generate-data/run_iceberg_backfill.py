@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Backfill historical academic years straight into the *_iceberg tables"""
+
+import argparse
+import logging
+import sys
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def main(from_year, years=10, student_count=1000, warehouse='file:///tmp/warehouse', engine='vectorized', seed=None):
+    """Generate academic years from_year/from_year+1 onwards, writing every load to Iceberg as well"""
+    try:
+        import run_complete_generation
+
+        print(f"🧊 Backfilling {years} academic years from {from_year}/{from_year + 1} into {warehouse}")
+        print("ℹ️ Register the Debezium connector afterwards with snapshot.mode=never so only live changes stream")
+
+        for offset in range(years):
+            year_start = from_year + offset
+            academic_year = f"{year_start}/{year_start + 1}"
+            print(f"\n{'='*20} Backfill {academic_year} {'='*20}")
+            success = run_complete_generation.main(
+                academic_year=academic_year,
+                student_count=student_count,
+                skip_existing=True,
+                engine=engine,
+                seed=None if seed is None else seed + offset,
+                iceberg_warehouse=warehouse
+            )
+            if not success:
+                print(f"❌ Backfill stopped at {academic_year}")
+                return False
+
+        print(f"\n🎉 Backfilled {years} academic years")
+        return True
+
+    except Exception as e:
+        print(f"❌ Iceberg backfill error: {e}")
+        logging.error(f"❌ Iceberg backfill error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Backfill historical academic years straight into Iceberg')
+    parser.add_argument('--from-year', type=int, required=True, help='First academic year start (e.g. 2015 for 2015/2016)')
+    parser.add_argument('--years', type=int, default=10, help='Number of academic years to backfill')
+    parser.add_argument('--count', type=int, default=1000, help='New students per academic year')
+    parser.add_argument('--warehouse', type=str, default='file:///tmp/warehouse',
+                        help='Hadoop-layout warehouse (set ICEBERG_CATALOG_URI to use a SQL catalog)')
+    parser.add_argument('--engine', choices=['python', 'vectorized'], default='vectorized',
+                        help='Fact table engine (the sql engine bypasses the backfill writer)')
+    parser.add_argument('--seed', type=int, help='Random seed (incremented per year)')
+
+    args = parser.parse_args()
+    success = main(args.from_year, args.years, args.count, args.warehouse, args.engine, args.seed)
+    sys.exit(0 if success else 1)
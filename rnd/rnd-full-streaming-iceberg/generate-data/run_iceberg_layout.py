@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Sink layout tool: print the sink DDL, pre-create the *_iceberg tables, or benchmark scan file counts"""
+
+import argparse
+import json
+import logging
+import sys
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def print_ddl():
+    """Print the Flink sink DDL with partitioning and table properties"""
+    import flink_job_builder
+    import pipeline_tables
+
+    for table_name, spec in pipeline_tables.PIPELINE_TABLES.items():
+        print(flink_job_builder.iceberg_sink_ddl(table_name, spec))
+        print()
+    return True
+
+def create_tables(catalog='hadoop', warehouse=None):
+    """Create the missing *_iceberg tables with their full partition spec, sort order and properties"""
+    import flink_job_builder
+    import hadoop_catalog
+    import iceberg_backfill
+    import pipeline_tables
+
+    if catalog == 'rest':
+        options = {key: value for key, value in flink_job_builder.CATALOGS['rest'].items() if key not in ('type', 'catalog-type')}
+        iceberg_catalog = hadoop_catalog.get_rest_catalog(options)
+    else:
+        iceberg_catalog = hadoop_catalog.get_local_catalog(warehouse or hadoop_catalog.ICEBERG_WAREHOUSE)
+
+    existing = set(iceberg_catalog.table_names())
+    writer = iceberg_backfill.IcebergBackfillWriter(iceberg_catalog)
+    for table_name in pipeline_tables.PIPELINE_TABLES:
+        if f"{table_name}_iceberg" in existing:
+            print(f"⏭️ {table_name}_iceberg exists - layout left unchanged")
+            continue
+        writer.table(table_name)
+        partition_by = pipeline_tables.PIPELINE_TABLES[table_name].get('partition_by')
+        print(f"✅ {table_name}_iceberg created ({', '.join(partition_by) if partition_by else 'unpartitioned'})")
+    return True
+
+def benchmark(warehouse, years, students, commits, seed, output=None):
+    """Compare scan file counts of the flat and the laid-out tables"""
+    import iceberg_layout_benchmark
+
+    results = iceberg_layout_benchmark.run_benchmark(warehouse, years, students, commits, seed)
+
+    print(f"\n{'table':<20} {'stage':<10} {'query':<18} {'flat files':>11} {'layout files':>13} {'flat MB':>9} {'layout MB':>10}")
+    for table_name, result in results.items():
+        for stage in ('streaming', 'compacted'):
+            flat, layout = result['flat'][stage], result['layout'][stage]
+            print(f"{table_name:<20} {stage:<10} {'(all data files)':<18} {flat['data_files']:>11} {layout['data_files']:>13}")
+            for label, flat_query in flat['queries'].items():
+                layout_query = layout['queries'][label]
+                print(f"{table_name:<20} {stage:<10} {label:<18} {flat_query['files']:>11} {layout_query['files']:>13} "
+                      f"{flat_query['bytes'] / 1e6:>9.2f} {layout_query['bytes'] / 1e6:>10.2f}")
+
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📄 Results written to {output}")
+    return True
+
+def main(action='ddl', catalog='hadoop', warehouse=None, years=3, students=2000, commits=12, seed=42, output=None):
+    try:
+        if action == 'create':
+            return create_tables(catalog, warehouse)
+        if action == 'benchmark':
+            import iceberg_layout_benchmark
+            return benchmark(warehouse or iceberg_layout_benchmark.BENCHMARK_WAREHOUSE, years, students, commits, seed, output)
+        return print_ddl()
+
+    except Exception as e:
+        print(f"❌ Iceberg layout error: {e}")
+        logging.error(f"❌ Iceberg layout error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Partition spec and table properties of the Iceberg sinks')
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument('--create', action='store_true', help='Pre-create the *_iceberg tables with their full layout')
+    group.add_argument('--benchmark', action='store_true', help='Compare scan file counts with and without the layout')
+    parser.add_argument('--catalog', choices=['hadoop', 'rest'], default='hadoop',
+                        help='Catalog for --create: local hadoop warehouse or Polaris')
+    parser.add_argument('--warehouse', type=str, help='Local warehouse (default file:///tmp/warehouse, or the benchmark warehouse)')
+    parser.add_argument('--years', type=int, default=3, help='Benchmark: academic years of data')
+    parser.add_argument('--students', type=int, default=2000, help='Benchmark: students per semester')
+    parser.add_argument('--commits', type=int, default=12, help='Benchmark: streaming commits per semester')
+    parser.add_argument('--seed', type=int, default=42, help='Benchmark: random seed')
+    parser.add_argument('--output', type=str, help='Benchmark: write results as JSON')
+
+    args = parser.parse_args()
+    action = 'create' if args.create else 'benchmark' if args.benchmark else 'ddl'
+    success = main(action, args.catalog, args.warehouse, args.years, args.students, args.commits, args.seed, args.output)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Compact, rewrite manifests, expire snapshots and remove orphans of the local Iceberg tables, once or on a schedule"""
+
+import argparse
+import json
+import logging
+import sys
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def main(warehouse=None, catalog_uri=None, tables=None, steps=None, interval=0, iterations=None,
+         min_input_files=None, orphan_age_hours=None, dry_run=False, output=None):
+    """Run maintenance once (interval 0) or every interval seconds"""
+    try:
+        import hadoop_catalog
+        import iceberg_maintenance
+
+        kwargs = {'dry_run': dry_run}
+        if min_input_files is not None:
+            kwargs['min_input_files'] = min_input_files
+        if orphan_age_hours is not None:
+            kwargs['orphan_min_age_seconds'] = int(orphan_age_hours * 3600)
+        maintenance = iceberg_maintenance.get_iceberg_maintenance(
+            warehouse or hadoop_catalog.ICEBERG_WAREHOUSE, catalog_uri or hadoop_catalog.ICEBERG_CATALOG_URI, **kwargs
+        )
+        steps = steps or iceberg_maintenance.MAINTENANCE_STEPS
+        print(f"🧹 Maintaining {', '.join(tables) if tables else 'all tables'} ({', '.join(steps)}){' - dry run' if dry_run else ''}")
+
+        if interval:
+            results = maintenance.run_forever(interval, tables, steps, iterations)
+        else:
+            results = maintenance.run(tables, steps)
+
+        failed = [table_name for table_name, report in results.items() if 'error' in report]
+        for table_name, report in results.items():
+            if 'error' in report:
+                print(f"❌ {table_name}: {report['error']}")
+                continue
+            compact = report.get('compact', {})
+            manifests = report.get('manifests', {})
+            print(f"✅ {table_name}: {compact.get('files_removed', 0)} → {compact.get('files_added', 0)} files, "
+                  f"manifests {manifests.get('manifests_before', '-')} → {manifests.get('manifests_after', '-')}, "
+                  f"{report.get('expire', {}).get('expired', 0)} snapshots expired, "
+                  f"{report.get('orphans', {}).get('orphans', 0)} orphans removed")
+
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+            print(f"📄 Report written to {output}")
+        return not failed
+
+    except KeyboardInterrupt:
+        print("⏹️ Maintenance stopped")
+        return True
+    except Exception as e:
+        print(f"❌ Iceberg maintenance error: {e}")
+        logging.error(f"❌ Iceberg maintenance error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Maintain the Iceberg tables of the local warehouse')
+    parser.add_argument('--warehouse', type=str, help='Hadoop-layout warehouse (default file:///tmp/warehouse)')
+    parser.add_argument('--catalog-uri', type=str, help='SQL catalog instead of the hadoop layout (e.g. sqlite:////tmp/warehouse/catalog.db)')
+    parser.add_argument('--tables', nargs='+', help='Tables to maintain (default all tables of the namespace)')
+    parser.add_argument('--steps', nargs='+', choices=['compact', 'manifests', 'expire', 'orphans'],
+                        help='Steps to run (default all, in this order)')
+    parser.add_argument('--interval', type=int, default=0, help='Seconds between passes (0 runs once)')
+    parser.add_argument('--iterations', type=int, help='Stop after this many passes')
+    parser.add_argument('--min-input-files', type=int, help='Small files a partition needs before it is compacted')
+    parser.add_argument('--orphan-age-hours', type=float, help='Minimum age of unreferenced files before removal')
+    parser.add_argument('--dry-run', action='store_true', help='Report what would be done without committing or deleting')
+    parser.add_argument('--output', type=str, help='Write the report as JSON')
+
+    args = parser.parse_args()
+    success = main(args.warehouse, args.catalog_uri, args.tables, args.steps, args.interval, args.iterations,
+                   args.min_input_files, args.orphan_age_hours, args.dry_run, args.output)
+    sys.exit(0 if success else 1)
@@ -4,6 +4,7 @@
 import logging
 import sys
 import os
+import argparse
 
 # Setup logging
 logging.basicConfig(
@@ -11,7 +12,7 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-def main():
+def main(courses_per_program=None):
     """Setup master data"""
     try:
         print("🏗️ Setting up master data...")
@@ -20,7 +21,7 @@ def main():
         import master_data_generator
         
         # Get generator
-        generator = master_data_generator.get_master_data_generator()
+        generator = master_data_generator.get_master_data_generator(courses_per_program)
         
         # Setup master data
         success = generator.setup_master_data()
@@ -40,5 +41,9 @@ def main():
         return False
 
 if __name__ == "__main__":
-    success = main()
+    parser = argparse.ArgumentParser(description='Setup university master data')
+    parser.add_argument('--courses-per-program', type=int, help='Number of courses generated per program')
+    
+    args = parser.parse_args()
+    success = main(args.courses_per_program)
     sys.exit(0 if success else 1) 
\ No newline at end of file
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""List, create, backfill (load and attach) and purge (detach and drop) academic-year partitions"""
+
+import argparse
+import logging
+import sys
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def main(ensure=None, backfill=None, dataset_dir=None, purge=None, confirm=False, publication=False, tables=None):
+    """Apply the requested partition changes, then list the partitions of every partitioned table"""
+    try:
+        import db_utils
+        import partition_manager
+
+        db = db_utils.get_db_manager()
+        partitioned = partition_manager.partitioned_tables(db)
+        if not partitioned:
+            print(f"❌ No partitioned tables: create the schema with {partition_manager.PARTITIONED_SCHEMA_FILE} "
+                  f"(python setup_and_run.py --partitioned)")
+            return False
+        tables = [table_name for table_name in partitioned if not tables or table_name in tables]
+
+        if publication:
+            name = partition_manager.ensure_publication(db)
+            print(f"📣 {name} publishes partition changes under the partitioned table names")
+
+        for academic_year in ensure or []:
+            names = partition_manager.ensure_partitions(db, academic_year, tables)
+            print(f"🧱 {academic_year}: {', '.join(names)}")
+
+        if backfill:
+            import dataset_artifact
+            artifact = dataset_artifact.get_dataset_artifact(dataset_dir or dataset_artifact.DATASET_DIR)
+            for academic_year in backfill:
+                attached = {name for table_name in tables for name, _ in partition_manager.list_partitions(db, table_name)}
+                existing = [partition_manager.partition_name(table_name, academic_year) for table_name in tables
+                            if partition_manager.partition_name(table_name, academic_year) in attached]
+                if existing:
+                    print(f"❌ {academic_year} already has partitions ({', '.join(existing)}); purge it first")
+                    return False
+                loaders = artifact.partition_loaders(db, academic_year, tables)
+                names = partition_manager.backfill_academic_year(db, academic_year, loaders, tables)
+                print(f"📎 {academic_year}: loaded and attached {', '.join(names)}")
+
+        for academic_year in purge or []:
+            names = [partition_manager.partition_name(table_name, academic_year) for table_name in tables]
+            if not confirm:
+                print(f"⚠️ Would detach and drop {', '.join(names)}; rerun with --yes to purge")
+                continue
+            partition_manager.purge_academic_year(db, academic_year, tables)
+            print(f"🗑️ {academic_year}: dropped {', '.join(names)}")
+
+        for table_name in tables:
+            partitions = partition_manager.list_partitions(db, table_name)
+            print(f"📋 {table_name}: {len(partitions)} partitions")
+            for name, bounds in partitions:
+                print(f"   {name:<36} {bounds}")
+        return True
+
+    except Exception as e:
+        print(f"❌ Partition maintenance error: {e}")
+        logging.error(f"❌ Partition maintenance error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Manage the academic-year partitions of the partitioned schema')
+    parser.add_argument('--ensure', nargs='+', metavar='YEAR', help='Create empty partitions for these academic years')
+    parser.add_argument('--backfill', nargs='+', metavar='YEAR',
+                        help='Load these years from a dataset artifact into staging tables and attach them as partitions')
+    parser.add_argument('--dataset', type=str, help='Dataset artifact to backfill from (default /tmp/university-dataset)')
+    parser.add_argument('--purge', nargs='+', metavar='YEAR', help='Detach and drop the partitions of these academic years')
+    parser.add_argument('--yes', action='store_true', help='Really purge (without it --purge only lists what it would drop)')
+    parser.add_argument('--publication', action='store_true',
+                        help='Make the Debezium publication publish partition changes via the partitioned tables')
+    parser.add_argument('--tables', nargs='+', choices=['registration', 'class', 'student_enrollment', 'payment'],
+                        help='Partitioned tables to act on (default all)')
+
+    args = parser.parse_args()
+    success = main(args.ensure, args.backfill, args.dataset, args.purge, args.yes, args.publication, args.tables)
+    sys.exit(0 if success else 1)
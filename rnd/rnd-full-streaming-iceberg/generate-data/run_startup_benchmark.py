@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Measure cold-start time of the generator modules and fail when a scenario exceeds its budget"""
+
+import argparse
+import json
+import logging
+import sys
+
+# Setup logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+
+def main(scenarios=None, repeats=5, budget=None, profile=None, output=None):
+    """Run the startup scenarios in fresh interpreters and print their timings"""
+    try:
+        import startup_benchmark
+
+        report = startup_benchmark.run_benchmark(scenarios, repeats, budget)
+
+        print(f"🐍 Bare interpreter: {report['interpreter_seconds']:.3f}s (median of {repeats})")
+        print(f"\n{'scenario':<24} {'median':>8} {'min':>8} {'max':>8} {'startup':>8} {'budget':>8}")
+        for name, timing in report['scenarios'].items():
+            flag = " ❌ over budget" if timing['over_budget'] else ""
+            print(f"{name:<24} {timing['median']:>7.3f}s {timing['min']:>7.3f}s {timing['max']:>7.3f}s "
+                  f"{timing['over_interpreter']:>7.3f}s {timing['budget']:>7.2f}s{flag}")
+
+        if profile:
+            report['profile'] = {}
+            for module in profile:
+                imports = startup_benchmark.import_profile(module)
+                report['profile'][module] = imports
+                print(f"\n🔬 Slowest imports of {module} (self ms, cumulative ms):")
+                for name, self_ms, cumulative_ms in imports:
+                    print(f"   {name:<40} {self_ms:>8.1f} {cumulative_ms:>9.1f}")
+
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"📄 Report written to {output}")
+
+        over = [name for name, timing in report['scenarios'].items() if timing['over_budget']]
+        if over:
+            print(f"❌ Over the startup budget: {', '.join(over)}")
+            return False
+        print("✅ Every scenario starts within its budget")
+        return True
+
+    except Exception as e:
+        print(f"❌ Startup benchmark error: {e}")
+        logging.error(f"❌ Startup benchmark error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Cold-start benchmark of the generator modules')
+    parser.add_argument('--scenarios', nargs='+',
+                        choices=['import-generators', 'construct-generators', 'first-fake-value', 'run-complete-generation',
+                                 'test-imports'],
+                        help='Scenarios to run (default all)')
+    parser.add_argument('--repeats', type=int, default=5, help='Fresh interpreters per scenario')
+    parser.add_argument('--budget', type=float, help='Median seconds every scenario may take (default 0.5, 1.8 for test-imports)')
+    parser.add_argument('--profile', nargs='+', metavar='MODULE', help='Also list the slowest imports of these modules')
+    parser.add_argument('--output', type=str, help='Write the report as JSON')
+
+    args = parser.parse_args()
+    success = main(args.scenarios, args.repeats, args.budget, args.profile, args.output)
+    sys.exit(0 if success else 1)
@@ -28,10 +28,11 @@ def main(entry_year=None, count=None):
         # Import local modules
         import student_generator
         import db_utils
+        import table_schemas
         
         # Get generator
-        generator = student_generator.get_student_generator()
         db = db_utils.get_db_manager()
+        generator = student_generator.get_student_generator(db)
         
         # Check if students for this year already exist
         existing_count = 0
@@ -51,24 +52,14 @@ def main(entry_year=None, count=None):
         print(f"🎯 Generated {len(students)} students")
         
         # Insert students
-        student_columns = ['student_id', 'full_name', 'entry_year', 'program_id', 'degree', 'faculty_id', 'status', 'created_at']
-        inserted_count = db.bulk_insert_data('students', student_columns, students)
+        inserted_count = db.bulk_insert_data('students', table_schemas.get_column_names('students'), students)
         print(f"✅ Successfully inserted {inserted_count} students")
         
-        # Insert student details (remove the first element which is student_detail_id)
-        student_details_for_insert = [detail[1:] for detail in student_details]
-        detail_columns = [
-            'student_id', 'gender', 'birth_date', 'birth_place',
-            'religion', 'nationality', 'registration_date', 'address', 'city',
-            'province', 'postal_code', 'phone_number', 'high_school', 'high_school_year',
-            'parent_name', 'parent_income', 'parent_occupation', 'blood_type',
-            'health_insurance', 'accommodation'
-        ]
-        db.bulk_insert_data('student_detail', detail_columns, student_details_for_insert)
+        # Insert student details
+        db.bulk_insert_data('student_detail', table_schemas.get_column_names('student_detail'), student_details)
         
         # Insert student fees
-        fee_columns = ['fee_id', 'student_id', 'ukt_fee', 'bop_fee', 'updated_at']
-        db.bulk_insert_data('student_fee', fee_columns, student_fees)
+        db.bulk_insert_data('student_fee', table_schemas.get_column_names('student_fee'), student_fees)
         
         print(f"✅ Generated complete student data for {entry_year}")
         return True
@@ -5,6 +5,7 @@ import logging
 import sys
 import os
 import subprocess
+import argparse
 from datetime import datetime
 
 # Setup logging
@@ -51,8 +52,8 @@ def wait_for_postgres():
     print("❌ PostgreSQL not ready after waiting")
     return False
 
-def setup_database_schema():
-    """Setup the university database schema"""
+def setup_database_schema(partitioned=False):
+    """Setup the university database schema (optionally partitioned by academic year)"""
     try:
         print("🗄️ Setting up database schema...")
         
@@ -64,9 +65,13 @@ def setup_database_schema():
         import db_utils
         db = db_utils.get_db_manager()
         
-        schema_file = os.path.join(os.path.dirname(__file__), 'university_tables.sql')
+        import partition_manager
+        import static_data
+        schema_name = partition_manager.PARTITIONED_SCHEMA_FILE if partitioned else 'university_tables.sql'
+        schema_file = os.path.join(os.path.dirname(__file__), schema_name)
         if os.path.exists(schema_file):
-            db.create_tables_from_sql_file(schema_file)
+            academic_years = [static_data.get_current_academic_year()] if partitioned else None
+            db.create_tables_from_sql_file(schema_file, academic_years)
             print("✅ University schema created successfully")
             return True
         else:
@@ -79,13 +84,13 @@ def setup_database_schema():
         traceback.print_exc()
         return False
 
-def main():
+def main(partitioned=False):
     """Main setup and run function"""
     try:
         print("🚀 Starting university data generation setup")
         
         # Step 1: Setup database schema
-        if not setup_database_schema():
+        if not setup_database_schema(partitioned):
             print("❌ Database schema setup failed")
             return False
         
@@ -113,5 +118,10 @@ def main():
         return False
 
 if __name__ == "__main__":
-    success = main()
+    parser = argparse.ArgumentParser(description='Setup university schema and run data generation')
+    parser.add_argument('--partitioned', action='store_true',
+                        help='Create registration, class, enrollment and payment partitioned by academic year')
+    args = parser.parse_args()
+    
+    success = main(args.partitioned)
     sys.exit(0 if success else 1) 
\ No newline at end of file
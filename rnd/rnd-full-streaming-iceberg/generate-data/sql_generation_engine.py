@@ -0,0 +1,320 @@
+"""Set-based in-database generation engine for the largest fact tables
+
+Expresses the enrollment, payment and attendance distributions from
+static_data as single SQL statements built on generate_series(), random()
+and joins against registration and class, so rows never leave PostgreSQL.
+"""
+
+import logging
+import random
+import static_data
+import db_utils
+import table_schemas
+
+WEEKDAYS = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+
+def _quote(value):
+    """SQL string literal for a static value"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+def _array_choice_sql(values, draw_column):
+    """Uniform choice from a list of values using a random() draw in [0, 1)"""
+    literals = ', '.join(_quote(v) if isinstance(v, str) else str(v) for v in values)
+    return f"(ARRAY[{literals}])[1 + floor({draw_column} * {len(values)})::int]"
+
+def _weighted_choice_sql(weights, draw_column):
+    """Weighted choice from a {value: weight} mapping using a random() draw in [0, 1)"""
+    total = float(sum(weights.values()))
+    cases = []
+    cumulative = 0.0
+    items = list(weights.items())
+    for value, weight in items[:-1]:
+        cumulative += weight / total
+        cases.append(f"WHEN {draw_column} < {cumulative:.6f} THEN {_quote(value)}")
+    return f"CASE {' '.join(cases)} ELSE {_quote(items[-1][0])} END"
+
+def _randint_sql(bounds, draw_column):
+    """Integer uniform in [low, high] (inclusive, like random.randint)"""
+    low, high = bounds
+    return f"({low} + floor({draw_column} * {high - low + 1}))"
+
+def _grade_band_sql(band_column, value_column, point_column):
+    """(final_grade_sql, grade_point_sql) drawing from static_data.GRADE_BANDS"""
+    grade_cases = []
+    point_cases = []
+    cumulative = 0.0
+    bands = static_data.GRADE_BANDS
+    for index, (probability, min_grade, max_grade, grade_points) in enumerate(bands):
+        cumulative += probability
+        condition = f"WHEN {band_column} < {cumulative:.6f} THEN" if index < len(bands) - 1 else "ELSE"
+        grade_cases.append(f"{condition} {min_grade} + {value_column} * {max_grade - min_grade}")
+        if len(grade_points) == 1:
+            point_cases.append(f"{condition} {grade_points[0]}")
+        else:
+            point_cases.append(f"{condition} {_array_choice_sql(grade_points, point_column)}")
+    return f"CASE {' '.join(grade_cases)} END", f"CASE {' '.join(point_cases)} END"
+
+def build_enrollment_sql():
+    """INSERT ... SELECT generating student_enrollment rows for %(academic_year)s"""
+    columns = ', '.join(table_schemas.get_column_names('student_enrollment'))
+    final_grade_sql, grade_point_sql = _grade_band_sql('band_draw', 'grade_draw', 'point_draw')
+    attendance_low, attendance_high = static_data.ATTENDANCE_PERCENTAGE_RANGE
+    graded = f"graded_draw < {static_data.GRADED_PROBABILITY}"
+
+    return f"""INSERT INTO student_enrollment ({columns})
+WITH regs AS (
+    SELECT r.registration_id, r.student_id, r.semester, r.total_sks, r.registration_date, s.program_id
+    FROM registration r
+    JOIN students s ON s.student_id = r.student_id
+    WHERE r.academic_year = %(academic_year)s AND r.registration_status = 'active'
+),
+classes AS (
+    SELECT c.class_id, c.semester, c.capacity, c.enrolled_count, co.credits, co.program_id
+    FROM class c
+    JOIN course co ON c.course_id = co.id
+    WHERE c.academic_year = %(academic_year)s AND c.class_status = 'active'
+),
+program_semesters AS (
+    SELECT DISTINCT semester, program_id FROM classes
+),
+candidates AS (
+    -- Classes of the student's program, or of any program when it has none this semester
+    SELECT g.registration_id, g.student_id, g.total_sks, g.registration_date,
+           c.class_id, c.credits, random() AS shuffle
+    FROM regs g
+    JOIN classes c ON c.semester = g.semester
+     AND (c.program_id = g.program_id OR NOT EXISTS (
+            SELECT 1 FROM program_semesters ps
+            WHERE ps.semester = g.semester AND ps.program_id = g.program_id))
+    WHERE c.enrolled_count < c.capacity
+),
+picked AS (
+    -- Take shuffled classes until the target SKS is reached
+    SELECT cd.*,
+           SUM(cd.credits) OVER (PARTITION BY cd.registration_id ORDER BY cd.shuffle
+                                 ROWS UNBOUNDED PRECEDING) - cd.credits AS sks_before
+    FROM candidates cd
+),
+draws AS (
+    SELECT p.registration_id, p.student_id, p.class_id, p.registration_date,
+           random() AS date_draw, random() AS graded_draw, random() AS band_draw,
+           random() AS grade_draw, random() AS point_draw, random() AS attendance_draw
+    FROM picked p
+    WHERE p.sks_before < p.total_sks
+)
+SELECT student_id,
+       registration_id,
+       class_id,
+       registration_date + {_randint_sql((0, static_data.ENROLLMENT_DATE_MAX_OFFSET), 'date_draw')}::int,
+       'enrolled',
+       CASE WHEN {graded} THEN round(({final_grade_sql})::numeric, 2) END,
+       CASE WHEN {graded} THEN {grade_point_sql} END,
+       CASE WHEN {graded} THEN round(({attendance_low} + attendance_draw * {attendance_high - attendance_low})::numeric, 2) END,
+       now()::timestamp,
+       now()::timestamp,
+       %(academic_year)s
+FROM draws
+ORDER BY student_id
+ON CONFLICT DO NOTHING"""
+
+def build_payment_sql():
+    """INSERT ... SELECT generating payment rows for %(academic_year)s (%(year_start)s = first year)"""
+    columns = ', '.join(table_schemas.get_column_names('payment'))
+
+    return f"""INSERT INTO payment ({columns})
+WITH regs AS (
+    SELECT r.registration_id, r.student_id, r.semester, r.registration_date, s.entry_year,
+           COALESCE(f.ukt_fee, {_randint_sql(static_data.DEFAULT_UKT_FEE_RANGE, 'random()')}) AS ukt_fee,
+           COALESCE(f.bop_fee, 0) AS bop_fee
+    FROM registration r
+    JOIN students s ON s.student_id = r.student_id
+    LEFT JOIN student_fee f ON f.student_id = r.student_id
+    WHERE r.academic_year = %(academic_year)s
+),
+kinds AS (
+    -- UKT every semester
+    SELECT registration_id, student_id, semester, 1 AS kind_order, 'UKT' AS payment_type,
+           ukt_fee AS amount, registration_date AS base_date
+    FROM regs
+    UNION ALL
+    -- BOP on the first registration (semester 1 of the entry year)
+    SELECT registration_id, student_id, semester, 2, 'BOP', bop_fee, registration_date
+    FROM regs
+    WHERE semester = 1 AND entry_year = %(year_start)s AND bop_fee > 0
+    UNION ALL
+    -- Occasional late fee
+    SELECT registration_id, student_id, semester, 3, 'Late Fee',
+           {_randint_sql(static_data.LATE_FEE_RANGE, 'random()')},
+           registration_date + {_randint_sql(static_data.LATE_FEE_PAYMENT_DELAY_DAYS, 'random()')}::int
+    FROM regs
+    WHERE random() < {static_data.LATE_FEE_PROBABILITY}
+),
+numbered AS (
+    SELECT k.*,
+           row_number() OVER (ORDER BY k.student_id, k.semester, k.kind_order) AS payment_counter,
+           random() AS bank_draw, random() AS channel_draw, random() AS status_draw,
+           random() AS delay_draw, random() AS time_draw, random() AS admin_draw,
+           random() AS admin_fee_draw, random() AS overdue_fee_draw,
+           random() AS installment_draw, random() AS account_draw
+    FROM kinds k
+),
+payments AS (
+    SELECT n.*,
+           'PAY-' || n.student_id || '-' || replace(%(academic_year)s, '/', '') || '-'
+               || lpad(n.payment_counter::text, 6, '0') AS payment_id,
+           {_array_choice_sql(static_data.PAYMENT_BANKS, 'n.bank_draw')} AS bank_name,
+           {_array_choice_sql(static_data.PAYMENT_CHANNELS, 'n.channel_draw')} AS payment_channel,
+           {_weighted_choice_sql(static_data.PAYMENT_STATUS_WEIGHTS, 'n.status_draw')} AS payment_status,
+           n.base_date + {static_data.PAYMENT_DUE_DAYS} AS due_date
+    FROM numbered n
+),
+timed AS (
+    SELECT p.*,
+           CASE WHEN p.payment_status = 'paid'
+                THEN p.base_date + {_randint_sql(static_data.PAYMENT_DELAY_DAYS, 'p.delay_draw')}::int END AS payment_date
+    FROM payments p
+),
+charged AS (
+    SELECT t.*,
+           CASE WHEN t.payment_status = 'overdue' OR t.payment_date > t.due_date
+                THEN {_randint_sql(static_data.OVERDUE_FEE_RANGE, 't.overdue_fee_draw')} ELSE 0 END AS late_fee_charged
+    FROM timed t
+)
+SELECT payment_id,
+       student_id,
+       registration_id,
+       payment_type,
+       amount,
+       bank_name,
+       bank_name || (1000000000 + floor(account_draw * 9000000000))::bigint::text,
+       payment_channel,
+       payment_date + make_interval(secs => floor(time_draw * 86400)),
+       payment_status,
+       CASE WHEN payment_type = 'BOP' AND amount > {static_data.BOP_INSTALLMENT_THRESHOLD}
+            THEN {_array_choice_sql(static_data.BOP_INSTALLMENT_CHOICES, 'installment_draw')} ELSE 1 END,
+       late_fee_charged,
+       CASE WHEN payment_status = 'paid'
+            THEN amount + CASE WHEN admin_draw < {static_data.ADMIN_FEE_PROBABILITY}
+                               THEN {_randint_sql(static_data.ADMIN_FEE_RANGE, 'admin_fee_draw')} ELSE 0 END
+            ELSE 0 END + late_fee_charged,
+       CASE WHEN payment_status = 'paid' THEN 'https://payment-proof.ui.ac.id/' || payment_id || '.pdf' END,
+       due_date,
+       now()::timestamp,
+       now()::timestamp,
+       %(academic_year)s
+FROM charged
+ON CONFLICT DO NOTHING"""
+
+def build_attendance_sql(year_start):
+    """SELECT generating weekly attendance rows for %(academic_year)s"""
+    periods = []
+    for semester in sorted(static_data.SEMESTER_PERIODS):
+        semester_start, semester_end = static_data.get_semester_period(year_start, semester)
+        periods.append(f"({semester}, DATE '{semester_start.isoformat()}', DATE '{semester_end.isoformat()}')")
+    weekday_array = ', '.join(_quote(day) for day in WEEKDAYS)
+    checkin_low, checkin_high = static_data.ATTENDANCE_CHECKIN_VARIATION_MINUTES
+
+    return f"""WITH enrollments AS (
+    SELECT se.student_id, se.class_id, c.schedule_day, c.schedule_time, c.semester
+    FROM student_enrollment se
+    JOIN class c ON se.class_id = c.class_id
+    WHERE c.academic_year = %(academic_year)s AND se.enrollment_status = 'enrolled'
+),
+periods AS (
+    SELECT * FROM (VALUES {', '.join(periods)}) AS p(semester, semester_start, semester_end)
+),
+weeks AS (
+    SELECT e.*, w.week_index, p.semester_end,
+           p.semester_start + 7 * w.week_index AS week_start
+    FROM enrollments e
+    JOIN periods p ON p.semester = e.semester
+    CROSS JOIN generate_series(0, {static_data.WEEKS_PER_SEMESTER - 1}) AS w(week_index)
+),
+sessions AS (
+    -- Next occurrence of the class weekday on or after the start of the week
+    SELECT wk.*,
+           wk.week_start + mod(COALESCE(array_position(ARRAY[{weekday_array}], wk.schedule_day), 1)
+                               - extract(isodow FROM wk.week_start)::int + 7, 7) AS class_date,
+           random() AS status_draw, random() AS checkin_draw
+    FROM weeks wk
+    WHERE wk.week_start <= wk.semester_end
+),
+marked AS (
+    SELECT s.*, {_weighted_choice_sql(static_data.ATTENDANCE_STATUS_WEIGHTS, 's.status_draw')} AS attendance_status
+    FROM sessions s
+    WHERE s.class_date <= s.semester_end
+)
+SELECT student_id,
+       class_id,
+       class_date AS attendance_date,
+       CASE WHEN attendance_status = 'hadir'
+            THEN to_char(class_date + split_part(schedule_time, '-', 1)::time
+                         + make_interval(mins => {_randint_sql((checkin_low, checkin_high), 'checkin_draw')}::int), 'HH24:MI:SS')
+       END AS attendance_time,
+       attendance_status,
+       week_index + 1 AS week_number,
+       semester,
+       %(academic_year)s AS academic_year,
+       now()::timestamp AS created_at
+FROM marked
+ORDER BY student_id, semester, week_index"""
+
+class SqlGenerationEngine:
+    def __init__(self, db=None, seed=None):
+        self.db = db or db_utils.get_db_manager()
+        self.seed = seed
+
+    def _session_setup(self, *stream):
+        """Statements that make random() reproducible for a seeded run, one sequence per stream"""
+        if self.seed is None:
+            return []
+        # setseed() takes a value in [-1, 1]; parallel workers would break the sequence
+        seed_value = random.Random(':'.join(map(str, (self.seed, *stream)))).uniform(-1.0, 1.0)
+        return [
+            ("SET LOCAL max_parallel_workers_per_gather = 0", None),
+            ("SELECT setseed(%s)", (seed_value,)),
+        ]
+
+    def generate_enrollments(self, academic_year):
+        """Generate student_enrollment rows for an academic year with one INSERT ... SELECT"""
+        try:
+            logging.info(f"📚 Generating enrollments in database for {academic_year}")
+            statements = self._session_setup('enrollment', academic_year) + [(build_enrollment_sql(), {'academic_year': academic_year})]
+            inserted = self.db.execute_transaction(statements)[-1]
+            logging.info(f"✅ Generated {inserted} enrollments in database")
+            return inserted
+        except Exception as e:
+            logging.error(f"❌ Error generating enrollments in database: {e}")
+            raise
+
+    def generate_payments(self, academic_year):
+        """Generate payment rows for an academic year with one INSERT ... SELECT"""
+        try:
+            logging.info(f"💰 Generating payments in database for {academic_year}")
+            params = {'academic_year': academic_year, 'year_start': int(academic_year.split('/')[0])}
+            statements = self._session_setup('payment', academic_year) + [(build_payment_sql(), params)]
+            inserted = self.db.execute_transaction(statements)[-1]
+            logging.info(f"✅ Generated {inserted} payments in database")
+            return inserted
+        except Exception as e:
+            logging.error(f"❌ Error generating payments in database: {e}")
+            raise
+
+    def generate_attendance(self, academic_year, fileobj):
+        """Generate attendance rows server-side and stream them to fileobj as CSV"""
+        try:
+            logging.info(f"📋 Generating attendance in database for {academic_year}")
+            year_start = int(academic_year.split('/')[0])
+            copied = self.db.copy_query_to_file(
+                build_attendance_sql(year_start), {'academic_year': academic_year}, fileobj,
+                setup_statements=self._session_setup('attendance', academic_year)
+            )
+            logging.info(f"✅ Generated {copied} attendance records in database")
+            return copied
+        except Exception as e:
+            logging.error(f"❌ Error generating attendance in database: {e}")
+            raise
+
+def get_sql_generation_engine(db=None, seed=None):
+    """Factory function to get SQL generation engine instance"""
+    return SqlGenerationEngine(db, seed)
@@ -0,0 +1,96 @@
+"""Cold-start benchmark: wall time of fresh interpreters importing and constructing the generators"""
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+GENERATOR_MODULES = (
+    'master_data_generator', 'student_generator', 'academic_generator',
+    'enrollment_generator', 'payment_generator', 'attendance_generator',
+)
+
+# Modules run_complete_generation.main() imports before its first step (the optional features import theirs when enabled)
+RUN_COMPLETE_GENERATION_MODULES = (
+    'run_complete_generation', 'db_utils', 'reference_cache', 'table_schemas', 'static_data',
+    'student_lifecycle', 'partition_manager', 'locale_providers',
+) + GENERATOR_MODULES
+
+# Python run by each scenario in a fresh interpreter
+STARTUP_SCENARIOS = {
+    'import-generators': f"import {', '.join(GENERATOR_MODULES)}",
+    'construct-generators': (
+        f"import {', '.join(GENERATOR_MODULES)}\n"
+        + "\n".join(f"{module}.get_{module}()" for module in GENERATOR_MODULES)
+    ),
+    'first-fake-value': "import student_generator\nstudent_generator.fake.name()",
+    'run-complete-generation': f"import {', '.join(RUN_COMPLETE_GENERATION_MODULES)}",
+    'test-imports': "import test_system\ntest_system.test_imports()",
+}
+
+# Unroutable address: a connection opened during startup costs its whole connect timeout
+BENCHMARK_DB_HOST = '10.255.255.1'
+
+# Median wall time a scenario may take before the benchmark fails (about 0.2s measured, 0.35s for run-complete-generation)
+STARTUP_BUDGET_SECONDS = 0.5
+
+# Scenarios with their own budget: test-imports imports every module, pyiceberg and pyarrow included (about 1.7s)
+STARTUP_BUDGETS = {'test-imports': 1.8}
+
+def _environment():
+    env = dict(os.environ)
+    env.update({'DB_HOST': BENCHMARK_DB_HOST, 'CONTAINER_HOST': BENCHMARK_DB_HOST, 'PYTHONDONTWRITEBYTECODE': '1'})
+    return env
+
+def time_scenario(code, repeats=5):
+    """Wall seconds of `repeats` fresh interpreters running code (interpreter start included)"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], cwd=MODULE_DIR, env=_environment(), check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+def import_profile(module, top=10):
+    """[(module, self_ms, cumulative_ms)] of the slowest imports of module (python -X importtime)"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"], cwd=MODULE_DIR,
+                            env=_environment(), check=True, capture_output=True, text=True)
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        imports.append((name, int(self_us) / 1000, int(cumulative_us) / 1000))
+    return sorted(imports, key=lambda entry: entry[1], reverse=True)[:top]
+
+def scenario_budget(name, budget_seconds=None):
+    """Median seconds scenario name may take: budget_seconds when given, else its STARTUP_BUDGETS entry or the default"""
+    return budget_seconds or STARTUP_BUDGETS.get(name, STARTUP_BUDGET_SECONDS)
+
+def run_benchmark(scenarios=None, repeats=5, budget_seconds=None):
+    """
+    Time the named (default all) scenarios against a bare interpreter.
+
+    budget_seconds overrides every scenario's budget (scenario_budget).
+    Returns {'interpreter_seconds', 'scenarios': {name: {'median', 'min',
+    'max', 'over_interpreter', 'budget', 'over_budget'}}}, times in seconds.
+    """
+    results = {}
+    baseline = statistics.median(time_scenario("pass", repeats))
+    for name in scenarios or STARTUP_SCENARIOS:
+        timings = time_scenario(STARTUP_SCENARIOS[name], repeats)
+        median = statistics.median(timings)
+        budget = scenario_budget(name, budget_seconds)
+        results[name] = {
+            'median': round(median, 3),
+            'min': round(min(timings), 3),
+            'max': round(max(timings), 3),
+            'over_interpreter': round(median - baseline, 3),
+            'budget': budget,
+            'over_budget': median > budget,
+        }
+    return {'interpreter_seconds': round(baseline, 3), 'scenarios': results}
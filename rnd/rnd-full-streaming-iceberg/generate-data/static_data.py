@@ -1,6 +1,6 @@
 """Static data module for university data generation"""
 
-from datetime import datetime
+from datetime import datetime, date
 import logging
 
 def get_academic_year_from_execution_date(execution_date):
@@ -50,6 +50,14 @@ def get_semester_from_date(date_obj):
         logging.error(f"❌ Error determining semester: {e}")
         return 1
 
+def get_semester_period(year_start, semester):
+    """Get (start_date, end_date) of the lecture period for a semester"""
+    (start_offset, start_month, start_day), (end_offset, end_month, end_day) = SEMESTER_PERIODS[semester]
+    return (
+        date(year_start + start_offset, start_month, start_day),
+        date(year_start + end_offset, end_month, end_day)
+    )
+
 # Static master data
 INDONESIAN_CITIES = [
     'Jakarta', 'Surabaya', 'Bandung', 'Bekasi', 'Medan', 'Tangerang', 'Depok', 'Semarang',
@@ -74,6 +82,107 @@ TIME_SLOTS = [
     '14:40-16:20', '16:30-18:10', '18:30-20:10'
 ]
 
+# Course catalog generation settings
+# Number of courses generated per program, by degree
+COURSE_CATALOG_SIZES = {'S1': 32, 'S2': 12}
+
+# Course levels per degree (first digit of the course number)
+COURSE_LEVELS = {'S1': [1, 2, 3, 4], 'S2': [5, 6]}
+
+# Credit (SKS) load distribution: credits -> weight
+COURSE_CREDIT_WEIGHTS = {2: 20, 3: 55, 4: 25}
+
+# Probability that a course above the entry level has prerequisites
+COURSE_PREREQUISITE_PROBABILITY = 0.6
+COURSE_MAX_PREREQUISITES = 2
+
+# Course name topics per level, combined with the program name
+COURSE_TOPICS = {
+    1: ['Pengantar', 'Dasar-Dasar', 'Matematika Dasar', 'Konsep Dasar'],
+    2: ['Metode', 'Teori', 'Analisis', 'Praktikum'],
+    3: ['Perancangan', 'Manajemen', 'Riset Operasional', 'Studi Kasus'],
+    4: ['Topik Khusus', 'Seminar', 'Kapita Selekta', 'Etika Profesi'],
+    5: ['Teori Lanjut', 'Metodologi Penelitian', 'Analisis Lanjut'],
+    6: ['Seminar Tesis', 'Topik Riset', 'Kajian Mutakhir'],
+}
+
+# General (university-wide) courses added to every S1 program
+GENERAL_COURSES = [
+    ('UNI101', 'Bahasa Indonesia', 2),
+    ('UNI102', 'Pancasila', 2),
+    ('UNI103', 'Bahasa Inggris', 2),
+    ('UNI104', 'Agama', 2),
+]
+
+# Registration distributions
+MAX_STUDY_YEARS = 6  # Students register for at most this many years
+REGISTRATION_SKIP_PROBABILITY = 0.05  # Students skipping a semester
+LATE_REGISTRATION_PROBABILITY = 0.1
+REGISTRATION_MONTHS = {1: (7, 8), 2: (12, 12)}  # Registration month range per semester
+# Target SKS by study year: (last study year of the band, (min_sks, max_sks))
+REGISTRATION_SKS_BANDS = [
+    (2, (18, 24)),  # Fresh students take more
+    (4, (15, 21)),  # Mid-level students
+    (6, (6, 15)),   # Senior students (thesis)
+]
+
+# Student lifecycle, applied once per academic year before registration
+STUDENT_STATUSES = ['active', 'leave', 'dropout', 'graduated']
+TERMINAL_STUDENT_STATUSES = ['dropout', 'graduated']
+# Yearly transition probabilities between non-terminal states
+LIFECYCLE_HAZARDS = {
+    'active': {'leave': 0.03, 'dropout': 0.02},
+    'leave': {'active': 0.6, 'dropout': 0.15},
+}
+# Graduation probability of active students by degree and completed study years
+GRADUATION_HAZARDS = {
+    'S1': {4: 0.35, 5: 0.6, 6: 0.8},
+    'S2': {2: 0.5, 3: 0.7, 4: 0.8},
+}
+# Students still active after MAX_STUDY_YEARS are dropped out
+LIFECYCLE_UPDATE_BATCH_SIZE = 10000
+
+# Enrollment grade distribution, shared by the Python and SQL generation engines
+# (probability, min_final_grade, max_final_grade, possible grade points)
+GRADE_BANDS = [
+    (0.05, 85, 100, [4.0]),      # A
+    (0.15, 80, 84, [3.5]),       # B+
+    (0.25, 75, 79, [3.0]),       # B
+    (0.25, 70, 74, [2.5]),       # C+
+    (0.20, 65, 69, [2.0]),       # C
+    (0.10, 40, 64, [1.0, 0.0]),  # D or E
+]
+GRADED_PROBABILITY = 0.8  # Share of enrollments that already have a grade
+ATTENDANCE_PERCENTAGE_RANGE = (70, 100)
+ENROLLMENT_DATE_MAX_OFFSET = 7  # Days after registration
+
+# Payment distributions
+PAYMENT_BANKS = ['BNI', 'BCA', 'Mandiri', 'BRI', 'BSI', 'CIMB']
+PAYMENT_CHANNELS = ['Virtual Account', 'Transfer Bank', 'Mobile Banking', 'ATM']
+PAYMENT_STATUS_WEIGHTS = {'paid': 85, 'pending': 10, 'overdue': 5}
+DEFAULT_UKT_FEE_RANGE = (5000000, 12500000)  # When a student has no fee record
+LATE_FEE_PROBABILITY = 0.1
+LATE_FEE_RANGE = (100000, 500000)
+LATE_FEE_PAYMENT_DELAY_DAYS = (30, 60)
+PAYMENT_DELAY_DAYS = (1, 30)
+PAYMENT_DUE_DAYS = 30
+ADMIN_FEE_PROBABILITY = 0.2
+ADMIN_FEE_RANGE = (5000, 25000)
+OVERDUE_FEE_RANGE = (50000, 200000)
+BOP_INSTALLMENT_THRESHOLD = 50000000
+BOP_INSTALLMENT_CHOICES = [1, 2, 3]
+
+# Attendance distributions
+ATTENDANCE_STATUS_WEIGHTS = {'hadir': 80, 'tidak_hadir': 15, 'izin': 3, 'sakit': 2}
+ATTENDANCE_CHECKIN_VARIATION_MINUTES = (-10, 30)
+WEEKS_PER_SEMESTER = 16
+
+# Lecture period per semester: (year offset, month, day) for start and end
+SEMESTER_PERIODS = {
+    1: ((0, 8, 15), (0, 12, 15)),  # Semester 1: August - December
+    2: ((1, 2, 15), (1, 6, 15)),   # Semester 2: February - June
+}
+
 UNIVERSITY_DATA = {
     'faculties': [
         {'code': 'FASILKOM', 'name': 'Fakultas Ilmu Komputer'},
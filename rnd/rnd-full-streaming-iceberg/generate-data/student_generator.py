@@ -3,15 +3,18 @@
 import logging
 import random
 from datetime import datetime, date
-from faker import Faker
 import static_data
 import db_utils
+import locale_providers
+import reference_cache
+import columnar_batch
 
-fake = Faker('id_ID')  # Indonesian locale
+fake = locale_providers.fake  # shared Faker('id_ID'), built on first use
 
 class StudentGenerator:
-    def __init__(self):
-        self.db = db_utils.get_db_manager()
+    def __init__(self, db=None, cache=None):
+        self.db = db or db_utils.get_db_manager()
+        self.cache = cache or reference_cache.get_reference_cache(self.db)
         
     def generate_students_for_year(self, entry_year, target_count=4500):
         """Generate students for a specific entry year"""
@@ -19,23 +22,22 @@ class StudentGenerator:
             logging.info(f"👥 Generating {target_count} students for entry year {entry_year}")
             
             # Get available programs
-            program_results = self.db.execute_query(
-                "SELECT id, program_code, faculty_id, degree FROM program ORDER BY id"
-            )
+            program_results = self.cache.programs()
             
             if not program_results:
                 raise Exception("❌ No programs found in database")
             
-            students = []
-            student_details = []
-            student_fees = []
+            students = columnar_batch.get_batch('students')
+            student_details = columnar_batch.get_batch('student_detail')
+            student_fees = columnar_batch.get_batch('student_fee')
             
             # Generate NPM pattern: {entry_year}{program_code}{sequence}
             npm_counters = {}  # Track NPM sequence per program
             
             for i in range(target_count):
                 # Select random program
-                program_id, program_code, faculty_id, degree = random.choice(program_results)
+                program = random.choice(program_results)
+                program_id, program_code, faculty_id, degree = program.id, program.program_code, program.faculty_id, program.degree
                 
                 # Generate NPM
                 if program_code not in npm_counters:
@@ -71,7 +73,6 @@ class StudentGenerator:
                 registration_date = date(entry_year, random.randint(8, 9), random.randint(1, 28))
                 
                 student_details.append((
-                    i + 1,  # student_detail_id (will be removed during insertion)
                     npm,    # student_id
                     gender,
                     birth_date,
@@ -114,6 +115,6 @@ class StudentGenerator:
             logging.error(f"❌ Error generating students: {e}")
             raise
 
-def get_student_generator():
+def get_student_generator(db=None, cache=None):
     """Factory function to get student generator instance"""
-    return StudentGenerator() 
\ No newline at end of file
+    return StudentGenerator(db, cache) 
\ No newline at end of file
@@ -0,0 +1,100 @@
+"""Student lifecycle transitions (active, leave, dropout, graduated)"""
+
+import logging
+import random
+import static_data
+import db_utils
+import reference_cache
+
+class StudentLifecycle:
+    """
+    Moves non-terminal students through their yearly status transitions.
+
+    Before an academic year is generated, active students may graduate
+    (by degree and completed study years), take a leave or drop out, and
+    students on leave may return or drop out. Students still active after
+    static_data.MAX_STUDY_YEARS are dropped out. Only students that change
+    state are written, grouped by new status into batched UPDATEs, so the
+    students table (and its CDC stream) sees realistic UPDATE traffic and
+    later semesters only scan the shrinking active set.
+    """
+
+    def __init__(self, db=None, cache=None, hazards=None, graduation_hazards=None, seed=None):
+        self.db = db or db_utils.get_db_manager()
+        self.cache = cache or reference_cache.get_reference_cache(self.db)
+        self.hazards = hazards or static_data.LIFECYCLE_HAZARDS
+        self.graduation_hazards = graduation_hazards or static_data.GRADUATION_HAZARDS
+        self.seed = seed
+        self.rng = random.Random(seed)
+
+    def next_status(self, status, degree, completed_years):
+        """Draw the status of one student for the coming academic year"""
+        rng = self.rng
+        if status == 'active':
+            graduation_probability = self.graduation_hazards.get(degree, {}).get(completed_years, 0.0)
+            if graduation_probability and rng.random() < graduation_probability:
+                return 'graduated'
+            if completed_years >= static_data.MAX_STUDY_YEARS:
+                return 'dropout'
+
+        draw = rng.random()
+        cumulative = 0.0
+        for new_status, probability in self.hazards.get(status, {}).items():
+            cumulative += probability
+            if draw < cumulative:
+                return new_status
+        return status
+
+    def plan_transitions(self, academic_year):
+        """{new_status: [student_id, ...]} for every student whose status changes"""
+        year_start = int(academic_year.split('/')[0])
+        if self.seed is not None:
+            # A seeded run draws each year's transitions from that year's own stream
+            self.rng = random.Random(f"{self.seed}:{academic_year}")
+        degrees = {program.id: program.degree for program in self.cache.programs()}
+        candidates = self.db.execute_query(
+            """SELECT student_id, entry_year, program_id, status
+               FROM students
+               WHERE status IN ('active', 'leave') AND entry_year < %s
+               ORDER BY student_id""",
+            (year_start,)
+        )
+
+        transitions = {}
+        for student_id, entry_year, program_id, status in candidates:
+            new_status = self.next_status(status, degrees.get(program_id, 'S1'), year_start - entry_year)
+            if new_status != status:
+                transitions.setdefault(new_status, []).append(student_id)
+        return transitions
+
+    def advance(self, academic_year):
+        """Apply the yearly transitions before academic_year, returns {new_status: count}"""
+        try:
+            logging.info(f"🔄 Advancing student lifecycle into {academic_year}")
+            transitions = self.plan_transitions(academic_year)
+
+            batch_size = static_data.LIFECYCLE_UPDATE_BATCH_SIZE
+            statements = []
+            for new_status, student_ids in transitions.items():
+                for start in range(0, len(student_ids), batch_size):
+                    statements.append((
+                        "UPDATE students SET status = %s WHERE student_id = ANY(%s)",
+                        (new_status, student_ids[start:start + batch_size])
+                    ))
+
+            if statements:
+                self.db.execute_transaction(statements)
+                self.db.notify_changes('students', 'u', 'student_id',
+                                       [student_id for student_ids in transitions.values() for student_id in student_ids])
+
+            counts = {new_status: len(student_ids) for new_status, student_ids in transitions.items()}
+            logging.info(f"✅ Student lifecycle transitions: {counts or 'none'}")
+            return counts
+
+        except Exception as e:
+            logging.error(f"❌ Error advancing student lifecycle: {e}")
+            raise
+
+def get_student_lifecycle(db=None, cache=None, seed=None):
+    """Factory function to get student lifecycle instance"""
+    return StudentLifecycle(db, cache, seed=seed)
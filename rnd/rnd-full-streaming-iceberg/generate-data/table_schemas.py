@@ -0,0 +1,134 @@
+"""Column definitions for generated tables"""
+
+# Column kinds used by columnar_batch.ColumnarBatch:
+#   'str'      - plain string (high cardinality, e.g. ids and names)
+#   'dict'     - dictionary-encoded string (low cardinality, e.g. status, bank)
+#   'int'      - 64-bit integer
+#   'float'    - 64-bit float
+#   'bool'     - boolean
+#   'date'     - date (stored as day ordinal)
+#   'datetime' - naive timestamp (stored as microseconds since epoch)
+
+# Insert columns per table, in the order generators emit them
+TABLE_COLUMNS = {
+    'students': [
+        ('student_id', 'str'),
+        ('full_name', 'str'),
+        ('entry_year', 'int'),
+        ('program_id', 'int'),
+        ('degree', 'dict'),
+        ('faculty_id', 'int'),
+        ('status', 'dict'),
+        ('created_at', 'datetime'),
+    ],
+    'student_detail': [
+        ('student_id', 'str'),
+        ('gender', 'dict'),
+        ('birth_date', 'date'),
+        ('birth_place', 'dict'),
+        ('religion', 'dict'),
+        ('nationality', 'dict'),
+        ('registration_date', 'date'),
+        ('address', 'str'),
+        ('city', 'dict'),
+        ('province', 'dict'),
+        ('postal_code', 'dict'),
+        ('phone_number', 'str'),
+        ('high_school', 'str'),
+        ('high_school_year', 'int'),
+        ('parent_name', 'str'),
+        ('parent_income', 'int'),
+        ('parent_occupation', 'dict'),
+        ('blood_type', 'dict'),
+        ('health_insurance', 'dict'),
+        ('accommodation', 'dict'),
+    ],
+    'student_fee': [
+        ('fee_id', 'str'),
+        ('student_id', 'str'),
+        ('ukt_fee', 'int'),
+        ('bop_fee', 'int'),
+        ('updated_at', 'datetime'),
+    ],
+    'registration': [
+        ('registration_id', 'str'),
+        ('student_id', 'str'),
+        ('academic_year', 'dict'),
+        ('semester', 'int'),
+        ('semester_code', 'dict'),
+        ('registration_date', 'date'),
+        ('registration_status', 'dict'),
+        ('total_sks', 'int'),
+        ('late_registration', 'bool'),
+        ('created_at', 'datetime'),
+        ('updated_at', 'datetime'),
+    ],
+    'class': [
+        ('class_id', 'str'),
+        ('course_id', 'int'),
+        ('lecturer_id', 'int'),
+        ('academic_year', 'dict'),
+        ('semester', 'int'),
+        ('class_code', 'str'),
+        ('room_code', 'dict'),
+        ('schedule_day', 'dict'),
+        ('schedule_time', 'dict'),
+        ('capacity', 'int'),
+        ('enrolled_count', 'int'),
+        ('class_status', 'dict'),
+        ('created_at', 'datetime'),
+    ],
+    'student_enrollment': [
+        ('student_id', 'dict'),
+        ('registration_id', 'dict'),
+        ('class_id', 'dict'),
+        ('enrollment_date', 'date'),
+        ('enrollment_status', 'dict'),
+        ('final_grade', 'float'),
+        ('grade_point', 'float'),
+        ('attendance_percentage', 'float'),
+        ('created_at', 'datetime'),
+        ('updated_at', 'datetime'),
+        ('academic_year', 'dict'),
+    ],
+    'payment': [
+        ('payment_id', 'str'),
+        ('student_id', 'dict'),
+        ('registration_id', 'dict'),
+        ('payment_type', 'dict'),
+        ('payment_amount', 'int'),
+        ('bank_name', 'dict'),
+        ('virtual_account_number', 'str'),
+        ('payment_channel', 'dict'),
+        ('payment_time', 'datetime'),
+        ('payment_status', 'dict'),
+        ('installment_number', 'int'),
+        ('late_fee_charged', 'int'),
+        ('total_paid_amount', 'int'),
+        ('payment_proof_url', 'str'),
+        ('due_date', 'date'),
+        ('created_at', 'datetime'),
+        ('updated_at', 'datetime'),
+        ('academic_year', 'dict'),
+    ],
+    # Attendance is not stored in PostgreSQL, it is written to file sinks
+    'attendance': [
+        ('student_id', 'dict'),
+        ('class_id', 'dict'),
+        ('attendance_date', 'date'),
+        ('attendance_time', 'dict'),
+        ('attendance_status', 'dict'),
+        ('week_number', 'int'),
+        ('semester', 'int'),
+        ('academic_year', 'dict'),
+        ('created_at', 'datetime'),
+    ],
+}
+
+def get_table_columns(table_name):
+    """Get (column_name, kind) pairs for a table"""
+    return TABLE_COLUMNS[table_name]
+
+def get_column_names(table_name):
+    """Get insert column names for a table"""
+    return [name for name, kind in TABLE_COLUMNS[table_name]]
@@ -0,0 +1,112 @@
+"""Conflict-free timetable scheduler for class generation"""
+
+import bisect
+import itertools
+import random
+from collections import namedtuple
+import static_data
+
+ScheduleSlot = namedtuple('ScheduleSlot', ['room_code', 'room_capacity', 'schedule_day', 'schedule_time', 'lecturer_id'])
+
+class TimetableScheduler:
+    """
+    Assigns (room, day, time slot, lecturer) without double-booking.
+
+    Every room and lecturer has an occupancy bitmap with one bit per
+    (day, time slot) pair. A slot is only handed out when it is free for
+    both the room and the lecturer, and rooms are picked best-fit by
+    capacity so large rooms stay available for large classes.
+    """
+
+    def __init__(self, rooms, lecturer_ids, days=None, time_slots=None, rng=None):
+        """
+        rooms: rows of (room_code, capacity)
+        lecturer_ids: lecturer ids to assign
+        """
+        self.days = list(days or static_data.DAYS_OF_WEEK)
+        self.time_slots = list(time_slots or static_data.TIME_SLOTS)
+        self.slot_count = len(self.days) * len(self.time_slots)
+        self.full_mask = (1 << self.slot_count) - 1
+        self.rng = rng or random
+
+        # Rooms sorted by capacity for best-fit lookups
+        sorted_rooms = sorted(rooms, key=lambda room: room[1])
+        self.room_codes = [room_code for room_code, capacity in sorted_rooms]
+        self.room_capacities = [capacity for room_code, capacity in sorted_rooms]
+        self.room_occupancy = [0] * len(sorted_rooms)
+
+        # Rooms that still have at least one free slot (kept sorted by capacity)
+        self.open_rooms = list(range(len(sorted_rooms)))
+        self.open_capacities = list(self.room_capacities)
+
+        # Free lecturers per slot, plus a bitmap of slots that still have any free lecturer
+        self.free_lecturers = [list(lecturer_ids) for _ in range(self.slot_count)]
+        self.lecturer_slot_mask = self.full_mask if lecturer_ids else 0
+
+        self.scheduled_count = 0
+        self.unscheduled_count = 0
+
+    def assign(self, capacity):
+        """
+        Reserve a room, day, time slot and lecturer for a class.
+
+        Rooms with at least `capacity` seats are tried smallest first. If none
+        of them has a free slot, the largest remaining rooms are used and the
+        caller should cap the class capacity at `room_capacity`.
+        Returns a ScheduleSlot, or None when the timetable is full.
+        """
+        if not self.lecturer_slot_mask:
+            # Every lecturer is booked in every slot: no room can help
+            self.unscheduled_count += 1
+            return None
+
+        start = bisect.bisect_left(self.open_capacities, capacity)
+        candidates = itertools.chain(range(start, len(self.open_rooms)), range(start - 1, -1, -1))
+
+        for position in candidates:
+            room_index = self.open_rooms[position]
+            free = self.lecturer_slot_mask & ~self.room_occupancy[room_index]
+            if not free:
+                continue
+
+            slot = self._pick_slot(free)
+            lecturer_id = self._take_lecturer(slot)
+            self.room_occupancy[room_index] |= 1 << slot
+            if self.room_occupancy[room_index] == self.full_mask:
+                del self.open_rooms[position]
+                del self.open_capacities[position]
+            self.scheduled_count += 1
+
+            day_index, time_index = divmod(slot, len(self.time_slots))
+            return ScheduleSlot(
+                self.room_codes[room_index],
+                self.room_capacities[room_index],
+                self.days[day_index],
+                self.time_slots[time_index],
+                lecturer_id
+            )
+
+        self.unscheduled_count += 1
+        return None
+
+    def _pick_slot(self, free):
+        """Pick a random set bit from the free mask"""
+        offset = self.rng.randrange(self.slot_count)
+        rotated = ((free >> offset) | (free << (self.slot_count - offset))) & self.full_mask
+        lowest = (rotated & -rotated).bit_length() - 1
+        return (lowest + offset) % self.slot_count
+
+    def _take_lecturer(self, slot):
+        """Remove and return a random free lecturer for a slot"""
+        lecturers = self.free_lecturers[slot]
+        index = self.rng.randrange(len(lecturers))
+        lecturer_id = lecturers[index]
+        lecturers[index] = lecturers[-1]
+        lecturers.pop()
+        if not lecturers:
+            self.lecturer_slot_mask &= ~(1 << slot)
+        return lecturer_id
+
+def get_timetable_scheduler(rooms, lecturer_ids, rng=None):
+    """Factory function to get timetable scheduler instance"""
+    return TimetableScheduler(rooms, lecturer_ids, rng=rng)
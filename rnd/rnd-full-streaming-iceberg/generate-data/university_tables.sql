@@ -101,6 +101,16 @@ CREATE TABLE IF NOT EXISTS course (
     FOREIGN KEY (program_id) REFERENCES program(id)
 );
 
+-- Course Prerequisites Table
+CREATE TABLE IF NOT EXISTS course_prerequisite (
+    course_code VARCHAR(10) NOT NULL,
+    prerequisite_code VARCHAR(10) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (course_code, prerequisite_code),
+    FOREIGN KEY (course_code) REFERENCES course(course_code),
+    FOREIGN KEY (prerequisite_code) REFERENCES course(course_code)
+);
+
 -- Registration Table
 CREATE TABLE IF NOT EXISTS registration (
     registration_id VARCHAR(50) PRIMARY KEY,
@@ -149,6 +159,7 @@ CREATE TABLE IF NOT EXISTS student_enrollment (
     attendance_percentage DECIMAL(5,2),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    academic_year VARCHAR(10),
     FOREIGN KEY (student_id) REFERENCES students(student_id),
     FOREIGN KEY (registration_id) REFERENCES registration(registration_id),
     FOREIGN KEY (class_id) REFERENCES class(class_id),
@@ -174,14 +185,26 @@ CREATE TABLE IF NOT EXISTS payment (
     due_date DATE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    academic_year VARCHAR(10),
     FOREIGN KEY (student_id) REFERENCES students(student_id),
     FOREIGN KEY (registration_id) REFERENCES registration(registration_id)
 );
 
+-- Upgrade tables created before enrollments and payments carried their academic year
+ALTER TABLE student_enrollment ADD COLUMN IF NOT EXISTS academic_year VARCHAR(10);
+ALTER TABLE payment ADD COLUMN IF NOT EXISTS academic_year VARCHAR(10);
+UPDATE student_enrollment se SET academic_year = r.academic_year
+FROM registration r WHERE se.registration_id = r.registration_id AND se.academic_year IS NULL;
+UPDATE payment p SET academic_year = r.academic_year
+FROM registration r WHERE p.registration_id = r.registration_id AND p.academic_year IS NULL;
+
 -- Create indexes for better performance
 CREATE INDEX IF NOT EXISTS idx_students_entry_year ON students(entry_year);
+CREATE INDEX IF NOT EXISTS idx_students_active ON students(student_id) WHERE status = 'active';
 CREATE INDEX IF NOT EXISTS idx_registration_academic_year ON registration(academic_year);
 CREATE INDEX IF NOT EXISTS idx_registration_semester ON registration(semester);
 CREATE INDEX IF NOT EXISTS idx_class_academic_year ON class(academic_year);
 CREATE INDEX IF NOT EXISTS idx_enrollment_student_id ON student_enrollment(student_id);
-CREATE INDEX IF NOT EXISTS idx_payment_student_id ON payment(student_id); 
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_payment_student_id ON payment(student_id);
+CREATE INDEX IF NOT EXISTS idx_enrollment_academic_year ON student_enrollment(academic_year);
+CREATE INDEX IF NOT EXISTS idx_payment_academic_year ON payment(academic_year); 
\ No newline at end of file
@@ -109,6 +109,16 @@ CREATE TABLE course (
     FOREIGN KEY (program_id) REFERENCES program(id)
 );
 
+-- Course Prerequisites Table
+CREATE TABLE course_prerequisite (
+    course_code VARCHAR(10) NOT NULL,
+    prerequisite_code VARCHAR(10) NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (course_code, prerequisite_code),
+    FOREIGN KEY (course_code) REFERENCES course(course_code),
+    FOREIGN KEY (prerequisite_code) REFERENCES course(course_code)
+);
+
 -- Registration Table
 CREATE TABLE registration (
     registration_id VARCHAR(50) PRIMARY KEY,
@@ -157,6 +167,7 @@ CREATE TABLE student_enrollment (
     attendance_percentage DECIMAL(5,2),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    academic_year VARCHAR(10),
     FOREIGN KEY (student_id) REFERENCES students(student_id),
     FOREIGN KEY (registration_id) REFERENCES registration(registration_id),
     FOREIGN KEY (class_id) REFERENCES class(class_id),
@@ -182,16 +193,20 @@ CREATE TABLE payment (
     due_date DATE,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    academic_year VARCHAR(10),
     FOREIGN KEY (student_id) REFERENCES students(student_id),
     FOREIGN KEY (registration_id) REFERENCES registration(registration_id)
 );
 
 -- Create indexes for better performance
 CREATE INDEX idx_students_entry_year ON students(entry_year);
+CREATE INDEX idx_students_active ON students(student_id) WHERE status = 'active';
 CREATE INDEX idx_registration_academic_year ON registration(academic_year);
 CREATE INDEX idx_registration_semester ON registration(semester);
 CREATE INDEX idx_class_academic_year ON class(academic_year);
 CREATE INDEX idx_enrollment_student_id ON student_enrollment(student_id);
 CREATE INDEX idx_payment_student_id ON payment(student_id);
+CREATE INDEX idx_enrollment_academic_year ON student_enrollment(academic_year);
+CREATE INDEX idx_payment_academic_year ON payment(academic_year);
 
 -- Debezium will manage replication slot automatically via connector config 
\ No newline at end of file